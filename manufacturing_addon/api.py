@@ -3,6 +3,11 @@ import frappe
 from frappe import _
 import json
 
+from manufacturing_addon.manufacturing_addon.utils.item_parameters import (
+    apply_item_parameters,
+    prime_item_parameter_caches,
+)
+
 @frappe.whitelist() 
 def create_order_sheet(sales_order): 
     """Creates an Order Sheet for a given Sales Order and adds items to child table""" 
@@ -54,122 +59,22 @@ def create_order_sheet(sales_order):
 
 
 def add_parameter(doc, method):
-    # Get custom_item_category from the Item's Item Group
-    if doc.item_group:
-        item_group = frappe.get_doc("Item Group", doc.item_group)
-        if hasattr(item_group, 'custom_item_category') and item_group.custom_item_category and not doc.custom_item_parameter:
-            category = frappe.get_doc("Item Category", item_group.custom_item_category)
-            for param in category.custom_item_parameter:
-                row = doc.append("custom_item_parameter", {})
-                row.parameter = param.parameter
-    
-    # Copy combo_detail from Stitching Size to Item's custom_product_combo_item
-    print(f"\n{'='*60}")
-    print(f"[add_parameter] Processing Item: '{doc.name}'")
-    print(f"{'='*60}")
-    
-    # Check if item has SIZE attribute
-    size_value = None
-    
-    # Method 1: Try to get from database (for existing items)
-    print(f"[add_parameter] Method 1: Getting variant attributes from database for item: '{doc.name}'")
-    variant_attributes = frappe.get_all(
-        "Item Variant Attribute",
-        filters={"parent": doc.name},
-        fields=["attribute", "attribute_value"]
+    """Item validate: copy Item Category parameters and Stitching Size combo rows."""
+    apply_item_parameters([doc])
+
+
+@frappe.whitelist()
+def enqueue_multiple_variant_creation(item, args, use_template_image=False):
+    """Warm parameter/combo caches for the whole variant batch, then defer to ERPNext."""
+    from erpnext.controllers.item_variant import enqueue_multiple_variant_creation as enqueue_variants
+
+    attributes = json.loads(args) if isinstance(args, str) else (args or {})
+    sizes = next((values for attribute, values in attributes.items() if attribute.upper() == "SIZE"), [])
+    prime_item_parameter_caches(
+        item_groups=[frappe.db.get_value("Item", item, "item_group")],
+        sizes=sizes,
     )
-    
-    print(f"[add_parameter] Found {len(variant_attributes)} variant attributes from database")
-    for attr in variant_attributes:
-        print(f"  - Attribute: '{attr.attribute}' = '{attr.attribute_value}'")
-        if attr.attribute and attr.attribute.upper() == "SIZE":
-            size_value = attr.attribute_value
-            print(f"[add_parameter] Found SIZE attribute from database: '{size_value}'")
-            break
-    
-    # Method 2: If not found, try to get from document's attributes (for new items)
-    if not size_value and hasattr(doc, 'attributes'):
-        print(f"[add_parameter] Method 2: Checking document attributes")
-        if doc.attributes:
-            for attr in doc.attributes:
-                print(f"  - Document Attribute: '{attr.attribute}' = '{attr.attribute_value}'")
-                if attr.attribute and attr.attribute.upper() == "SIZE":
-                    size_value = attr.attribute_value
-                    print(f"[add_parameter] Found SIZE attribute from document: '{size_value}'")
-                    break
-    
-    # Method 3: If still not found, extract from item name (fallback)
-    if not size_value:
-        print(f"[add_parameter] Method 3: Extracting SIZE from item name: '{doc.name}'")
-        import re
-        item_name = doc.name or ""
-        # Pattern: size-like token with X separators and optional /, +, *, or parentheses
-        size_pattern = re.search(r'([0-9][0-9Xx/,+*().]*[Xx][0-9Xx/,+*().]*)', item_name)
-        if size_pattern:
-            size_value = size_pattern.group(1)
-            size_value = size_value.strip()
-            if size_value.startswith("("):
-                size_value = size_value[1:]
-            if ")*" in size_value:
-                size_value = size_value.replace(")*", "*")
-            if size_value.endswith(")"):
-                size_value = size_value[:-1]
-            print(f"[add_parameter] Extracted SIZE from item name: '{size_value}'")
-    
-    if not size_value:
-        print(f"[add_parameter] No SIZE found for item '{doc.name}'")
-        print(f"{'='*60}\n")
-        return
-    
-    # If SIZE attribute found, get combo_detail from Stitching Size
-    print(f"[add_parameter] Looking for Stitching Size with name: '{size_value}'")
-    stitching_size = frappe.db.get_value("Stitching Size", size_value, "name")
-    
-    if not stitching_size:
-        print(f"[add_parameter] Stitching Size '{size_value}' not found")
-        print(f"{'='*60}\n")
-        return
-    
-    print(f"[add_parameter] Found Stitching Size: '{stitching_size}'")
-    stitching_size_doc = frappe.get_doc("Stitching Size", stitching_size)
-    
-    # Check if combo_detail exists
-    if not hasattr(stitching_size_doc, 'combo_detail'):
-        print(f"[add_parameter] Stitching Size '{stitching_size}' has no combo_detail field")
-        print(f"{'='*60}\n")
-        return
-    
-    if not stitching_size_doc.combo_detail:
-        print(f"[add_parameter] Stitching Size '{stitching_size}' has empty combo_detail")
-        print(f"{'='*60}\n")
-        return
-    
-    print(f"[add_parameter] Found {len(stitching_size_doc.combo_detail)} combo_detail rows")
-    
-    # Check if Item has custom_product_combo_item field
-    if not hasattr(doc, 'custom_product_combo_item'):
-        print(f"[add_parameter] Item '{doc.name}' has no custom_product_combo_item field")
-        print(f"{'='*60}\n")
-        return
-    
-    # If custom_product_combo_item already has rows, do not overwrite
-    existing_count = len(doc.custom_product_combo_item) if doc.custom_product_combo_item else 0
-    if existing_count > 0:
-        print(f"[add_parameter] Skipping combo copy; {existing_count} existing custom_product_combo_item rows found")
-        print(f"{'='*60}\n")
-        return
-    
-    # Copy combo_detail to custom_product_combo_item
-    copied_count = 0
-    for combo_row in stitching_size_doc.combo_detail:
-        print(f"[add_parameter] Copying combo item: item='{combo_row.item}', pcs={combo_row.pcs}")
-        new_row = doc.append("custom_product_combo_item", {})
-        new_row.item = combo_row.item
-        new_row.pcs = combo_row.pcs
-        copied_count += 1
-    
-    print(f"[add_parameter] ✓ Successfully copied {copied_count} combo items from Stitching Size '{stitching_size}' to Item '{doc.name}'")
-    print(f"{'='*60}\n")
+    return enqueue_variants(item, args, use_template_image=use_template_image)
 
 
 
@@ -360,8 +265,13 @@ def get_bulk_work_order_summary(sales_order):
 
 
 @frappe.whitelist()
-def bulk_allocate_delivery(sales_order, delivery_data):
-    """Bulk allocate delivery quantities to work orders"""
+def bulk_allocate_delivery(sales_order, delivery_data, dry_run=False):
+    """Bulk allocate delivery quantities to work orders (FIFO, single pass).
+
+    With ``dry_run`` the allocation plan and timings are returned and nothing is written.
+    """
+    from manufacturing_addon.manufacturing_addon.utils.delivery_allocator import allocate_delivery
+
     if not sales_order or not delivery_data:
         return {"error": "Sales Order and delivery data are required"}
     
@@ -370,75 +280,25 @@ def bulk_allocate_delivery(sales_order, delivery_data):
             delivery_data = json.loads(delivery_data)
         
         # Validate delivery data
+        delivery_map = {}
         for item_data in delivery_data:
             if not item_data.get("item_code") or not item_data.get("delivery_qty"):
                 return {"error": "Invalid delivery data format"}
-        
-        # Get work orders for the sales order
-        work_orders = frappe.get_all(
-            "Work Order",
-            filters={
-                "sales_order": sales_order,
-                "docstatus": 1
-            },
-            fields=["name", "item_code", "qty", "produced_qty"],
-            order_by="creation_date"
-        )
-        
-        allocation_results = []
-        
-        for item_data in delivery_data:
             item_code = item_data["item_code"]
-            delivery_qty = frappe.utils.flt(item_data["delivery_qty"])
-            
-            # Find work orders for this item
-            item_work_orders = [wo for wo in work_orders if wo.item_code == item_code]
-            
-            remaining_qty = delivery_qty
-            item_allocation = {
-                "item_code": item_code,
-                "total_delivery_qty": delivery_qty,
-                "allocated_qty": 0,
-                "work_orders": []
-            }
-            
-            for wo in item_work_orders:
-                if remaining_qty <= 0:
-                    break
-                
-                pending_qty = frappe.utils.flt(wo.qty) - frappe.utils.flt(wo.produced_qty)
-                if pending_qty <= 0:
-                    continue
-                
-                # Allocate quantity to this work order
-                allocation_qty = min(remaining_qty, pending_qty)
-                
-                # Update work order
-                new_produced_qty = frappe.utils.flt(wo.produced_qty) + allocation_qty
-                frappe.db.set_value("Work Order", wo.name, "produced_qty", new_produced_qty)
-                
-                item_allocation["work_orders"].append({
-                    "work_order": wo.name,
-                    "allocated_qty": allocation_qty,
-                    "new_produced_qty": new_produced_qty
-                })
-                
-                item_allocation["allocated_qty"] += allocation_qty
-                remaining_qty -= allocation_qty
-            
-            allocation_results.append(item_allocation)
-            
-            if remaining_qty > 0:
-                frappe.msgprint(_("Warning: {0} units of {1} could not be allocated").format(
-                    remaining_qty, item_code
-                ), indicator="orange")
-        
-        frappe.db.commit()
+            delivery_map[item_code] = delivery_map.get(item_code, 0) + frappe.utils.flt(item_data["delivery_qty"])
+
+        dry_run = frappe.utils.cint(dry_run)
+        plan = allocate_delivery(sales_order, delivery_map, dry_run=dry_run)
+        if not dry_run:
+            frappe.db.commit()
         
         return {
             "success": True,
-            "allocation_results": allocation_results,
-            "message": "Bulk allocation completed successfully"
+            "allocation_results": plan["items"],
+            "unallocated": plan["unallocated"],
+            "timings": plan["timings"],
+            "dry_run": bool(dry_run),
+            "message": "Allocation plan generated" if dry_run else "Bulk allocation completed successfully"
         }
         
     except Exception as e:
@@ -562,17 +422,18 @@ def create_bulk_stock_entry(sales_order, delivery_items, stock_entry_type=None,
 
 def determine_stock_entry_type_from_items(delivery_items):
     """Determine stock entry type based on items"""
-    for item_data in delivery_items:
-        if frappe.utils.flt(item_data.get("delivery_qty", 0)) > 0:
-            # Check if this is a finished good (has BOM)
-            bom_exists = frappe.db.exists("BOM", {
-                "item": item_data["item_code"],
-                "is_active": 1,
-                "is_default": 1
-            })
-            
-            if bom_exists:
-                return "Manufacture"
+    item_codes = [
+        item_data["item_code"]
+        for item_data in delivery_items
+        if frappe.utils.flt(item_data.get("delivery_qty", 0)) > 0
+    ]
+    # A finished good (has an active default BOM) makes it a Manufacture entry
+    if item_codes and frappe.get_all(
+        "BOM",
+        filters={"item": ["in", item_codes], "is_active": 1, "is_default": 1},
+        limit=1,
+    ):
+        return "Manufacture"
     
     return "Material Transfer for Manufacture"
 
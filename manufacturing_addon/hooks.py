@@ -158,10 +158,30 @@ doc_events = {
 	"Item": {
 		"validate": "manufacturing_addon.api.add_parameter",
 	},
+    "Item Category": {
+        "on_update": "manufacturing_addon.manufacturing_addon.utils.item_parameters.clear_category_parameters_cache",
+        "on_trash": "manufacturing_addon.manufacturing_addon.utils.item_parameters.clear_category_parameters_cache",
+    },
+    "Stitching Size": {
+        "on_update": "manufacturing_addon.manufacturing_addon.utils.item_parameters.clear_size_combo_cache",
+        "on_trash": "manufacturing_addon.manufacturing_addon.utils.item_parameters.clear_size_combo_cache",
+    },
     "Sales Order": {
 		"validate": "manufacturing_addon.api.validate_sales_order",
 		"on_update": "manufacturing_addon.manufacturing_addon.doctype.sales_order.sales_order.close_cost_center_when_sales_order_is_closed",
+		"on_submit": "manufacturing_addon.sales_addon_api.clear_sales_order_listview_dashboard_cache",
+		"on_cancel": "manufacturing_addon.sales_addon_api.clear_sales_order_listview_dashboard_cache",
+		"on_update_after_submit": "manufacturing_addon.sales_addon_api.clear_sales_order_listview_dashboard_cache",
 	},
+    # Deliveries and invoices move Sales Order status (To Deliver / To Bill / Completed)
+    "Delivery Note": {
+        "on_submit": "manufacturing_addon.sales_addon_api.clear_sales_order_listview_dashboard_cache",
+        "on_cancel": "manufacturing_addon.sales_addon_api.clear_sales_order_listview_dashboard_cache",
+    },
+    "Sales Invoice": {
+        "on_submit": "manufacturing_addon.sales_addon_api.clear_sales_order_listview_dashboard_cache",
+        "on_cancel": "manufacturing_addon.sales_addon_api.clear_sales_order_listview_dashboard_cache",
+    },
     "BOM": {
         "validate": ["manufacturing_addon.manufacturing_addon.doctype.bom.bom.duplicate_item", 
                     # "manufacturing_addon.manufacturing_addon.doctype.bom.bom.get_bom_items_from_bom_template"
@@ -176,8 +196,45 @@ doc_events = {
         "on_update": "manufacturing_addon.manufacturing_addon.doctype.subcontracting_order.subcontracting_order.on_update_currency_conversion",
     },
     "Packing Report": {
-        "on_submit": "manufacturing_addon.manufacturing_addon.doctype.shipment_loading.shipment_loading.sync_shipment_loading_from_packing_report",
-        "on_cancel": "manufacturing_addon.manufacturing_addon.doctype.shipment_loading.shipment_loading.sync_shipment_loading_from_packing_report",
+        "on_update": "manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link.sync_item_production_links",
+        "on_submit": [
+            "manufacturing_addon.manufacturing_addon.doctype.shipment_loading.shipment_loading.sync_shipment_loading_from_packing_report",
+            "manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link.sync_item_production_links",
+        ],
+        "on_cancel": [
+            "manufacturing_addon.manufacturing_addon.doctype.shipment_loading.shipment_loading.sync_shipment_loading_from_packing_report",
+            "manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link.sync_item_production_links",
+        ],
+        "on_update_after_submit": "manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link.sync_item_production_links",
+        "on_trash": "manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link.sync_item_production_links",
+    },
+    "Order Sheet": {
+        "on_update": "manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link.sync_item_production_links",
+        "on_submit": "manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link.sync_item_production_links",
+        "on_cancel": "manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link.sync_item_production_links",
+        "on_update_after_submit": "manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link.sync_item_production_links",
+        "on_trash": "manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link.sync_item_production_links",
+    },
+    "Cutting Report": {
+        "on_update": "manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link.sync_item_production_links",
+        "on_submit": "manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link.sync_item_production_links",
+        "on_cancel": "manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link.sync_item_production_links",
+        "on_update_after_submit": "manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link.sync_item_production_links",
+        "on_trash": "manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link.sync_item_production_links",
+    },
+    "Stitching Report": {
+        "on_update": "manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link.sync_item_production_links",
+        "on_submit": "manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link.sync_item_production_links",
+        "on_cancel": "manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link.sync_item_production_links",
+        "on_update_after_submit": "manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link.sync_item_production_links",
+        "on_trash": "manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link.sync_item_production_links",
+    },
+    "Checking Report": {
+        "on_update": "manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link.sync_item_production_links",
+        "on_submit": "manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link.sync_item_production_links",
+        "on_cancel": "manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link.sync_item_production_links",
+        "on_update_after_submit": "manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link.sync_item_production_links",
+        "on_trash": "manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link.sync_item_production_links",
     },
 }
 
@@ -218,6 +275,12 @@ scheduler_events = {
 # override_whitelisted_methods = {
 # 	"frappe.desk.doctype.event.event.get_events": "manufacturing_addon.event.get_events"
 # }
+
+override_whitelisted_methods = {
+	"erpnext.controllers.item_variant.enqueue_multiple_variant_creation": "manufacturing_addon.api.enqueue_multiple_variant_creation",
+	"frappe.model.utils.user_settings.save": "manufacturing_addon.manufacturing_addon.utils.print_columns.save_user_settings",
+}
+
 #
 # each overriding function accepts a `data` argument;
 # generated from the base implementation of the doctype dashboard,
@@ -0,0 +1,220 @@
+# Copyright (c) 2026, Manufacturing Addon contributors
+# License: MIT
+
+"""Wall time and query counts of the manufacturing hot paths on synthetic data.
+
+Seeds data with ``synthetic_data.generate()``, runs every case ``repeat``
+times under ``query_budget.measure()`` and returns (or writes to ``output``)
+one JSON document per run, so results of two versions can be diffed with
+``compare()``. Cases that write (WOTM population, RMT submit, shipment
+auto-fill, report save) run inside a savepoint rolled back after each
+repetition, so every repetition sees the same data.
+
+	bench --site <site> execute manufacturing_addon.manufacturing_addon.benchmarks.hot_paths.run --kwargs "{'order_sheets': 50, 'lines': 20, 'output': 'hot_paths.json'}"
+	bench --site <site> execute manufacturing_addon.manufacturing_addon.benchmarks.hot_paths.compare --kwargs "{'baseline': 'before.json', 'current': 'after.json'}"
+
+RMT submit posts real Stock Entries: the source warehouse needs stock (or
+Stock Settings must allow negative stock), otherwise that case reports the
+error instead of timings.
+"""
+
+import json
+import statistics
+import time
+
+import frappe
+from frappe.utils import now, strip_html
+
+import manufacturing_addon
+from manufacturing_addon.manufacturing_addon.benchmarks import synthetic_data
+from manufacturing_addon.manufacturing_addon.utils.query_budget import measure
+from manufacturing_addon.manufacturing_addon.utils.stage_totals import STAGE_TABLES
+
+SAVEPOINT = "manufacturing_addon_benchmark"
+
+
+def _save_report(doctype, name):
+	frappe.get_doc(doctype, name).save(ignore_permissions=True)
+
+
+def _submit_rmt(name):
+	frappe.get_doc("Raw Material Transfer", name).submit()
+
+
+def _cases(data):
+	"""{case: (callable, writes)} for the seeded data."""
+	from manufacturing_addon.manufacturing_addon.doctype.shipment_loading.shipment_loading import auto_fill_container
+	from manufacturing_addon.manufacturing_addon.doctype.work_order_transfer_manager.work_order_transfer_manager import (
+		populate_work_order_tables,
+	)
+	from manufacturing_addon.manufacturing_addon.page.contractor_billing.contractor_billing import (
+		get_contractor_billing_data,
+	)
+	from manufacturing_addon.manufacturing_addon.page.order_tracking.order_tracking import get_dashboard_data
+
+	first_sheet = data["order_sheets"][0]
+	cases = {
+		"order_tracking.order_sheet": (lambda: get_dashboard_data(order_sheet=first_sheet), False),
+		"order_tracking.customer": (lambda: get_dashboard_data(customer=data["customer"]), False),
+		"contractor_billing.order_sheet": (lambda: get_contractor_billing_data({"order_sheet": first_sheet}), False),
+		"contractor_billing.contractor": (lambda: get_contractor_billing_data({"contractor": data["contractor"]}), False),
+		"wotm.populate": (lambda: populate_work_order_tables(data["sales_orders"][0], data["wotm_draft"]), True),
+		"rmt.submit": (lambda: _submit_rmt(data["rmt"]), True),
+		"shipment.auto_fill": (lambda: auto_fill_container(first_sheet), True),
+	}
+	for stage, name in data["draft_reports"].items():
+		doctype = STAGE_TABLES[stage][0]
+		cases[f"report_save.{frappe.scrub(stage)}"] = (lambda doctype=doctype, name=name: _save_report(doctype, name), True)
+	return cases
+
+
+def _run_case(name, fn, writes, repeat):
+	samples, error = [], None
+	for _i in range(repeat):
+		if writes:
+			frappe.db.savepoint(SAVEPOINT)
+		try:
+			with measure(name) as probe:
+				fn()
+			samples.append(probe.sample)
+		except Exception as e:
+			error = f"{type(e).__name__}: {strip_html(str(e))}"
+		finally:
+			frappe.local.message_log = []
+			if writes:
+				try:
+					frappe.db.rollback(save_point=SAVEPOINT)
+				except Exception:
+					# the case committed mid-run, so later repetitions would see its writes
+					error = error or "savepoint lost: case committed its own transaction"
+		if error:
+			break
+
+	result = {"writes": writes, "runs": len(samples)}
+	if error:
+		result["error"] = error
+	if samples:
+		ms = [s["db_ms"] + s["py_ms"] for s in samples]
+		result.update(
+			{
+				"ms_min": round(min(ms), 2),
+				"ms_median": round(statistics.median(ms), 2),
+				"db_ms_median": round(statistics.median(s["db_ms"] for s in samples), 2),
+				"py_ms_median": round(statistics.median(s["py_ms"] for s in samples), 2),
+				"queries": max(s["queries"] for s in samples),
+				"peak_kb": max(s["peak_kb"] for s in samples),
+			}
+		)
+	return result
+
+
+def _app_ref():
+	try:
+		from frappe.utils.change_log import get_app_last_commit_ref
+
+		return get_app_last_commit_ref("manufacturing_addon")
+	except Exception:
+		return None
+
+
+def run(
+	order_sheets=10,
+	lines=20,
+	reports=3,
+	combo_every=4,
+	combo_size=2,
+	raw_materials=4,
+	repeat=5,
+	seed=7,
+	cases=None,
+	prefix=synthetic_data.DEFAULT_PREFIX,
+	keep=0,
+	output=None,
+):
+	"""Seed, time every case and tear down; returns a JSON-serialisable dict.
+
+	``cases`` is an optional comma-separated list of case names to run;
+	``keep=1`` leaves the synthetic data in place for inspection.
+	"""
+	params = {
+		"order_sheets": int(order_sheets),
+		"lines": int(lines),
+		"reports": int(reports),
+		"combo_every": int(combo_every),
+		"combo_size": int(combo_size),
+		"raw_materials": int(raw_materials),
+		"repeat": max(int(repeat), 1),
+		"seed": int(seed),
+	}
+	if isinstance(cases, str):
+		cases = [c.strip() for c in cases.split(",") if c.strip()]
+
+	synthetic_data.teardown(prefix)
+	started = time.perf_counter()
+	data = synthetic_data.generate(prefix=prefix, **{k: v for k, v in params.items() if k != "repeat"})
+	seed_seconds = round(time.perf_counter() - started, 2)
+
+	results = {}
+	try:
+		for name, (fn, writes) in _cases(data).items():
+			if cases and name not in cases:
+				continue
+			results[name] = _run_case(name, fn, writes, params["repeat"])
+	finally:
+		if not int(keep):
+			synthetic_data.teardown(prefix)
+
+	out = {
+		"benchmark": "hot_paths",
+		"timestamp": now(),
+		"versions": {
+			"manufacturing_addon": manufacturing_addon.__version__,
+			"commit": _app_ref(),
+			"frappe": frappe.__version__,
+		},
+		"params": params,
+		"data": data["counts"],
+		"seed_seconds": seed_seconds,
+		"cases": results,
+	}
+	if output:
+		with open(output, "w") as f:
+			json.dump(out, f, indent=2)
+	return out
+
+
+def _load(result):
+	if isinstance(result, dict):
+		return result
+	with open(result) as f:
+		return json.load(f)
+
+
+def compare(baseline, current, threshold=10):
+	"""Per-case change between two run() outputs (dicts or JSON paths).
+
+	A case regresses when its median time grows by more than ``threshold``
+	percent or it issues more queries than the baseline.
+	"""
+	baseline, current = _load(baseline), _load(current)
+	threshold = float(threshold)
+	cases = {}
+	for name, after in current.get("cases", {}).items():
+		before = baseline.get("cases", {}).get(name)
+		if not before or "ms_median" not in before or "ms_median" not in after:
+			cases[name] = {"error": after.get("error") or "missing in baseline"}
+			continue
+		change = (after["ms_median"] - before["ms_median"]) / before["ms_median"] * 100 if before["ms_median"] else 0
+		cases[name] = {
+			"ms_median": [before["ms_median"], after["ms_median"]],
+			"ms_change_pct": round(change, 1),
+			"queries": [before["queries"], after["queries"]],
+			"regression": change > threshold or after["queries"] > before["queries"],
+		}
+	return {
+		"baseline": baseline.get("versions"),
+		"current": current.get("versions"),
+		"params_match": baseline.get("params") == current.get("params"),
+		"regressions": sorted(name for name, row in cases.items() if row.get("regression")),
+		"cases": cases,
+	}
@@ -0,0 +1,106 @@
+# Copyright (c) 2026, Manufacturing Addon contributors
+# License: MIT
+
+"""Throughput benchmark for size/article extraction from item names.
+
+Compares the previous inline regex code (recompiled per call, no memo) with
+utils.size_parser over a synthetic corpus shaped like real export-order item
+names, where a few hundred distinct names repeat across many order lines.
+
+	bench --site <site> execute manufacturing_addon.manufacturing_addon.benchmarks.item_name_parsing.run
+	python -m manufacturing_addon.manufacturing_addon.benchmarks.item_name_parsing
+"""
+
+import json
+import random
+import re
+import time
+
+from manufacturing_addon.manufacturing_addon.utils import size_parser
+
+ARTICLES = ["BDH-QCS", "DVC-PRM", "FS-300TC", "PC-OXF", "TWL-BTH", "QLT-STR", "BSP-SET"]
+COLOURS = ["WHITE", "IVORY", "GREY", "NAVY", "SAGE", "BLUSH"]
+SIZES = [
+	"140X220",
+	"140X220,60X70+15",
+	"46X71+7.5",
+	"140X200/70X80",
+	"(135X200/80X80)*2",
+	"200X200,2X50X75",
+	"90X190+30",
+	"160X200+25,2X50X75",
+	"240X260/2X65X65",
+]
+
+
+def build_corpus(lines=100_000, distinct=500, seed=7):
+	"""``lines`` item names drawn from ``distinct`` real-style names."""
+	rng = random.Random(seed)
+	names = [
+		f"{rng.choice(ARTICLES)}-{rng.choice(SIZES)}-{rng.choice(COLOURS)}-{i:04d}"
+		for i in range(distinct)
+	]
+	return [rng.choice(names) for _ in range(lines)]
+
+
+def _legacy_extract(item_name):
+	size_value = None
+	size_pattern = re.search(r'([0-9][0-9Xx/,+*().]*[Xx][0-9Xx/,+*().]*)', item_name)
+	if size_pattern:
+		size_value = size_pattern.group(1).strip()
+		if size_value.startswith("("):
+			size_value = size_value[1:]
+		if ")*" in size_value:
+			size_value = size_value.replace(")*", "*")
+		if size_value.endswith(")"):
+			size_value = size_value[:-1]
+
+	article_value = None
+	size_match = re.search(r'\d+(?:\.\d+)?X\d+', item_name)
+	if size_match:
+		article_value = item_name[:size_match.start()].strip().rstrip('- ').strip() or None
+	return article_value, size_value
+
+
+def _parser_extract(item_name):
+	parsed = size_parser.parse_item_name(item_name)
+	return parsed.article, parsed.size
+
+
+def _time(fn, corpus):
+	start = time.perf_counter()
+	for name in corpus:
+		fn(name)
+	elapsed = time.perf_counter() - start
+	return {"seconds": round(elapsed, 4), "names_per_second": int(len(corpus) / elapsed) if elapsed else None}
+
+
+def run(lines=100_000, distinct=500, seed=7):
+	"""Time legacy vs memoized parsing; returns a JSON-serialisable dict."""
+	corpus = build_corpus(int(lines), int(distinct), int(seed))
+
+	mismatches = [name for name in set(corpus) if _legacy_extract(name) != _parser_extract(name)]
+
+	size_parser.clear_parse_cache()
+	legacy = _time(_legacy_extract, corpus)
+	size_parser.clear_parse_cache()
+	parser_cold = _time(_parser_extract, corpus)
+	parser_warm = _time(_parser_extract, corpus)
+	size_parser.clear_parse_cache()
+	parse_size = _time(lambda name: size_parser.parse_size(size_parser.extract_size(name)), corpus)
+
+	return {
+		"benchmark": "item_name_parsing",
+		"lines": len(corpus),
+		"distinct_names": len(set(corpus)),
+		"mismatches": sorted(mismatches)[:20],
+		"legacy": legacy,
+		"parser_cold": parser_cold,
+		"parser_warm": parser_warm,
+		"parse_size": parse_size,
+		"cache": size_parser.parse_item_name.cache_info()._asdict(),
+	}
+
+
+if __name__ == "__main__":
+	print(json.dumps(run(), indent=2))
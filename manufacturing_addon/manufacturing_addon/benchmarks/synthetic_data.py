@@ -0,0 +1,501 @@
+# Copyright (c) 2026, Manufacturing Addon contributors
+# License: MIT
+
+"""Synthetic order data for the hot-path benchmarks.
+
+``generate()`` writes N order sheets × M lines (every ``combo_every``-th line
+a product combo), their Sales Orders, BOMs, Work Orders and Bins, K submitted
+reports per stage and one draft report per stage, a Shipment Loading with
+cartons, a draft and a submitted Work Order Transfer Manager and a draft Raw
+Material Transfer. Rows are written straight to the database (no controller
+hooks), so seeding a few thousand lines takes seconds. Every name starts with
+``<prefix>-`` and ``teardown(prefix)`` removes them again.
+
+Only for local benchmark sites: it refuses to run unless ``developer_mode``
+or ``allow_tests`` is set in site config.
+"""
+
+import math
+import random
+
+import frappe
+from frappe import _
+from frappe.utils import add_days, flt, now_datetime, nowdate, nowtime
+
+from manufacturing_addon.manufacturing_addon.utils.stage_totals import STAGE_TABLES
+
+DEFAULT_PREFIX = "BENCH"
+STOCK_ENTRY_TYPE = "Material Transfer for Manufacture"
+
+# share of planned qty each stage has finished once all K reports are in
+STAGE_RATIOS = {"Cutting": 1.0, "Stitching": 0.95, "Checking": 0.9, "Quality": 0.9, "Packing": 0.85}
+STAGE_ABBR = {"Cutting": "CR", "Stitching": "SR", "Checking": "CHR", "Quality": "QR", "Packing": "PR"}
+
+# parents seeded by generate(); children are removed through their parenttype
+FIXTURE_DOCTYPES = (
+	"Raw Material Transfer",
+	"Work Order Transfer Manager",
+	"Shipment Loading",
+	*(report for report, _ct, _qty in STAGE_TABLES.values()),
+	"Order Sheet",
+	"Work Order",
+	"Sales Order",
+	"BOM",
+	"Item",
+	"Manufacturing Contractor",
+	"Supplier",
+	"Customer",
+)
+
+
+def ensure_benchmark_site():
+	if not (frappe.conf.get("developer_mode") or frappe.conf.get("allow_tests")):
+		frappe.throw(_("Benchmarks write synthetic data; enable developer_mode or allow_tests on this site first"))
+
+
+def _insert(values, name=None, docstatus=0):
+	"""Insert a document and its child rows without running controller hooks."""
+	doc = frappe.get_doc(values)
+	doc.docstatus = docstatus
+	doc.set_new_name(set_name=name)
+	doc.set_user_and_timestamp()
+	doc.set_parent_in_children()
+	doc.db_insert()
+	for child in doc.get_all_children():
+		child.docstatus = docstatus
+		child.db_insert()
+	return doc
+
+
+def _warehouses(company):
+	warehouses = frappe.get_all(
+		"Warehouse",
+		filters={"company": company, "is_group": 0, "disabled": 0},
+		pluck="name",
+		order_by="name",
+		limit=2,
+	)
+	if not warehouses:
+		frappe.throw(_("Company {0} has no warehouses").format(company))
+	return warehouses[0], warehouses[-1]
+
+
+def _item(code, item_group, valuation_rate=0, default_bom=None, combo_items=None):
+	values = {
+		"doctype": "Item",
+		"item_code": code,
+		"item_name": code,
+		"item_group": item_group,
+		"stock_uom": "Nos",
+		"is_stock_item": 1,
+		"include_item_in_manufacturing": 1,
+		"valuation_rate": valuation_rate,
+		"default_bom": default_bom,
+	}
+	if combo_items and frappe.get_meta("Item").has_field("custom_product_combo_item"):
+		values["custom_is_product_combo"] = 1
+		values["custom_product_combo_item"] = [{"item": c, "pcs": 1} for c in combo_items]
+	return _insert(values, name=code)
+
+
+def _report_rows(stage, sheet_rows, qty_per_report, customer):
+	qty_field = STAGE_TABLES[stage][2]
+	return [
+		{
+			"customer": customer,
+			"so_item": row["so_item"],
+			"combo_item": row["combo_item"],
+			"order_qty": row["order_qty"],
+			"planned_qty": row["planned_qty"],
+			"qty_ctn": str(row["qty_ctn"]),
+			qty_field: qty_per_report[(row["so_item"], row["combo_item"] or "")],
+		}
+		for row in sheet_rows
+	]
+
+
+def _report(stage, name, order_sheet, rows, customer, contractor, posting_date, docstatus):
+	report_doctype, child_doctype, _qty = STAGE_TABLES[stage]
+	meta = frappe.get_meta(report_doctype)
+	values = {
+		"doctype": report_doctype,
+		"date": posting_date,
+		"time": nowtime(),
+		"order_sheet": order_sheet,
+		"ordered_qty": sum(flt(r["order_qty"]) for r in rows),
+		frappe.scrub(child_doctype): rows,
+	}
+	if meta.has_field("customer"):
+		values["customer"] = customer
+	if meta.has_field("supplier"):
+		values["supplier"] = contractor
+	return _insert(values, name=name, docstatus=docstatus)
+
+
+def generate(order_sheets=10, lines=20, reports=3, combo_every=4, combo_size=2, raw_materials=4, prefix=DEFAULT_PREFIX, seed=7):
+	"""Seed synthetic data and return the names the benchmark cases run against."""
+	ensure_benchmark_site()
+	order_sheets = max(int(order_sheets), 2)
+	lines, reports, seed = int(lines), int(reports), int(seed)
+	combo_every, combo_size, raw_materials = int(combo_every), int(combo_size), int(raw_materials)
+
+	company = frappe.defaults.get_global_default("company")
+	if not company:
+		frappe.throw(_("Set a default company before running benchmarks"))
+	source_warehouse, target_warehouse = _warehouses(company)
+	currency = frappe.get_cached_value("Company", company, "default_currency")
+	item_group = frappe.db.get_value("Item Group", {"is_group": 0}, "name") or "All Item Groups"
+	rng = random.Random(seed)
+	today = nowdate()
+	counts = {}
+
+	customer = _insert({"doctype": "Customer", "customer_name": f"{prefix}-Customer"}, name=f"{prefix}-Customer").name
+	supplier = _insert({"doctype": "Supplier", "supplier_name": f"{prefix}-Contractor"}, name=f"{prefix}-Contractor").name
+	contractor = _insert(
+		{
+			"doctype": "Manufacturing Contractor",
+			"supplier": supplier,
+			"cutting": 1,
+			"stitching": 1,
+			"checking": 1,
+			"packing": 1,
+		},
+		name=supplier,
+	).name
+
+	raw_pool = [f"{prefix}-RM-{i:03d}" for i in range(max(raw_materials * 5, 10))]
+	for code in raw_pool:
+		_item(code, item_group, valuation_rate=10)
+		_insert(
+			{
+				"doctype": "Bin",
+				"item_code": code,
+				"warehouse": source_warehouse,
+				"actual_qty": 1_000_000,
+				"projected_qty": 1_000_000,
+				"stock_uom": "Nos",
+			}
+		)
+	counts["raw_materials"] = counts["bins"] = len(raw_pool)
+
+	result = {
+		"prefix": prefix,
+		"company": company,
+		"customer": customer,
+		"contractor": contractor,
+		"source_warehouse": source_warehouse,
+		"target_warehouse": target_warehouse,
+		"order_sheets": [],
+		"sales_orders": [],
+		"draft_reports": {},
+	}
+	sheet_rows_by_sheet = []
+	bom_items_by_sheet = []
+
+	for s in range(order_sheets):
+		sales_order = f"{prefix}-SO-{s:04d}"
+		order_sheet = f"{prefix}-OS-{s:04d}"
+		so_items, os_rows, work_orders, bom_totals = [], [], [], {}
+
+		for line in range(lines):
+			fg = f"{prefix}-FG-{s:04d}-{line:03d}"
+			qty = rng.randrange(100, 2000, 10)
+			qty_ctn = rng.choice((6, 12, 24))
+			components = (
+				[f"{fg}-C{c}" for c in range(combo_size)] if combo_every and line % combo_every == combo_every - 1 else []
+			)
+
+			bom = f"{prefix}-BOM-{s:04d}-{line:03d}"
+			bom_rows = []
+			for code in rng.sample(raw_pool, min(raw_materials, len(raw_pool))):
+				unit_qty = rng.randint(1, 5)
+				bom_rows.append(
+					{
+						"item_code": code,
+						"item_name": code,
+						"qty": unit_qty,
+						"stock_qty": unit_qty,
+						"uom": "Nos",
+						"stock_uom": "Nos",
+						"conversion_factor": 1,
+						"rate": 10,
+						"amount": unit_qty * 10,
+					}
+				)
+				bom_totals[code] = bom_totals.get(code, 0) + unit_qty * qty
+
+			for component in components:
+				_item(component, item_group)
+			_item(fg, item_group, default_bom=bom, combo_items=components)
+			_insert(
+				{
+					"doctype": "BOM",
+					"item": fg,
+					"item_name": fg,
+					"company": company,
+					"currency": currency,
+					"quantity": 1,
+					"uom": "Nos",
+					"is_active": 1,
+					"is_default": 1,
+					"rm_cost_as_per": "Valuation Rate",
+					"items": bom_rows,
+				},
+				name=bom,
+				docstatus=1,
+			)
+
+			so_items.append(
+				{
+					"item_code": fg,
+					"item_name": fg,
+					"qty": qty,
+					"stock_qty": qty,
+					"uom": "Nos",
+					"stock_uom": "Nos",
+					"conversion_factor": 1,
+					"rate": 10,
+					"amount": qty * 10,
+					"delivery_date": add_days(today, 60),
+					"warehouse": target_warehouse,
+				}
+			)
+			work_orders.append(
+				{
+					"doctype": "Work Order",
+					"production_item": fg,
+					"item_name": fg,
+					"bom_no": bom,
+					"qty": qty,
+					"sales_order": sales_order,
+					"company": company,
+					"status": "Not Started",
+					"stock_uom": "Nos",
+					"source_warehouse": source_warehouse,
+					"wip_warehouse": target_warehouse,
+					"fg_warehouse": target_warehouse,
+					"planned_start_date": today,
+					"required_items": [
+						{
+							"item_code": row["item_code"],
+							"item_name": row["item_code"],
+							"required_qty": row["qty"] * qty,
+							"source_warehouse": source_warehouse,
+						}
+						for row in bom_rows
+					],
+				}
+			)
+			for combo_item in components or [None]:
+				os_rows.append(
+					{
+						"so_item": fg,
+						"combo_item": combo_item,
+						"product_combo": 1 if combo_item else 0,
+						"order_qty": qty,
+						"planned_qty": qty,
+						"qty_ctn": qty_ctn,
+						"total_carton": math.ceil(qty / qty_ctn),
+						"default_bom": bom,
+						"active_bom": bom,
+					}
+				)
+
+		_insert(
+			{
+				"doctype": "Sales Order",
+				"customer": customer,
+				"company": company,
+				"currency": currency,
+				"transaction_date": today,
+				"delivery_date": add_days(today, 60),
+				"status": "To Deliver and Bill",
+				"total_qty": sum(i["qty"] for i in so_items),
+				"total": sum(i["amount"] for i in so_items),
+				"grand_total": sum(i["amount"] for i in so_items),
+				"base_grand_total": sum(i["amount"] for i in so_items),
+				"items": so_items,
+			},
+			name=sales_order,
+			docstatus=1,
+		)
+		for idx, work_order in enumerate(work_orders):
+			_insert(work_order, name=f"{prefix}-WO-{s:04d}-{idx:03d}", docstatus=1)
+
+		_insert(
+			{
+				"doctype": "Order Sheet",
+				"customer": customer,
+				"sales_order": sales_order,
+				"order_no": order_sheet,
+				"shipment_date": add_days(today, 60),
+				"posting_date_and_time": now_datetime(),
+				"total_order_qty": sum(i["qty"] for i in so_items),
+				"total_planned_qty": sum(i["qty"] for i in so_items),
+				"order_sheet_ct": os_rows,
+			},
+			name=order_sheet,
+			docstatus=1,
+		)
+
+		for stage in STAGE_TABLES:
+			abbr = STAGE_ABBR[stage]
+			per_report = {
+				(row["so_item"], row["combo_item"] or ""): math.floor(
+					row["planned_qty"] * STAGE_RATIOS[stage] / (reports + 1)
+				)
+				for row in os_rows
+			}
+			rows = _report_rows(stage, os_rows, per_report, customer)
+			for k in range(reports):
+				_report(
+					stage,
+					f"{prefix}-{abbr}-{s:04d}-{k:02d}",
+					order_sheet,
+					[dict(r) for r in rows],
+					customer,
+					contractor,
+					add_days(today, k - reports),
+					docstatus=1,
+				)
+			if s == 0:
+				result["draft_reports"][stage] = _report(
+					stage, f"{prefix}-{abbr}-{s:04d}-D", order_sheet, rows, customer, contractor, today, docstatus=0
+				).name
+
+		result["order_sheets"].append(order_sheet)
+		result["sales_orders"].append(sales_order)
+		sheet_rows_by_sheet.append(os_rows)
+		bom_items_by_sheet.append(bom_totals)
+
+	# cartons of the first sheet's packed quantity, waiting to be placed
+	packed = STAGE_RATIOS["Packing"] * reports / (reports + 1)
+	cartons = []
+	for idx, row in enumerate(sheet_rows_by_sheet[0], start=1):
+		pieces = math.floor(row["planned_qty"] * packed)
+		carton_count = math.ceil(pieces / row["qty_ctn"]) if pieces else 0
+		if not carton_count:
+			continue
+		cartons.append(
+			{
+				"packing_report": f"{prefix}-PR-0000-00",
+				"so_item": row["so_item"],
+				"combo_item": row["combo_item"],
+				"carton_no": idx,
+				"carton_count": carton_count,
+				"qty_in_carton": row["qty_ctn"],
+				"total_pieces": pieces,
+				"carton_dimension": "60x40x40",
+				"per_carton_cbm": 0.096,
+				"cbm": round(carton_count * 0.096, 3),
+			}
+		)
+	_insert(
+		{
+			"doctype": "Shipment Loading",
+			"order_sheet": result["order_sheets"][0],
+			"customer": customer,
+			"sales_order": result["sales_orders"][0],
+			"container_type": "40ft FCL",
+			"status": "Pending",
+			"total_cartons": sum(c["carton_count"] for c in cartons),
+			"pending_cartons": sum(c["carton_count"] for c in cartons),
+			"total_cbm": sum(c["cbm"] for c in cartons),
+			"cartons": cartons,
+		},
+		name=result["order_sheets"][0],
+	)
+
+	wotm_values = {
+		"doctype": "Work Order Transfer Manager",
+		"posting_date": today,
+		"posting_time": nowtime(),
+		"customer": customer,
+		"company": company,
+		"source_warehouse": source_warehouse,
+		"target_warehouse": target_warehouse,
+		"stock_entry_type": STOCK_ENTRY_TYPE,
+		"transfer_status": "Pending",
+	}
+	result["wotm_draft"] = _insert(
+		dict(wotm_values, sales_order=result["sales_orders"][0]), name=f"{prefix}-WOTM-0000"
+	).name
+
+	# RMT needs a submitted WOTM; use the last sheet so the draft above stays free to populate
+	last = order_sheets - 1
+	raw_totals = bom_items_by_sheet[last]
+	result["wotm_submitted"] = _insert(
+		dict(
+			wotm_values,
+			sales_order=result["sales_orders"][last],
+			transfer_items=[
+				{
+					"item_code": code,
+					"item_name": code,
+					"total_required_qty": qty,
+					"pending_qty": qty,
+					"uom": "Nos",
+					"warehouse": source_warehouse,
+					"company": company,
+					"source": "Work Order",
+				}
+				for code, qty in sorted(raw_totals.items())
+			],
+		),
+		name=f"{prefix}-WOTM-{last:04d}",
+		docstatus=1,
+	).name
+	result["rmt"] = _insert(
+		{
+			"doctype": "Raw Material Transfer",
+			"posting_date": today,
+			"posting_time": nowtime(),
+			"sales_order": result["sales_orders"][last],
+			"work_order_transfer_manager": result["wotm_submitted"],
+			"customer": customer,
+			"company": company,
+			"stock_entry_type": STOCK_ENTRY_TYPE,
+			"source_warehouse": source_warehouse,
+			"target_warehouse": target_warehouse,
+			"raw_materials": [
+				{
+					"item_code": code,
+					"item_name": code,
+					"total_required_qty": qty,
+					"pending_qty": qty,
+					"transfer_qty": min(qty, 10),
+					"uom": "Nos",
+					"source_warehouse": source_warehouse,
+					"target_warehouse": target_warehouse,
+				}
+				for code, qty in sorted(raw_totals.items())
+			],
+		},
+		name=f"{prefix}-RMT-{last:04d}",
+	).name
+
+	counts.update(
+		{
+			"order_sheets": order_sheets,
+			"order_sheet_rows": sum(len(rows) for rows in sheet_rows_by_sheet),
+			"work_orders": order_sheets * lines,
+			"boms": order_sheets * lines,
+			"reports": order_sheets * reports * len(STAGE_TABLES),
+			"cartons": len(cartons),
+		}
+	)
+	result["counts"] = counts
+	frappe.db.commit()
+	return result
+
+
+def teardown(prefix=DEFAULT_PREFIX):
+	"""Delete everything generate() seeded under ``prefix``."""
+	ensure_benchmark_site()
+	pattern = f"{prefix}-%"
+	for doctype in FIXTURE_DOCTYPES:
+		for table_field in frappe.get_meta(doctype).get_table_fields():
+			frappe.db.delete(table_field.options, {"parenttype": doctype, "parent": ["like", pattern]})
+		frappe.db.delete(doctype, {"name": ["like", pattern]})
+	frappe.db.delete("Bin", {"item_code": ["like", pattern]})
+	frappe.db.commit()
@@ -4,6 +4,8 @@ from frappe.model.document import Document
 from frappe.utils import flt, nowdate, nowtime
 import json
 
+from manufacturing_addon.manufacturing_addon.utils.delivery_allocator import allocate_delivery
+
 class BulkWorkOrderManager(Document):
     def validate(self):
         self.validate_sales_order()
@@ -212,74 +214,31 @@ class BulkWorkOrderManager(Document):
         delivery_map = {}
         for item in self.bulk_delivery_items:
             if flt(item.delivery_qty) > 0:
-                delivery_map[item.item_code] = flt(item.delivery_qty)
-        
-        # Update work orders with smart allocation
-        for item_code, total_delivery_qty in delivery_map.items():
-            self.allocate_delivery_to_work_orders(item_code, total_delivery_qty, stock_entry_name)
-    
-    def allocate_delivery_to_work_orders(self, item_code, total_delivery_qty, stock_entry_name):
-        """Smart allocation of delivery quantity to work orders"""
-        # Get work orders for this item that have pending quantities
-        work_orders = frappe.get_all(
-            "Work Order",
-            filters={
-                "sales_order": self.sales_order,
-                "item_code": item_code,
-                "docstatus": 1
-            },
-            fields=["name", "qty", "produced_qty"],
-            order_by="creation_date"  # First created work orders get priority
+                delivery_map[item.item_code] = delivery_map.get(item.item_code, 0) + flt(item.delivery_qty)
+
+        return self.allocate_delivery_to_work_orders(delivery_map, stock_entry_name)
+
+    def allocate_delivery_to_work_orders(self, delivery_map, stock_entry_name=None, dry_run=False):
+        """FIFO allocation of all items across the Sales Order's open work orders in one pass"""
+        return allocate_delivery(
+            self.sales_order,
+            delivery_map,
+            dry_run=dry_run,
+            create_stock_entries=True,
+            posting_date=self.posting_date,
+            posting_time=self.posting_time,
+            reference_doctype="Stock Entry",
+            reference_name=stock_entry_name,
         )
-        
-        remaining_delivery_qty = total_delivery_qty
-        
-        for wo in work_orders:
-            if remaining_delivery_qty <= 0:
-                break
-            
-            pending_qty = flt(wo.qty) - flt(wo.produced_qty)
-            if pending_qty <= 0:
-                continue
-            
-            # Allocate delivery quantity to this work order
-            allocation_qty = min(remaining_delivery_qty, pending_qty)
-            
-            # Update work order produced quantity
-            new_produced_qty = flt(wo.produced_qty) + allocation_qty
-            frappe.db.set_value("Work Order", wo.name, "produced_qty", new_produced_qty)
-            
-            # Create stock entry for the allocation
-            self.create_stock_entry_for_allocation(wo.name, item_code, allocation_qty, stock_entry_name)
-            
-            remaining_delivery_qty -= allocation_qty
-        
-        if remaining_delivery_qty > 0:
-            frappe.msgprint(_("Warning: {0} units of {1} could not be allocated to work orders").format(
-                remaining_delivery_qty, item_code
-            ), indicator="orange")
-    
-    def create_stock_entry_for_allocation(self, work_order_name, item_code, qty, stock_entry_name):
-        """Create stock entry to record the allocation to work order"""
-        stock_entry = frappe.new_doc("Stock Entry")
-        stock_entry.stock_entry_type = "Manufacture"
-        stock_entry.posting_date = self.posting_date
-        stock_entry.posting_time = self.posting_time
-        stock_entry.work_order = work_order_name
-        stock_entry.reference_doctype = "Stock Entry"
-        stock_entry.reference_document = stock_entry_name
-        
-        # Add the item
-        stock_entry.append("items", {
-            "item_code": item_code,
-            "qty": qty,
-            "s_warehouse": "",  # Will be set by system
-            "t_warehouse": "",  # Will be set by system
-            "is_finished_item": 1
-        })
-        
-        stock_entry.save()
-        stock_entry.submit()
+
+    @frappe.whitelist()
+    def get_allocation_plan(self):
+        """Dry run: allocation plan and timings for the current delivery quantities"""
+        delivery_map = {}
+        for item in self.bulk_delivery_items:
+            if flt(item.delivery_qty) > 0:
+                delivery_map[item.item_code] = delivery_map.get(item.item_code, 0) + flt(item.delivery_qty)
+        return self.allocate_delivery_to_work_orders(delivery_map, dry_run=True)
 
 
 @frappe.whitelist()
@@ -6,6 +6,7 @@ from frappe.model.document import Document
 from frappe import _
 from frappe.utils import flt
 
+from manufacturing_addon.manufacturing_addon.utils.query_budget import query_budget
 from manufacturing_addon.manufacturing_addon.utils.report_style_contractor import (
     append_style_contractors,
     validate_mandatory_contractors,
@@ -22,6 +23,10 @@ from manufacturing_addon.manufacturing_addon.utils.nested_style_contractors impo
     load_nested_style_contractors,
     save_nested_style_contractors,
 )
+from manufacturing_addon.manufacturing_addon.utils.stage_totals import (
+    reset_stage_totals,
+    stage_totals_for,
+)
 
 
 @frappe.whitelist()
@@ -88,6 +93,7 @@ class CheckingReport(Document):
         return len(self.checking_report_ct or [])
 
     @frappe.whitelist()
+    @query_budget()
     def get_data1(self):
         print(f"\n{'='*60}")
         print(f"[get_data1] Starting for Checking Report: '{self.name}'")
@@ -370,7 +376,9 @@ class CheckingReport(Document):
             print(f"[get_data1] checking_report_ct already has {existing_rows} rows, skipping fetch")
             print(f"{'='*60}\n")
 
+    @query_budget()
     def validate(self):
+        reset_stage_totals(self)
         self.calculate_finished_stitched_qty()
         self.calculate_finished_checked_qty()
         self._apply_subassembly_style_qty()
@@ -392,75 +400,27 @@ class CheckingReport(Document):
         self.calculate_finished_checked_qty()
         self._apply_subassembly_style_qty()
 
-    def _qty_query(self, row, report_doctype, child_doctype, qty_field, exclude_self=False):
-        if row.combo_item:
-            query = f"""
-                SELECT SUM(ct.{qty_field}) AS total_qty
-                FROM `tab{child_doctype}` AS ct
-                LEFT JOIN `tab{report_doctype}` AS r ON ct.parent = r.name
-                WHERE r.order_sheet = %s AND ct.so_item = %s AND ct.combo_item = %s AND r.docstatus = 1
-                {{exclude}}
-                GROUP BY ct.so_item, ct.combo_item
-            """
-            params = [self.order_sheet, row.so_item, row.combo_item]
-        else:
-            query = f"""
-                SELECT SUM(ct.{qty_field}) AS total_qty
-                FROM `tab{child_doctype}` AS ct
-                LEFT JOIN `tab{report_doctype}` AS r ON ct.parent = r.name
-                WHERE r.order_sheet = %s AND ct.so_item = %s
-                    AND (ct.combo_item IS NULL OR ct.combo_item = '') AND r.docstatus = 1
-                {{exclude}}
-                GROUP BY ct.so_item
-            """
-            params = [self.order_sheet, row.so_item]
-
-        exclude = ""
-        if exclude_self and self.name:
-            exclude = "AND r.name != %s"
-            params.append(self.name)
-
-        return frappe.db.sql(query.format(exclude=exclude), tuple(params), as_dict=True)
-
     def calculate_finished_stitched_qty(self):
         """Available stitched qty from submitted Stitching Reports."""
         try:
-            totals = {}
+            stage_totals = stage_totals_for(self)
             for row in self.checking_report_ct:
-                if not row.so_item:
-                    continue
-                result = self._qty_query(
-                    row,
-                    "Stitching Report",
-                    "Stitching Report CT",
-                    "stitching_qty",
-                    exclude_self=False,
+                row.finished_stitched_qty = (
+                    stage_totals.qty("Stitching", row.so_item, row.combo_item) if row.so_item else 0
                 )
-                totals[(row.so_item, row.combo_item or "")] = flt(result[0].total_qty) if result else 0
-
-            for row in self.checking_report_ct:
-                row.finished_stitched_qty = totals.get((row.so_item, row.combo_item or ""), 0)
         except Exception:
             frappe.log_error(frappe.get_traceback(), "Finished Stitched Quantity Fetch Failed")
 
     def calculate_finished_checked_qty(self):
         """Already checked qty from other submitted Checking Reports."""
         try:
-            totals = {}
+            stage_totals = stage_totals_for(self)
             for row in self.checking_report_ct:
-                if not row.so_item:
-                    continue
-                result = self._qty_query(
-                    row,
-                    "Checking Report",
-                    "Checking Report CT",
-                    "checking_qty",
-                    exclude_self=True,
+                row.finished_checked_qty = (
+                    stage_totals.qty("Checking", row.so_item, row.combo_item, exclude_self=True)
+                    if row.so_item
+                    else 0
                 )
-                totals[(row.so_item, row.combo_item or "")] = flt(result[0].total_qty) if result else 0
-
-            for row in self.checking_report_ct:
-                row.finished_checked_qty = totals.get((row.so_item, row.combo_item or ""), 0)
         except Exception as e:
             frappe.log_error(frappe.get_traceback(), "Finished Checking Quantity Calculation Failed")
             frappe.throw(_("Error calculating already checked quantity: {0}").format(str(e)))
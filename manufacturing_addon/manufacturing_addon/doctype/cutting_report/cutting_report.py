@@ -6,6 +6,7 @@ from frappe.model.document import Document
 from frappe import _
 from frappe.utils import flt
 
+from manufacturing_addon.manufacturing_addon.utils.query_budget import query_budget
 from manufacturing_addon.manufacturing_addon.utils.report_style_contractor import (
     append_style_contractors,
     validate_mandatory_contractors,
@@ -25,6 +26,10 @@ from manufacturing_addon.manufacturing_addon.utils.nested_style_contractors impo
     load_nested_style_contractors,
     save_nested_style_contractors,
 )
+from manufacturing_addon.manufacturing_addon.utils.stage_totals import (
+    reset_stage_totals,
+    stage_totals_for,
+)
 
 
 @frappe.whitelist()
@@ -91,6 +96,7 @@ class CuttingReport(Document):
         return len(self.cutting_report_ct or [])
 
     @frappe.whitelist()
+    @query_budget()
     def get_data1(self):
         print(f"\n{'='*60}")
         print(f"[get_data1] Starting for Cutting Report: '{self.name}'")
@@ -376,7 +382,9 @@ class CuttingReport(Document):
             print(f"[get_data1] cutting_report_ct already has {existing_rows} rows, skipping fetch")
             print(f"{'='*60}\n")
 
+    @query_budget()
     def validate(self):
+        reset_stage_totals(self)
         self.calculate_finished_cutting_qty()
         self._apply_subassembly_style_qty()
         validate_mandatory_contractors(
@@ -399,55 +407,14 @@ class CuttingReport(Document):
     def calculate_finished_cutting_qty(self):
         """Calculate and update finished_cutting_qty in the child table based on user-entered cutting_qty values."""
         try:
-            # Dictionary to store total cutting_qty for each (so_item, combo_item) combination
-            cutting_totals = {}
-
-            # Iterate through child table and fetch totals dynamically
-            for row in self.cutting_report_ct:
-                if not row.so_item:
-                    continue
-
-                exclude = "AND cr.name != %s" if self.name else ""
-                if row.combo_item:
-                    query = f"""
-                        SELECT SUM(crct.cutting_qty) AS total_cutting
-                        FROM `tabCutting Report CT` AS crct
-                        LEFT JOIN `tabCutting Report` AS cr
-                        ON crct.parent = cr.name
-                        WHERE cr.order_sheet = %s AND crct.so_item = %s AND crct.combo_item = %s
-                          AND cr.docstatus = 1 {exclude}
-                        GROUP BY crct.so_item, crct.combo_item
-                    """
-                    params = (
-                        (self.order_sheet, row.so_item, row.combo_item, self.name)
-                        if self.name
-                        else (self.order_sheet, row.so_item, row.combo_item)
-                    )
-                else:
-                    query = f"""
-                        SELECT SUM(crct.cutting_qty) AS total_cutting
-                        FROM `tabCutting Report CT` AS crct
-                        LEFT JOIN `tabCutting Report` AS cr
-                        ON crct.parent = cr.name
-                        WHERE cr.order_sheet = %s AND crct.so_item = %s
-                          AND (crct.combo_item IS NULL OR crct.combo_item = '')
-                          AND cr.docstatus = 1 {exclude}
-                        GROUP BY crct.so_item
-                    """
-                    params = (
-                        (self.order_sheet, row.so_item, self.name)
-                        if self.name
-                        else (self.order_sheet, row.so_item)
-                    )
-
-                order_sheets = frappe.db.sql(query, params, as_dict=True)
-
-                # Store the total in the dictionary
-                cutting_totals[(row.so_item, row.combo_item or '')] = order_sheets[0].total_cutting if order_sheets else 0
-
-            # Update finished_cutting_qty in child table
+            # Totals per (so_item, combo_item) from other submitted Cutting Reports
+            stage_totals = stage_totals_for(self)
             for row in self.cutting_report_ct:
-                row.finished_cutting_qty = cutting_totals.get((row.so_item, row.combo_item or ''), 0)
+                row.finished_cutting_qty = (
+                    stage_totals.qty("Cutting", row.so_item, row.combo_item, exclude_self=True)
+                    if row.so_item
+                    else 0
+                )
 
         except Exception as e:
             frappe.log_error(frappe.get_traceback(), "Finished Cutting Quantity Calculation Failed")
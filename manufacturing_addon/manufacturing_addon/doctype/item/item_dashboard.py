@@ -7,6 +7,10 @@ import frappe
 from frappe import _
 from frappe.desk.notifications import get_open_count as frappe_get_open_count
 
+from manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link import (
+	get_item_production_counts,
+)
+
 
 PRODUCTION_CONNECTION_ITEMS = (
 	"Order Sheet",
@@ -16,14 +20,6 @@ PRODUCTION_CONNECTION_ITEMS = (
 	"Packing Report",
 )
 
-CHILD_TABLE_BY_DOCTYPE = {
-	"Order Sheet": "Order Sheet CT",
-	"Cutting Report": "Cutting Report CT",
-	"Stitching Report": "Stitching Report CT",
-	"Checking Report": "Checking Report CT",
-	"Packing Report": "Packing Report CT",
-}
-
 
 def get_data(data=None):
 	data = frappe._dict(data or {})
@@ -87,31 +83,32 @@ def get_open_count(doctype: str, name: str, items=None):
 	]
 	internal_by_dt = {row.get("doctype"): row for row in internal if row.get("doctype")}
 
+	# Counts come from Item Production Link in one query; names are fetched
+	# only when a connection is opened (get_production_link_names).
+	production_counts = get_item_production_counts(name)
 	for linked_doctype in items:
 		if linked_doctype not in PRODUCTION_CONNECTION_ITEMS:
 			continue
-		if not frappe.db.exists("DocType", linked_doctype):
-			continue
-
-		child_doctype = CHILD_TABLE_BY_DOCTYPE.get(linked_doctype)
-		names = _parent_docs_for_item(child_doctype, linked_doctype, name) if child_doctype else []
 		internal_by_dt[linked_doctype] = {
 			"doctype": linked_doctype,
-			"count": len(names),
+			"count": production_counts.get(linked_doctype, 0),
 			"open_count": 0,
-			"names": names,
 		}
 
 	count["internal_links_found"] = list(internal_by_dt.values())
 	return out
 
 
-def _parent_docs_for_item(child_doctype, parent_doctype, item_code):
+@frappe.whitelist()
+def get_production_link_names(item_code: str, doctype: str):
+	"""Names of one production doctype linked to an Item, for an expanded connection."""
+	if doctype not in PRODUCTION_CONNECTION_ITEMS:
+		return []
+	frappe.has_permission("Item", doc=item_code, throw=True)
+	frappe.has_permission(doctype, throw=True)
 	return frappe.get_all(
-		child_doctype,
-		filters={"so_item": item_code, "parenttype": parent_doctype},
-		pluck="parent",
-		distinct=True,
-		limit=500,
+		"Item Production Link",
+		filters={"item_code": item_code, "link_doctype": doctype},
+		pluck="link_name",
 		order_by="modified desc",
 	)
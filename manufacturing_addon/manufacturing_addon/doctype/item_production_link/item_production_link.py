@@ -0,0 +1,97 @@
+# Copyright (c) 2026, mohtashim and contributors
+# For license information, please see license.txt
+
+"""One row per (Item, production document) so the Item dashboard can count
+connections with a single grouped query instead of scanning report CT tables."""
+
+import frappe
+from frappe.model.document import Document
+
+# parent doctype -> child table fieldname holding so_item
+LINKED_TABLE_FIELD = {
+	"Order Sheet": "order_sheet_ct",
+	"Cutting Report": "cutting_report_ct",
+	"Stitching Report": "stitching_report_ct",
+	"Checking Report": "checking_report_ct",
+	"Packing Report": "packing_report_ct",
+}
+
+
+class ItemProductionLink(Document):
+	pass
+
+
+def sync_item_production_links(doc, method=None):
+	"""doc_events hook: keep Item Production Link rows in step with doc's so_item set."""
+	table_field = LINKED_TABLE_FIELD.get(doc.doctype)
+	if not table_field:
+		return
+
+	if method == "on_trash":
+		current = set()
+	else:
+		current = {row.so_item for row in doc.get(table_field) or [] if row.get("so_item")}
+
+	existing = dict(
+		frappe.get_all(
+			"Item Production Link",
+			filters={"link_doctype": doc.doctype, "link_name": doc.name},
+			fields=["item_code", "name"],
+			as_list=True,
+		)
+	)
+
+	stale = [name for item_code, name in existing.items() if item_code not in current]
+	if stale:
+		frappe.db.delete("Item Production Link", {"name": ("in", stale)})
+
+	missing = sorted(current - set(existing))
+	if missing:
+		now = frappe.utils.now()
+		frappe.db.bulk_insert(
+			"Item Production Link",
+			fields=["name", "item_code", "link_doctype", "link_name", "creation", "modified", "owner", "modified_by"],
+			values=[
+				(frappe.generate_hash(length=10), item_code, doc.doctype, doc.name, now, now, "Administrator", "Administrator")
+				for item_code in missing
+			],
+		)
+
+
+def get_item_production_counts(item_code):
+	"""{link doctype: number of linked documents} for one Item, in one query."""
+	return dict(
+		frappe.db.sql(
+			"""
+			SELECT link_doctype, COUNT(*)
+			FROM `tabItem Production Link`
+			WHERE item_code = %s
+			GROUP BY link_doctype
+			""",
+			(item_code,),
+		)
+	)
+
+
+def rebuild_item_production_links():
+	"""Recreate every link row from the production CT tables (used by the backfill patch)."""
+	frappe.db.delete("Item Production Link")
+	now = frappe.utils.now()
+	for parent_doctype, table_field in LINKED_TABLE_FIELD.items():
+		rows = frappe.db.sql(
+			f"""
+			SELECT DISTINCT ct.so_item, ct.parent
+			FROM `tab{parent_doctype} CT` ct
+			WHERE ct.parenttype = %s AND ct.parentfield = %s AND IFNULL(ct.so_item, '') != ''
+			""",
+			(parent_doctype, table_field),
+		)
+		if rows:
+			frappe.db.bulk_insert(
+				"Item Production Link",
+				fields=["name", "item_code", "link_doctype", "link_name", "creation", "modified", "owner", "modified_by"],
+				values=[
+					(frappe.generate_hash(length=10), so_item, parent_doctype, parent, now, now, "Administrator", "Administrator")
+					for so_item, parent in rows
+				],
+			)
@@ -0,0 +1,71 @@
+# Copyright (c) 2026, mohtashim and Contributors
+# See license.txt
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link import (
+	LINKED_TABLE_FIELD,
+	get_item_production_counts,
+	sync_item_production_links,
+)
+
+ITEM_A = "_Test IPL Item A"
+ITEM_B = "_Test IPL Item B"
+ITEM_C = "_Test IPL Item C"
+
+
+def _production_doc(doctype, name, item_codes):
+	# the hook only reads doctype, name and the CT so_items, so the doc is never inserted
+	doc = frappe.new_doc(doctype)
+	doc.name = name
+	for item_code in item_codes:
+		doc.append(LINKED_TABLE_FIELD[doctype], {"so_item": item_code})
+	return doc
+
+
+def _linked_items(doc):
+	return sorted(
+		frappe.get_all(
+			"Item Production Link",
+			filters={"link_doctype": doc.doctype, "link_name": doc.name},
+			pluck="item_code",
+		)
+	)
+
+
+class TestItemProductionLink(FrappeTestCase):
+	def tearDown(self):
+		frappe.db.rollback()
+
+	def test_links_follow_save_cancel_and_delete(self):
+		for doctype in LINKED_TABLE_FIELD:
+			with self.subTest(doctype=doctype):
+				doc = _production_doc(doctype, f"_Test IPL {doctype}", [ITEM_A, ITEM_B, ITEM_B, None])
+				sync_item_production_links(doc, "on_update")
+				self.assertEqual(_linked_items(doc), [ITEM_A, ITEM_B])
+
+				# rows edited: A dropped, C added, B kept
+				doc.set(LINKED_TABLE_FIELD[doctype], [])
+				doc.append(LINKED_TABLE_FIELD[doctype], {"so_item": ITEM_B})
+				doc.append(LINKED_TABLE_FIELD[doctype], {"so_item": ITEM_C})
+				sync_item_production_links(doc, "on_update")
+				self.assertEqual(_linked_items(doc), [ITEM_B, ITEM_C])
+
+				# a cancelled document still counts as a connection of its items
+				sync_item_production_links(doc, "on_cancel")
+				self.assertEqual(_linked_items(doc), [ITEM_B, ITEM_C])
+
+				sync_item_production_links(doc, "on_trash")
+				self.assertEqual(_linked_items(doc), [])
+
+	def test_get_item_production_counts(self):
+		for doctype in LINKED_TABLE_FIELD:
+			sync_item_production_links(_production_doc(doctype, f"_Test IPL {doctype} 1", [ITEM_A, ITEM_B]), "on_update")
+		sync_item_production_links(_production_doc("Cutting Report", "_Test IPL Cutting Report 2", [ITEM_A]), "on_submit")
+
+		expected_a = {doctype: 1 for doctype in LINKED_TABLE_FIELD}
+		expected_a["Cutting Report"] = 2
+		self.assertEqual(get_item_production_counts(ITEM_A), expected_a)
+		self.assertEqual(get_item_production_counts(ITEM_B), {doctype: 1 for doctype in LINKED_TABLE_FIELD})
+		self.assertEqual(get_item_production_counts(ITEM_C), {})
@@ -1,9 +1,14 @@
 import frappe
 from frappe.model.document import Document
 from frappe import _
+from frappe.utils import flt
+
+from manufacturing_addon.manufacturing_addon.utils.query_budget import query_budget
+from manufacturing_addon.manufacturing_addon.utils.stage_totals import get_operation_totals
 
 class OperationReport(Document):
     @frappe.whitelist()
+    @query_budget()
     def get_data1(self):
         if isinstance(self.order_sheet, str) and self.order_sheet:
             doc = frappe.get_doc("Order Sheet", self.order_sheet)
@@ -34,7 +39,9 @@ class OperationReport(Document):
                     })
                     self.save()
 
+    @query_budget()
     def validate(self):
+        self.flags.operation_totals = None
         self.cutting_condition()
         self.stitching_condition()
         self.total_qty()
@@ -88,160 +95,43 @@ class OperationReport(Document):
                 #     frappe.msgprint(f"⚠️ Excess Qty Error: Finished Stitched Qty ({stitched_qty}) cannot be greater than Finished Packing Qty ({packing_qty}) for row {i.idx}.", 
                 #                 indicator='orange', title="Warning")
 
+    def get_operation_totals(self):
+        """Submitted cutting1/stitching1/packaging1 totals per (so_item, combo_item), queried once per save."""
+        if self.flags.operation_totals is None:
+            self.flags.operation_totals = get_operation_totals(self.order_sheet)
+        return self.flags.operation_totals
+
+    def _set_finished_qty(self, target_field, source_field):
+        totals = self.get_operation_totals()
+        for row in self.operation_report_ct:
+            stage = totals.get((row.so_item, row.combo_item or '')) if row.so_item else None
+            row.set(target_field, stage[source_field] if stage else 0)
+
     def calculate_cutting_qty(self):
         """Calculate and update finished_cutting_qty in the child table based on user-entered cutting1 values."""
         try:
-            # Dictionary to store total cutting1 for each (so_item, combo_item) combination
-            cutting_totals = {}
-
-            # Iterate through child table and fetch totals dynamically
-            for row in self.operation_report_ct:
-                if not row.so_item:
-                    continue  # Skip rows without valid so_item
-                
-                # Handle cases where combo_item is blank
-                if row.combo_item:
-                    query = """
-                        SELECT SUM(orct.cutting1) AS total_cutting1
-                        FROM `tabOperation Report CT` AS orct 
-                        LEFT JOIN `tabOperation Report` AS opr 
-                        ON orct.parent = opr.name
-                        WHERE opr.order_sheet = %s AND orct.so_item = %s AND orct.combo_item = %s and opr.docstatus = 1
-                        GROUP BY orct.so_item, orct.combo_item
-                    """
-                    params = (self.order_sheet, row.so_item, row.combo_item)
-                else:
-                    query = """
-                        SELECT SUM(orct.cutting1) AS total_cutting1
-                        FROM `tabOperation Report CT` AS orct 
-                        LEFT JOIN `tabOperation Report` AS opr 
-                        ON orct.parent = opr.name
-                        WHERE opr.order_sheet = %s AND orct.so_item = %s AND (orct.combo_item IS NULL OR orct.combo_item = '') and opr.docstatus = 1
-                        GROUP BY orct.so_item
-                    """
-                    params = (self.order_sheet, row.so_item)
-
-                order_sheets = frappe.db.sql(query, params, as_dict=True)
-
-                # Store the total in the dictionary
-                cutting_totals[(row.so_item, row.combo_item or '')] = order_sheets[0].total_cutting1 if order_sheets else 0
-
-            # Update finished_cutting_qty in child table without modifying cutting1
-            for row in self.operation_report_ct:
-                row.finished_cutting_qty = cutting_totals.get((row.so_item, row.combo_item or ''), 0)
-
+            self._set_finished_qty("finished_cutting_qty", "cutting1")
         except Exception as e:
             frappe.log_error(frappe.get_traceback(), "Finished Cutting Quantity Calculation Failed")
             frappe.throw(f"Error in calculating finished cutting quantity: {str(e)}")
 
-
     def calculate_stitching_qty(self):
-        """Calculate and update finished_stitching_qty in the child table based on user-entered stitching1 values."""
+        """Calculate and update finished_stitched_qty in the child table based on user-entered stitching1 values."""
         try:
-            # Dictionary to store total stitching1 for each (so_item, combo_item) combination
-            stitching_totals = {}
-
-            # Iterate through child table and fetch totals dynamically
-            for row in self.operation_report_ct:
-                if not row.so_item:
-                    continue  # Skip rows without valid so_item
-                
-                # Handle cases where combo_item is blank
-                if row.combo_item:
-                    query = """
-                        SELECT SUM(orct.stitching1) AS total_stitching
-                        FROM `tabOperation Report CT` AS orct 
-                        LEFT JOIN `tabOperation Report` AS opr 
-                        ON orct.parent = opr.name
-                        WHERE opr.order_sheet = %s AND orct.so_item = %s AND orct.combo_item = %s and opr.docstatus = 1
-                        GROUP BY orct.so_item, orct.combo_item
-                    """
-                    params = (self.order_sheet, row.so_item, row.combo_item)
-                else:
-                    query = """
-                        SELECT SUM(orct.stitching1) AS total_stitching
-                        FROM `tabOperation Report CT` AS orct 
-                        LEFT JOIN `tabOperation Report` AS opr 
-                        ON orct.parent = opr.name
-                        WHERE opr.order_sheet = %s AND orct.so_item = %s AND (orct.combo_item IS NULL OR orct.combo_item = '') and opr.docstatus = 1
-                        GROUP BY orct.so_item
-                    """
-                    params = (self.order_sheet, row.so_item)
-
-                order_sheets = frappe.db.sql(query, params, as_dict=True)
-
-                # Store the total in the dictionary
-                stitching_totals[(row.so_item, row.combo_item or '')] = order_sheets[0].total_stitching if order_sheets else 0
-                # frappe.errprint(f"{order_sheets[0].total_stitching}")
-
-            # Update finished_stitching_qty in child table without modifying stitching1
-            for row in self.operation_report_ct:
-                row.finished_stitched_qty = stitching_totals.get((row.so_item, row.combo_item or ''), 0)  # Correct field name
-                # row.db_set("finished_stitching_qty", stitching_totals.get((row.so_item, row.combo_item or ''), 0))
-                # frappe.errprint(f"finished stitching {row.finished_stitching_qty}")
-                # self.save(ignore_permissions=True)
-                # frappe.db.commit()
-
-                # frappe.errprint(f"finished stitching {row.finished_stitching_qty}")
-                
-
+            self._set_finished_qty("finished_stitched_qty", "stitching1")
         except Exception as e:
-            frappe.log_error(frappe.get_traceback(), "Finished Stitching Quantity Calculation Failed")  # Fixed error message
+            frappe.log_error(frappe.get_traceback(), "Finished Stitching Quantity Calculation Failed")
             frappe.throw(f"Error in calculating finished stitching quantity: {str(e)}")
 
     def calculate_packaging_qty(self):
         """Calculate and update finished_packaging_qty in the child table based on user-entered packaging1 values."""
         try:
-            # Dictionary to store total packaging1 for each (so_item, combo_item) combination
-            packaging_totals = {}
-
-            # Iterate through child table and fetch totals dynamically
-            for row in self.operation_report_ct:
-                if not row.so_item:
-                    continue  # Skip rows without valid so_item
-                
-                # Handle cases where combo_item is blank
-                if row.combo_item:
-                    query = """
-                        SELECT SUM(orct.packaging1) AS total_packaging
-                        FROM `tabOperation Report CT` AS orct 
-                        LEFT JOIN `tabOperation Report` AS opr 
-                        ON orct.parent = opr.name
-                        WHERE opr.order_sheet = %s AND orct.so_item = %s AND orct.combo_item = %s  and opr.docstatus = 1
-                        GROUP BY orct.so_item, orct.combo_item
-                    """
-                    params = (self.order_sheet, row.so_item, row.combo_item)
-                else:
-                    query = """
-                        SELECT SUM(orct.packaging1) AS total_packaging
-                        FROM `tabOperation Report CT` AS orct 
-                        LEFT JOIN `tabOperation Report` AS opr 
-                        ON orct.parent = opr.name
-                        WHERE opr.order_sheet = %s AND orct.so_item = %s AND (orct.combo_item IS NULL OR orct.combo_item = '') and opr.docstatus = 1
-                        GROUP BY orct.so_item
-                    """
-                    params = (self.order_sheet, row.so_item)
-
-                order_sheets = frappe.db.sql(query, params, as_dict=True)
-
-                # Store the total in the dictionary
-                packaging_totals[(row.so_item, row.combo_item or '')] = order_sheets[0].total_packaging if order_sheets else 0
-
-            # Update finished_packaging_qty in child table
-            for row in self.operation_report_ct:
-                # row.finished_packaging_qty = packaging_totals.get((row.so_item, row.combo_item or ''), 0)
-                row.db_set("finished_packaging_qty", packaging_totals.get((row.so_item, row.combo_item or ''), 0))
-                # frappe.errprint(f"finished packaging {row.finished_packaging_qty}")
-                # self.save(ignore_permissions=True)
-                # frappe.db.commit()
-
-
+            # before_save runs ahead of the row writes, so plain assignment is persisted
+            self._set_finished_qty("finished_packaging_qty", "packaging1")
         except Exception as e:
             frappe.log_error(frappe.get_traceback(), "Finished Packaging Quantity Calculation Failed")
             frappe.throw(f"Error in calculating finished packaging quantity: {str(e)}")
 
-
-
     def total_qty(self):
         for i in self.operation_report_ct:
             i.total_copy1 = i.packaging1
@@ -269,36 +159,10 @@ class OperationReport(Document):
         # doc.save()
 
     def total(self):
-        total_qty = 0
-        ready_qty = frappe.db.sql("""
-            SELECT oprct.customer, 
-                oprct.design, 
-                oprct.colour, 
-                oprct.article, 
-                oprct.ean, 
-                oprct.qty,
-                SUM(oprct.cutting1) AS cutting,
-                SUM(oprct.stitching1) AS stitching,
-                SUM(oprct.packaging1) AS packaging,
-                oprct.qty_ctn
-            FROM `tabOperation Report` AS oprr
-            LEFT JOIN `tabOperation Report CT` AS oprct ON oprct.parent = oprr.name
-            WHERE oprr.order_sheet = %s
-            GROUP BY oprct.customer, oprct.design, oprct.colour, oprct.article, oprct.ean, oprct.qty, oprct.qty_ctn
-        """, (self.order_sheet,), as_dict=True)
+        self.ordered_qty = sum(flt(i.qty) for i in self.operation_report_ct)
 
-        # Ensure `ready_qty` is not empty before accessing its fields
-        if ready_qty:
-            # If you need a single value or total for `qty`, you can sum or select the appropriate entry
-            self.ready_qty = ready_qty[0].get("packaging", 0)  # Assuming you want the first entry's qty
-        else:
-            self.ready_qty = 0  # Default to 0 if no results
-        
-        if self.ready_qty and  self.ordered_qty:
-            self.percentage = (self.ready_qty / self.ordered_qty ) * 100
-		
-	
-        for i in self.operation_report_ct:
-            total_qty += i.qty
-            self.ordered_qty = total_qty
+        # Ready qty is everything packed against this order sheet on submitted reports
+        self.ready_qty = sum(t["packaging1"] for t in self.get_operation_totals().values())
 
+        if self.ready_qty and self.ordered_qty:
+            self.percentage = (self.ready_qty / self.ordered_qty) * 100
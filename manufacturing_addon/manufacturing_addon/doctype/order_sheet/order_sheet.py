@@ -4,7 +4,14 @@
 import frappe
 import re
 from frappe.model.document import Document
-from frappe.utils import today, now_datetime, flt
+from frappe.utils import cstr, today, now_datetime, flt
+
+from manufacturing_addon.manufacturing_addon.utils.size_parser import (
+	extract_article,
+	extract_size,
+	normalize_size,
+	size_dimensions,
+)
 
 
 class OrderSheet(Document):
@@ -40,6 +47,7 @@ class OrderSheet(Document):
 
 	def populate_bom_and_carton_details(self):
 		"""Populate BOM and carton details for each Order Sheet row."""
+		details_map = get_bom_carton_details_map([row.so_item for row in self.order_sheet_ct])
 		for row in self.order_sheet_ct:
 			if not row.so_item:
 				row.default_bom = None
@@ -48,8 +56,7 @@ class OrderSheet(Document):
 				row.carton_dimension = None
 				continue
 
-			details = get_bom_carton_details(row.so_item)
-			apply_bom_carton_details_to_row(row, details)
+			apply_bom_carton_details_to_row(row, details_map.get(row.so_item) or _empty_bom_carton_details())
 	
 	def qty_per_cartoon(self):
 		for row in self.order_sheet_ct:
@@ -597,7 +604,6 @@ def find_or_create_standard_size(standard_size_str):
 					"width_in_cm_copy": width_in_cm
 				})
 				doc.insert(ignore_permissions=True)
-				frappe.db.commit()
 				return doc.name
 			except frappe.exceptions.DuplicateEntryError:
 				# If duplicate, find and return existing
@@ -628,18 +634,7 @@ def find_or_create_size(size_value):
 	if not size_value:
 		return None
 
-	def normalize_size_value(value):
-		value = (value or "").strip()
-		value = value.replace(" CM", "").replace('"', "").strip()
-		if value.startswith("("):
-			value = value[1:]
-		if ")*" in value:
-			value = value.replace(")*", "*")
-		if value.endswith(")"):
-			value = value[:-1]
-		return value.strip()
-
-	normalized_size = normalize_size_value(size_value)
+	normalized_size = normalize_size(size_value)
 	
 	# Step 1: Check if exists by name (the name should be the full size value)
 	existing = frappe.get_all(
@@ -664,24 +659,7 @@ def find_or_create_size(size_value):
 	
 	# Step 2: Create new record with the full size value as name
 	# Extract lenght and width from first part for required fields
-	size_clean = normalized_size
-	first_part = size_clean
-	# Find first separator
-	for separator in [',', '+', '/']:
-		if separator in first_part:
-			first_part = first_part.split(separator)[0].strip()
-			break
-	
-	# Extract lenght and width for required fields
-	lenght = None
-	width = None
-	size_match = re.search(r'(\d+(?:\.\d+)?)\s*[Xx]\s*(\d+(?:\.\d+)?)', first_part)
-	if size_match:
-		try:
-			lenght = float(size_match.group(1))
-			width = float(size_match.group(2))
-		except (ValueError, IndexError):
-			pass
+	lenght, width = size_dimensions(normalized_size)
 	
 	# If we can't extract lenght/width, still try to create with just size field
 	# But Stitching Size requires lenght and width, so we need them
@@ -697,7 +675,6 @@ def find_or_create_size(size_value):
 			"size": normalized_size or size_value
 		})
 		doc.insert(ignore_permissions=True)
-		frappe.db.commit()
 		print(f"[find_or_create_size] Created new Stitching Size: '{doc.name}' with size='{size_value}'")
 		return doc.name
 	except frappe.exceptions.DuplicateEntryError:
@@ -721,6 +698,145 @@ def find_or_create_size(size_value):
 		return None
 
 
+# Order Sheet CT field -> (master doctype, value field, also match on name)
+ORDER_SHEET_MASTER_FIELDS = {
+	"design": ("Stitching Design", "design", False),
+	"ean": ("Ean Code", "ean_code", True),
+	"colour": ("Stitching Colour", "colour", True),
+	"stitching_article_no": ("Stitching Article No", "article_no", True),
+	"gsm": ("GSM", "gsm", False),
+}
+
+
+def _is_named_after_field(doctype, value_field):
+	"""True when the master is named after value_field, so rows can be bulk inserted."""
+	return frappe.get_meta(doctype).autoname in (f"field:{value_field}", f"format:{{{value_field}}}")
+
+
+def resolve_masters(doctype, value_field, values, match_name=False):
+	"""Map each value to an existing or newly created master: {value: name}.
+
+	Existing masters are found with one IN lookup (by value_field, and by name when
+	match_name). Missing ones are created in one bulk insert when the doctype is
+	named after value_field, otherwise one insert each. Nothing is committed here.
+	"""
+	values = list({cstr(v).strip() for v in values if cstr(v).strip()})
+	if not values:
+		return {}
+
+	conditions = [f"`{value_field}` IN %(values)s"]
+	if match_name:
+		conditions.append("name IN %(values)s")
+	rows = frappe.db.sql(
+		f"""
+		SELECT name, `{value_field}` AS value
+		FROM `tab{doctype}`
+		WHERE {" OR ".join(conditions)}
+		""",
+		{"values": values},
+		as_dict=True
+	)
+
+	# MariaDB matches case-insensitively; mirror that so lookups agree with get_all
+	found = {}
+	if match_name:
+		for row in rows:
+			found.setdefault(row.name.lower(), row.name)
+	for row in rows:
+		if row.value:
+			found.setdefault(cstr(row.value).lower(), row.name)
+
+	missing = {}
+	for value in values:
+		if value.lower() not in found:
+			missing.setdefault(value.lower(), value)
+
+	if missing:
+		if _is_named_after_field(doctype, value_field):
+			now = frappe.utils.now()
+			user = frappe.session.user
+			frappe.db.bulk_insert(
+				doctype,
+				fields=["name", value_field, "creation", "modified", "owner", "modified_by"],
+				values=[(value, value, now, now, user, user) for value in missing.values()],
+				ignore_duplicates=True,
+			)
+			found.update(missing)
+		else:
+			for key, value in missing.items():
+				try:
+					doc = frappe.get_doc({"doctype": doctype, value_field: value})
+					doc.insert(ignore_permissions=True)
+					found[key] = doc.name
+				except Exception as e:
+					frappe.log_error(f"Error creating {doctype}: {str(e)}")
+
+	return {value: found[value.lower()] for value in values if value.lower() in found}
+
+
+def resolve_sizes(size_values):
+	"""Map each size value to an existing or newly created Stitching Size: {value: name}.
+
+	Matches by name on the raw and normalized value in one query and bulk inserts
+	the missing sizes (named after their normalized size). Values without a
+	parsable lenght/width are left out, as in find_or_create_size.
+	"""
+	size_values = list({cstr(v).strip() for v in size_values if cstr(v).strip()})
+	if not size_values:
+		return {}
+
+	normalized = {v: normalize_size(v) for v in size_values}
+	candidates = list(set(size_values) | {n for n in normalized.values() if n})
+	existing = {
+		name.lower(): name
+		for name in frappe.get_all("Stitching Size", filters={"name": ["in", candidates]}, pluck="name")
+	}
+
+	result = {}
+	missing = {}
+	for value in size_values:
+		name = existing.get(value.lower()) or existing.get(normalized[value].lower())
+		if name:
+			result[value] = name
+			continue
+		new_name = normalized[value] or value
+		lenght, width = size_dimensions(normalized[value])
+		if lenght is None or width is None:
+			continue
+		missing.setdefault(new_name.lower(), (new_name, lenght, width))
+		result[value] = missing[new_name.lower()][0]
+
+	if missing:
+		now = frappe.utils.now()
+		user = frappe.session.user
+		frappe.db.bulk_insert(
+			"Stitching Size",
+			fields=["name", "lenght", "width", "size", "creation", "modified", "owner", "modified_by"],
+			values=[(name, lenght, width, name, now, now, user, user) for name, lenght, width in missing.values()],
+			ignore_duplicates=True,
+		)
+
+	return result
+
+
+def get_variant_attributes_map(item_codes):
+	"""{item_code: {ATTRIBUTE: value}} for many items in one query."""
+	item_codes = list({code for code in item_codes or [] if code})
+	if not item_codes:
+		return {}
+
+	attributes = {}
+	for attr in frappe.get_all(
+		"Item Variant Attribute",
+		filters={"parent": ["in", item_codes]},
+		fields=["parent", "attribute", "attribute_value"],
+		order_by="parent, idx"
+	):
+		if attr.attribute:
+			attributes.setdefault(attr.parent, {})[attr.attribute.upper()] = attr.attribute_value
+	return attributes
+
+
 def parse_carton_dimension(dimension_text):
 	"""Parse carton dimension text and return length, width, height in cm."""
 	if not dimension_text:
@@ -750,97 +866,119 @@ def get_item_weight_per_unit(item_code, cache=None):
 	return weight
 
 
-def get_bom_carton_details(item_code):
-	"""Get default BOM, active BOM, carton item and carton dimension for an item."""
-	if not item_code:
-		return {
-			"default_bom": None,
-			"active_bom": None,
-			"carton_item": None,
-			"carton_dimension": None,
-			"qty_ctn": None,
-			"so_item_weight_per_unit": 0,
-			"carton_weight_per_unit": 0
-		}
+def _empty_bom_carton_details():
+	return {
+		"default_bom": None,
+		"active_bom": None,
+		"carton_item": None,
+		"carton_dimension": None,
+		"qty_ctn": None,
+		"so_item_weight_per_unit": 0,
+		"carton_weight_per_unit": 0
+	}
 
-	default_bom = frappe.db.get_value(
-		"BOM",
-		{
-			"item": item_code,
-			"is_default": 1,
-			"is_active": 1,
-			"docstatus": 1
-		},
-		"name",
-		order_by="modified desc"
-	)
 
-	active_bom = frappe.db.get_value(
-		"BOM",
-		{
-			"item": item_code,
-			"is_active": 1,
-			"docstatus": 1
-		},
-		"name",
-		order_by="is_default desc, modified desc"
-	)
+def get_bom_carton_details_map(item_codes):
+	"""Get BOM/carton details for many items at once: {item_code: details}.
 
-	bom_for_carton = default_bom or active_bom
-	carton_item = None
-	carton_dimension = None
-	carton_qty = None
-	bom_qty = None
-	qty_ctn = None
+	Uses four queries regardless of item count (BOMs, carton BOM rows, carton
+	dimensions, item weights) instead of several lookups per item.
+	"""
+	item_codes = list({code for code in item_codes or [] if code})
+	if not item_codes:
+		return {}
 
-	if bom_for_carton:
-		bom_qty = frappe.db.get_value("BOM", bom_for_carton, "quantity")
+	boms = frappe.db.sql(
+		"""
+		SELECT name, item, is_default, quantity
+		FROM `tabBOM`
+		WHERE item IN %(items)s AND is_active = 1 AND docstatus = 1
+		ORDER BY is_default DESC, modified DESC
+		""",
+		{"items": item_codes},
+		as_dict=True
+	)
 
-		carton_item_row = frappe.db.sql(
+	default_bom = {}
+	active_bom = {}
+	bom_qty = {}
+	for bom in boms:
+		bom_qty[bom.name] = bom.quantity
+		active_bom.setdefault(bom.item, bom.name)
+		if bom.is_default:
+			default_bom.setdefault(bom.item, bom.name)
+
+	carton_boms = list({default_bom.get(code) or active_bom.get(code) for code in item_codes} - {None})
+	carton_rows = {}
+	if carton_boms:
+		for row in frappe.db.sql(
 			"""
-			SELECT bi.item_code, bi.qty
+			SELECT bi.parent, bi.item_code, bi.qty
 			FROM `tabBOM Item` bi
 			LEFT JOIN `tabItem` i ON i.name = bi.item_code
-			WHERE bi.parent = %s
+			WHERE bi.parent IN %(boms)s
 			  AND (
 				UPPER(IFNULL(i.item_group, '')) LIKE 'CARTON%%'
 				OR UPPER(IFNULL(bi.item_code, '')) LIKE 'CARTON%%'
 				OR UPPER(IFNULL(bi.item_name, '')) LIKE 'CARTON%%'
 			  )
-			ORDER BY bi.idx ASC
-			LIMIT 1
+			ORDER BY bi.parent, bi.idx ASC
 			""",
-			(bom_for_carton,),
+			{"boms": carton_boms},
 			as_dict=True
-		)
+		):
+			carton_rows.setdefault(row.parent, row)
 
-		if carton_item_row:
-			carton_item = carton_item_row[0].item_code
-			carton_qty = carton_item_row[0].qty or 0
-			carton_dimension = frappe.db.get_value(
-				"Item Variant Attribute",
-				{
-					"parent": carton_item,
-					"attribute": "Carton Dimension"
-				},
-				"attribute_value"
-			)
+	carton_items = list({row.item_code for row in carton_rows.values() if row.item_code})
+	carton_dimensions = {}
+	if carton_items:
+		for attr in frappe.get_all(
+			"Item Variant Attribute",
+			filters={"parent": ["in", carton_items], "attribute": "Carton Dimension"},
+			fields=["parent", "attribute_value"]
+		):
+			carton_dimensions.setdefault(attr.parent, attr.attribute_value)
+
+	weights = dict(
+		frappe.get_all(
+			"Item",
+			filters={"name": ["in", list(set(item_codes) | set(carton_items))]},
+			fields=["name", "weight_per_unit"],
+			as_list=True
+		)
+	)
 
-			if bom_qty and carton_qty:
+	details_map = {}
+	for item_code in item_codes:
+		details = _empty_bom_carton_details()
+		details["default_bom"] = default_bom.get(item_code)
+		details["active_bom"] = active_bom.get(item_code)
+		details["so_item_weight_per_unit"] = flt(weights.get(item_code) or 0)
+
+		carton_row = carton_rows.get(details["default_bom"] or details["active_bom"])
+		if carton_row:
+			carton_item = carton_row.item_code
+			carton_qty = carton_row.qty or 0
+			qty = bom_qty.get(carton_row.parent)
+			details["carton_item"] = carton_item
+			details["carton_dimension"] = carton_dimensions.get(carton_item)
+			details["carton_weight_per_unit"] = flt(weights.get(carton_item) or 0)
+			if qty and carton_qty:
 				try:
-					qty_ctn = float(bom_qty) / float(carton_qty)
+					details["qty_ctn"] = float(qty) / float(carton_qty)
 				except Exception:
-					qty_ctn = None
+					details["qty_ctn"] = None
 
-	return {
-		"default_bom": default_bom,
-		"active_bom": active_bom,
-		"carton_item": carton_item,
-		"carton_dimension": carton_dimension,
-		"qty_ctn": qty_ctn,
-		"so_item_weight_per_unit": get_item_weight_per_unit(item_code),
-		"carton_weight_per_unit": get_item_weight_per_unit(carton_item)
-	}
+		details_map[item_code] = details
+
+	return details_map
+
+
+def get_bom_carton_details(item_code):
+	"""Get default BOM, active BOM, carton item and carton dimension for an item."""
+	if not item_code:
+		return _empty_bom_carton_details()
+	return get_bom_carton_details_map([item_code]).get(item_code) or _empty_bom_carton_details()
 
 
 def apply_bom_carton_details_to_row(row, details, force_qty_ctn=False):
@@ -904,10 +1042,11 @@ def refresh_order_sheet_bom_carton_details(doc, force_qty_ctn=False):
 	updated_rows = 0
 	bom_changed_rows = 0
 
+	details_map = get_bom_carton_details_map([row.so_item for row in doc.order_sheet_ct])
 	for row in doc.order_sheet_ct:
 		if not row.so_item:
 			continue
-		details = get_bom_carton_details(row.so_item)
+		details = details_map.get(row.so_item) or _empty_bom_carton_details()
 		if apply_bom_carton_details_to_row(row, details, force_qty_ctn=force_qty_ctn):
 			bom_changed_rows += 1
 		updated_rows += 1
@@ -1032,14 +1171,21 @@ def get_items_from_sales_order(sales_order):
 	"""
 	Fetch items from Sales Order and return them in a format suitable for Order Sheet CT
 	Includes variant attributes mapping with automatic record creation
+
+	Variant attributes and BOM/carton details are loaded for all lines at once and
+	each master doctype is resolved with one lookup plus one batched insert.
 	"""
 	if not sales_order:
 		frappe.throw("Sales Order is required")
 
 	# Get Sales Order document
 	so = frappe.get_doc("Sales Order", sales_order)
-	
+	item_codes = [item.item_code for item in so.items]
+	bom_carton_map = get_bom_carton_details_map(item_codes)
+	attributes_map = get_variant_attributes_map(item_codes)
+
 	items = []
+	master_values = []
 	for item in so.items:
 		item_data = {
 			"item_code": item.item_code,
@@ -1053,129 +1199,35 @@ def get_items_from_sales_order(sales_order):
 		}
 
 		# Populate BOM/carton details for direct row fill in Order Sheet CT
-		bom_carton_details = get_bom_carton_details(item.item_code)
-		item_data.update(bom_carton_details)
-		
-		# Fetch variant attributes from item
-		attributes = {}
-		
-		# Get attributes from Item Variant Attribute child table
-		# This works for both variant items and items with attributes
-		variant_attributes = frappe.get_all(
-			"Item Variant Attribute",
-			filters={"parent": item.item_code},
-			fields=["attribute", "attribute_value"]
-		)
-		
-		# Convert to dictionary for easy lookup
-		for attr in variant_attributes:
-			attributes[attr.attribute.upper()] = attr.attribute_value
-		
-		# Map attributes to Order Sheet CT fields with find_or_create
-		# DESIGN -> design (Link to Stitching Design)
-		if attributes.get("DESIGN"):
-			design_name = find_or_create_design(attributes.get("DESIGN"))
-			if design_name:
-				item_data["design"] = design_name
-		
-		# EAN -> ean (Link to Ean Code)
-		if attributes.get("EAN"):
-			ean_name = find_or_create_ean(attributes.get("EAN"))
-			if ean_name:
-				item_data["ean"] = ean_name
-		
-		# COLOR/COLOUR/DESIGN -> colour (Link to Stitching Colour)
-		colour_value = None
-		if attributes.get("COLOR"):
-			colour_value = attributes.get("COLOR")
-		elif attributes.get("COLOUR"):
-			colour_value = attributes.get("COLOUR")
-		elif attributes.get("DESIGN"):
-			# If DESIGN is used for colour
-			colour_value = attributes.get("DESIGN")
-		
-		if colour_value:
-			colour_name = find_or_create_colour(colour_value)
-			if colour_name:
-				item_data["colour"] = colour_name
-		
-		# ARTICLE -> stitching_article_no (Link to Stitching Article No)
-		article_value = None
-		if attributes.get("ARTICLE"):
-			article_value = attributes.get("ARTICLE")
-		else:
-			# Fallback: Try to extract article from item name (part before size pattern)
-			item_name = item.item_code or item.item_name or ""
-			# Extract part before the size pattern (e.g., "BDH-QCS" from "BDH-QCS-140X220...")
-			size_match = re.search(r'\d+(?:\.\d+)?X\d+', item_name)
-			if size_match:
-				before_size = item_name[:size_match.start()].strip()
-				# Remove trailing dashes/hyphens
-				before_size = before_size.rstrip('- ').strip()
-				if before_size:
-					article_value = before_size
-					print(f"Extracted ARTICLE '{article_value}' from item name: '{item_name}'")
-		
-		if article_value:
-			article_name = find_or_create_article(article_value)
-			if article_name:
-				item_data["stitching_article_no"] = article_name
-		
-		# SIZE -> size (Link to Stitching Size)
-		size_value = None
-		if attributes.get("SIZE"):
-			size_value = attributes.get("SIZE")
-		else:
-			# Fallback: Try to extract size from item name
-			# Look for patterns like "140X220" or "140X220,60X70+15" in item name
-			item_name = item.item_code or item.item_name or ""
-			# Pattern: size-like token with X separators and optional /, +, *, or parentheses
-			# Matches: "140X220", "140X220,60X70+15", "46X71+7.5", "140X200/70X80", "(135X200/80X80)*2"
-			size_pattern = re.search(r'([0-9][0-9Xx/,+*().]*[Xx][0-9Xx/,+*().]*)', item_name)
-			if size_pattern:
-				size_value = size_pattern.group(1)
-				size_value = size_value.strip()
-				if size_value.startswith("("):
-					size_value = size_value[1:]
-				if ")*" in size_value:
-					size_value = size_value.replace(")*", "*")
-				if size_value.endswith(")"):
-					size_value = size_value[:-1]
-				print(f"Extracted SIZE '{size_value}' from item name: '{item_name}'")
-		
-		if size_value:
-			print(f"\n{'='*60}")
-			print(f"PROCESSING SIZE for Item: {item.item_code}")
-			print(f"SIZE Value: '{size_value}'")
-			print(f"{'='*60}")
-			
-			try:
-				size_name = find_or_create_size(size_value)
-				if size_name:
-					item_data["size"] = size_name
-					print(f"✓✓✓ FINAL RESULT: SIZE '{size_value}' -> Stitching Size '{size_name}'")
-					print(f"✓ Size field set in item_data for {item.item_code}\n")
-				else:
-					print(f"✗✗✗ FINAL RESULT: Failed to create/find Stitching Size for SIZE '{size_value}'")
-					print(f"✗ Size field NOT set for {item.item_code}\n")
-					item_code_short = item.item_code[:30] if len(item.item_code) > 30 else item.item_code
-					error_msg = f"Failed to create/find Stitching Size for SIZE '{size_value[:30]}' in item {item_code_short}"
-					print(f"ERROR: {error_msg}")
-			except Exception as e:
-				print(f"✗✗✗ EXCEPTION: {str(e)[:200]}\n")
-				error_detail = str(e)[:80] if len(str(e)) > 80 else str(e)
-				item_code_short = item.item_code[:30] if len(item.item_code) > 30 else item.item_code
-				error_msg = f"Exception processing SIZE '{size_value[:30]}' for item {item_code_short}: {error_detail}"
-				print(f"ERROR: {error_msg}")
-		
-		# GSM -> gsm (Link to GSM)
-		if attributes.get("GSM"):
-			gsm_name = find_or_create_gsm(attributes.get("GSM"))
-			if gsm_name:
-				item_data["gsm"] = gsm_name
-		
+		item_data.update(bom_carton_map.get(item.item_code) or _empty_bom_carton_details())
+
+		attributes = attributes_map.get(item.item_code) or {}
+		item_name = item.item_code or item.item_name or ""
+		master_values.append({
+			"design": attributes.get("DESIGN"),
+			"ean": attributes.get("EAN"),
+			# COLOR/COLOUR, else DESIGN doubles as colour
+			"colour": attributes.get("COLOR") or attributes.get("COLOUR") or attributes.get("DESIGN"),
+			"stitching_article_no": attributes.get("ARTICLE") or extract_article(item_name),
+			"size": attributes.get("SIZE") or extract_size(item_name),
+			"gsm": attributes.get("GSM"),
+		})
 		items.append(item_data)
-	
+
+	resolved = {
+		fieldname: resolve_masters(
+			doctype, value_field, [v[fieldname] for v in master_values], match_name=match_name
+		)
+		for fieldname, (doctype, value_field, match_name) in ORDER_SHEET_MASTER_FIELDS.items()
+	}
+	resolved["size"] = resolve_sizes([v["size"] for v in master_values])
+
+	for item_data, values in zip(items, master_values):
+		for fieldname, names in resolved.items():
+			name = names.get(cstr(values[fieldname]).strip())
+			if name:
+				item_data[fieldname] = name
+
 	return items
 
 
@@ -1242,11 +1294,29 @@ def get_linked_production_plans(order_sheet):
 	return {"plans": plans}
 
 
+def get_production_plan_warehouse(company, warehouse=None):
+	"""For Warehouse of a Production Plan built from an Order Sheet.
+
+	Explicit argument, else Manufacturing Addon Setting, else the Stock Settings
+	default warehouse, else the company default warehouse.
+	"""
+	return (
+		warehouse
+		or frappe.db.get_single_value("Manufacturing Addon Setting", "production_plan_warehouse")
+		or frappe.db.get_single_value("Stock Settings", "default_warehouse")
+		or frappe.get_cached_value("Company", company, "default_warehouse")
+	)
+
+
 @frappe.whitelist()
-def create_production_plan_from_order_sheet(order_sheet):
+def create_production_plan_from_order_sheet(order_sheet, warehouse=None):
 	"""
 	Create a Production Plan from Order Sheet
 	"""
+	from manufacturing_addon.manufacturing_addon.doctype.production_plan.production_plan import (
+		get_item_bom_details,
+	)
+
 	if not order_sheet:
 		frappe.throw("Order Sheet is required")
 
@@ -1261,6 +1331,8 @@ def create_production_plan_from_order_sheet(order_sheet):
 	if not company:
 		frappe.throw("Please set default Company in User Settings")
 
+	for_warehouse = get_production_plan_warehouse(company, warehouse)
+
 	# Create Production Plan
 	production_plan = frappe.get_doc({
 		"doctype": "Production Plan",
@@ -1269,7 +1341,7 @@ def create_production_plan_from_order_sheet(order_sheet):
 		"custom_order_sheet": os_doc.name,
 		"posting_date": os_doc.posting_date_and_time.date() if os_doc.posting_date_and_time else today(),
 		"get_items_from": "Sales Order" if os_doc.sales_order else "",
-		"for_warehouse": "Stores - SAH",
+		"for_warehouse": for_warehouse,
 		"po_items": []
 	})
 
@@ -1279,75 +1351,32 @@ def create_production_plan_from_order_sheet(order_sheet):
 			"sales_order": os_doc.sales_order
 		})
 
+	# BOM, stock UOM, description and item default warehouse for all rows at once
+	item_details = get_item_bom_details([row.so_item for row in os_doc.order_sheet_ct], company)
+
+	# Company fallback warehouse for items without an Item Default, looked up once
+	company_warehouse = None
+	if any(not item.default_warehouse for item in item_details.values()):
+		company_warehouse = frappe.get_cached_value("Company", company, "default_warehouse")
+		if not company_warehouse:
+			# Get any warehouse for the company
+			company_warehouse = frappe.db.get_value("Warehouse", {"company": company}, "name")
+
+	planned_start_date = os_doc.posting_date_and_time if os_doc.posting_date_and_time else now_datetime()
+	missing_bom = []
+
 	# Add items from Order Sheet CT
 	for row in os_doc.order_sheet_ct:
 		if not row.so_item:
 			continue
 
-		# Get item details
-		item_doc = frappe.get_doc("Item", row.so_item)
-		
-		# Get default BOM for the item
-		bom_no = None
-		if item_doc.default_bom:
-			bom_no = item_doc.default_bom
-		else:
-			# Try to find active BOM
-			bom_list = frappe.get_all(
-				"BOM",
-				filters={
-					"item": row.so_item,
-					"is_active": 1,
-					"is_default": 1
-				},
-				limit=1
-			)
-			if bom_list:
-				bom_no = bom_list[0].name
-			else:
-				# Get any active BOM
-				bom_list = frappe.get_all(
-					"BOM",
-					filters={
-						"item": row.so_item,
-						"is_active": 1
-					},
-					limit=1
-				)
-				if bom_list:
-					bom_no = bom_list[0].name
-
-		if not bom_no:
-			frappe.msgprint(
-				f"No BOM found for item {row.so_item}. Skipping this item.",
-				indicator="orange",
-				title="BOM Not Found"
-			)
-			continue
+		item = item_details.get(row.so_item)
+		if not item:
+			frappe.throw(f"Item {row.so_item} not found")
 
-		# Get warehouse from item defaults or company defaults
-		warehouse = None
-		
-		# Try to get warehouse from item defaults (per company)
-		item_defaults = frappe.db.get_value(
-			"Item Default",
-			{"parent": row.so_item, "company": company},
-			"default_warehouse"
-		)
-		if item_defaults:
-			warehouse = item_defaults
-		else:
-			# Get default finished goods warehouse from company
-			warehouse = frappe.db.get_value("Company", company, "default_warehouse")
-			if not warehouse:
-				# Get any warehouse for the company
-				warehouse_list = frappe.get_all(
-					"Warehouse",
-					filters={"company": company},
-					limit=1
-				)
-				if warehouse_list:
-					warehouse = warehouse_list[0].name
+		if not item.bom_no:
+			missing_bom.append(row.so_item)
+			continue
 
 		# Use planned_qty if available, otherwise use order_qty
 		planned_qty = row.planned_qty if row.planned_qty else (row.order_qty or 0)
@@ -1355,23 +1384,27 @@ def create_production_plan_from_order_sheet(order_sheet):
 		if planned_qty <= 0:
 			continue
 
-		# Get stock UOM from item
-		stock_uom = item_doc.stock_uom
-		if not stock_uom:
-			stock_uom = item_doc.stock_uom or "Nos"  # Default to Nos if not set
-
 		# Add item to Production Plan
 		production_plan.append("po_items", {
 			"item_code": row.so_item,
-			"bom_no": bom_no,
+			"bom_no": item.bom_no,
 			"planned_qty": planned_qty,
-			"stock_uom": stock_uom,
-			"warehouse": warehouse,
-			"planned_start_date": os_doc.posting_date_and_time if os_doc.posting_date_and_time else now_datetime(),
+			"stock_uom": item.stock_uom or "Nos",
+			"warehouse": item.default_warehouse or company_warehouse,
+			"planned_start_date": planned_start_date,
 			"sales_order": os_doc.sales_order if os_doc.sales_order else None,
-			"description": item_doc.description or item_doc.item_name
+			"description": item.description or item.item_name
 		})
 
+	if missing_bom:
+		frappe.msgprint(
+			"No active BOM found for these items, skipped: {0}".format(
+				", ".join(sorted(set(missing_bom)))
+			),
+			indicator="orange",
+			title="BOM Not Found"
+		)
+
 	if not production_plan.po_items or len(production_plan.po_items) == 0:
 		frappe.throw("No valid items found to create Production Plan. Please ensure items have BOMs.")
 
@@ -1388,7 +1421,7 @@ def create_production_plan_from_order_sheet(order_sheet):
 		# Call get_items_for_material_requests to populate MR items
 		mr_items = get_items_for_material_requests(
 			production_plan.as_dict(),
-			warehouses=[{"warehouse": "Stores - SAH"}]
+			warehouses=[{"warehouse": for_warehouse}] if for_warehouse else None
 		)
 		
 		# Update Production Plan with MR items
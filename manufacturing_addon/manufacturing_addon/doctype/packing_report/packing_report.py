@@ -7,6 +7,7 @@ from frappe.model.document import Document
 from frappe import _
 from frappe.utils import flt
 
+from manufacturing_addon.manufacturing_addon.utils.query_budget import query_budget
 from manufacturing_addon.manufacturing_addon.utils.report_style_contractor import (
     append_style_contractors,
     validate_mandatory_contractors,
@@ -23,6 +24,13 @@ from manufacturing_addon.manufacturing_addon.utils.nested_style_contractors impo
     load_nested_style_contractors,
     save_nested_style_contractors,
 )
+from manufacturing_addon.manufacturing_addon.utils.stage_totals import (
+    reset_stage_totals,
+    stage_totals_for,
+)
+from manufacturing_addon.manufacturing_addon.utils.trace import get_tracer
+
+trace = get_tracer("packing_report")
 
 # Patch Stock Entry's set_rate_for_outgoing_items to respect set_basic_rate_manually and already set rates
 _original_set_rate_for_outgoing_items = None
@@ -37,7 +45,12 @@ def _patched_set_rate_for_outgoing_items(self, reset_outgoing_rate=True, raise_e
             current_rate = flt(d.basic_rate)
             if set_manually:
                 # Rate is manually set - skip recalculation, just calculate amount
-                print(f"[PATCH] Skipping rate calc for {d.item_code}: set_basic_rate_manually={set_manually}, current_rate={current_rate}")
+                trace(
+                    "[PATCH] Skipping rate calc for {}: set_basic_rate_manually={}, current_rate={}",
+                    d.item_code,
+                    set_manually,
+                    current_rate,
+                )
                 d.basic_amount = flt(flt(d.transfer_qty) * flt(d.basic_rate), d.precision("basic_amount"))
                 if not d.t_warehouse:
                     outgoing_items_cost += flt(d.basic_amount)
@@ -71,9 +84,9 @@ if not hasattr(frappe, '_stock_entry_rate_patch_applied'):
         _original_set_rate_for_outgoing_items = StockEntry.set_rate_for_outgoing_items
         StockEntry.set_rate_for_outgoing_items = _patched_set_rate_for_outgoing_items
         frappe._stock_entry_rate_patch_applied = True
-        print("[Packing Report] Patched StockEntry.set_rate_for_outgoing_items to respect set_basic_rate_manually")
+        trace("[Packing Report] Patched StockEntry.set_rate_for_outgoing_items to respect set_basic_rate_manually")
     except Exception as e:
-        print(f"[Packing Report] Warning: Could not patch StockEntry.set_rate_for_outgoing_items: {str(e)}")
+        trace("[Packing Report] Warning: Could not patch StockEntry.set_rate_for_outgoing_items: {}", str(e))
 
 
 @frappe.whitelist()
@@ -200,81 +213,72 @@ class PackingReport(Document):
 
         return bundle_items
 
-    def _get_finished_bundle_equivalent_qty(self, report_table, child_table, qty_field, row, use_highest=False):
+    def _get_finished_bundle_equivalent_qty(self, stage, row, use_highest=False):
         """
         For finished-item packing rows, convert bundle-component totals back to
         finished-set equivalent from bundle components.
         """
-        bundle_items = self._get_bundle_items_for_so_item(row.so_item)
+        bundle_cache = self.flags.setdefault("bundle_items", {})
+        if row.so_item not in bundle_cache:
+            bundle_cache[row.so_item] = self._get_bundle_items_for_so_item(row.so_item)
+        bundle_items = bundle_cache[row.so_item]
         if not bundle_items:
             return None
 
-        query = f"""
-            SELECT child.combo_item, SUM(IFNULL(child.{qty_field}, 0)) AS total_qty
-            FROM `tab{child_table}` AS child
-            LEFT JOIN `tab{report_table}` AS parent ON child.parent = parent.name
-            WHERE parent.order_sheet = %s
-                AND child.so_item = %s
-                AND parent.docstatus = 1
-                AND IFNULL(child.combo_item, '') != ''
-            GROUP BY child.combo_item
-        """
-        component_totals = frappe.db.sql(query, (self.order_sheet, row.so_item), as_dict=True)
-        total_map = {d.combo_item: flt(d.total_qty) for d in component_totals if d.combo_item}
-
-        normalized_totals = []
-        for bundle_item in bundle_items:
-            combo_item = bundle_item.get("item")
-            pcs = flt(bundle_item.get("pcs")) or 1
-            normalized_totals.append(flt(total_map.get(combo_item, 0)) / pcs)
-
-        if not normalized_totals:
-            return 0
-
-        return max(normalized_totals) if use_highest else min(normalized_totals)
+        return stage_totals_for(self).bundle_equivalent_qty(
+            stage, row.so_item, bundle_items, use_highest=use_highest
+        )
 
     @frappe.whitelist()
+    @query_budget()
     def get_data1(self):
-        print(f"\n{'='*60}")
-        print(f"[get_data1] Starting for Packing Report: '{self.name}'")
-        print(f"[get_data1] Order Sheet: '{self.order_sheet}'")
-        print(f"{'='*60}")
+        trace(
+            "[get_data1] Starting for Packing Report: '{}'\n"
+            "[get_data1] Order Sheet: '{}'",
+            self.name,
+            self.order_sheet,
+        )
         
         if not self.order_sheet:
-            print(f"[get_data1] ERROR: No Order Sheet selected")
+            trace("[get_data1] ERROR: No Order Sheet selected")
             frappe.throw("Please select an Order Sheet first.")
         
         if isinstance(self.order_sheet, str) and self.order_sheet:
             try:
                 # Use ignore_links to load cancelled Order Sheets
                 doc = frappe.get_doc("Order Sheet", self.order_sheet)
-                print(f"[get_data1] Loaded Order Sheet: '{doc.name}'")
-                print(f"[get_data1] Order Sheet is_or: {doc.is_or}")
-                print(f"[get_data1] Order Sheet docstatus: {doc.docstatus}")
+                trace(
+                    "[get_data1] Loaded Order Sheet: '{}'\n"
+                    "[get_data1] Order Sheet is_or: {}\n"
+                    "[get_data1] Order Sheet docstatus: {}",
+                    doc.name,
+                    doc.is_or,
+                    doc.docstatus,
+                )
                 
                 # Check if Order Sheet is cancelled
                 if doc.docstatus == 2:
-                    print(f"[get_data1] WARNING: Order Sheet is cancelled, but proceeding anyway")
+                    trace("[get_data1] WARNING: Order Sheet is cancelled, but proceeding anyway")
             except Exception as e:
-                print(f"[get_data1] ERROR loading Order Sheet: {str(e)}")
+                trace("[get_data1] ERROR loading Order Sheet: {}", str(e))
                 frappe.throw(f"Invalid Order Sheet reference: {str(e)}")
         else:
-            print(f"[get_data1] ERROR: Invalid Order Sheet type")
+            trace("[get_data1] ERROR: Invalid Order Sheet type")
             frappe.throw("Invalid Order Sheet reference.")
         
         # Check if packing_report_ct is empty or not
         existing_rows = len(self.packing_report_ct) if self.packing_report_ct else 0
-        print(f"[get_data1] Existing packing_report_ct rows: {existing_rows}")
+        trace("[get_data1] Existing packing_report_ct rows: {}", existing_rows)
         
         # Clear existing rows to allow re-fetch with new calculations
         if existing_rows > 0:
-            print(f"[get_data1] Clearing {existing_rows} existing rows to re-fetch data...")
+            trace("[get_data1] Clearing {} existing rows to re-fetch data...", existing_rows)
             self.packing_report_ct = []
         
         if not self.packing_report_ct or existing_rows == 0:
-            print(f"[get_data1] packing_report_ct is empty, will fetch data")
+            trace("[get_data1] packing_report_ct is empty, will fetch data")
             if doc.is_or == 0:
-                print(f"[get_data1] Order Sheet is_or = 0, fetching data...")
+                trace("[get_data1] Order Sheet is_or = 0, fetching data...")
                 rec = frappe.db.sql("""
                     SELECT * FROM `tabOrder Sheet` AS opr
                     LEFT JOIN `tabOrder Sheet CT` AS orct
@@ -282,27 +286,35 @@ class PackingReport(Document):
                     WHERE opr.name = %s AND opr.is_or = 0
                 """, (self.order_sheet,), as_dict=True)
                 
-                print(f"[get_data1] Found {len(rec)} rows from Order Sheet")
+                trace("[get_data1] Found {} rows from Order Sheet", len(rec))
 
                 self.packing_report_ct = []
-                print(f"[get_data1] Processing {len(rec)} Order Sheet CT rows...")
+                trace("[get_data1] Processing {} Order Sheet CT rows...", len(rec))
                 for idx, r in enumerate(rec):
                     so_item = r.get("so_item")
                     planned_qty = r.get("planned_qty") or 0
                     order_qty = r.get("order_qty") or 0
                     
-                    print(f"\n{'='*60}")
-                    print(f"[get_data1] Row {idx+1} - Raw Data from Order Sheet CT:")
-                    print(f"  - so_item: '{so_item}'")
-                    print(f"  - order_qty (raw): {r.get('order_qty')}")
-                    print(f"  - planned_qty (raw): {r.get('planned_qty')}")
-                    print(f"  - order_qty (after or 0): {order_qty}")
-                    print(f"  - planned_qty (after or 0): {planned_qty}")
-                    print(f"  - All keys in row: {list(r.keys())}")
-                    print(f"{'='*60}")
+                    if trace.enabled():
+                        trace(
+                            "[get_data1] Row {} - Raw Data from Order Sheet CT:\n"
+                            "  - so_item: '{}'\n"
+                            "  - order_qty (raw): {}\n"
+                            "  - planned_qty (raw): {}\n"
+                            "  - order_qty (after or 0): {}\n"
+                            "  - planned_qty (after or 0): {}\n"
+                            "  - All keys in row: {}",
+                            idx + 1,
+                            so_item,
+                            r.get('order_qty'),
+                            r.get('planned_qty'),
+                            order_qty,
+                            planned_qty,
+                            list(r.keys()),
+                        )
                     
                     if not so_item:
-                        print(f"[get_data1] Row {idx+1}: Skipping - no so_item")
+                        trace("[get_data1] Row {}: Skipping - no so_item", idx + 1)
                         continue
                     
                     # In Packing Report, show FINISHED ITEM directly (not expand into combo items)
@@ -311,13 +323,19 @@ class PackingReport(Document):
                         item_doc = frappe.get_doc("Item", so_item)
                         combo_items = getattr(item_doc, 'custom_product_combo_item', [])
                         
-                        print(f"[get_data1] Item {so_item}:")
-                        print(f"  - custom_product_combo_item count: {len(combo_items) if combo_items else 0}")
+                        if trace.enabled():
+                            trace(
+                                "[get_data1] Item {}:\n"
+                                "  - custom_product_combo_item count: {}",
+                                so_item,
+                                len(combo_items) if combo_items else 0,
+                            )
                         
                         # Get combo items from Item or Stitching Size for reference
                         bundle_items_data = []  # List of dicts: [{"pcs": 2, "item": "PILLOW 80X80"}, ...]
                         if combo_items and len(combo_items) > 0:
-                            print(f"[get_data1] ✓ Found {len(combo_items)} combo items in Item for reference")
+                            if trace.enabled():
+                                trace("[get_data1] ✓ Found {} combo items in Item for reference", len(combo_items))
                             for combo_item_row in combo_items:
                                 bundle_items_data.append({
                                     "pcs": combo_item_row.pcs or 1,
@@ -341,7 +359,11 @@ class PackingReport(Document):
                                 if stitching_size:
                                     stitching_size_doc = frappe.get_doc("Stitching Size", stitching_size)
                                     if stitching_size_doc.combo_detail and len(stitching_size_doc.combo_detail) > 0:
-                                        print(f"[get_data1] ✓ Found {len(stitching_size_doc.combo_detail)} combo items in Stitching Size for reference")
+                                        if trace.enabled():
+                                            trace(
+                                                "[get_data1] ✓ Found {} combo items in Stitching Size for reference",
+                                                len(stitching_size_doc.combo_detail),
+                                            )
                                         for combo_item_row in stitching_size_doc.combo_detail:
                                             bundle_items_data.append({
                                                 "pcs": combo_item_row.pcs or 1,
@@ -482,18 +504,23 @@ class PackingReport(Document):
                         else:
                             bundle_items_text = None
                         
-                        # Plain text version for print logs
-                        bundle_items_log = ', '.join([f"{item['pcs']}x {item['item']}" for item in bundle_items_data]) if bundle_items_data else None
+                        if trace.enabled():
+                            # Plain text version for print logs
+                            bundle_items_log = ', '.join([f"{item['pcs']}x {item['item']}" for item in bundle_items_data]) if bundle_items_data else None
                         
-                        print(f"\n{'='*60}")
-                        print(f"[get_data1] ADDING FINISHED ITEM TO PACKING REPORT:")
-                        print(f"{'='*60}")
-                        print(f"  Finished Item: {so_item}")
-                        print(f"  Bundle Items: {bundle_items_log or 'None'}")
-                        print(f"  Order Qty: {order_qty}")
-                        print(f"  Planned Qty: {planned_qty}")
-                        print(f"  Qty: {planned_qty} (same as planned_qty for finished item)")
-                        print(f"{'='*60}")
+                            trace(
+                                "[get_data1] ADDING FINISHED ITEM TO PACKING REPORT:\n"
+                                "  Finished Item: {}\n"
+                                "  Bundle Items: {}\n"
+                                "  Order Qty: {}\n"
+                                "  Planned Qty: {}\n"
+                                "  Qty: {} (same as planned_qty for finished item)",
+                                so_item,
+                                bundle_items_log or 'None',
+                                order_qty,
+                                planned_qty,
+                                planned_qty,
+                            )
                         
                         new_row = self._append_packing_ct_row({
                         "customer": r.get("customer"),
@@ -513,33 +540,50 @@ class PackingReport(Document):
                         })
                         
                         # Verify bundle_items was set
-                        print(f"[get_data1] ✓ Finished item added successfully!")
-                        print(f"[get_data1] Verifying bundle_items in row:")
-                        print(f"  - bundle_items set: {new_row.bundle_items is not None}")
-                        print(f"  - bundle_items length: {len(new_row.bundle_items) if new_row.bundle_items else 0}")
-                        print(f"  - bundle_items preview: {new_row.bundle_items[:100] if new_row.bundle_items else 'None'}...")
-                        print(f"{'='*60}\n")
+                        if trace.enabled():
+                            trace(
+                                "[get_data1] ✓ Finished item added successfully!\n"
+                                "[get_data1] Verifying bundle_items in row:\n"
+                                "  - bundle_items set: {}\n"
+                                "  - bundle_items length: {}\n"
+                                "  - bundle_items preview: {}...",
+                                new_row.bundle_items is not None,
+                                len(new_row.bundle_items) if new_row.bundle_items else 0,
+                                new_row.bundle_items[:100] if new_row.bundle_items else 'None',
+                            )
                     except Exception as e:
                         error_msg = f"Error processing item {so_item}: {str(e)}"
-                        print(f"[get_data1] Row {idx+1}: ✗ ERROR: {error_msg}")
+                        trace("[get_data1] Row {}: ✗ ERROR: {}", idx + 1, error_msg)
                         frappe.log_error(error_msg, "Packing Report Item Processing")
                         continue
                 
-                print(f"\n{'='*60}")
-                print(f"[get_data1] SUMMARY:")
-                print(f"  - Total rows added to packing_report_ct: {len(self.packing_report_ct)}")
-                print(f"[get_data1] Final packing_report_ct data:")
-                for idx, row in enumerate(self.packing_report_ct):
-                    print(f"  Row {idx+1}:")
-                    print(f"    - so_item: {row.so_item}")
-                    print(f"    - combo_item: {row.combo_item}")
-                    print(f"    - bundle_items: {row.bundle_items}")
-                    print(f"    - order_qty: {row.order_qty}")
-                    print(f"    - planned_qty: {row.planned_qty}")
-                    print(f"    - pcs: {row.pcs}")
-                    print(f"    - qty: {row.qty}")
-                print(f"{'='*60}")
-                print(f"[get_data1] Saving Packing Report...")
+                trace(
+                    "[get_data1] SUMMARY:\n"
+                    "  - Total rows added to packing_report_ct: {}\n"
+                    "[get_data1] Final packing_report_ct data:",
+                    len(self.packing_report_ct),
+                )
+                if trace.enabled():
+                    for idx, row in enumerate(self.packing_report_ct):
+                        trace(
+                            "  Row {}:\n"
+                            "    - so_item: {}\n"
+                            "    - combo_item: {}\n"
+                            "    - bundle_items: {}\n"
+                            "    - order_qty: {}\n"
+                            "    - planned_qty: {}\n"
+                            "    - pcs: {}\n"
+                            "    - qty: {}",
+                            idx + 1,
+                            row.so_item,
+                            row.combo_item,
+                            row.bundle_items,
+                            row.order_qty,
+                            row.planned_qty,
+                            row.pcs,
+                            row.qty,
+                        )
+                trace("[get_data1] Saving Packing Report...")
                 
                 # Set flag to ignore link validation (allow cancelled Order Sheets)
                 self.flags.ignore_links = True
@@ -547,21 +591,21 @@ class PackingReport(Document):
                 try:
                     self.save(ignore_permissions=True)
                     frappe.db.commit()
-                    print(f"[get_data1] ✓ Saved successfully")
+                    trace("[get_data1] ✓ Saved successfully")
                 except Exception as e:
-                    print(f"[get_data1] ERROR saving: {str(e)}")
+                    trace("[get_data1] ERROR saving: {}", str(e))
                     frappe.db.rollback()
                     raise
                 
-                print(f"{'='*60}\n")
             else:
-                print(f"[get_data1] Order Sheet is_or = 1, skipping (only process when is_or = 0)")
-                print(f"{'='*60}\n")
+                trace("[get_data1] Order Sheet is_or = 1, skipping (only process when is_or = 0)")
         else:
-            print(f"[get_data1] packing_report_ct already has {existing_rows} rows, skipping fetch")
-            print(f"{'='*60}\n")
+            trace("[get_data1] packing_report_ct already has {} rows, skipping fetch", existing_rows)
 
+    @query_budget()
     def validate(self):
+        reset_stage_totals(self)
+        self.flags.bundle_items = {}
         self.set_cost_center_from_sales_order()
         self.calculate_finished_cutting_qty()
         self.calculate_finished_stitching_qty()
@@ -617,45 +661,18 @@ class PackingReport(Document):
     def calculate_finished_cutting_qty(self):
         """Get finished cutting qty from Cutting Reports"""
         try:
-            cutting_totals = {}
+            stage_totals = stage_totals_for(self)
             for row in self.packing_report_ct:
                 if not row.so_item:
+                    row.finished_cutting_qty = 0
                     continue
-                
-                if row.combo_item:
-                    # If combo_item is set, get cutting qty for that specific combo item
-                    query = """
-                        SELECT SUM(crct.cutting_qty) AS total_cutting
-                        FROM `tabCutting Report CT` AS crct 
-                        LEFT JOIN `tabCutting Report` AS cr 
-                        ON crct.parent = cr.name
-                        WHERE cr.order_sheet = %s AND crct.so_item = %s AND crct.combo_item = %s AND cr.docstatus = 1
-                        GROUP BY crct.so_item, crct.combo_item
-                    """
-                    params = (self.order_sheet, row.so_item, row.combo_item)
-                else:
-                    finished_qty = self._get_finished_bundle_equivalent_qty(
-                        "Cutting Report", "Cutting Report CT", "cutting_qty", row, use_highest=True
-                    )
-                    if finished_qty is not None:
-                        cutting_totals[(row.so_item, row.combo_item or '')] = finished_qty
-                        continue
-
-                    query = """
-                        SELECT SUM(crct.cutting_qty) AS total_cutting
-                        FROM `tabCutting Report CT` AS crct 
-                        LEFT JOIN `tabCutting Report` AS cr 
-                        ON crct.parent = cr.name
-                        WHERE cr.order_sheet = %s AND crct.so_item = %s AND (crct.combo_item IS NULL OR crct.combo_item = '') AND cr.docstatus = 1
-                        GROUP BY crct.so_item
-                    """
-                    params = (self.order_sheet, row.so_item)
 
-                result = frappe.db.sql(query, params, as_dict=True)
-                cutting_totals[(row.so_item, row.combo_item or '')] = result[0].total_cutting if result else 0
-
-            for row in self.packing_report_ct:
-                row.finished_cutting_qty = cutting_totals.get((row.so_item, row.combo_item or ''), 0)
+                finished_qty = None
+                if not row.combo_item:
+                    finished_qty = self._get_finished_bundle_equivalent_qty("Cutting", row, use_highest=True)
+                if finished_qty is None:
+                    finished_qty = stage_totals.qty("Cutting", row.so_item, row.combo_item)
+                row.finished_cutting_qty = finished_qty
 
         except Exception as e:
             frappe.log_error(frappe.get_traceback(), "Finished Cutting Quantity Fetch Failed")
@@ -663,45 +680,18 @@ class PackingReport(Document):
     def calculate_finished_stitching_qty(self):
         """Get finished stitching qty from Stitching Reports"""
         try:
-            stitching_totals = {}
+            stage_totals = stage_totals_for(self)
             for row in self.packing_report_ct:
                 if not row.so_item:
+                    row.finished_stitching_qty = 0
                     continue
-                
-                if row.combo_item:
-                    # If combo_item is set, get stitching qty for that specific combo item
-                    query = """
-                        SELECT SUM(srct.stitching_qty) AS total_stitching
-                        FROM `tabStitching Report CT` AS srct 
-                        LEFT JOIN `tabStitching Report` AS sr 
-                        ON srct.parent = sr.name
-                        WHERE sr.order_sheet = %s AND srct.so_item = %s AND srct.combo_item = %s AND sr.docstatus = 1
-                        GROUP BY srct.so_item, srct.combo_item
-                    """
-                    params = (self.order_sheet, row.so_item, row.combo_item)
-                else:
-                    finished_qty = self._get_finished_bundle_equivalent_qty(
-                        "Stitching Report", "Stitching Report CT", "stitching_qty", row, use_highest=True
-                    )
-                    if finished_qty is not None:
-                        stitching_totals[(row.so_item, row.combo_item or '')] = finished_qty
-                        continue
-
-                    query = """
-                        SELECT SUM(srct.stitching_qty) AS total_stitching
-                        FROM `tabStitching Report CT` AS srct 
-                        LEFT JOIN `tabStitching Report` AS sr 
-                        ON srct.parent = sr.name
-                        WHERE sr.order_sheet = %s AND srct.so_item = %s AND (srct.combo_item IS NULL OR srct.combo_item = '') AND sr.docstatus = 1
-                        GROUP BY srct.so_item
-                    """
-                    params = (self.order_sheet, row.so_item)
 
-                result = frappe.db.sql(query, params, as_dict=True)
-                stitching_totals[(row.so_item, row.combo_item or '')] = result[0].total_stitching if result else 0
-
-            for row in self.packing_report_ct:
-                row.finished_stitching_qty = stitching_totals.get((row.so_item, row.combo_item or ''), 0)
+                finished_qty = None
+                if not row.combo_item:
+                    finished_qty = self._get_finished_bundle_equivalent_qty("Stitching", row, use_highest=True)
+                if finished_qty is None:
+                    finished_qty = stage_totals.qty("Stitching", row.so_item, row.combo_item)
+                row.finished_stitching_qty = finished_qty
 
         except Exception as e:
             frappe.log_error(frappe.get_traceback(), "Finished Stitching Quantity Fetch Failed")
@@ -709,37 +699,11 @@ class PackingReport(Document):
     def calculate_finished_quality_qty(self):
         """Get finished quality qty from Quality Reports"""
         try:
-            quality_totals = {}
+            stage_totals = stage_totals_for(self)
             for row in self.packing_report_ct:
-                if not row.so_item:
-                    continue
-                
-                if row.combo_item:
-                    query = """
-                        SELECT SUM(qrct.quality_qty) AS total_quality
-                        FROM `tabQuality Report CT` AS qrct 
-                        LEFT JOIN `tabQuality Report` AS qr 
-                        ON qrct.parent = qr.name
-                        WHERE qr.order_sheet = %s AND qrct.so_item = %s AND qrct.combo_item = %s AND qr.docstatus = 1
-                        GROUP BY qrct.so_item, qrct.combo_item
-                    """
-                    params = (self.order_sheet, row.so_item, row.combo_item)
-                else:
-                    query = """
-                        SELECT SUM(qrct.quality_qty) AS total_quality
-                        FROM `tabQuality Report CT` AS qrct 
-                        LEFT JOIN `tabQuality Report` AS qr 
-                        ON qrct.parent = qr.name
-                        WHERE qr.order_sheet = %s AND qrct.so_item = %s AND (qrct.combo_item IS NULL OR qrct.combo_item = '') AND qr.docstatus = 1
-                        GROUP BY qrct.so_item
-                    """
-                    params = (self.order_sheet, row.so_item)
-
-                result = frappe.db.sql(query, params, as_dict=True)
-                quality_totals[(row.so_item, row.combo_item or '')] = result[0].total_quality if result else 0
-
-            for row in self.packing_report_ct:
-                row.finished_quality_qty = quality_totals.get((row.so_item, row.combo_item or ''), 0)
+                row.finished_quality_qty = (
+                    stage_totals.qty("Quality", row.so_item, row.combo_item) if row.so_item else 0
+                )
 
         except Exception as e:
             frappe.log_error(frappe.get_traceback(), "Finished Quality Quantity Fetch Failed")
@@ -747,64 +711,14 @@ class PackingReport(Document):
     def calculate_finished_packaging_qty(self):
         """Calculate and update finished_packaging_qty in the child table based on user-entered packaging_qty values."""
         try:
-            packaging_totals = {}
-
+            # Exclude current document from calculation
+            stage_totals = stage_totals_for(self)
             for row in self.packing_report_ct:
-                if not row.so_item:
-                    continue
-                
-                # Exclude current document from calculation
-                current_doc_filter = ""
-                if self.name:
-                    current_doc_filter = "AND pr.name != %s"
-                    if row.combo_item:
-                        query = """
-                            SELECT SUM(prct.packaging_qty) AS total_packaging
-                            FROM `tabPacking Report CT` AS prct 
-                            LEFT JOIN `tabPacking Report` AS pr 
-                            ON prct.parent = pr.name
-                            WHERE pr.order_sheet = %s AND prct.so_item = %s AND prct.combo_item = %s AND pr.docstatus = 1 {current_doc_filter}
-                            GROUP BY prct.so_item, prct.combo_item
-                        """.format(current_doc_filter=current_doc_filter)
-                        params = (self.order_sheet, row.so_item, row.combo_item, self.name)
-                    else:
-                        query = """
-                            SELECT SUM(prct.packaging_qty) AS total_packaging
-                            FROM `tabPacking Report CT` AS prct 
-                            LEFT JOIN `tabPacking Report` AS pr 
-                            ON prct.parent = pr.name
-                            WHERE pr.order_sheet = %s AND prct.so_item = %s AND (prct.combo_item IS NULL OR prct.combo_item = '') AND pr.docstatus = 1 {current_doc_filter}
-                            GROUP BY prct.so_item
-                        """.format(current_doc_filter=current_doc_filter)
-                        params = (self.order_sheet, row.so_item, self.name)
-                else:
-                    # New document, no need to exclude
-                    if row.combo_item:
-                        query = """
-                            SELECT SUM(prct.packaging_qty) AS total_packaging
-                            FROM `tabPacking Report CT` AS prct 
-                            LEFT JOIN `tabPacking Report` AS pr 
-                            ON prct.parent = pr.name
-                            WHERE pr.order_sheet = %s AND prct.so_item = %s AND prct.combo_item = %s AND pr.docstatus = 1
-                            GROUP BY prct.so_item, prct.combo_item
-                        """
-                        params = (self.order_sheet, row.so_item, row.combo_item)
-                    else:
-                        query = """
-                            SELECT SUM(prct.packaging_qty) AS total_packaging
-                            FROM `tabPacking Report CT` AS prct 
-                            LEFT JOIN `tabPacking Report` AS pr 
-                            ON prct.parent = pr.name
-                            WHERE pr.order_sheet = %s AND prct.so_item = %s AND (prct.combo_item IS NULL OR prct.combo_item = '') AND pr.docstatus = 1
-                            GROUP BY prct.so_item
-                        """
-                        params = (self.order_sheet, row.so_item)
-
-                result = frappe.db.sql(query, params, as_dict=True)
-                packaging_totals[(row.so_item, row.combo_item or '')] = result[0].total_packaging if result else 0
-
-            for row in self.packing_report_ct:
-                row.finished_packaging_qty = packaging_totals.get((row.so_item, row.combo_item or ''), 0)
+                row.finished_packaging_qty = (
+                    stage_totals.qty("Packing", row.so_item, row.combo_item, exclude_self=True)
+                    if row.so_item
+                    else 0
+                )
 
         except Exception as e:
             frappe.log_error(frappe.get_traceback(), "Finished Packaging Quantity Calculation Failed")
@@ -917,16 +831,18 @@ class PackingReport(Document):
     def on_submit(self):
         """Create Stock Entry for Manufacture when Packing Report is submitted"""
         try:
-            print(f"\n{'='*60}")
-            print(f"[on_submit] Creating Stock Entry for Packing Report: '{self.name}'")
-            print(f"{'='*60}")
+            trace("[on_submit] Creating Stock Entry for Packing Report: '{}'", self.name)
             
             # Fixed warehouses
             source_warehouse = "Work In Progress - SAH"
             target_warehouse = "Finished Goods - SAH"
             
-            print(f"[on_submit] Source Warehouse: {source_warehouse}")
-            print(f"[on_submit] Target Warehouse: {target_warehouse}")
+            trace(
+                "[on_submit] Source Warehouse: {}\n"
+                "[on_submit] Target Warehouse: {}",
+                source_warehouse,
+                target_warehouse,
+            )
             
             # Get company from Order Sheet
             company = None
@@ -941,7 +857,7 @@ class PackingReport(Document):
             if not company:
                 frappe.throw(_("Company not found. Please ensure Order Sheet has a company set."))
             
-            print(f"[on_submit] Company: {company}")
+            trace("[on_submit] Company: {}", company)
             
             # Process each packing report row
             stock_entries_created = []
@@ -953,7 +869,11 @@ class PackingReport(Document):
                 finished_item = row.so_item
                 packaging_qty = row.packaging_qty
                 
-                print(f"\n[on_submit] Processing row: Finished Item = {finished_item}, Packaging Qty = {packaging_qty}")
+                trace(
+                    "[on_submit] Processing row: Finished Item = {}, Packaging Qty = {}",
+                    finished_item,
+                    packaging_qty,
+                )
                 
                 # Get BOM for finished item
                 bom_no = frappe.db.get_value("BOM", {"item": finished_item, "is_active": 1, "is_default": 1}, "name")
@@ -970,7 +890,7 @@ class PackingReport(Document):
                 if bom_item != finished_item:
                     frappe.throw(_("BOM {0} is for item {1}, but finished item is {2}. Please use the correct BOM.").format(bom_no, bom_item, finished_item))
                 
-                print(f"[on_submit] BOM: {bom_no}, BOM Item: {bom_item}, Finished Item: {finished_item}")
+                trace("[on_submit] BOM: {}, BOM Item: {}, Finished Item: {}", bom_no, bom_item, finished_item)
                 
                 # Create Stock Entry
                 stock_entry = frappe.new_doc("Stock Entry")
@@ -998,16 +918,17 @@ class PackingReport(Document):
                 # Set custom_cost_center from Packing Report
                 if hasattr(stock_entry, 'custom_cost_center') and self.cost_center:
                     stock_entry.custom_cost_center = self.cost_center
-                    print(f"[on_submit] Set custom_cost_center: {self.cost_center}")
+                    trace("[on_submit] Set custom_cost_center: {}", self.cost_center)
                 
                 # Call get_items to populate items from BOM (will use multi-level BOM if enabled)
-                print(f"[on_submit] Calling get_items() to populate items from BOM (with multi-level expansion)...")
+                trace("[on_submit] Calling get_items() to populate items from BOM (with multi-level expansion)...")
                 stock_entry.get_items()
                 
                 if not stock_entry.items:
                     frappe.throw(_("No items found from BOM {0}. Please check the BOM.").format(bom_no))
                 
-                print(f"[on_submit] Items populated: {len(stock_entry.items)} items")
+                if trace.enabled():
+                    trace("[on_submit] Items populated: {} items", len(stock_entry.items))
                 
                 # Ensure warehouses are set for all items
                 # For Manufacture type, consumed items should have s_warehouse, finished items should have t_warehouse
@@ -1025,7 +946,7 @@ class PackingReport(Document):
                     # Set custom_packing_report field
                     if hasattr(item, 'custom_packing_report'):
                         item.custom_packing_report = self.name
-                        print(f"[on_submit] Set custom_packing_report for {item.item_code}: {self.name}")
+                        trace("[on_submit] Set custom_packing_report for {}: {}", item.item_code, self.name)
                 
                 # Ensure finished good is added (get_items should add it, but let's verify and add if missing)
                 finished_item_found = False
@@ -1047,76 +968,116 @@ class PackingReport(Document):
                     # Set custom_packing_report for manually added finished good
                     if hasattr(finished_item_row, 'custom_packing_report'):
                         finished_item_row.custom_packing_report = self.name
-                    print(f"[on_submit] Added finished good manually: {finished_item} = {packaging_qty} {item_uom}")
+                    trace(
+                        "[on_submit] Added finished good manually: {} = {} {}",
+                        finished_item,
+                        packaging_qty,
+                        item_uom,
+                    )
                     warehouses_modified = True
                 
                 # Always recalculate rates after modifying items (warehouses or adding items)
                 # This ensures valuation rates are fetched from stock ledger for all items with proper warehouse assignments
                 # Note: validate() will call calculate_rate_and_amount() with raise_error_if_no_rate=True by default,
                 # so we need to ensure all items have proper rates calculated before insert
-                print(f"\n{'='*80}")
-                print(f"[on_submit] Recalculating rates after modifying items...")
-                print(f"[on_submit] Items before rate calculation: {len(stock_entry.items)}")
-                for idx, item in enumerate(stock_entry.items):
-                    print(f"  Item {idx+1}: {item.item_code}")
-                    print(f"    - s_warehouse: {item.s_warehouse}")
-                    print(f"    - t_warehouse: {item.t_warehouse}")
-                    print(f"    - is_finished_item: {item.is_finished_item}")
-                    print(f"    - qty: {item.qty}")
-                    print(f"    - transfer_qty: {getattr(item, 'transfer_qty', 'NOT SET')}")
+                if trace.enabled():
+                    trace(
+                        "[on_submit] Recalculating rates after modifying items...\n"
+                        "[on_submit] Items before rate calculation: {}",
+                        len(stock_entry.items),
+                    )
+                if trace.enabled():
+                    for idx, item in enumerate(stock_entry.items):
+                        trace(
+                            "  Item {}: {}\n"
+                            "    - s_warehouse: {}\n"
+                            "    - t_warehouse: {}\n"
+                            "    - is_finished_item: {}\n"
+                            "    - qty: {}\n"
+                            "    - transfer_qty: {}",
+                            idx + 1,
+                            item.item_code,
+                            item.s_warehouse,
+                            item.t_warehouse,
+                            item.is_finished_item,
+                            item.qty,
+                            getattr(item, 'transfer_qty', 'NOT SET'),
+                        )
                 
                 # Ensure transfer_qty is set for all items before calculating rates
-                print(f"[on_submit] Setting transfer_qty for all items...")
+                trace("[on_submit] Setting transfer_qty for all items...")
                 stock_entry.set_transfer_qty()
-                print(f"[on_submit] transfer_qty set. Items after set_transfer_qty:")
-                for idx, item in enumerate(stock_entry.items):
-                    print(f"  Item {idx+1}: {item.item_code} | transfer_qty: {item.transfer_qty}")
+                trace("[on_submit] transfer_qty set. Items after set_transfer_qty:")
+                if trace.enabled():
+                    for idx, item in enumerate(stock_entry.items):
+                        trace("  Item {}: {} | transfer_qty: {}", idx + 1, item.item_code, item.transfer_qty)
                 
                 # Recalculate rates - this will fetch valuation rates from stock ledger
                 # Use raise_error_if_no_rate=False to allow items without stock to proceed
                 # (they will need allow_zero_valuation_rate set if they truly have no stock)
-                print(f"[on_submit] Calling calculate_rate_and_amount(raise_error_if_no_rate=False)...")
+                trace("[on_submit] Calling calculate_rate_and_amount(raise_error_if_no_rate=False)...")
                 stock_entry.calculate_rate_and_amount(raise_error_if_no_rate=False)
-                print(f"[on_submit] calculate_rate_and_amount() completed")
-                print(f"{'='*80}\n")
-                
-                print(f"[on_submit] Valuation rates after calculation:")
+                trace(
+                    "[on_submit] calculate_rate_and_amount() completed\n"
+                    "[on_submit] Valuation rates after calculation:",
+                )
                 from frappe.utils import flt
                 for item in stock_entry.items:
                     if item.s_warehouse:
-                        print(f"\n{'='*80}")
-                        print(f"[on_submit] Processing consumed item: {item.item_code}")
-                        print(f"  - s_warehouse: {item.s_warehouse}")
-                        print(f"  - transfer_qty: {item.transfer_qty}")
-                        print(f"  - basic_rate (before check): {item.basic_rate}")
-                        print(f"  - valuation_rate (before check): {item.valuation_rate}")
-                        print(f"  - allow_zero_valuation_rate (before check): {item.allow_zero_valuation_rate}")
+                        trace(
+                            "[on_submit] Processing consumed item: {}\n"
+                            "  - s_warehouse: {}\n"
+                            "  - transfer_qty: {}\n"
+                            "  - basic_rate (before check): {}\n"
+                            "  - valuation_rate (before check): {}\n"
+                            "  - allow_zero_valuation_rate (before check): {}",
+                            item.item_code,
+                            item.s_warehouse,
+                            item.transfer_qty,
+                            item.basic_rate,
+                            item.valuation_rate,
+                            item.allow_zero_valuation_rate,
+                        )
                         
                         # If item has no rate and no allow_zero_valuation_rate, try to get rate from stock ledger
                         # Try multiple methods to get the valuation rate
                         if not flt(item.basic_rate) and not item.allow_zero_valuation_rate:
-                            print(f"[on_submit] Item {item.item_code} has no rate and allow_zero_valuation_rate is False, attempting to fetch from stock ledger...")
+                            trace(
+                                "[on_submit] Item {} has no rate and allow_zero_valuation_rate is False, attempting to fetch from stock ledger...",
+                                item.item_code,
+                            )
                             
                             rate = None
                             
                             # Method 1: Try get_incoming_rate (for outgoing items)
                             try:
                                 from erpnext.stock.utils import get_incoming_rate
-                                print(f"[on_submit] Method 1: Trying get_incoming_rate()...")
+                                trace("[on_submit] Method 1: Trying get_incoming_rate()...")
                                 args = stock_entry.get_args_for_incoming_rate(item)
-                                print(f"[on_submit] Args: item_code={args.get('item_code')}, warehouse={args.get('warehouse')}, qty={args.get('qty')}")
+                                if trace.enabled():
+                                    trace(
+                                        "[on_submit] Args: item_code={}, warehouse={}, qty={}",
+                                        args.get('item_code'),
+                                        args.get('warehouse'),
+                                        args.get('qty'),
+                                    )
                                 rate = get_incoming_rate(args, raise_error_if_no_rate=False)
-                                print(f"[on_submit] get_incoming_rate() returned: {rate}")
+                                trace("[on_submit] get_incoming_rate() returned: {}", rate)
                             except Exception as e:
-                                print(f"[on_submit] get_incoming_rate() failed: {str(e)}")
+                                trace("[on_submit] get_incoming_rate() failed: {}", str(e))
                             
                             # Method 2: If get_incoming_rate returned 0 or None, try get_valuation_rate directly from stock ledger
                             if not rate or flt(rate) == 0:
                                 try:
                                     from erpnext.stock.stock_ledger import get_valuation_rate
                                     import erpnext
-                                    print(f"[on_submit] Method 2: Trying get_valuation_rate() directly from stock ledger...")
-                                    print(f"[on_submit] Args: item_code={item.item_code}, warehouse={item.s_warehouse}, company={stock_entry.company}")
+                                    trace(
+                                        "[on_submit] Method 2: Trying get_valuation_rate() directly from stock ledger...\n"
+                                        "[on_submit] Args: item_code={}, warehouse={}, company={}",
+                                        item.item_code,
+                                        item.s_warehouse,
+                                        stock_entry.company,
+                                    )
                                     rate = get_valuation_rate(
                                         item.item_code,
                                         item.s_warehouse,
@@ -1129,14 +1090,16 @@ class PackingReport(Document):
                                         batch_no=item.batch_no,
                                         serial_and_batch_bundle=item.serial_and_batch_bundle,
                                     )
-                                    print(f"[on_submit] get_valuation_rate() returned: {rate}")
+                                    trace("[on_submit] get_valuation_rate() returned: {}", rate)
                                 except Exception as e:
-                                    print(f"[on_submit] get_valuation_rate() failed: {str(e)}")
+                                    trace("[on_submit] get_valuation_rate() failed: {}", str(e))
                             
                             # Method 3: If still no rate, check bin table (current stock balance)
                             if not rate or flt(rate) == 0:
                                 try:
-                                    print(f"[on_submit] Method 3: Checking bin table for current stock valuation rate...")
+                                    trace(
+                                        "[on_submit] Method 3: Checking bin table for current stock valuation rate...",
+                                    )
                                     bin_data = frappe.db.sql("""
                                         SELECT valuation_rate, actual_qty, stock_value
                                         FROM `tabBin`
@@ -1150,31 +1113,42 @@ class PackingReport(Document):
                                         stock_value = flt(bin_info.get('stock_value', 0))
                                         bin_valuation_rate = flt(bin_info.get('valuation_rate', 0))
                                         
-                                        print(f"[on_submit] Bin data: actual_qty={actual_qty}, stock_value={stock_value}, valuation_rate={bin_valuation_rate}")
+                                        trace(
+                                            "[on_submit] Bin data: actual_qty={}, stock_value={}, valuation_rate={}",
+                                            actual_qty,
+                                            stock_value,
+                                            bin_valuation_rate,
+                                        )
                                         
                                         if actual_qty > 0:
                                             # Use valuation_rate from bin if available, otherwise calculate from stock_value/actual_qty
                                             if bin_valuation_rate and bin_valuation_rate > 0:
                                                 rate = bin_valuation_rate
-                                                print(f"[on_submit] Using valuation_rate from bin: {rate}")
+                                                trace("[on_submit] Using valuation_rate from bin: {}", rate)
                                             elif stock_value > 0:
                                                 rate = stock_value / actual_qty
-                                                print(f"[on_submit] Calculated rate from stock_value/actual_qty: {rate}")
+                                                trace(
+                                                    "[on_submit] Calculated rate from stock_value/actual_qty: {}",
+                                                    rate,
+                                                )
                                             else:
-                                                print(f"[on_submit] Bin has stock but no valuation rate or stock value")
+                                                trace("[on_submit] Bin has stock but no valuation rate or stock value")
                                         else:
-                                            print(f"[on_submit] Bin shows no stock (actual_qty={actual_qty})")
+                                            trace("[on_submit] Bin shows no stock (actual_qty={})", actual_qty)
                                     else:
-                                        print(f"[on_submit] No bin record found for item-warehouse combination")
+                                        trace("[on_submit] No bin record found for item-warehouse combination")
                                 except Exception as e:
-                                    print(f"[on_submit] Bin query failed: {str(e)}")
+                                    trace("[on_submit] Bin query failed: {}", str(e))
                                     import traceback
-                                    print(f"[on_submit] Traceback: {traceback.format_exc()}")
+                                    if trace.enabled():
+                                        trace("[on_submit] Traceback: {}", traceback.format_exc())
                             
                             # Method 4: If still no rate, query latest stock ledger entry (any qty, just get the rate)
                             if not rate or flt(rate) == 0:
                                 try:
-                                    print(f"[on_submit] Method 4: Querying latest stock ledger entry for valuation rate...")
+                                    trace(
+                                        "[on_submit] Method 4: Querying latest stock ledger entry for valuation rate...",
+                                    )
                                     sle_data = frappe.db.sql("""
                                         SELECT valuation_rate, actual_qty, stock_value, stock_value_difference
                                         FROM `tabStock Ledger Entry`
@@ -1188,9 +1162,9 @@ class PackingReport(Document):
                                     
                                     if sle_data and sle_data[0].get('valuation_rate'):
                                         rate = flt(sle_data[0].valuation_rate)
-                                        print(f"[on_submit] Latest stock ledger entry returned valuation_rate: {rate}")
+                                        trace("[on_submit] Latest stock ledger entry returned valuation_rate: {}", rate)
                                     else:
-                                        print(f"[on_submit] No stock ledger entry found with valuation_rate > 0")
+                                        trace("[on_submit] No stock ledger entry found with valuation_rate > 0")
                                         # Try without valuation_rate filter - get any entry and calculate
                                         sle_data2 = frappe.db.sql("""
                                             SELECT stock_value, actual_qty, stock_value_difference
@@ -1201,16 +1175,26 @@ class PackingReport(Document):
                                             ORDER BY posting_date DESC, posting_time DESC, creation DESC
                                             LIMIT 10
                                         """, (item.item_code, item.s_warehouse), as_dict=True)
-                                        print(f"[on_submit] Found {len(sle_data2)} stock ledger entries (without valuation_rate filter)")
-                                        for sle in sle_data2:
-                                            print(f"  - actual_qty: {sle.get('actual_qty')}, stock_value: {sle.get('stock_value')}, stock_value_difference: {sle.get('stock_value_difference')}")
+                                        if trace.enabled():
+                                            trace(
+                                                "[on_submit] Found {} stock ledger entries (without valuation_rate filter)",
+                                                len(sle_data2),
+                                            )
+                                        if trace.enabled():
+                                            for sle in sle_data2:
+                                                trace(
+                                                    "  - actual_qty: {}, stock_value: {}, stock_value_difference: {}",
+                                                    sle.get('actual_qty'),
+                                                    sle.get('stock_value'),
+                                                    sle.get('stock_value_difference'),
+                                                )
                                 except Exception as e:
-                                    print(f"[on_submit] Stock ledger query failed: {str(e)}")
+                                    trace("[on_submit] Stock ledger query failed: {}", str(e))
                             
                             # Method 5: Check if item has stock in ANY warehouse and get weighted average
                             if not rate or flt(rate) == 0:
                                 try:
-                                    print(f"[on_submit] Method 5: Checking all warehouses for this item...")
+                                    trace("[on_submit] Method 5: Checking all warehouses for this item...")
                                     # Get weighted average valuation rate across all warehouses
                                     all_warehouses_data = frappe.db.sql("""
                                         SELECT 
@@ -1227,34 +1211,54 @@ class PackingReport(Document):
                                         total_qty = flt(data.get('total_actual_qty', 0))
                                         total_value = flt(data.get('total_stock_value', 0))
                                         
-                                        print(f"[on_submit] All warehouses: total_qty={total_qty}, total_value={total_value}")
+                                        trace(
+                                            "[on_submit] All warehouses: total_qty={}, total_value={}",
+                                            total_qty,
+                                            total_value,
+                                        )
                                         
                                         if total_qty > 0 and total_value > 0:
                                             rate = total_value / total_qty
-                                            print(f"[on_submit] Calculated weighted average rate from all warehouses: {rate}")
+                                            trace(
+                                                "[on_submit] Calculated weighted average rate from all warehouses: {}",
+                                                rate,
+                                            )
                                         else:
-                                            print(f"[on_submit] No stock found in any warehouse")
+                                            trace("[on_submit] No stock found in any warehouse")
                                 except Exception as e:
-                                    print(f"[on_submit] All warehouses query failed: {str(e)}")
+                                    trace("[on_submit] All warehouses query failed: {}", str(e))
                             
                             # Set the rate if found - store it to set after final recalculation
                             if rate and flt(rate) > 0:
                                 # Item has valuation rate - store it to set after final recalculation
                                 # (because calculate_rate_and_amount will reset it)
-                                print(f"[on_submit] ✓ Item {item.item_code} has valuation rate {rate} from stock ledger")
+                                trace(
+                                    "[on_submit] ✓ Item {} has valuation rate {} from stock ledger",
+                                    item.item_code,
+                                    rate,
+                                )
                                 # Store the rate in a custom attribute to set after recalculation
                                 item._manual_valuation_rate = flt(rate)
                                 # Also set it now so it's available, but it will be overwritten by calculate_rate_and_amount
                                 item.allow_zero_valuation_rate = 0
                                 item.basic_rate = flt(rate)
                                 item.basic_amount = flt(flt(item.transfer_qty) * flt(item.basic_rate), item.precision("basic_amount"))
-                                print(f"[on_submit] Stored manual rate {rate} to set after final recalculation")
-                                print(f"[on_submit] Set now (will be restored after recalculation): basic_rate={item.basic_rate}, basic_amount={item.basic_amount}")
+                                trace(
+                                    "[on_submit] Stored manual rate {} to set after final recalculation\n"
+                                    "[on_submit] Set now (will be restored after recalculation): basic_rate={}, basic_amount={}",
+                                    rate,
+                                    item.basic_rate,
+                                    item.basic_amount,
+                                )
                             else:
                                 # No rate available - allow zero valuation rate
-                                print(f"[on_submit] ✗ WARNING: Item {item.item_code} has no valuation rate in {item.s_warehouse}")
-                                print(f"  - All methods returned 0 or None")
-                                print(f"  - Setting allow_zero_valuation_rate=1")
+                                trace(
+                                    "[on_submit] ✗ WARNING: Item {} has no valuation rate in {}\n"
+                                    "  - All methods returned 0 or None\n"
+                                    "  - Setting allow_zero_valuation_rate=1",
+                                    item.item_code,
+                                    item.s_warehouse,
+                                )
                                 item.allow_zero_valuation_rate = 1
                                 item.basic_rate = 0.0
                                 item.basic_amount = 0.0
@@ -1262,69 +1266,115 @@ class PackingReport(Document):
                                 if hasattr(item, 'db_set'):
                                     # This is a child table row, ensure flag is set
                                     item.db_set('allow_zero_valuation_rate', 1, update_modified=False)
-                                print(f"[on_submit] Verified allow_zero_valuation_rate={item.allow_zero_valuation_rate}")
+                                trace(
+                                    "[on_submit] Verified allow_zero_valuation_rate={}",
+                                    item.allow_zero_valuation_rate,
+                                )
                         else:
                             if flt(item.basic_rate):
-                                print(f"[on_submit] Item {item.item_code} already has rate: {item.basic_rate}, skipping")
+                                trace(
+                                    "[on_submit] Item {} already has rate: {}, skipping",
+                                    item.item_code,
+                                    item.basic_rate,
+                                )
                             elif item.allow_zero_valuation_rate:
-                                print(f"[on_submit] Item {item.item_code} already has allow_zero_valuation_rate=True, skipping")
-                        print(f"{'='*80}\n")
+                                trace(
+                                    "[on_submit] Item {} already has allow_zero_valuation_rate=True, skipping",
+                                    item.item_code,
+                                )
                     elif item.t_warehouse and item.is_finished_item:
-                        print(f"  - Finished: {item.item_code} | Rate: {item.basic_rate} | Valuation Rate: {item.valuation_rate}")
+                        trace(
+                            "  - Finished: {} | Rate: {} | Valuation Rate: {}",
+                            item.item_code,
+                            item.basic_rate,
+                            item.valuation_rate,
+                        )
                 
                 # Final recalculation after any allow_zero_valuation_rate changes
                 # But skip if we have manually set rates (they will be restored after)
-                print(f"\n{'='*80}")
-                print(f"[on_submit] Final recalculation after rate fixes...")
+                trace("[on_submit] Final recalculation after rate fixes...")
                 has_manual_rates = any(hasattr(item, '_manual_valuation_rate') and item._manual_valuation_rate for item in stock_entry.items if item.s_warehouse)
                 if has_manual_rates:
-                    print(f"[on_submit] Skipping calculate_rate_and_amount() - will restore manual rates after")
+                    trace("[on_submit] Skipping calculate_rate_and_amount() - will restore manual rates after")
                 else:
                     stock_entry.calculate_rate_and_amount(raise_error_if_no_rate=False)
                 
                 # After recalculation (or if skipped), restore manually set rates that were found
-                print(f"[on_submit] Setting manually found rates...")
+                trace("[on_submit] Setting manually found rates...")
                 restored_count = 0
                 for item in stock_entry.items:
                     if hasattr(item, '_manual_valuation_rate') and item._manual_valuation_rate:
                         manual_rate = item._manual_valuation_rate
                         old_rate = item.basic_rate
-                        print(f"[on_submit] Setting manual rate {manual_rate} for {item.item_code} (current: {old_rate})")
+                        trace(
+                            "[on_submit] Setting manual rate {} for {} (current: {})",
+                            manual_rate,
+                            item.item_code,
+                            old_rate,
+                        )
                         item.allow_zero_valuation_rate = 0
                         # Set set_basic_rate_manually flag BEFORE setting the rate
                         if hasattr(item, 'set_basic_rate_manually'):
                             item.set_basic_rate_manually = 1
-                            print(f"[on_submit] Set set_basic_rate_manually=1 to prevent rate reset")
+                            trace("[on_submit] Set set_basic_rate_manually=1 to prevent rate reset")
                         item.basic_rate = flt(manual_rate)
                         item.basic_amount = flt(flt(item.transfer_qty) * flt(item.basic_rate), item.precision("basic_amount"))
                         # Mark that this rate was manually set
                         item._rate_manually_set = True
-                        print(f"[on_submit] Set: basic_rate={item.basic_rate}, basic_amount={item.basic_amount}, allow_zero_valuation_rate={item.allow_zero_valuation_rate}, set_basic_rate_manually={getattr(item, 'set_basic_rate_manually', 'N/A')}")
+                        if trace.enabled():
+                            trace(
+                                "[on_submit] Set: basic_rate={}, basic_amount={}, allow_zero_valuation_rate={}, set_basic_rate_manually={}",
+                                item.basic_rate,
+                                item.basic_amount,
+                                item.allow_zero_valuation_rate,
+                                getattr(item, 'set_basic_rate_manually', 'N/A'),
+                            )
                         # Keep _manual_valuation_rate until after final verification before insert
                         restored_count += 1
-                print(f"[on_submit] Set {restored_count} manually found rates")
-                
-                print(f"[on_submit] Final state of all items:")
-                for idx, item in enumerate(stock_entry.items):
-                    if item.s_warehouse:
-                        print(f"  Consumed Item {idx+1}: {item.item_code}")
-                        print(f"    - s_warehouse: {item.s_warehouse}")
-                        print(f"    - transfer_qty: {item.transfer_qty}")
-                        print(f"    - basic_rate: {item.basic_rate}")
-                        print(f"    - valuation_rate: {item.valuation_rate}")
-                        print(f"    - allow_zero_valuation_rate: {item.allow_zero_valuation_rate}")
-                        print(f"    - basic_amount: {item.basic_amount}")
-                    elif item.t_warehouse and item.is_finished_item:
-                        print(f"  Finished Item {idx+1}: {item.item_code}")
-                        print(f"    - t_warehouse: {item.t_warehouse}")
-                        print(f"    - transfer_qty: {item.transfer_qty}")
-                        print(f"    - basic_rate: {item.basic_rate}")
-                        print(f"    - valuation_rate: {item.valuation_rate}")
-                print(f"{'='*80}\n")
-                
+                trace(
+                    "[on_submit] Set {} manually found rates\n"
+                    "[on_submit] Final state of all items:",
+                    restored_count,
+                )
+                if trace.enabled():
+                    for idx, item in enumerate(stock_entry.items):
+                        if item.s_warehouse:
+                            trace(
+                                "  Consumed Item {}: {}\n"
+                                "    - s_warehouse: {}\n"
+                                "    - transfer_qty: {}\n"
+                                "    - basic_rate: {}\n"
+                                "    - valuation_rate: {}\n"
+                                "    - allow_zero_valuation_rate: {}\n"
+                                "    - basic_amount: {}",
+                                idx + 1,
+                                item.item_code,
+                                item.s_warehouse,
+                                item.transfer_qty,
+                                item.basic_rate,
+                                item.valuation_rate,
+                                item.allow_zero_valuation_rate,
+                                item.basic_amount,
+                            )
+                        elif item.t_warehouse and item.is_finished_item:
+                            trace(
+                                "  Finished Item {}: {}\n"
+                                "    - t_warehouse: {}\n"
+                                "    - transfer_qty: {}\n"
+                                "    - basic_rate: {}\n"
+                                "    - valuation_rate: {}",
+                                idx + 1,
+                                item.item_code,
+                                item.t_warehouse,
+                                item.transfer_qty,
+                                item.basic_rate,
+                                item.valuation_rate,
+                            )
                 # Ensure allow_zero_valuation_rate is set correctly before insert
                 # Only set it for items that truly have no rate (not items with manually restored rates)
-                print(f"[on_submit] Final verification: Ensuring allow_zero_valuation_rate is set for items with zero rate...")
+                trace(
+                    "[on_submit] Final verification: Ensuring allow_zero_valuation_rate is set for items with zero rate...",
+                )
                 for item in stock_entry.items:
                     if item.s_warehouse:
                         current_rate = flt(item.basic_rate)
@@ -1336,31 +1386,53 @@ class PackingReport(Document):
                             manual_rate = item._manual_valuation_rate
                             # Always restore the manual rate (it might have been reset)
                             if abs(flt(current_rate) - flt(manual_rate)) > 0.01:  # Use tolerance for float comparison
-                                print(f"[on_submit] Restoring manual rate {manual_rate} for {item.item_code} (current_rate={current_rate})")
+                                trace(
+                                    "[on_submit] Restoring manual rate {} for {} (current_rate={})",
+                                    manual_rate,
+                                    item.item_code,
+                                    current_rate,
+                                )
                                 item.allow_zero_valuation_rate = 0
                                 item.basic_rate = flt(manual_rate)
                                 item.basic_amount = flt(flt(item.transfer_qty) * flt(item.basic_rate), item.precision("basic_amount"))
-                                print(f"[on_submit] ✓ Restored: basic_rate={item.basic_rate}, basic_amount={item.basic_amount}")
+                                trace(
+                                    "[on_submit] ✓ Restored: basic_rate={}, basic_amount={}",
+                                    item.basic_rate,
+                                    item.basic_amount,
+                                )
                             else:
-                                print(f"[on_submit] {item.item_code}: Manual rate {manual_rate} already set correctly (current={current_rate})")
+                                trace(
+                                    "[on_submit] {}: Manual rate {} already set correctly (current={})",
+                                    item.item_code,
+                                    manual_rate,
+                                    current_rate,
+                                )
                             # DON'T delete _manual_valuation_rate yet - keep it for final verification
                         elif (not current_rate or current_rate == 0):
                             # Item truly has no rate - set allow_zero_valuation_rate
                             if not item.allow_zero_valuation_rate:
-                                print(f"[on_submit] WARNING: {item.item_code} has rate 0 but allow_zero_valuation_rate is not set! Setting it now...")
+                                trace(
+                                    "[on_submit] WARNING: {} has rate 0 but allow_zero_valuation_rate is not set! Setting it now...",
+                                    item.item_code,
+                                )
                                 item.allow_zero_valuation_rate = 1
                                 item.basic_rate = 0.0
                                 item.basic_amount = 0.0
                             # Ensure it's integer 1, not boolean True
                             if item.allow_zero_valuation_rate is True:
                                 item.allow_zero_valuation_rate = 1
-                            print(f"[on_submit] {item.item_code}: allow_zero_valuation_rate={item.allow_zero_valuation_rate} (type: {type(item.allow_zero_valuation_rate).__name__})")
+                            trace(
+                                "[on_submit] {}: allow_zero_valuation_rate={} (type: {})",
+                                item.item_code,
+                                item.allow_zero_valuation_rate,
+                                type(item.allow_zero_valuation_rate).__name__,
+                            )
                         elif current_rate > 0:
-                            print(f"[on_submit] {item.item_code}: Has rate {current_rate}, no action needed")
+                            trace("[on_submit] {}: Has rate {}, no action needed", item.item_code, current_rate)
                 
                 # Final verification: Double-check that manually found rates are still set
                 # This MUST happen right before insert to ensure rates aren't reset by validation
-                print(f"[on_submit] Final verification before insert: Checking all rates...")
+                trace("[on_submit] Final verification before insert: Checking all rates...")
                 for item in stock_entry.items:
                     if item.s_warehouse:
                         # If item has _manual_valuation_rate attribute, it means rate was found but might have been reset
@@ -1369,9 +1441,18 @@ class PackingReport(Document):
                             current_rate = flt(item.basic_rate)
                             # Always restore the manual rate right before insert (it might have been reset by validation)
                             if abs(current_rate - flt(manual_rate)) > 0.01:  # Use tolerance for float comparison
-                                print(f"[on_submit] CRITICAL: {item.item_code} rate was reset! Restoring {manual_rate} (current: {current_rate})")
+                                trace(
+                                    "[on_submit] CRITICAL: {} rate was reset! Restoring {} (current: {})",
+                                    item.item_code,
+                                    manual_rate,
+                                    current_rate,
+                                )
                             else:
-                                print(f"[on_submit] {item.item_code}: Rate {manual_rate} is set, but ensuring it persists...")
+                                trace(
+                                    "[on_submit] {}: Rate {} is set, but ensuring it persists...",
+                                    item.item_code,
+                                    manual_rate,
+                                )
                             
                             # Always set the rate right before insert to ensure it persists
                             item.allow_zero_valuation_rate = 0
@@ -1380,23 +1461,45 @@ class PackingReport(Document):
                             # Set set_basic_rate_manually to prevent future resets (though it might not work for outgoing items)
                             if hasattr(item, 'set_basic_rate_manually'):
                                 item.set_basic_rate_manually = 1
-                            print(f"[on_submit] ✓ FINAL SET: {item.item_code} basic_rate={item.basic_rate}, basic_amount={item.basic_amount}, set_basic_rate_manually={getattr(item, 'set_basic_rate_manually', 'N/A')}")
+                            if trace.enabled():
+                                trace(
+                                    "[on_submit] ✓ FINAL SET: {} basic_rate={}, basic_amount={}, set_basic_rate_manually={}",
+                                    item.item_code,
+                                    item.basic_rate,
+                                    item.basic_amount,
+                                    getattr(item, 'set_basic_rate_manually', 'N/A'),
+                                )
                             delattr(item, '_manual_valuation_rate')
-                        print(f"[on_submit] Pre-insert check - {item.item_code}: basic_rate={item.basic_rate}, allow_zero_valuation_rate={item.allow_zero_valuation_rate}")
+                        trace(
+                            "[on_submit] Pre-insert check - {}: basic_rate={}, allow_zero_valuation_rate={}",
+                            item.item_code,
+                            item.basic_rate,
+                            item.allow_zero_valuation_rate,
+                        )
                 
                 # Ensure set_basic_rate_manually is set for items with manually found rates BEFORE insert
                 # This will prevent validate() from trying to recalculate rates
-                print(f"[on_submit] Setting set_basic_rate_manually for items with manually found rates...")
+                trace("[on_submit] Setting set_basic_rate_manually for items with manually found rates...")
                 for item in stock_entry.items:
                     if item.s_warehouse and hasattr(item, '_manual_valuation_rate') and item._manual_valuation_rate:
                         if hasattr(item, 'set_basic_rate_manually'):
                             item.set_basic_rate_manually = 1
-                            print(f"[on_submit] Set set_basic_rate_manually=1 for {item.item_code} (rate={item._manual_valuation_rate})")
+                            trace(
+                                "[on_submit] Set set_basic_rate_manually=1 for {} (rate={})",
+                                item.item_code,
+                                item._manual_valuation_rate,
+                            )
                         # Ensure rate is set
                         item.allow_zero_valuation_rate = 0
                         item.basic_rate = flt(item._manual_valuation_rate)
                         item.basic_amount = flt(flt(item.transfer_qty) * flt(item.basic_rate), item.precision("basic_amount"))
-                        print(f"[on_submit] Pre-insert: {item.item_code} basic_rate={item.basic_rate}, set_basic_rate_manually={getattr(item, 'set_basic_rate_manually', 'N/A')}")
+                        if trace.enabled():
+                            trace(
+                                "[on_submit] Pre-insert: {} basic_rate={}, set_basic_rate_manually={}",
+                                item.item_code,
+                                item.basic_rate,
+                                getattr(item, 'set_basic_rate_manually', 'N/A'),
+                            )
                 
                 # Store manually found rates in Stock Entry document to restore after validation (backup)
                 stock_entry._manual_rates_to_restore = {}
@@ -1408,17 +1511,26 @@ class PackingReport(Document):
                             'item_code': item.item_code,
                             'idx': idx
                         }
-                        print(f"[on_submit] Stored manual rate {item._manual_valuation_rate} for {item.item_code} (key={key})")
+                        trace(
+                            "[on_submit] Stored manual rate {} for {} (key={})",
+                            item._manual_valuation_rate,
+                            item.item_code,
+                            key,
+                        )
                 
                 # Save and submit Stock Entry
-                print(f"[on_submit] Inserting Stock Entry (patch should prevent rate reset during validation)...")
+                trace("[on_submit] Inserting Stock Entry (patch should prevent rate reset during validation)...")
                 try:
                     stock_entry.insert(ignore_permissions=True)
-                    print(f"[on_submit] Stock Entry inserted: {stock_entry.name}")
+                    trace("[on_submit] Stock Entry inserted: {}", stock_entry.name)
                     
                     # After insert, restore manually found rates that were reset by validation
                     if hasattr(stock_entry, '_manual_rates_to_restore') and stock_entry._manual_rates_to_restore:
-                        print(f"[on_submit] Restoring {len(stock_entry._manual_rates_to_restore)} manually found rates after insert...")
+                        if trace.enabled():
+                            trace(
+                                "[on_submit] Restoring {} manually found rates after insert...",
+                                len(stock_entry._manual_rates_to_restore),
+                            )
                         # Reload the document to get fresh items
                         stock_entry.reload()
                         restored_count = 0
@@ -1427,36 +1539,46 @@ class PackingReport(Document):
                             if key in stock_entry._manual_rates_to_restore:
                                 manual_data = stock_entry._manual_rates_to_restore[key]
                                 manual_rate = manual_data['rate']
-                                print(f"[on_submit] Restoring rate {manual_rate} for {item.item_code} (idx={idx}, key={key})")
+                                trace(
+                                    "[on_submit] Restoring rate {} for {} (idx={}, key={})",
+                                    manual_rate,
+                                    item.item_code,
+                                    idx,
+                                    key,
+                                )
                                 item.allow_zero_valuation_rate = 0
                                 item.basic_rate = flt(manual_rate)
                                 item.basic_amount = flt(flt(item.transfer_qty) * flt(item.basic_rate), item.precision("basic_amount"))
-                                print(f"[on_submit] ✓ Restored: basic_rate={item.basic_rate}, basic_amount={item.basic_amount}")
+                                trace(
+                                    "[on_submit] ✓ Restored: basic_rate={}, basic_amount={}",
+                                    item.basic_rate,
+                                    item.basic_amount,
+                                )
                                 restored_count += 1
                         
                         if restored_count > 0:
                             # Save again to persist the restored rates
-                            print(f"[on_submit] Saving Stock Entry with {restored_count} restored rates...")
+                            trace("[on_submit] Saving Stock Entry with {} restored rates...", restored_count)
                             stock_entry.save(ignore_permissions=True)
                             frappe.db.commit()
-                            print(f"[on_submit] ✓ Stock Entry saved with restored rates")
+                            trace("[on_submit] ✓ Stock Entry saved with restored rates")
                         else:
-                            print(f"[on_submit] WARNING: No rates were restored (items might have changed)")
+                            trace("[on_submit] WARNING: No rates were restored (items might have changed)")
                 except Exception as e:
-                    print(f"[on_submit] Error during insert/save: {str(e)}")
+                    trace("[on_submit] Error during insert/save: {}", str(e))
                     import traceback
-                    print(f"[on_submit] Traceback: {traceback.format_exc()}")
+                    if trace.enabled():
+                        trace("[on_submit] Traceback: {}", traceback.format_exc())
                     raise
-                print(f"[on_submit] Stock Entry inserted: {stock_entry.name}")
+                trace("[on_submit] Stock Entry inserted: {}", stock_entry.name)
                 # stock_entry.submit()
                 
                 stock_entries_created.append(stock_entry.name)
-                print(f"[on_submit] ✓ Stock Entry '{stock_entry.name}' created and submitted successfully")
+                trace("[on_submit] ✓ Stock Entry '{}' created and submitted successfully", stock_entry.name)
             
             if not stock_entries_created:
                 frappe.throw(_("No items to process. Please ensure packaging quantities are entered."))
             
-            print(f"{'='*60}\n")
             
             # Show success message
             if len(stock_entries_created) == 1:
@@ -1476,6 +1598,6 @@ class PackingReport(Document):
             
         except Exception as e:
             error_msg = f"Error creating Stock Entry: {str(e)}"
-            print(f"[on_submit] ✗ ERROR: {error_msg}")
+            trace("[on_submit] ✗ ERROR: {}", error_msg)
             frappe.log_error(frappe.get_traceback(), "Packing Report Stock Entry Creation Failed")
             frappe.throw(_(error_msg))
@@ -4,6 +4,74 @@ from frappe.utils import getdate, nowdate
 from erpnext.manufacturing.doctype.production_plan.production_plan import ProductionPlan as ERPNextProductionPlan
 
 
+def get_item_bom_details(item_codes, company=None):
+	"""Default active BOM and item metadata for many items in two queries.
+
+	Returns {item_code: {"bom_no", "stock_uom", "description", "item_name",
+	"default_warehouse", "boms"}} where ``boms`` maps each active, submitted
+	BOM of the item to its is_default flag. ``bom_no`` follows the same
+	precedence as get_default_active_bom: Item.default_bom if active, else the
+	latest active default BOM, else the latest active BOM. Items that do not
+	exist are left out.
+	"""
+	item_codes = list({code for code in item_codes or [] if code})
+	if not item_codes:
+		return {}
+
+	items = frappe.db.sql(
+		"""
+		SELECT item.name, item.default_bom, item.stock_uom, item.description, item.item_name,
+			item_default.default_warehouse
+		FROM `tabItem` item
+		LEFT JOIN `tabItem Default` item_default
+			ON item_default.parent = item.name
+			AND item_default.parenttype = 'Item'
+			AND item_default.company = %(company)s
+		WHERE item.name IN %(items)s
+		""",
+		{"items": item_codes, "company": company or ""},
+		as_dict=True,
+	)
+
+	details = {}
+	for item in items:
+		# several Item Default rows for one company are not expected; keep the first
+		details.setdefault(item.name, frappe._dict(
+			bom_no=None,
+			default_bom=item.default_bom,
+			stock_uom=item.stock_uom,
+			description=item.description,
+			item_name=item.item_name,
+			default_warehouse=item.default_warehouse,
+			boms={},
+		))
+
+	if not details:
+		return {}
+
+	boms = frappe.db.sql(
+		"""
+		SELECT name, item, is_default
+		FROM `tabBOM`
+		WHERE item IN %(items)s AND is_active = 1 AND docstatus = 1
+		ORDER BY is_default DESC, modified DESC
+		""",
+		{"items": list(details)},
+		as_dict=True,
+	)
+	for bom in boms:
+		details[bom.item].boms[bom.name] = bom.is_default
+
+	for item in details.values():
+		if item.default_bom and item.default_bom in item.boms:
+			item.bom_no = item.default_bom
+		elif item.boms:
+			# rows are ordered default-first, newest-first
+			item.bom_no = next(iter(item.boms))
+
+	return details
+
+
 def get_default_active_bom(item_code):
 	"""
 	Get the default active BOM for an item.
@@ -12,57 +80,9 @@ def get_default_active_bom(item_code):
 	"""
 	if not item_code:
 		return None
-	
-	# First, try to get default BOM from item master
-	default_bom = frappe.db.get_value("Item", item_code, "default_bom")
-	
-	if default_bom:
-		# Check if default BOM is active
-		bom_status = frappe.db.get_value(
-			"BOM",
-			default_bom,
-			["is_active", "docstatus"],
-			as_dict=True
-		)
-		
-		if bom_status and bom_status.is_active == 1 and bom_status.docstatus == 1:
-			return default_bom
-	
-	# If default BOM is not active or doesn't exist, find active default BOM
-	bom = frappe.qb.DocType("BOM")
-	active_default_bom = (
-		frappe.qb.from_(bom)
-		.select(bom.name)
-		.where(
-			(bom.item == item_code)
-			& (bom.is_active == 1)
-			& (bom.is_default == 1)
-			& (bom.docstatus == 1)
-		)
-		.orderby(bom.modified, order=frappe.qb.Order.desc)
-		.limit(1)
-	).run()
-	
-	if active_default_bom:
-		return active_default_bom[0][0]
-	
-	# If no default BOM found, get any active BOM
-	active_bom = (
-		frappe.qb.from_(bom)
-		.select(bom.name)
-		.where(
-			(bom.item == item_code)
-			& (bom.is_active == 1)
-			& (bom.docstatus == 1)
-		)
-		.orderby(bom.modified, order=frappe.qb.Order.desc)
-		.limit(1)
-	).run()
-	
-	if active_bom:
-		return active_bom[0][0]
-	
-	return None
+
+	item = get_item_bom_details([item_code]).get(item_code)
+	return item.bom_no if item else None
 
 
 class ProductionPlan(ERPNextProductionPlan):
@@ -75,28 +95,24 @@ class ProductionPlan(ERPNextProductionPlan):
 		"""
 		Override add_items to update BOM to default active before adding items.
 		"""
-		# Update BOM in items data before processing
+		# Resolve every item's active BOMs once instead of per row
+		details = get_item_bom_details(
+			[data.get("item_code") for data in items if data.get("bom_no")]
+		)
+
 		for data in items:
-			if data.get("bom_no") and data.get("item_code"):
-				# Check if BOM from sales order is active and default
-				bom_status = frappe.db.get_value(
-					"BOM",
-					data.bom_no,
-					["is_active", "is_default", "docstatus"],
-					as_dict=True
-				)
-				
-				# If BOM is not active or not default, get the default active BOM
-				if not bom_status or not (bom_status.is_active == 1 and bom_status.docstatus == 1):
-					default_active_bom = get_default_active_bom(data.item_code)
-					if default_active_bom:
-						data.bom_no = default_active_bom
-				elif bom_status.is_default != 1:
-					# BOM is active but not default, check if there's a default active BOM
-					default_active_bom = get_default_active_bom(data.item_code)
-					if default_active_bom:
-						data.bom_no = default_active_bom
-		
+			if not (data.get("bom_no") and data.get("item_code")):
+				continue
+
+			item = details.get(data.item_code)
+			if not item or not item.bom_no:
+				continue
+
+			# Keep the sales order BOM only if it is active, submitted and default;
+			# otherwise switch to the default active BOM
+			if item.boms.get(data.bom_no) != 1:
+				data.bom_no = item.bom_no
+
 		# Call parent method to add items
 		super().add_items(items)
 
@@ -326,39 +326,40 @@ class PurchaseOrder(ERPNextPurchaseOrder):
 		"""
 		if not self.items:
 			return
-		
-		print(f"\n{'='*80}")
-		print(f"[validate_po_qty_against_mr] Starting validation for PO: {self.name}")
-		print(f"{'='*80}")
-		
+
+		mr_item_names = list({item.material_request_item for item in self.items if item.material_request_item})
+		if not mr_item_names:
+			return
+
+		exclude_po_name = None
+		if self.name and not self.name.startswith("new-"):
+			exclude_po_name = self.name
+
+		mr_items = get_mr_item_ordered_qty(mr_item_names, exclude_po_name)
+
+		# Stock qty of this PO's rows as last saved (for updates)
+		old_po_item_qty = {}
+		if exclude_po_name:
+			old_po_item_qty = dict(
+				frappe.get_all(
+					"Purchase Order Item",
+					filters={"parenttype": "Purchase Order", "parent": exclude_po_name},
+					fields=["name", "stock_qty"],
+					as_list=True,
+				)
+			)
+
+		# Compare at the same precision to avoid tiny UOM conversion float diffs
+		precision = frappe.get_precision("Purchase Order Item", "stock_qty") or 6
+
 		for item in self.items:
 			if not item.material_request_item:
-				print(f"[validate_po_qty_against_mr] Row {item.idx}: Skipping - no material_request_item")
 				continue
-			
-			print(f"\n[validate_po_qty_against_mr] Processing Row {item.idx}:")
-			print(f"  - Item: {item.item_code}")
-			print(f"  - Material Request Item: {item.material_request_item}")
-			print(f"  - PO Item qty: {item.qty}")
-			print(f"  - PO Item stock_qty: {item.stock_qty}")
-			
-			# Get Material Request Item details
-			mr_item = frappe.db.get_value(
-				"Material Request Item",
-				item.material_request_item,
-				["qty", "stock_qty", "item_code", "parent"],
-				as_dict=True
-			)
-			
+
+			mr_item = mr_items.get(item.material_request_item)
 			if not mr_item:
-				print(f"  - ERROR: Material Request Item not found!")
 				continue
-			
-			print(f"  - MR Item Code: {mr_item.item_code}")
-			print(f"  - MR Parent: {mr_item.parent}")
-			print(f"  - MR qty: {mr_item.qty}")
-			print(f"  - MR stock_qty: {mr_item.stock_qty}")
-			
+
 			# Get total requested quantity in stock UOM - ALWAYS use stock_qty
 			# This ensures comparison is always in stock UOM (e.g., pcs vs pcs, not pcs vs kg)
 			if not mr_item.stock_qty or mr_item.stock_qty <= 0:
@@ -382,106 +383,28 @@ class PurchaseOrder(ERPNextPurchaseOrder):
 					title=_("Invalid Purchase Order Stock Quantity")
 				)
 			po_stock_qty = item.stock_qty
-			
-			# Calculate total ordered quantity from all POs linked to this MR item
-			# Use SQL query for reliability - include all draft and submitted POs, exclude cancelled
-			exclude_po_name = None
-			if self.name and not self.name.startswith("new-"):
-				exclude_po_name = self.name
-			
-			print(f"  - Current PO name: {self.name}")
-			print(f"  - Exclude PO name: {exclude_po_name}")
-			
-			# Get sum of all PO items linked to this MR item
-			# Include draft (docstatus=0) and submitted (docstatus=1) POs
-			# Exclude cancelled (docstatus=2) POs
-			# ALWAYS use stock_qty only - ensures comparison is in stock UOM
-			sql_query = """
-				SELECT 
-					po.name as po_name,
-					po.docstatus,
-					po_item.stock_qty,
-					po_item.qty
-				FROM `tabPurchase Order Item` po_item
-				INNER JOIN `tabPurchase Order` po ON po_item.parent = po.name
-				WHERE po_item.material_request_item = %(mr_item)s
-				AND po.docstatus != 2
-			"""
-			
-			params = {"mr_item": item.material_request_item}
-			
-			# Exclude current PO if it's saved
-			if exclude_po_name:
-				sql_query += " AND po.name != %(exclude_po)s"
-				params["exclude_po"] = exclude_po_name
-			
-			# Get detailed list for debugging
-			detailed_result = frappe.db.sql(sql_query, params, as_dict=True)
-			print(f"  - Found {len(detailed_result)} existing PO items linked to this MR item:")
-			for row in detailed_result:
-				print(f"    * PO: {row.po_name}, docstatus: {row.docstatus}, stock_qty: {row.stock_qty}, qty: {row.qty}")
-			
-			# Get sum - ALWAYS use stock_qty only
-			sum_query = """
-				SELECT COALESCE(SUM(COALESCE(po_item.stock_qty, 0)), 0) as total
-				FROM `tabPurchase Order Item` po_item
-				INNER JOIN `tabPurchase Order` po ON po_item.parent = po.name
-				WHERE po_item.material_request_item = %(mr_item)s
-				AND po.docstatus != 2
-			"""
-			
-			sum_params = {"mr_item": item.material_request_item}
-			if exclude_po_name:
-				sum_query += " AND po.name != %(exclude_po)s"
-				sum_params["exclude_po"] = exclude_po_name
-			
-			result = frappe.db.sql(sum_query, sum_params, as_dict=True)
-			total_ordered_from_other_pos = result[0].total if result and result[0].total else 0
-			
-			print(f"  - Total ordered qty from other POs (excluding current): {total_ordered_from_other_pos}")
-			
-			# Get old qty of current PO item if it exists (for updates)
-			# ALWAYS use stock_qty only
-			old_po_item_qty = 0
-			if exclude_po_name and item.name:
-				existing_po_item = frappe.db.get_value(
-					"Purchase Order Item",
-					item.name,
-					["stock_qty"],
-					as_dict=True
-				)
-				if existing_po_item and existing_po_item.stock_qty:
-					old_po_item_qty = existing_po_item.stock_qty
-					print(f"  - Existing PO item old stock_qty: {old_po_item_qty}")
-			
+
+			# Draft and submitted POs other than this one, in stock UOM
+			total_ordered_from_other_pos = mr_item.ordered_stock_qty or 0
+
 			# Calculate available quantity
 			# For new PO: Available = MR Total - Total from other POs
 			# For existing PO: Available = MR Total - Total from other POs + Old qty (old qty is being replaced, so add it back)
 			mr_available_stock_qty = mr_total_stock_qty - total_ordered_from_other_pos
 			
 			# If updating an existing PO, add back the old qty since it's being replaced
-			if old_po_item_qty > 0:
-				mr_available_stock_qty += old_po_item_qty
-			
-			print(f"  - MR Total: {mr_total_stock_qty}")
-			print(f"  - Total Ordered from other POs: {total_ordered_from_other_pos}")
-			if old_po_item_qty > 0:
-				print(f"  - Old qty of current PO (being replaced): {old_po_item_qty}")
-				print(f"  - Available qty (after adding back old qty): {mr_available_stock_qty}")
-			else:
-				print(f"  - Available qty: {mr_available_stock_qty}")
-			print(f"  - Current/New PO qty: {po_stock_qty}")
-			
-			# Compare at the same precision to avoid tiny UOM conversion float diffs
-			precision = frappe.get_precision("Purchase Order Item", "stock_qty") or 6
+			old_qty = (old_po_item_qty.get(item.name) or 0) if item.name else 0
+			if old_qty > 0:
+				mr_available_stock_qty += old_qty
+
 			po_stock_qty_cmp = frappe.utils.flt(po_stock_qty, precision)
 			mr_available_stock_qty_cmp = frappe.utils.flt(mr_available_stock_qty, precision)
-			print(f"  - Validation (precision {precision}): {po_stock_qty_cmp} > {mr_available_stock_qty_cmp} = {po_stock_qty_cmp > mr_available_stock_qty_cmp}")
 			
 			# Check if PO quantity exceeds available MR quantity
 			if po_stock_qty_cmp > mr_available_stock_qty_cmp:
-				print(f"  - ERROR: Quantity exceeds available MR quantity!")
-				
+				# Existing PO lines for the breakdown, only needed for the error message
+				detailed_result = get_mr_item_po_lines(item.material_request_item, exclude_po_name)
+
 				# Build a clear, user-friendly error message with HTML formatting
 				item_name = item.item_code or mr_item.item_code
 				mr_name = mr_item.parent
@@ -571,7 +494,45 @@ class PurchaseOrder(ERPNextPurchaseOrder):
 					error_msg,
 					title=_("Quantity Exceeds Available Material Request")
 				)
-			else:
-				print(f"  - ✓ Validation passed")
-		
-		print(f"{'='*80}\n")
+
+
+def get_mr_item_ordered_qty(mr_item_names, exclude_po=None):
+	"""{Material Request Item: {stock_qty, item_code, parent, ordered_stock_qty}} in one query.
+
+	ordered_stock_qty sums stock_qty of draft and submitted Purchase Order Items
+	linked to each MR item, leaving out ``exclude_po``.
+	"""
+	rows = frappe.db.sql(
+		"""
+		SELECT
+			mri.name, mri.stock_qty, mri.item_code, mri.parent,
+			COALESCE(SUM(CASE WHEN po.name IS NOT NULL THEN po_item.stock_qty END), 0) AS ordered_stock_qty
+		FROM `tabMaterial Request Item` mri
+		LEFT JOIN `tabPurchase Order Item` po_item
+			ON po_item.material_request_item = mri.name
+			AND po_item.parent != %(exclude_po)s
+		LEFT JOIN `tabPurchase Order` po
+			ON po.name = po_item.parent AND po.docstatus != 2
+		WHERE mri.name IN %(mr_items)s
+		GROUP BY mri.name, mri.stock_qty, mri.item_code, mri.parent
+		""",
+		{"mr_items": list(mr_item_names), "exclude_po": exclude_po or ""},
+		as_dict=True,
+	)
+	return {row.name: row for row in rows}
+
+
+def get_mr_item_po_lines(mr_item, exclude_po=None):
+	"""Draft/submitted Purchase Order lines against one MR item (for error details)."""
+	return frappe.db.sql(
+		"""
+		SELECT po.name AS po_name, po.docstatus, po_item.stock_qty, po_item.qty
+		FROM `tabPurchase Order Item` po_item
+		INNER JOIN `tabPurchase Order` po ON po_item.parent = po.name
+		WHERE po_item.material_request_item = %(mr_item)s
+			AND po.docstatus != 2
+			AND po.name != %(exclude_po)s
+		""",
+		{"mr_item": mr_item, "exclude_po": exclude_po or ""},
+		as_dict=True,
+	)
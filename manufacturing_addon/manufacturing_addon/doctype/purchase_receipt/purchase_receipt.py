@@ -8,9 +8,21 @@ from erpnext.stock.get_item_details import get_conversion_factor
 class CustomPurchaseReceipt(PurchaseReceipt):
 	def before_validate(self):
 		"""Store original rates before validation to prevent auto-change"""
-		self._preserve_rates()
+		self._prepare_items()
 		super().before_validate()
 
+	def _prepare_items(self):
+		"""One pass before validation, shared by the overrides below: original
+		rates/quantities and user-entered stock_qty per line, plus conversion
+		factors for all multi-UOM lines (PO items and Item UOM rows) in bulk."""
+		self._preserve_rates()
+		self._conversion_factors = get_conversion_factor_maps(
+			[
+				item for item in self.get("items")
+				if item.item_code and item.uom and item.stock_uom and item.uom != item.stock_uom
+			]
+		)
+
 	def validate(self):
 		# Call parent validate (which calls set_qty_as_per_stock_uom - our override)
 		super().validate()
@@ -37,20 +49,13 @@ class CustomPurchaseReceipt(PurchaseReceipt):
 			
 			# Also check if conversion_factor matches what would be calculated from stock_qty/qty
 			# This indicates user entered stock_qty
-			if not exact_value and flt(item.stock_qty) and flt(item.qty) and flt(item.qty) > 0 and flt(item.conversion_factor):
-				calculated_cf = flt(item.stock_qty) / flt(item.qty)
-				# If conversion_factor matches (within precision), user entered stock_qty
-				if abs(flt(item.conversion_factor) - calculated_cf) < 0.0001:
-					exact_value = flt(item.stock_qty)
-					# Store it for future reference
-					if item.name:
-						if not hasattr(self, '_user_entered_stock_qty'):
-							self._user_entered_stock_qty = {}
-						self._user_entered_stock_qty[item.name] = exact_value
-					elif item.idx:
-						if not hasattr(self, '_user_entered_stock_qty'):
-							self._user_entered_stock_qty = {}
-						self._user_entered_stock_qty[item.idx] = exact_value
+			if not exact_value and self._stock_qty_matches_conversion(item):
+				exact_value = flt(item.stock_qty)
+				# Store it for future reference
+				if item.name or item.idx:
+					if not hasattr(self, '_user_entered_stock_qty'):
+						self._user_entered_stock_qty = {}
+					self._user_entered_stock_qty[item.name or item.idx] = exact_value
 			
 			# If we have an exact value, ALWAYS restore it to prevent floating-point precision issues
 			if exact_value:
@@ -63,6 +68,14 @@ class CustomPurchaseReceipt(PurchaseReceipt):
 					# Preserve the exact value user entered
 					item.stock_qty = exact_value
 
+	@staticmethod
+	def _stock_qty_matches_conversion(item):
+		"""conversion_factor equals stock_qty / qty, i.e. the user entered stock_qty."""
+		if flt(item.stock_qty) and flt(item.qty) and flt(item.qty) > 0 and flt(item.conversion_factor):
+			calculated_cf = flt(item.stock_qty) / flt(item.qty)
+			return abs(flt(item.conversion_factor) - calculated_cf) < 0.0001
+		return False
+
 	def _preserve_rates(self):
 		"""Store original rates to prevent auto-change"""
 		if not hasattr(self, '_original_rates'):
@@ -82,21 +95,17 @@ class CustomPurchaseReceipt(PurchaseReceipt):
 				# Store stock_qty if conversion_factor matches what would be calculated from it
 				# This indicates user entered stock_qty
 				if item.uom and item.stock_uom and item.uom != item.stock_uom:
-					if flt(item.stock_qty) and flt(item.qty) and flt(item.qty) > 0 and flt(item.conversion_factor):
-						calculated_cf = flt(item.stock_qty) / flt(item.qty)
-						if abs(flt(item.conversion_factor) - calculated_cf) < 0.0001:
-							# User entered stock_qty, store exact value
-							self._user_entered_stock_qty[item.name] = flt(item.stock_qty)
+					if self._stock_qty_matches_conversion(item):
+						# User entered stock_qty, store exact value
+						self._user_entered_stock_qty[item.name] = flt(item.stock_qty)
 			elif item.rate and flt(item.rate) > 0:
 				# For new items, store rate if it's set
 				item._original_rate = flt(item.rate)
 				# Also store stock_qty for new items
 				if item.uom and item.stock_uom and item.uom != item.stock_uom:
-					if flt(item.stock_qty) and flt(item.qty) and flt(item.qty) > 0 and flt(item.conversion_factor):
-						calculated_cf = flt(item.stock_qty) / flt(item.qty)
-						if abs(flt(item.conversion_factor) - calculated_cf) < 0.0001:
-							# User entered stock_qty, store exact value
-							self._user_entered_stock_qty[item.idx] = flt(item.stock_qty)
+					if self._stock_qty_matches_conversion(item):
+						# User entered stock_qty, store exact value
+						self._user_entered_stock_qty[item.idx] = flt(item.stock_qty)
 
 	def _validate_rate_locking(self):
 		"""Ensure rate never changes when qty, stock_qty, or conversion_factor is edited"""
@@ -151,13 +160,10 @@ class CustomPurchaseReceipt(PurchaseReceipt):
 				
 				# ALWAYS check if conversion_factor matches what would be calculated from stock_qty/qty
 				# This is the key indicator that user entered stock_qty
-				if flt(item.stock_qty) and flt(item.qty) and flt(item.qty) > 0 and flt(item.conversion_factor):
-					calculated_cf = flt(item.stock_qty) / flt(item.qty)
-					# If conversion_factor matches (within precision), user entered stock_qty
-					if abs(flt(item.conversion_factor) - calculated_cf) < 0.0001:
-						should_preserve = True
-						# Preserve exact value - use current stock_qty, not calculated one
-						preserve_value = flt(item.stock_qty)
+				if self._stock_qty_matches_conversion(item):
+					should_preserve = True
+					# Preserve exact value - use current stock_qty, not calculated one
+					preserve_value = flt(item.stock_qty)
 				
 				if should_preserve and preserve_value:
 					if item.name:
@@ -201,6 +207,7 @@ class CustomPurchaseReceipt(PurchaseReceipt):
 
 	def _auto_fetch_conversion_factor(self):
 		"""Auto-fetch conversion factor from Item master or PO if Purchase UOM != Stock UOM"""
+		conversion_factors = None
 		for item in self.get("items"):
 			if not item.item_code or not item.uom or not item.stock_uom:
 				continue
@@ -218,32 +225,29 @@ class CustomPurchaseReceipt(PurchaseReceipt):
 					# If stock_qty changed significantly, user likely entered it manually
 					if abs(flt(item.stock_qty) - flt(original_stock_qty)) > 0.0001:
 						stock_qty_manually_entered = True
-				elif flt(item.stock_qty) and flt(item.qty) and flt(item.qty) > 0:
+				elif self._stock_qty_matches_conversion(item):
 					# If conversion_factor matches what would be calculated from stock_qty, user entered stock_qty
-					calculated_cf = flt(item.stock_qty) / flt(item.qty)
-					if flt(item.conversion_factor) and abs(flt(item.conversion_factor) - calculated_cf) < 0.0001:
-						stock_qty_manually_entered = True
+					stock_qty_manually_entered = True
 				
 				# If conversion_factor is not set or is 0, fetch it
 				if not flt(item.conversion_factor):
 					conversion_factor = None
+					if conversion_factors is None:
+						conversion_factors = getattr(self, "_conversion_factors", None) or get_conversion_factor_maps(
+							[d for d in self.get("items") if d.item_code and d.uom and d.stock_uom and d.uom != d.stock_uom]
+						)
+					po_conversion_factors, uom_conversion_factors = conversion_factors
 					
 					# Priority 1: Get from PO item if PR is against PO
 					if item.purchase_order_item:
-						conversion_factor = frappe.db.get_value(
-							"Purchase Order Item",
-							item.purchase_order_item,
-							"conversion_factor"
-						)
+						conversion_factor = po_conversion_factors.get(item.purchase_order_item)
 					
-					# Priority 2: Get from Item master using get_conversion_factor
+					# Priority 2: Get from Item master (UOM Conversion Detail, else global UOM conversion)
 					if not conversion_factor:
-						try:
-							conv_data = get_conversion_factor(item.item_code, item.uom)
-							if conv_data and conv_data.get("conversion_factor"):
-								conversion_factor = conv_data.get("conversion_factor")
-						except:
-							pass
+						key = (item.item_code, item.uom)
+						if key not in uom_conversion_factors:
+							uom_conversion_factors[key] = _item_uom_conversion_factor(item.item_code, item.uom)
+						conversion_factor = uom_conversion_factors[key]
 					
 					if conversion_factor:
 						item.conversion_factor = flt(conversion_factor)
@@ -279,3 +283,67 @@ class CustomPurchaseReceipt(PurchaseReceipt):
 					elif flt(item.qty) and flt(item.conversion_factor) and not stock_qty_manually_entered:
 						# Recalculate stock_qty from qty and conversion_factor only if user didn't enter it
 						item.stock_qty = flt(item.qty) * flt(item.conversion_factor)
+
+
+def _item_uom_conversion_factor(item_code, uom):
+	try:
+		conv_data = get_conversion_factor(item_code, uom)
+	except Exception:
+		return None
+	return conv_data.get("conversion_factor") if conv_data else None
+
+
+def get_conversion_factor_maps(items):
+	"""({Purchase Order Item: conversion_factor}, {(item_code, uom): conversion_factor}) for many lines.
+
+	PO item factors, Item variant_of and UOM Conversion Detail rows (item or its
+	template) are each read in one query. Pairs without a UOM Conversion Detail
+	row are left out; callers fall back to get_conversion_factor for those.
+	"""
+	po_conversion_factors, uom_conversion_factors = {}, {}
+	items = [item for item in items if item.item_code and item.uom]
+	if not items:
+		return po_conversion_factors, uom_conversion_factors
+
+	po_items = list({item.purchase_order_item for item in items if item.purchase_order_item})
+	if po_items:
+		po_conversion_factors = dict(
+			frappe.get_all(
+				"Purchase Order Item",
+				filters={"name": ["in", po_items]},
+				fields=["name", "conversion_factor"],
+				as_list=True,
+			)
+		)
+
+	pairs = {(item.item_code, item.uom) for item in items}
+	item_codes = list({item_code for item_code, _uom in pairs})
+	variant_of = dict(
+		frappe.get_all(
+			"Item",
+			filters={"name": ["in", item_codes]},
+			fields=["name", "variant_of"],
+			as_list=True,
+		)
+	)
+
+	detail_factors = {}
+	for row in frappe.get_all(
+		"UOM Conversion Detail",
+		filters={
+			"parenttype": "Item",
+			"parent": ["in", list(set(item_codes) | {v for v in variant_of.values() if v})],
+			"uom": ["in", list({uom for _item_code, uom in pairs})],
+		},
+		fields=["parent", "uom", "conversion_factor"],
+	):
+		detail_factors[(row.parent, row.uom)] = row.conversion_factor
+
+	for item_code, uom in pairs:
+		conversion_factor = detail_factors.get((item_code, uom)) or detail_factors.get(
+			(variant_of.get(item_code), uom)
+		)
+		if conversion_factor:
+			uom_conversion_factors[(item_code, uom)] = conversion_factor
+
+	return po_conversion_factors, uom_conversion_factors
@@ -5,9 +5,16 @@ import frappe
 from frappe.model.document import Document
 from frappe import _
 
+from manufacturing_addon.manufacturing_addon.utils.query_budget import query_budget
+from manufacturing_addon.manufacturing_addon.utils.stage_totals import (
+    reset_stage_totals,
+    stage_totals_for,
+)
+
 
 class QualityReport(Document):
     @frappe.whitelist()
+    @query_budget()
     def get_data1(self):
         if isinstance(self.order_sheet, str) and self.order_sheet:
             doc = frappe.get_doc("Order Sheet", self.order_sheet)
@@ -38,7 +45,9 @@ class QualityReport(Document):
                     })
                     self.save()
 
+    @query_budget()
     def validate(self):
+        reset_stage_totals(self)
         self.calculate_finished_stitching_qty()
         self.calculate_finished_quality_qty()
         self.quality_condition()
@@ -53,37 +62,11 @@ class QualityReport(Document):
     def calculate_finished_stitching_qty(self):
         """Get finished stitching qty from Stitching Reports"""
         try:
-            stitching_totals = {}
-            for row in self.quality_report_ct:
-                if not row.so_item:
-                    continue
-                
-                if row.combo_item:
-                    query = """
-                        SELECT SUM(srct.stitching_qty) AS total_stitching
-                        FROM `tabStitching Report CT` AS srct 
-                        LEFT JOIN `tabStitching Report` AS sr 
-                        ON srct.parent = sr.name
-                        WHERE sr.order_sheet = %s AND srct.so_item = %s AND srct.combo_item = %s AND sr.docstatus = 1
-                        GROUP BY srct.so_item, srct.combo_item
-                    """
-                    params = (self.order_sheet, row.so_item, row.combo_item)
-                else:
-                    query = """
-                        SELECT SUM(srct.stitching_qty) AS total_stitching
-                        FROM `tabStitching Report CT` AS srct 
-                        LEFT JOIN `tabStitching Report` AS sr 
-                        ON srct.parent = sr.name
-                        WHERE sr.order_sheet = %s AND srct.so_item = %s AND (srct.combo_item IS NULL OR srct.combo_item = '') AND sr.docstatus = 1
-                        GROUP BY srct.so_item
-                    """
-                    params = (self.order_sheet, row.so_item)
-
-                result = frappe.db.sql(query, params, as_dict=True)
-                stitching_totals[(row.so_item, row.combo_item or '')] = result[0].total_stitching if result else 0
-
+            stage_totals = stage_totals_for(self)
             for row in self.quality_report_ct:
-                row.finished_stitched_qty = stitching_totals.get((row.so_item, row.combo_item or ''), 0)
+                row.finished_stitched_qty = (
+                    stage_totals.qty("Stitching", row.so_item, row.combo_item) if row.so_item else 0
+                )
 
         except Exception as e:
             frappe.log_error(frappe.get_traceback(), "Finished Stitching Quantity Fetch Failed")
@@ -91,38 +74,11 @@ class QualityReport(Document):
     def calculate_finished_quality_qty(self):
         """Calculate and update finished_quality_qty in the child table based on user-entered quality_qty values."""
         try:
-            quality_totals = {}
-
-            for row in self.quality_report_ct:
-                if not row.so_item:
-                    continue
-                
-                if row.combo_item:
-                    query = """
-                        SELECT SUM(qrct.quality_qty) AS total_quality
-                        FROM `tabQuality Report CT` AS qrct 
-                        LEFT JOIN `tabQuality Report` AS qr 
-                        ON qrct.parent = qr.name
-                        WHERE qr.order_sheet = %s AND qrct.so_item = %s AND qrct.combo_item = %s AND qr.docstatus = 1
-                        GROUP BY qrct.so_item, qrct.combo_item
-                    """
-                    params = (self.order_sheet, row.so_item, row.combo_item)
-                else:
-                    query = """
-                        SELECT SUM(qrct.quality_qty) AS total_quality
-                        FROM `tabQuality Report CT` AS qrct 
-                        LEFT JOIN `tabQuality Report` AS qr 
-                        ON qrct.parent = qr.name
-                        WHERE qr.order_sheet = %s AND qrct.so_item = %s AND (qrct.combo_item IS NULL OR qrct.combo_item = '') AND qr.docstatus = 1
-                        GROUP BY qrct.so_item
-                    """
-                    params = (self.order_sheet, row.so_item)
-
-                result = frappe.db.sql(query, params, as_dict=True)
-                quality_totals[(row.so_item, row.combo_item or '')] = result[0].total_quality if result else 0
-
+            stage_totals = stage_totals_for(self)
             for row in self.quality_report_ct:
-                row.finished_quality_qty = quality_totals.get((row.so_item, row.combo_item or ''), 0)
+                row.finished_quality_qty = (
+                    stage_totals.qty("Quality", row.so_item, row.combo_item) if row.so_item else 0
+                )
 
         except Exception as e:
             frappe.log_error(frappe.get_traceback(), "Finished Quality Quantity Calculation Failed")
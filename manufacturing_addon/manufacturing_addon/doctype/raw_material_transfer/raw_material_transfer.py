@@ -2,6 +2,9 @@ import frappe
 from frappe import _
 from frappe.utils import flt, now_datetime
 from manufacturing_addon.manufacturing_addon.doctype.work_order_transfer_manager.work_order_transfer_manager import update_transfer_quantities
+from manufacturing_addon.manufacturing_addon.utils.trace import get_tracer
+
+trace = get_tracer("raw_material_transfer")
 
 class RawMaterialTransfer(frappe.model.document.Document):
     def onload(self):
@@ -158,11 +161,11 @@ class RawMaterialTransfer(frappe.model.document.Document):
             for item in self.raw_materials:
                 if item.item_code:
                     item.transferred_qty_so_far = flt(item_total_transferred.get(item.item_code, 0))
-                    print(f"DEBUG: Item {item.item_code} - Transferred So Far: {item.transferred_qty_so_far}")
+                    trace("DEBUG: Item {} - Transferred So Far: {}", item.item_code, item.transferred_qty_so_far)
                     
         except Exception as e:
             frappe.log_error(f"Error calculating transferred quantities for {self.name}: {str(e)}")
-            print(f"DEBUG: Error calculating transferred quantities: {str(e)}")
+            trace("DEBUG: Error calculating transferred quantities: {}", str(e))
 
     @frappe.whitelist()
     def calculate_transferred_quantities_server(self):
@@ -195,7 +198,11 @@ class RawMaterialTransfer(frappe.model.document.Document):
                     frappe.msgprint(_(f"WOTM update failed: {out.get('message')}"), alert=True, indicator="red")
                 else:
                     frappe.msgprint(_(f"WOTM updated successfully for {self.work_order_transfer_manager}"), alert=True, indicator="green")
-                print(f"🔍 DEBUG: WOTM quantities updated for {self.work_order_transfer_manager} using transfer {self.name}")
+                trace(
+                    "🔍 DEBUG: WOTM quantities updated for {} using transfer {}",
+                    self.work_order_transfer_manager,
+                    self.name,
+                )
         except Exception as e:
             frappe.msgprint(_(f"Error updating WOTM: {str(e)}"), alert=True, indicator="red")
             frappe.log_error(f"Error updating WOTM after submit for {self.name}: {str(e)}")
@@ -206,7 +213,7 @@ class RawMaterialTransfer(frappe.model.document.Document):
                 stock_entry_doc = frappe.get_doc("Stock Entry", self.stock_entry)
                 if stock_entry_doc.docstatus == 1:
                     stock_entry_doc.cancel()
-                    print(f"🔍 DEBUG: Stock Entry {self.stock_entry} cancelled")
+                    trace("🔍 DEBUG: Stock Entry {} cancelled", self.stock_entry)
             except Exception as e:
                 frappe.log_error(f"Error cancelling stock entry {self.stock_entry}: {str(e)}")
 
@@ -214,7 +221,7 @@ class RawMaterialTransfer(frappe.model.document.Document):
         try:
             if self.work_order_transfer_manager:
                 update_transfer_quantities(self.work_order_transfer_manager, None)
-                print(f"🔍 DEBUG: Recomputed WOTM after cancel: {self.work_order_transfer_manager}")
+                trace("🔍 DEBUG: Recomputed WOTM after cancel: {}", self.work_order_transfer_manager)
         except Exception as e:
             frappe.log_error(f"Error recomputing WOTM after cancel for {self.name}: {str(e)}")
 
@@ -239,10 +246,14 @@ class RawMaterialTransfer(frappe.model.document.Document):
             for item in self.raw_materials:
                 if item.item_code in wotm_transferred:
                     item.transferred_qty_so_far = wotm_transferred[item.item_code]
-                    print(f"🔍 DEBUG: Updated transferred_qty_so_far for {item.item_code} to {item.transferred_qty_so_far}")
+                    trace(
+                        "🔍 DEBUG: Updated transferred_qty_so_far for {} to {}",
+                        item.item_code,
+                        item.transferred_qty_so_far,
+                    )
             
         except Exception as e:
-            print(f"⚠️ WARNING: Could not refresh transferred quantities from WOTM: {e}")
+            trace("⚠️ WARNING: Could not refresh transferred quantities from WOTM: {}", e)
 
     def validate_transfer_quantities(self):
         # Check if at least one item has transfer quantity > 0
@@ -282,13 +293,24 @@ class RawMaterialTransfer(frappe.model.document.Document):
             if not frappe.flags.in_test and flt(item.transfer_qty) > actual_qty:
                 if additional_transfer_qty > 0:
                     # User is intentionally transferring more than available stock
-                    print(f"🔍 DEBUG: Allowing additional transfer for {item.item_code}. Available: {actual_qty}, Transfer: {item.transfer_qty}, Additional: {additional_transfer_qty}")
+                    trace(
+                        "🔍 DEBUG: Allowing additional transfer for {}. Available: {}, Transfer: {}, Additional: {}",
+                        item.item_code,
+                        actual_qty,
+                        item.transfer_qty,
+                        additional_transfer_qty,
+                    )
                 else:
                     # User is transferring more than available stock (accidentally or intentionally)
-                    print(f"🔍 DEBUG: Allowing transfer beyond available stock for {item.item_code}. Available: {actual_qty}, Transfer: {item.transfer_qty}")
+                    trace(
+                        "🔍 DEBUG: Allowing transfer beyond available stock for {}. Available: {}, Transfer: {}",
+                        item.item_code,
+                        actual_qty,
+                        item.transfer_qty,
+                    )
                     # Auto-calculate additional_transfer_qty
                     item.additional_transfer_qty = flt(item.transfer_qty) - actual_qty
-                    print(f"🔍 DEBUG: Auto-calculated additional_transfer_qty: {item.additional_transfer_qty}")
+                    trace("🔍 DEBUG: Auto-calculated additional_transfer_qty: {}", item.additional_transfer_qty)
 
     def validate_work_order_manager(self):
         if not self.work_order_transfer_manager:
@@ -345,16 +367,17 @@ class RawMaterialTransfer(frappe.model.document.Document):
             
             if transfer_qty > pending_qty:
                 extra_qty = transfer_qty - pending_qty
-                print(f"DEBUG: Item {item.item_code} has extra quantity: {extra_qty}")
+                trace("DEBUG: Item {} has extra quantity: {}", item.item_code, extra_qty)
                 
                 # Get work orders that use this specific item
                 work_orders_using_item = self.get_work_orders_using_item(item.item_code)
-                print(f"DEBUG: Work orders using {item.item_code}: {len(work_orders_using_item)}")
+                if trace.enabled():
+                    trace("DEBUG: Work orders using {}: {}", item.item_code, len(work_orders_using_item))
                 
                 if work_orders_using_item:
                     # Distribute extra quantity among work orders using this item
                     extra_per_wo = extra_qty / len(work_orders_using_item)
-                    print(f"DEBUG: Extra per work order: {extra_per_wo}")
+                    trace("DEBUG: Extra per work order: {}", extra_per_wo)
                     
                     # Add extra quantity to this item
                     item.extra_qty = flt(item.extra_qty or 0) + extra_qty
@@ -364,14 +387,20 @@ class RawMaterialTransfer(frappe.model.document.Document):
                     # Update transfer status
                     self.update_item_transfer_status(item)
                     
-                    print(f"DEBUG: Added {extra_qty} extra to {item.item_code} (distributed among {len(work_orders_using_item)} work orders)")
+                    if trace.enabled():
+                        trace(
+                            "DEBUG: Added {} extra to {} (distributed among {} work orders)",
+                            extra_qty,
+                            item.item_code,
+                            len(work_orders_using_item),
+                        )
                 else:
                     # If no work orders found, just add to this item
                     item.extra_qty = flt(item.extra_qty or 0) + extra_qty
                     item.target_qty = flt(item.pending_qty or 0) + flt(item.extra_qty or 0)
                     item.expected_qty = flt(item.transfer_qty or 0) + flt(item.extra_qty or 0)
                     self.update_item_transfer_status(item)
-                    print(f"DEBUG: No work orders found for {item.item_code}, added {extra_qty} extra to item only")
+                    trace("DEBUG: No work orders found for {}, added {} extra to item only", item.item_code, extra_qty)
 
     def get_work_orders_using_item(self, item_code):
         """Get work orders that use the specified item"""
@@ -393,7 +422,7 @@ class RawMaterialTransfer(frappe.model.document.Document):
             
             return work_orders
         except Exception as e:
-            print(f"DEBUG: Error getting work orders for item {item_code}: {str(e)}")
+            trace("DEBUG: Error getting work orders for item {}: {}", item_code, str(e))
             return []
 
     def distribute_extra_quantities(self):
@@ -592,7 +621,7 @@ class RawMaterialTransfer(frappe.model.document.Document):
         return debug_info
 
     def create_stock_entries_for_work_orders(self):
-        print(f"🔍 DEBUG: Creating stock entries for work orders")
+        trace("🔍 DEBUG: Creating stock entries for work orders")
         work_orders = frappe.db.sql(
             """
             SELECT name, production_item, qty, material_transferred_for_manufacturing, creation, docstatus, wip_warehouse
@@ -600,7 +629,7 @@ class RawMaterialTransfer(frappe.model.document.Document):
             WHERE sales_order = %s AND docstatus = 1
             ORDER BY creation ASC
             """, (self.sales_order,), as_dict=True)
-        print(f"🔍 DEBUG: Found {len(work_orders)} work orders for sales order {self.sales_order}")
+        trace("🔍 DEBUG: Found {} work orders for sales order {}", len(work_orders), self.sales_order)
 
         work_order_allocation = {}
         for raw_item in self.raw_materials:
@@ -608,7 +637,12 @@ class RawMaterialTransfer(frappe.model.document.Document):
                 continue
 
             remaining_qty = flt(raw_item.transfer_qty)
-            print(f"🔍 DEBUG: Allocating {raw_item.item_code} - Transfer Qty: {raw_item.transfer_qty}, Remaining: {remaining_qty}")
+            trace(
+                "🔍 DEBUG: Allocating {} - Transfer Qty: {}, Remaining: {}",
+                raw_item.item_code,
+                raw_item.transfer_qty,
+                remaining_qty,
+            )
 
             # First, calculate BOM requirements for all work orders
             bom_allocations = {}
@@ -670,7 +704,11 @@ class RawMaterialTransfer(frappe.model.document.Document):
 
             # If there's still remaining quantity (extra), distribute it proportionally among work orders
             if remaining_qty > 0 and total_bom_requirement > 0:
-                print(f"🔍 DEBUG: Distributing extra quantity {remaining_qty} for {raw_item.item_code} among work orders")
+                trace(
+                    "🔍 DEBUG: Distributing extra quantity {} for {} among work orders",
+                    remaining_qty,
+                    raw_item.item_code,
+                )
                 for wo in work_orders:
                     if remaining_qty <= 0:
                         break
@@ -709,11 +747,11 @@ class RawMaterialTransfer(frappe.model.document.Document):
                         })
 
                         remaining_qty -= extra_qty_to_allocate
-                        print(f"🔍 DEBUG: Allocated extra {extra_qty_to_allocate} to work order {wo.name}")
+                        trace("🔍 DEBUG: Allocated extra {} to work order {}", extra_qty_to_allocate, wo.name)
 
         # Fallback: if no allocation was created at all, allocate full transfer to the earliest WO with WIP and pending
         if not any(a.get("items") for a in work_order_allocation.values()):
-            print("🔍 DEBUG: No BOM-based allocation produced; using fallback allocation to earliest pending Work Order")
+            trace("🔍 DEBUG: No BOM-based allocation produced; using fallback allocation to earliest pending Work Order")
             frappe.msgprint(_("No BOM-based allocation matched. Falling back to allocate full transfer to earliest pending Work Order."), alert=True, indicator="orange")
             # Find first WO with pending and wip_warehouse
             fallback_wo = None
@@ -754,7 +792,7 @@ class RawMaterialTransfer(frappe.model.document.Document):
         self.update_allocation_quantities(work_order_allocation)
 
     def update_allocation_quantities(self, work_order_allocation):
-        print(f"🔍 DEBUG: Updating allocation quantities")
+        trace("🔍 DEBUG: Updating allocation quantities")
         item_allocation = {}
         for _, allocation in work_order_allocation.items():
             for item in allocation["items"]:
@@ -766,7 +804,7 @@ class RawMaterialTransfer(frappe.model.document.Document):
             raw_item.remaining_qty = flt(raw_item.transfer_qty) - allocated_qty
 
     def create_stock_entry_for_work_order(self, work_order_name, allocation):
-        print(f"🔍 DEBUG: Creating stock entry for work order: {work_order_name}")
+        trace("🔍 DEBUG: Creating stock entry for work order: {}", work_order_name)
         work_order = frappe.get_doc("Work Order", work_order_name)
         wip_warehouse = work_order.wip_warehouse
         if not wip_warehouse:
@@ -801,7 +839,7 @@ class RawMaterialTransfer(frappe.model.document.Document):
             stock_entry.flags.ignore_permissions = True
             stock_entry.submit()
             frappe.msgprint(_(f"Stock Entry created: {stock_entry.name} for Work Order {work_order_name}"), alert=True, indicator="green")
-            print(f"🔍 DEBUG: Stock Entry created: {stock_entry.name} for work order {work_order_name}")
+            trace("🔍 DEBUG: Stock Entry created: {} for work order {}", stock_entry.name, work_order_name)
         except Exception as e:
             frappe.msgprint(_(f"Error creating Stock Entry for Work Order {work_order_name}: {str(e)}"), alert=True, indicator="red")
             frappe.log_error(f"Error creating Stock Entry for Work Order {work_order_name} in RMT {self.name}: {str(e)}")
@@ -809,7 +847,7 @@ class RawMaterialTransfer(frappe.model.document.Document):
         return stock_entry
 
     def update_work_orders_with_allocation(self):
-        print(f"🔍 DEBUG: Updating work orders with allocation")
+        trace("🔍 DEBUG: Updating work orders with allocation")
         work_orders = frappe.db.sql("""
             SELECT name, production_item, qty, material_transferred_for_manufacturing, creation, docstatus
             FROM `tabWork Order`
@@ -902,8 +940,13 @@ def bulk_delete_raw_material_rows(doc_name, row_indices):
     try:
         doc = frappe.get_doc("Raw Material Transfer", doc_name)
         
-        print(f"DEBUG: Bulk delete - Doc: {doc_name}, Indices: {row_indices}")
-        print(f"DEBUG: Raw materials count before: {len(doc.raw_materials)}")
+        trace(
+            "DEBUG: Bulk delete - Doc: {}, Indices: {}\n"
+            "DEBUG: Raw materials count before: {}",
+            doc_name,
+            row_indices,
+            len(doc.raw_materials),
+        )
         
         # Convert string indices to integers
         if isinstance(row_indices, str):
@@ -911,7 +954,7 @@ def bulk_delete_raw_material_rows(doc_name, row_indices):
         elif isinstance(row_indices, list):
             row_indices = [int(x) for x in row_indices if str(x).isdigit()]
         
-        print(f"DEBUG: Converted indices: {row_indices}")
+        trace("DEBUG: Converted indices: {}", row_indices)
         
         if not row_indices:
             return {"success": False, "message": "No valid row indices provided"}
@@ -919,7 +962,7 @@ def bulk_delete_raw_material_rows(doc_name, row_indices):
         # Perform bulk delete
         doc.bulk_delete_rows(row_indices)
         
-        print(f"DEBUG: Raw materials count after: {len(doc.raw_materials)}")
+        trace("DEBUG: Raw materials count after: {}", len(doc.raw_materials))
         
         # If no items remain, skip validation to avoid "no transfer quantities" error
         if len(doc.raw_materials) == 0:
@@ -1225,7 +1268,7 @@ def create_raw_material_transfer_from_pending(work_order_transfer_manager, selec
                 item_code = se_item.item_code
                 qty = flt(se_item.qty)
                 transferred_map[item_code] = transferred_map.get(item_code, 0) + qty
-                print(f"DEBUG: Found {qty} of {item_code} transferred in Stock Entry")
+                trace("DEBUG: Found {} of {} transferred in Stock Entry", qty, item_code)
         
         # Fallback to Raw Material Transfer documents if no Stock Entries found
         if not stock_entries:
@@ -1233,7 +1276,7 @@ def create_raw_material_transfer_from_pending(work_order_transfer_manager, selec
                 d = frappe.get_doc("Raw Material Transfer", r.name)
                 for it in d.raw_materials:
                     transferred_map[it.item_code] = transferred_map.get(it.item_code, 0) + flt(it.transfer_qty)
-                    print(f"DEBUG: Fallback - Found {it.transfer_qty} of {it.item_code} from RMT")
+                    trace("DEBUG: Fallback - Found {} of {} from RMT", it.transfer_qty, it.item_code)
 
         pending_items = []
         for item in wotm_doc.transfer_items:
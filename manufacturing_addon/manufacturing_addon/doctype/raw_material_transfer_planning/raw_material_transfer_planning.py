@@ -232,12 +232,14 @@ class RawMaterialTransferPlanning(Document):
 
 	def _refresh_availability_rows(self):
 		"""Refresh availability for all material rows"""
-		# For performance, pre-get all warehouses of company
-		wh_list = [w.name for w in frappe.get_all("Warehouse", filters={"company": self.company})]
+		# Bin quantities for all rows at once
+		from_wh_qty, company_qty = _bin_qty_map(
+			[d.item_code for d in self.rmtp_raw_material], self.from_warehouse, self.company
+		)
 		
 		for d in self.rmtp_raw_material:
-			d.available_in_from_wh = self._bin_qty(d.item_code, self.from_warehouse)
-			d.available_in_company = sum(self._bin_qty(d.item_code, wh) for wh in wh_list)
+			d.available_in_from_wh = from_wh_qty.get(d.item_code, 0.0)
+			d.available_in_company = company_qty.get(d.item_code, 0.0)
 			d.pending_qty = max((d.qty or 0) - (d.issued_qty or 0), 0)
 			
 			# Calculate percentages
@@ -359,128 +361,19 @@ class RawMaterialTransferPlanning(Document):
 
 	def _update_issued_qty_from_stock_entries(self):
 		"""Update issued_qty in rmtp_raw_material from stock entries and Raw Material Issuance submissions"""
-		# First, get issued_qty from Raw Material Issuance submissions (primary source)
-		item_issued_from_rmi = {}
-		
-		# Get all submitted Raw Material Issuance for this planning
-		rmi_list = frappe.get_all(
-			"Raw Material Issuance",
-			filters={"planning": self.name, "docstatus": 1},
-			fields=["name"]
-		)
-		
-		if rmi_list:
-			# Get all items from these Raw Material Issuance documents
-			rmi_item_names = [rmi.name for rmi in rmi_list]
-			rmi_items = frappe.get_all(
-				"RMTI Item",
-				filters={"parent": ["in", rmi_item_names], "planning_row": ["is", "set"]},
-				fields=["item_code", "qty", "planning_row"]
-			)
-			
-			# Aggregate by item_code and planning_row
-			for rmi_item in rmi_items:
-				if rmi_item.item_code and rmi_item.planning_row:
-					key = (rmi_item.item_code, rmi_item.planning_row)
-					if key not in item_issued_from_rmi:
-						item_issued_from_rmi[key] = 0.0
-					item_issued_from_rmi[key] += float(rmi_item.qty or 0)
-		
-		# Second, get additional stock entries against sales order cost center OR linked to same sales order
-		item_issued_from_se = {}
-		if self.sales_order:
-			# Get sales order cost center
-			so_cost_center = frappe.db.get_value("Sales Order", self.sales_order, "cost_center")
-			
-			# Get stock entries from Raw Material Issuance to exclude them
-			rmi_stock_entries = []
-			if rmi_list:
-				rmi_stock_entries = frappe.get_all(
-					"Raw Material Issuance",
-					filters={"planning": self.name, "docstatus": 1, "stock_entry": ["is", "set"]},
-					fields=["stock_entry"]
-				)
-				rmi_stock_entries = [se.stock_entry for se in rmi_stock_entries if se.stock_entry]
-			
-			# Build filters for stock entries:
-			# 1. Stock entries linked to same Sales Order (via custom_sales_order or standard field if exists)
-			# 2. OR Stock entries with cost_center matching sales order cost center
-			# Exclude those already from Raw Material Issuance
-			
-			# Check if custom_sales_order field exists in Stock Entry
-			has_custom_sales_order = frappe.db.exists("Custom Field", {"dt": "Stock Entry", "fieldname": "custom_sales_order"})
-			
-			stock_entries = []
-			
-			# Get stock entries linked to same Sales Order
-			if has_custom_sales_order:
-				so_filters = {
-					"custom_sales_order": self.sales_order,
-					"docstatus": 1,
-					"purpose": ["in", ["Material Transfer", "Material Transfer for Manufacture"]]
-				}
-				if rmi_stock_entries:
-					so_filters["name"] = ["not in", rmi_stock_entries]
-				
-				so_stock_entries = frappe.get_all(
-					"Stock Entry",
-					filters=so_filters,
-					fields=["name"]
-				)
-				stock_entries.extend(so_stock_entries)
-			
-			# Get stock entries with cost center matching sales order cost center
-			if so_cost_center:
-				cc_filters = {
-					"custom_cost_center": so_cost_center,
-					"docstatus": 1,
-					"purpose": ["in", ["Material Transfer", "Material Transfer for Manufacture"]]
-				}
-				if rmi_stock_entries:
-					cc_filters["name"] = ["not in", rmi_stock_entries]
-				
-				cc_stock_entries = frappe.get_all(
-					"Stock Entry",
-					filters=cc_filters,
-					fields=["name"]
-				)
-				
-				# Add only those not already in stock_entries list
-				existing_names = {se.name for se in stock_entries}
-				for se in cc_stock_entries:
-					if se.name not in existing_names:
-						stock_entries.append(se)
-			
-			if stock_entries:
-				se_names = [se.name for se in stock_entries]
-				se_items = frappe.get_all(
-					"Stock Entry Detail",
-					filters={"parent": ["in", se_names]},
-					fields=["item_code", "qty", "t_warehouse"]
-				)
-				
-				# Aggregate by item_code only (we don't have planning_row for these)
-				for se_item in se_items:
-					ic = se_item.item_code
-					if se_item.t_warehouse and ic:
-						if ic not in item_issued_from_se:
-							item_issued_from_se[ic] = 0.0
-						item_issued_from_se[ic] += float(se_item.qty or 0)
-		
-		# Update issued_qty in rmtp_raw_material rows
+		item_issued_from_rmi, item_issued_from_se = get_issued_qty_map(self.name, self.sales_order)
+
+		# Stock entries are only added for items without any Raw Material Issuance,
+		# otherwise they might be counted twice
+		items_with_rmi = {item_code for item_code, _planning_row in item_issued_from_rmi}
+
 		for rm_row in self.rmtp_raw_material:
 			# Start with issued_qty from Raw Material Issuance for this specific row
-			key = (rm_row.item_code, rm_row.name)
-			issued_qty = item_issued_from_rmi.get(key, 0.0)
-			
+			issued_qty = item_issued_from_rmi.get((rm_row.item_code, rm_row.name), 0.0)
+
 			# Add any additional stock entries against cost center for this item
-			# (only if not already counted from Raw Material Issuance)
-			if rm_row.item_code in item_issued_from_se:
-				# Only add if this item doesn't have any Raw Material Issuance entries
-				# Otherwise, we might double count
-				has_rmi_for_item = any(k[0] == rm_row.item_code for k in item_issued_from_rmi.keys())
-				if not has_rmi_for_item:
-					issued_qty += item_issued_from_se[rm_row.item_code]
+			if rm_row.item_code not in items_with_rmi:
+				issued_qty += item_issued_from_se.get(rm_row.item_code, 0.0)
 			
 			rm_row.issued_qty = issued_qty
 			rm_row.pending_qty = max((rm_row.qty or 0) - (rm_row.issued_qty or 0), 0)
@@ -495,12 +388,138 @@ class RawMaterialTransferPlanning(Document):
 			else:
 				rm_row.transfer_percentage = 0.0
 
+	def db_update_issued_qty(self):
+		"""Write refreshed issued/pending/availability of all material rows and
+		the header totals without saving the document (works when submitted)."""
+		if self.rmtp_raw_material:
+			frappe.db.bulk_update(
+				"RMTP Raw Material",
+				{
+					rm_row.name: {
+						"issued_qty": rm_row.issued_qty,
+						"pending_qty": rm_row.pending_qty,
+						"required_percentage": rm_row.required_percentage,
+						"transfer_percentage": rm_row.transfer_percentage,
+						"available_in_from_wh": rm_row.available_in_from_wh,
+						"available_in_company": rm_row.available_in_company,
+					}
+					for rm_row in self.rmtp_raw_material
+				},
+				chunk_size=500,
+				update_modified=False,
+			)
+
+		frappe.db.set_value(
+			"Raw Material Transfer Planning",
+			self.name,
+			{
+				"status": self.status,
+				"total_planned_qty": self.total_planned_qty,
+				"total_issued_qty": self.total_issued_qty,
+				"total_pending_qty": self.total_pending_qty,
+				"total_required_percentage": self.total_required_percentage,
+				"total_transfer_percentage": self.total_transfer_percentage,
+			},
+			update_modified=False,
+		)
+
 	def on_trash(self):
 		"""Safety: cannot delete if any materials already issued"""
 		if any((d.issued_qty or 0) > 0 for d in self.rmtp_raw_material):
 			frappe.throw("Cannot delete: some materials already issued.")
 
 
+def _bin_qty_map(item_codes, warehouse, company):
+	"""({item_code: actual qty in warehouse}, {item_code: actual qty across company warehouses})."""
+	item_codes = list({code for code in item_codes if code})
+	from_wh_qty, company_qty = {}, {}
+	if not item_codes:
+		return from_wh_qty, company_qty
+
+	if warehouse:
+		from_wh_qty = {
+			item_code: float(qty or 0)
+			for item_code, qty in frappe.db.sql(
+				"""
+				SELECT item_code, SUM(actual_qty) FROM `tabBin`
+				WHERE warehouse = %(warehouse)s AND item_code IN %(items)s
+				GROUP BY item_code
+				""",
+				{"warehouse": warehouse, "items": item_codes},
+			)
+		}
+
+	if company:
+		company_qty = {
+			item_code: float(qty or 0)
+			for item_code, qty in frappe.db.sql(
+				"""
+				SELECT b.item_code, SUM(b.actual_qty) FROM `tabBin` b
+				JOIN `tabWarehouse` w ON w.name = b.warehouse
+				WHERE w.company = %(company)s AND b.item_code IN %(items)s
+				GROUP BY b.item_code
+				""",
+				{"company": company, "items": item_codes},
+			)
+		}
+
+	return from_wh_qty, company_qty
+
+
+ISSUE_PURPOSES = ("Material Transfer", "Material Transfer for Manufacture")
+
+
+def get_issued_qty_map(planning, sales_order=None):
+	"""Issued quantities for a planning in one grouped query.
+
+	Returns ({(item_code, planning_row): qty} from submitted Raw Material
+	Issuances, {item_code: qty} from other submitted transfer Stock Entries
+	linked to the sales order or booked on its cost center). Stock Entries
+	created by this planning's issuances are excluded from the second map.
+	"""
+	conditions = ["se.custom_cost_center = (SELECT so.cost_center FROM `tabSales Order` so WHERE so.name = %(sales_order)s)"]
+	if frappe.get_meta("Stock Entry").has_field("custom_sales_order"):
+		conditions.append("se.custom_sales_order = %(sales_order)s")
+
+	rows = frappe.db.sql(
+		f"""
+		SELECT 'rmi' AS source, ri.item_code, ri.planning_row, SUM(ri.qty) AS qty
+		FROM `tabRMTI Item` ri
+		JOIN `tabRaw Material Issuance` rmi ON rmi.name = ri.parent
+		WHERE rmi.planning = %(planning)s AND rmi.docstatus = 1
+			AND IFNULL(ri.item_code, '') != '' AND IFNULL(ri.planning_row, '') != ''
+		GROUP BY ri.item_code, ri.planning_row
+
+		UNION ALL
+
+		SELECT 'se' AS source, sed.item_code, NULL AS planning_row, SUM(sed.qty) AS qty
+		FROM `tabStock Entry Detail` sed
+		JOIN `tabStock Entry` se ON se.name = sed.parent
+		WHERE %(sales_order)s != ''
+			AND se.docstatus = 1
+			AND se.purpose IN %(purposes)s
+			AND ({" OR ".join(conditions)})
+			AND se.name NOT IN (
+				SELECT rmi.stock_entry FROM `tabRaw Material Issuance` rmi
+				WHERE rmi.planning = %(planning)s AND rmi.docstatus = 1 AND IFNULL(rmi.stock_entry, '') != ''
+			)
+			AND IFNULL(sed.item_code, '') != '' AND IFNULL(sed.t_warehouse, '') != ''
+		GROUP BY sed.item_code
+		""",
+		{"planning": planning, "sales_order": sales_order or "", "purposes": ISSUE_PURPOSES},
+		as_dict=True,
+	)
+
+	issued_from_rmi, issued_from_se = {}, {}
+	for row in rows:
+		if row.source == "rmi":
+			issued_from_rmi[(row.item_code, row.planning_row)] = float(row.qty or 0)
+		else:
+			issued_from_se[row.item_code] = float(row.qty or 0)
+
+	return issued_from_rmi, issued_from_se
+
+
 @frappe.whitelist()
 def make_raw_material_issuance(source_name, target_doc=None):
 	"""Create Raw Material Issuance from Raw Material Transfer Planning"""
@@ -5,6 +5,8 @@ from erpnext.selling.doctype.sales_order.sales_order import SalesOrder as ERPNex
 from frappe.utils import flt
 from pathlib import Path
 
+from manufacturing_addon.sales_addon_api import clear_sales_order_listview_dashboard_cache
+
 
 class CustomSalesOrder(ERPNextSalesOrder):
 	def validate_update_after_submit(self):
@@ -71,6 +73,8 @@ def close_sales_order_and_cost_center(sales_order_name):
         
         # Use the proper ERPNext method to update status to Closed
         sales_order.update_status("Closed")
+        # update_status writes via db_set, so no doc event clears the list view summary
+        clear_sales_order_listview_dashboard_cache()
         
         # Disable cost center if it exists
         if sales_order.cost_center:
@@ -9,6 +9,8 @@ from frappe import _
 from frappe.model.document import Document
 from frappe.utils import cint, flt, now_datetime
 
+from manufacturing_addon.manufacturing_addon.utils.query_budget import query_budget
+
 
 LOADING_TAG_OPTIONS = ("Manual", "Forklift", "Pallet Jack", "Crane", "Conveyor", "Bulk")
 
@@ -34,15 +36,7 @@ class ShipmentLoading(Document):
 		self.pending_cartons = pending
 		self.total_cbm = total_cbm
 		self.loaded_cbm = loaded_cbm
-
-		if total == 0:
-			self.status = "Pending"
-		elif loaded == 0:
-			self.status = "Pending"
-		elif loaded < total:
-			self.status = "In Progress"
-		else:
-			self.status = "Completed"
+		self.status = _loading_status(total, loaded)
 
 
 def parse_carton_dimension(dimension_text):
@@ -57,22 +51,31 @@ def parse_carton_dimension(dimension_text):
 	return (flt(match.group(1)), flt(match.group(2)), flt(match.group(3)))
 
 
-def _carton_dimension_map(order_sheet):
+def _carton_dimension_maps(order_sheets):
+	"""{order_sheet: (dimensions, qty_ctn_map)} from one Order Sheet CT query."""
+	maps = {order_sheet: ({}, {}) for order_sheet in order_sheets}
+	if not maps:
+		return maps
+
 	rows = frappe.get_all(
 		"Order Sheet CT",
-		filters={"parent": order_sheet},
-		fields=["so_item", "combo_item", "carton_dimension", "qty_ctn"],
+		filters={"parent": ["in", list(maps)], "parenttype": "Order Sheet"},
+		fields=["parent", "so_item", "combo_item", "carton_dimension", "qty_ctn"],
+		order_by="parent, idx",
 	)
-	dimensions = {}
-	qty_ctn_map = {}
 	for row in rows:
+		dimensions, qty_ctn_map = maps[row.parent]
 		key = (row.so_item, row.combo_item or "")
 		dimensions[key] = row.carton_dimension
 		qty_ctn_map[key] = flt(row.qty_ctn)
 		if row.so_item and (row.so_item, "") not in dimensions:
 			dimensions[(row.so_item, "")] = row.carton_dimension
 			qty_ctn_map[(row.so_item, "")] = flt(row.qty_ctn)
-	return dimensions, qty_ctn_map
+	return maps
+
+
+def _carton_dimension_map(order_sheet):
+	return _carton_dimension_maps([order_sheet])[order_sheet]
 
 
 def _compute_ready_cartons(total_packed_qty, qty_ctn):
@@ -91,56 +94,65 @@ def _compute_ready_cartons(total_packed_qty, qty_ctn):
 	return len(carton_qtys), carton_qtys
 
 
-def compute_packing_readiness(order_sheet):
-	"""Pieces ready and expected cartons from submitted packing reports."""
-	if not order_sheet:
-		return {"pieces_ready": 0, "expected_cartons": 0, "ready_cbm": 0.0}
+def compute_packing_readiness_map(order_sheets):
+	"""Pieces ready, expected cartons and ready CBM for many order sheets at once.
+
+	Packing lines are grouped by (order sheet, item, qty/ctn, pieces) so each
+	distinct line is costed once and multiplied by its count; with the
+	Order Sheet CT carton lookup that is two queries for any number of sheets.
+	"""
+	order_sheets = list({os for os in order_sheets or [] if os})
+	readiness = {os: {"pieces_ready": 0.0, "expected_cartons": 0, "ready_cbm": 0.0} for os in order_sheets}
+	if not order_sheets:
+		return readiness
 
-	_, qty_ctn_map = _carton_dimension_map(order_sheet)
 	ct_rows = frappe.db.sql(
 		"""
 		SELECT
+			pr.order_sheet,
 			prct.so_item,
-			prct.combo_item,
-			prct.qty_ctn,
-			IFNULL(prct.packaging_qty, 0) + IFNULL(prct.finished_packaging_qty, 0) AS pieces_ready
+			IFNULL(prct.combo_item, '') AS combo_item,
+			IFNULL(prct.qty_ctn, 0) AS qty_ctn,
+			IFNULL(prct.packaging_qty, 0) + IFNULL(prct.finished_packaging_qty, 0) AS pieces_ready,
+			COUNT(*) AS line_count
 		FROM `tabPacking Report` pr
 		INNER JOIN `tabPacking Report CT` prct ON prct.parent = pr.name
-		WHERE pr.order_sheet = %s AND pr.docstatus = 1
+		WHERE pr.order_sheet IN %(order_sheets)s AND pr.docstatus = 1
+			AND IFNULL(prct.packaging_qty, 0) + IFNULL(prct.finished_packaging_qty, 0) > 0
+		GROUP BY pr.order_sheet, prct.so_item, IFNULL(prct.combo_item, ''), IFNULL(prct.qty_ctn, 0),
+			IFNULL(prct.packaging_qty, 0) + IFNULL(prct.finished_packaging_qty, 0)
 		""",
-		order_sheet,
+		{"order_sheets": order_sheets},
 		as_dict=True,
 	)
-
-	pieces_ready = 0.0
-	expected_cartons = 0
-	ready_cbm = 0.0
-	dimensions, _ = _carton_dimension_map(order_sheet)
+	carton_maps = _carton_dimension_maps({row.order_sheet for row in ct_rows})
 
 	for row in ct_rows:
+		dimensions, qty_ctn_map = carton_maps[row.order_sheet]
+		totals = readiness[row.order_sheet]
+		count = cint(row.line_count)
 		pieces = flt(row.pieces_ready)
-		if pieces <= 0:
-			continue
-		pieces_ready += pieces
-		qty_ctn = flt(row.qty_ctn) or qty_ctn_map.get((row.so_item, row.combo_item or "")) or qty_ctn_map.get(
-			(row.so_item, "")
-		)
-		_, carton_qtys = _compute_ready_cartons(pieces, qty_ctn)
-		expected_cartons += len(carton_qtys)
-		carton_dimension = dimensions.get((row.so_item, row.combo_item or "")) or dimensions.get(
+		totals["pieces_ready"] += pieces * count
+		qty_ctn = flt(row.qty_ctn) or qty_ctn_map.get((row.so_item, row.combo_item)) or qty_ctn_map.get(
 			(row.so_item, "")
 		)
+		cartons, _ = _compute_ready_cartons(pieces, qty_ctn)
+		totals["expected_cartons"] += cartons * count
+		carton_dimension = dimensions.get((row.so_item, row.combo_item)) or dimensions.get((row.so_item, ""))
 		length_cm, width_cm, height_cm = parse_carton_dimension(carton_dimension)
 		per_carton_cbm = (
 			(length_cm * width_cm * height_cm) / 1000000.0 if (length_cm and width_cm and height_cm) else 0
 		)
-		ready_cbm += per_carton_cbm * len(carton_qtys)
+		totals["ready_cbm"] += per_carton_cbm * cartons * count
 
-	return {
-		"pieces_ready": pieces_ready,
-		"expected_cartons": expected_cartons,
-		"ready_cbm": ready_cbm,
-	}
+	return readiness
+
+
+def compute_packing_readiness(order_sheet):
+	"""Pieces ready and expected cartons from submitted packing reports."""
+	if not order_sheet:
+		return {"pieces_ready": 0, "expected_cartons": 0, "ready_cbm": 0.0}
+	return compute_packing_readiness_map([order_sheet])[order_sheet]
 
 
 def estimate_consignment_containers(total_cbm, container_type="20ft FCL"):
@@ -216,113 +228,167 @@ def get_or_create_shipment_loading(order_sheet):
 	return doc
 
 
+CARTON_PAYLOAD_FIELDS = (
+	"packing_report",
+	"packing_report_row",
+	"so_item",
+	"combo_item",
+	"colour",
+	"article",
+	"finished_size",
+	"design",
+	"carton_no",
+	"carton_label",
+	"carton_count",
+	"qty_in_carton",
+	"partial_qty",
+	"total_pieces",
+	"carton_dimension",
+	"per_carton_cbm",
+	"cbm",
+)
+
+
+def _loading_status(total, loaded):
+	if total == 0 or loaded == 0:
+		return "Pending"
+	if loaded < total:
+		return "In Progress"
+	return "Completed"
+
+
+def _packing_carton_payloads(order_sheet, packing_reports):
+	"""Carton row payloads and readiness contribution of the given packing reports.
+
+	Returns ({(packing_report, packing_report_row): payload}, readiness) using one
+	Packing Report CT query for all reports.
+	"""
+	payloads = {}
+	readiness = {"pieces_ready": 0.0, "expected_cartons": 0, "ready_cbm": 0.0}
+	if not packing_reports:
+		return payloads, readiness
+
+	dimensions, qty_ctn_map = _carton_dimension_map(order_sheet)
+	ct_rows = frappe.get_all(
+		"Packing Report CT",
+		filters={"parent": ["in", list(packing_reports)], "parenttype": "Packing Report"},
+		fields=[
+			"parent",
+			"name",
+			"so_item",
+			"combo_item",
+			"colour",
+			"article",
+			"finished_size",
+			"design",
+			"qty_ctn",
+			"packaging_qty",
+			"finished_packaging_qty",
+		],
+		order_by="parent, idx",
+	)
+	for row in ct_rows:
+		qty_ctn = flt(row.qty_ctn) or qty_ctn_map.get((row.so_item, row.combo_item or "")) or qty_ctn_map.get(
+			(row.so_item, "")
+		)
+		total_packed = flt(row.packaging_qty) + flt(row.finished_packaging_qty)
+		if total_packed > 0:
+			readiness["pieces_ready"] += total_packed
+		carton_count, qty_per_carton, partial_qty, total_pieces = _carton_batch_details(
+			total_packed, qty_ctn
+		)
+		if not carton_count:
+			continue
+
+		carton_dimension = dimensions.get((row.so_item, row.combo_item or "")) or dimensions.get(
+			(row.so_item, "")
+		)
+		length_cm, width_cm, height_cm = parse_carton_dimension(carton_dimension)
+		per_carton_cbm = (
+			(length_cm * width_cm * height_cm) / 1000000.0 if (length_cm and width_cm and height_cm) else 0
+		)
+		total_cbm = per_carton_cbm * carton_count
+		readiness["expected_cartons"] += carton_count
+		readiness["ready_cbm"] += total_cbm
+		payloads[(row.parent, row.name)] = {
+			"packing_report": row.parent,
+			"packing_report_row": row.name,
+			"so_item": row.so_item,
+			"combo_item": row.combo_item,
+			"colour": row.colour,
+			"article": row.article,
+			"finished_size": row.finished_size,
+			"design": row.design,
+			"carton_no": 1,
+			"carton_label": f"{row.parent} · {carton_count} ctns",
+			"carton_count": carton_count,
+			"qty_in_carton": qty_per_carton,
+			"partial_qty": partial_qty,
+			"total_pieces": total_pieces,
+			"carton_dimension": carton_dimension,
+			"per_carton_cbm": per_carton_cbm,
+			"cbm": total_cbm,
+		}
+	return payloads, readiness
+
+
 def sync_shipment_loading_for_order_sheet(order_sheet, packing_report=None):
-	"""Build carton rows from submitted packing reports for an order sheet."""
+	"""Build carton rows from submitted packing reports for an order sheet.
+
+	With ``packing_report`` only that report's rows are applied, incrementally.
+	"""
 	if not order_sheet:
 		return None
+	if packing_report:
+		return apply_packing_report_cartons(order_sheet, packing_report)
 
 	doc = get_or_create_shipment_loading(order_sheet)
 	readiness = compute_packing_readiness(order_sheet)
+	readiness_changed = (
+		flt(doc.total_pieces_ready) != flt(readiness["pieces_ready"])
+		or cint(doc.expected_cartons) != cint(readiness["expected_cartons"])
+		or flt(doc.ready_cbm) != flt(readiness["ready_cbm"])
+	)
 	doc.total_pieces_ready = readiness["pieces_ready"]
 	doc.expected_cartons = readiness["expected_cartons"]
-	dimensions, qty_ctn_map = _carton_dimension_map(order_sheet)
+	doc.ready_cbm = readiness["ready_cbm"]
 	existing_by_key = {
 		(row.packing_report, row.packing_report_row): row for row in (doc.cartons or [])
 	}
 
-	filters = {"order_sheet": order_sheet, "docstatus": 1}
-	if packing_report:
-		filters["name"] = packing_report
-
 	packing_reports = frappe.get_all(
 		"Packing Report",
-		filters=filters,
-		fields=["name"],
+		filters={"order_sheet": order_sheet, "docstatus": 1},
+		pluck="name",
 		order_by="modified desc",
 	)
+	payloads, _ = _packing_carton_payloads(order_sheet, packing_reports)
 
 	added = 0
 	updated = 0
-	for pr in packing_reports:
-		ct_rows = frappe.get_all(
-			"Packing Report CT",
-			filters={"parent": pr.name},
-			fields=[
-				"name",
-				"so_item",
-				"combo_item",
-				"colour",
-				"article",
-				"finished_size",
-				"design",
-				"qty_ctn",
-				"packaging_qty",
-				"finished_packaging_qty",
-			],
-		)
-		for row in ct_rows:
-			qty_ctn = flt(row.qty_ctn) or qty_ctn_map.get((row.so_item, row.combo_item or "")) or qty_ctn_map.get(
-				(row.so_item, "")
-			)
-			total_packed = flt(row.packaging_qty) + flt(row.finished_packaging_qty)
-			carton_count, qty_per_carton, partial_qty, total_pieces = _carton_batch_details(
-				total_packed, qty_ctn
-			)
-			if not carton_count:
-				continue
-
-			carton_dimension = dimensions.get((row.so_item, row.combo_item or "")) or dimensions.get(
-				(row.so_item, "")
-			)
-			length_cm, width_cm, height_cm = parse_carton_dimension(carton_dimension)
-			per_carton_cbm = (
-				(length_cm * width_cm * height_cm) / 1000000.0 if (length_cm and width_cm and height_cm) else 0
-			)
-			total_cbm = per_carton_cbm * carton_count
-			key = (pr.name, row.name)
-			label = f"{pr.name} · {carton_count} ctns"
-			payload = {
-				"packing_report": pr.name,
-				"packing_report_row": row.name,
-				"so_item": row.so_item,
-				"combo_item": row.combo_item,
-				"colour": row.colour,
-				"article": row.article,
-				"finished_size": row.finished_size,
-				"design": row.design,
-				"carton_no": 1,
-				"carton_label": label,
-				"carton_count": carton_count,
-				"qty_in_carton": qty_per_carton,
-				"partial_qty": partial_qty,
-				"total_pieces": total_pieces,
-				"carton_dimension": carton_dimension,
-				"per_carton_cbm": per_carton_cbm,
-				"cbm": total_cbm,
-			}
-
-			existing = existing_by_key.get(key)
-			if existing:
-				if existing.is_loaded:
-					continue
-				if not flt(existing.per_carton_cbm) and flt(existing.cbm):
-					existing.per_carton_cbm = flt(existing.cbm) / max(cint(existing.carton_count), 1)
-				changed = False
-				for field, value in payload.items():
-					if getattr(existing, field, None) != value:
-						setattr(existing, field, value)
-						changed = True
-				if changed:
-					updated += 1
+	for key, payload in payloads.items():
+		existing = existing_by_key.get(key)
+		if existing:
+			if existing.is_loaded:
 				continue
+			if not flt(existing.per_carton_cbm) and flt(existing.cbm):
+				existing.per_carton_cbm = flt(existing.cbm) / max(cint(existing.carton_count), 1)
+			changed = False
+			for field, value in payload.items():
+				if getattr(existing, field, None) != value:
+					setattr(existing, field, value)
+					changed = True
+			if changed:
+				updated += 1
+			continue
 
-			payload["is_loaded"] = 0
-			doc.append("cartons", payload)
-			existing_by_key[key] = doc.cartons[-1]
-			added += 1
+		payload["is_loaded"] = 0
+		doc.append("cartons", payload)
+		existing_by_key[key] = doc.cartons[-1]
+		added += 1
 
 	doc.update_totals()
-	if added or updated or doc.total_pieces_ready != readiness["pieces_ready"] or doc.expected_cartons != readiness["expected_cartons"]:
+	if added or updated or readiness_changed:
 		doc.save(ignore_permissions=True)
 	return {
 		"name": doc.name,
@@ -334,12 +400,117 @@ def sync_shipment_loading_for_order_sheet(order_sheet, packing_report=None):
 	}
 
 
-def remove_unloaded_cartons_for_packing_report(packing_report):
-	"""Remove pending cartons when a packing report is cancelled."""
+def _apply_loading_deltas(loading, deltas):
+	"""Add carton/CBM/readiness deltas to the stored Shipment Loading totals."""
+	if not any(deltas.values()):
+		return None
+
+	# lock the parent row so concurrent packing report submits/cancels apply their deltas in turn
+	current = frappe.db.get_value(
+		"Shipment Loading",
+		loading,
+		["total_cartons", "loaded_cartons", "total_cbm", "loaded_cbm", "total_pieces_ready", "expected_cartons", "ready_cbm"],
+		as_dict=True,
+		for_update=True,
+	)
+	total = max(cint(current.total_cartons) + deltas.get("total_cartons", 0), 0)
+	loaded = cint(current.loaded_cartons)
+	values = {
+		"total_cartons": total,
+		"pending_cartons": total - loaded,
+		"total_cbm": max(flt(current.total_cbm) + deltas.get("total_cbm", 0), 0),
+		"total_pieces_ready": max(flt(current.total_pieces_ready) + deltas.get("pieces_ready", 0), 0),
+		"expected_cartons": max(cint(current.expected_cartons) + deltas.get("expected_cartons", 0), 0),
+		"ready_cbm": max(flt(current.ready_cbm) + deltas.get("ready_cbm", 0), 0),
+		"status": _loading_status(total, loaded),
+	}
+	frappe.db.set_value("Shipment Loading", loading, values, update_modified=True)
+	return values
+
+
+def apply_packing_report_cartons(order_sheet, packing_report, readiness_sign=0):
+	"""Apply one packing report's carton rows to the Shipment Loading in place.
+
+	Only that report's carton rows are read and written; parent totals move by
+	deltas and nothing is written when nothing changed. ``readiness_sign`` (+1
+	on submit) adds the report's pieces/cartons/CBM to the stored readiness.
+	"""
+	loading = frappe.db.get_value("Shipment Loading", {"order_sheet": order_sheet}, "name")
+	if not loading:
+		loading = get_or_create_shipment_loading(order_sheet).name
+	payloads, readiness = _packing_carton_payloads(order_sheet, [packing_report])
+	existing_rows = frappe.get_all(
+		"Shipment Loading Carton",
+		filters={"parent": loading, "parenttype": "Shipment Loading", "packing_report": packing_report},
+		fields=["name", "is_loaded"] + list(CARTON_PAYLOAD_FIELDS),
+	)
+	existing_by_key = {(packing_report, row.packing_report_row): row for row in existing_rows}
+
+	deltas = {
+		"total_cartons": 0,
+		"total_cbm": 0.0,
+		"pieces_ready": readiness_sign * readiness["pieces_ready"],
+		"expected_cartons": readiness_sign * readiness["expected_cartons"],
+		"ready_cbm": readiness_sign * readiness["ready_cbm"],
+	}
+	added = 0
+	updated = 0
+	next_idx = None
+	for key, payload in payloads.items():
+		existing = existing_by_key.get(key)
+		if existing:
+			if existing.is_loaded:
+				continue
+			changes = {field: value for field, value in payload.items() if existing.get(field) != value}
+			if not changes:
+				continue
+			frappe.db.set_value("Shipment Loading Carton", existing.name, changes, update_modified=False)
+			deltas["total_cartons"] += (cint(payload["carton_count"]) or 1) - (cint(existing.carton_count) or 1)
+			deltas["total_cbm"] += flt(payload["cbm"]) - flt(existing.cbm)
+			updated += 1
+			continue
+
+		if next_idx is None:
+			next_idx = cint(
+				frappe.db.sql(
+					"SELECT MAX(idx) FROM `tabShipment Loading Carton` WHERE parent = %s AND parenttype = 'Shipment Loading'",
+					loading,
+				)[0][0]
+			) + 1
+		row = frappe.get_doc(
+			dict(
+				payload,
+				doctype="Shipment Loading Carton",
+				parent=loading,
+				parenttype="Shipment Loading",
+				parentfield="cartons",
+				idx=next_idx,
+				is_loaded=0,
+			)
+		)
+		row.db_insert()
+		next_idx += 1
+		deltas["total_cartons"] += cint(payload["carton_count"]) or 1
+		deltas["total_cbm"] += flt(payload["cbm"])
+		added += 1
+
+	totals = _apply_loading_deltas(loading, deltas) or {}
+	return {
+		"name": loading,
+		"added_cartons": added,
+		"updated_cartons": updated,
+		"total_cartons": totals.get("total_cartons"),
+		"pieces_ready": totals.get("total_pieces_ready"),
+		"expected_cartons": totals.get("expected_cartons"),
+	}
+
+
+def remove_unloaded_cartons_for_packing_report(packing_report, order_sheet=None):
+	"""Remove pending cartons and the readiness contribution of a cancelled packing report."""
 	if not packing_report:
 		return
 
-	order_sheet = frappe.db.get_value("Packing Report", packing_report, "order_sheet")
+	order_sheet = order_sheet or frappe.db.get_value("Packing Report", packing_report, "order_sheet")
 	if not order_sheet:
 		return
 
@@ -347,37 +518,50 @@ def remove_unloaded_cartons_for_packing_report(packing_report):
 	if not loading_name:
 		return
 
-	doc = frappe.get_doc("Shipment Loading", loading_name)
-	remaining = []
-	removed = 0
-	for row in doc.cartons or []:
-		if row.packing_report == packing_report and not row.is_loaded:
-			removed += 1
-			continue
-		remaining.append(row)
+	pending = frappe.get_all(
+		"Shipment Loading Carton",
+		filters={
+			"parent": loading_name,
+			"parenttype": "Shipment Loading",
+			"packing_report": packing_report,
+			"is_loaded": 0,
+		},
+		fields=["name", "carton_count", "cbm"],
+	)
+	if pending:
+		frappe.db.delete("Shipment Loading Carton", {"name": ("in", [row.name for row in pending])})
 
-	doc.set("cartons", remaining)
-	doc.update_totals()
-	doc.save(ignore_permissions=True)
-	return {"removed": removed, "name": doc.name}
+	_, readiness = _packing_carton_payloads(order_sheet, [packing_report])
+	_apply_loading_deltas(
+		loading_name,
+		{
+			"total_cartons": -sum(cint(row.carton_count) or 1 for row in pending),
+			"total_cbm": -sum(flt(row.cbm) for row in pending),
+			"pieces_ready": -readiness["pieces_ready"],
+			"expected_cartons": -readiness["expected_cartons"],
+			"ready_cbm": -readiness["ready_cbm"],
+		},
+	)
+	return {"removed": len(pending), "name": loading_name}
 
 
 def sync_shipment_loading_from_packing_report(doc, method=None):
 	if doc.doctype != "Packing Report" or not doc.order_sheet:
 		return
 	if doc.docstatus == 1:
-		sync_shipment_loading_for_order_sheet(doc.order_sheet, packing_report=doc.name)
+		apply_packing_report_cartons(doc.order_sheet, doc.name, readiness_sign=1)
 	elif doc.docstatus == 2:
-		remove_unloaded_cartons_for_packing_report(doc.name)
+		remove_unloaded_cartons_for_packing_report(doc.name, order_sheet=doc.order_sheet)
 
 
 @frappe.whitelist()
-def get_shipment_loading_board(filters=None):
+def get_shipment_loading_board(filters=None, start=0, page_length=200):
 	"""Return order-sheet wise shipment loading summary for the page."""
 	filters = frappe.parse_json(filters) if isinstance(filters, str) else (filters or {})
 
 	conditions = ["pr.docstatus = 1", "pr.order_sheet IS NOT NULL", "pr.order_sheet != ''"]
-	values = {}
+	having = ""
+	values = {"start": cint(start), "page_length": cint(page_length) or 200}
 
 	if filters.get("order_sheet"):
 		conditions.append("pr.order_sheet = %(order_sheet)s")
@@ -385,6 +569,9 @@ def get_shipment_loading_board(filters=None):
 	if filters.get("customer"):
 		conditions.append("pr.customer = %(customer)s")
 		values["customer"] = filters["customer"]
+	if filters.get("status"):
+		having = "HAVING status = %(status)s"
+		values["status"] = filters["status"]
 
 	where_sql = " AND ".join(conditions)
 	rows = frappe.db.sql(
@@ -395,7 +582,7 @@ def get_shipment_loading_board(filters=None):
 			COUNT(DISTINCT pr.name) AS packing_report_count,
 			MAX(pr.modified) AS last_packing_at,
 			MAX(sl.name) AS shipment_loading,
-			MAX(sl.status) AS status,
+			IFNULL(MAX(sl.status), 'Pending') AS status,
 			IFNULL(MAX(sl.total_cartons), 0) AS total_cartons,
 			IFNULL(MAX(sl.loaded_cartons), 0) AS loaded_cartons,
 			IFNULL(MAX(sl.pending_cartons), 0) AS pending_cartons,
@@ -403,6 +590,7 @@ def get_shipment_loading_board(filters=None):
 			IFNULL(MAX(sl.loaded_cbm), 0) AS loaded_cbm,
 			IFNULL(MAX(sl.total_pieces_ready), 0) AS total_pieces_ready,
 			IFNULL(MAX(sl.expected_cartons), 0) AS expected_cartons,
+			IFNULL(MAX(sl.ready_cbm), 0) AS ready_cbm,
 			MAX(sl.shipment_date) AS shipment_date,
 			MAX(sl.sales_order) AS sales_order,
 			MAX(sl.container_type) AS container_type
@@ -410,23 +598,25 @@ def get_shipment_loading_board(filters=None):
 		LEFT JOIN `tabShipment Loading` sl ON sl.order_sheet = pr.order_sheet
 		WHERE {where_sql}
 		GROUP BY pr.order_sheet
+		{having}
 		ORDER BY last_packing_at DESC
-		LIMIT 200
+		LIMIT %(page_length)s OFFSET %(start)s
 		""",
 		values,
 		as_dict=True,
 	)
 
+	# Readiness is stored at packing submit; only sheets never synced are computed, together.
+	missing = [row.order_sheet for row in rows if not flt(row.total_pieces_ready)]
+	readiness_map = compute_packing_readiness_map(missing) if missing else {}
+
 	board = []
 	for row in rows:
-		status = row.status or "Pending"
-		if filters.get("status") and status != filters["status"]:
-			continue
-
-		if not flt(row.total_pieces_ready):
-			readiness = compute_packing_readiness(row.order_sheet)
+		readiness = readiness_map.get(row.order_sheet)
+		if readiness:
 			row.total_pieces_ready = readiness["pieces_ready"]
 			row.expected_cartons = readiness["expected_cartons"]
+			row.ready_cbm = readiness["ready_cbm"]
 
 		board.append(
 			{
@@ -435,7 +625,7 @@ def get_shipment_loading_board(filters=None):
 				"packing_report_count": row.packing_report_count,
 				"last_packing_at": row.last_packing_at,
 				"shipment_loading": row.shipment_loading,
-				"status": status,
+				"status": row.status,
 				"total_cartons": row.total_cartons,
 				"loaded_cartons": row.loaded_cartons,
 				"pending_cartons": row.pending_cartons,
@@ -443,6 +633,7 @@ def get_shipment_loading_board(filters=None):
 				"loaded_cbm": row.loaded_cbm,
 				"total_pieces_ready": row.total_pieces_ready,
 				"expected_cartons": row.expected_cartons,
+				"ready_cbm": row.ready_cbm,
 				"shipment_date": row.shipment_date,
 				"sales_order": row.sales_order,
 				"container_type": row.container_type or "20ft FCL",
@@ -452,6 +643,25 @@ def get_shipment_loading_board(filters=None):
 	return {"rows": board}
 
 
+def refresh_stored_packing_readiness(order_sheets=None):
+	"""Recompute and store readiness on Shipment Loading (all, or the given sheets)."""
+	filters = {"order_sheet": ["in", list(order_sheets)]} if order_sheets else {}
+	loadings = dict(frappe.get_all("Shipment Loading", filters=filters, fields=["order_sheet", "name"], as_list=True))
+	readiness_map = compute_packing_readiness_map(list(loadings))
+	for order_sheet, readiness in readiness_map.items():
+		frappe.db.set_value(
+			"Shipment Loading",
+			loadings[order_sheet],
+			{
+				"total_pieces_ready": readiness["pieces_ready"],
+				"expected_cartons": readiness["expected_cartons"],
+				"ready_cbm": readiness["ready_cbm"],
+			},
+			update_modified=False,
+		)
+	return len(readiness_map)
+
+
 @frappe.whitelist()
 def sync_order_sheet_cartons(order_sheet):
 	"""Sync cartons from packing reports for one order sheet (on-demand)."""
@@ -461,12 +671,16 @@ def sync_order_sheet_cartons(order_sheet):
 
 
 @frappe.whitelist()
-def get_order_sheet_cartons(order_sheet, packing_report=None, loaded_only=None, sync=1):
+def get_order_sheet_cartons(order_sheet, packing_report=None, loaded_only=None, sync=0):
+	"""Stored carton rows and readiness; packing submit/cancel keep them current.
+
+	Pass ``sync=1`` (the desk's Sync button) to force a full rebuild first.
+	"""
 	if not order_sheet:
 		frappe.throw(_("Order Sheet is required"))
 
 	if cint(sync):
-		sync_shipment_loading_for_order_sheet(order_sheet, packing_report=packing_report or None)
+		sync_shipment_loading_for_order_sheet(order_sheet)
 
 	loading_name = frappe.db.get_value("Shipment Loading", {"order_sheet": order_sheet}, "name")
 	if not loading_name:
@@ -527,10 +741,15 @@ def get_order_sheet_cartons(order_sheet, packing_report=None, loaded_only=None,
 			"container_no",
 			"total_cbm",
 			"loaded_cbm",
+			"ready_cbm",
 		],
 		as_dict=True,
 	)
-	readiness = compute_packing_readiness(order_sheet)
+	readiness = {
+		"pieces_ready": flt((summary or {}).get("total_pieces_ready")),
+		"expected_cartons": cint((summary or {}).get("expected_cartons")),
+		"ready_cbm": flt((summary or {}).get("ready_cbm")),
+	}
 	container_type = (summary and summary.container_type) or "20ft FCL"
 	container_spec = CONTAINER_SPECS.get(container_type, CONTAINER_SPECS["20ft FCL"])
 	consignment_cbm = flt(readiness.get("ready_cbm")) or flt((summary or {}).get("total_cbm"))
@@ -871,6 +1090,7 @@ def _normalize_optional_text(val):
 
 
 @frappe.whitelist()
+@query_budget()
 def auto_fill_container(
 	order_sheet,
 	carton_rows=None,
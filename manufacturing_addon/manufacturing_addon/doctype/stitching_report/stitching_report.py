@@ -6,6 +6,7 @@ from frappe.model.document import Document
 from frappe import _
 from frappe.utils import flt
 
+from manufacturing_addon.manufacturing_addon.utils.query_budget import query_budget
 from manufacturing_addon.manufacturing_addon.utils.report_style_contractor import (
     append_style_contractors,
     validate_mandatory_contractors,
@@ -22,6 +23,13 @@ from manufacturing_addon.manufacturing_addon.utils.nested_style_contractors impo
     load_nested_style_contractors,
     save_nested_style_contractors,
 )
+from manufacturing_addon.manufacturing_addon.utils.stage_totals import (
+    reset_stage_totals,
+    stage_totals_for,
+)
+from manufacturing_addon.manufacturing_addon.utils.trace import get_tracer
+
+trace = get_tracer("stitching_report")
 
 
 @frappe.whitelist()
@@ -88,47 +96,55 @@ class StitchingReport(Document):
         return len(self.stitching_report_ct or [])
 
     @frappe.whitelist()
+    @query_budget()
     def get_data1(self):
-        print(f"\n{'='*60}")
-        print(f"[get_data1] Starting for Stitching Report: '{self.name}'")
-        print(f"[get_data1] Order Sheet: '{self.order_sheet}'")
-        print(f"{'='*60}")
+        trace(
+            "[get_data1] Starting for Stitching Report: '{}'\n"
+            "[get_data1] Order Sheet: '{}'",
+            self.name,
+            self.order_sheet,
+        )
         
         if not self.order_sheet:
-            print(f"[get_data1] ERROR: No Order Sheet selected")
+            trace("[get_data1] ERROR: No Order Sheet selected")
             frappe.throw("Please select an Order Sheet first.")
         
         if isinstance(self.order_sheet, str) and self.order_sheet:
             try:
                 # Use ignore_links to load cancelled Order Sheets
                 doc = frappe.get_doc("Order Sheet", self.order_sheet)
-                print(f"[get_data1] Loaded Order Sheet: '{doc.name}'")
-                print(f"[get_data1] Order Sheet is_or: {doc.is_or}")
-                print(f"[get_data1] Order Sheet docstatus: {doc.docstatus}")
+                trace(
+                    "[get_data1] Loaded Order Sheet: '{}'\n"
+                    "[get_data1] Order Sheet is_or: {}\n"
+                    "[get_data1] Order Sheet docstatus: {}",
+                    doc.name,
+                    doc.is_or,
+                    doc.docstatus,
+                )
                 
                 # Check if Order Sheet is cancelled
                 if doc.docstatus == 2:
-                    print(f"[get_data1] WARNING: Order Sheet is cancelled, but proceeding anyway")
+                    trace("[get_data1] WARNING: Order Sheet is cancelled, but proceeding anyway")
             except Exception as e:
-                print(f"[get_data1] ERROR loading Order Sheet: {str(e)}")
+                trace("[get_data1] ERROR loading Order Sheet: {}", str(e))
                 frappe.throw(f"Invalid Order Sheet reference: {str(e)}")
         else:
-            print(f"[get_data1] ERROR: Invalid Order Sheet type")
+            trace("[get_data1] ERROR: Invalid Order Sheet type")
             frappe.throw("Invalid Order Sheet reference.")
         
         # Check if stitching_report_ct is empty or not
         existing_rows = len(self.stitching_report_ct) if self.stitching_report_ct else 0
-        print(f"[get_data1] Existing stitching_report_ct rows: {existing_rows}")
+        trace("[get_data1] Existing stitching_report_ct rows: {}", existing_rows)
         
         # Clear existing rows to allow re-fetch with new calculations
         if existing_rows > 0:
-            print(f"[get_data1] Clearing {existing_rows} existing rows to re-fetch data...")
+            trace("[get_data1] Clearing {} existing rows to re-fetch data...", existing_rows)
             self.stitching_report_ct = []
         
         if not self.stitching_report_ct or existing_rows == 0:
-            print(f"[get_data1] stitching_report_ct is empty, will fetch data")
+            trace("[get_data1] stitching_report_ct is empty, will fetch data")
             if doc.is_or == 0:
-                print(f"[get_data1] Order Sheet is_or = 0, fetching data...")
+                trace("[get_data1] Order Sheet is_or = 0, fetching data...")
                 rec = frappe.db.sql("""
                     SELECT * FROM `tabOrder Sheet` AS opr
                     LEFT JOIN `tabOrder Sheet CT` AS orct
@@ -136,27 +152,35 @@ class StitchingReport(Document):
                     WHERE opr.name = %s AND opr.is_or = 0
                 """, (self.order_sheet,), as_dict=True)
                 
-                print(f"[get_data1] Found {len(rec)} rows from Order Sheet")
+                trace("[get_data1] Found {} rows from Order Sheet", len(rec))
 
                 self.stitching_report_ct = []
-                print(f"[get_data1] Processing {len(rec)} Order Sheet CT rows...")
+                trace("[get_data1] Processing {} Order Sheet CT rows...", len(rec))
                 for idx, r in enumerate(rec):
                     so_item = r.get("so_item")
                     planned_qty = r.get("planned_qty") or 0
                     order_qty = r.get("order_qty") or 0
                     
-                    print(f"\n{'='*60}")
-                    print(f"[get_data1] Row {idx+1} - Raw Data from Order Sheet CT:")
-                    print(f"  - so_item: '{so_item}'")
-                    print(f"  - order_qty (raw): {r.get('order_qty')}")
-                    print(f"  - planned_qty (raw): {r.get('planned_qty')}")
-                    print(f"  - order_qty (after or 0): {order_qty}")
-                    print(f"  - planned_qty (after or 0): {planned_qty}")
-                    print(f"  - All keys in row: {list(r.keys())}")
-                    print(f"{'='*60}")
+                    if trace.enabled():
+                        trace(
+                            "[get_data1] Row {} - Raw Data from Order Sheet CT:\n"
+                            "  - so_item: '{}'\n"
+                            "  - order_qty (raw): {}\n"
+                            "  - planned_qty (raw): {}\n"
+                            "  - order_qty (after or 0): {}\n"
+                            "  - planned_qty (after or 0): {}\n"
+                            "  - All keys in row: {}",
+                            idx + 1,
+                            so_item,
+                            r.get('order_qty'),
+                            r.get('planned_qty'),
+                            order_qty,
+                            planned_qty,
+                            list(r.keys()),
+                        )
                     
                     if not so_item:
-                        print(f"[get_data1] Row {idx+1}: Skipping - no so_item")
+                        trace("[get_data1] Row {}: Skipping - no so_item", idx + 1)
                         continue
                     
                     # Check if item has combo items (either flag is set OR combo items exist)
@@ -165,60 +189,83 @@ class StitchingReport(Document):
                         is_product_combo = getattr(item_doc, 'custom_is_product_combo', 0) == 1
                         combo_items = getattr(item_doc, 'custom_product_combo_item', [])
                         
-                        print(f"[get_data1] Item {so_item}:")
-                        print(f"  - custom_is_product_combo: {is_product_combo}")
-                        print(f"  - custom_product_combo_item count: {len(combo_items) if combo_items else 0}")
+                        if trace.enabled():
+                            trace(
+                                "[get_data1] Item {}:\n"
+                                "  - custom_is_product_combo: {}\n"
+                                "  - custom_product_combo_item count: {}",
+                                so_item,
+                                is_product_combo,
+                                len(combo_items) if combo_items else 0,
+                            )
                         
                         # Check if item has combo items (either flag is set OR combo items exist)
                         has_combo_items = (combo_items and len(combo_items) > 0)
                         
                         # First, try to get combo items from Item's custom_product_combo_item
                         if combo_items and len(combo_items) > 0:
-                            print(f"[get_data1] ✓ Found {len(combo_items)} combo items in Item")
+                            if trace.enabled():
+                                trace("[get_data1] ✓ Found {} combo items in Item", len(combo_items))
                             # Add each combo item to stitching report
                             for combo_item_row in combo_items:
                                 combo_item_code = combo_item_row.item
                                 combo_pcs = combo_item_row.pcs or 1
                                 calculated_qty = combo_pcs * planned_qty
                                 
-                                print(f"\n{'='*60}")
-                                print(f"[get_data1] PROCESSING COMBO ITEM:")
-                                print(f"{'='*60}")
-                                print(f"  Combo Item Code: {combo_item_code}")
-                                print(f"  Source: Item's custom_product_combo_item table")
-                                print(f"")
-                                print(f"  STEP 1: Get PCS from combo_item_row.pcs")
-                                print(f"    - combo_item_row.pcs (raw): {combo_item_row.pcs}")
-                                print(f"    - combo_item_row.pcs (after 'or 1'): {combo_pcs}")
-                                print(f"    → PCS = {combo_pcs}")
-                                print(f"")
-                                print(f"  STEP 2: Get Order Qty from Order Sheet CT")
-                                print(f"    - Order Sheet CT order_qty (raw): {r.get('order_qty')}")
-                                print(f"    - Order Sheet CT order_qty (after 'or 0'): {order_qty}")
-                                print(f"    → Order Qty = {order_qty} (NOT multiplied by PCS)")
-                                print(f"")
-                                print(f"  STEP 3: Get Planned Qty from Order Sheet CT")
-                                print(f"    - Order Sheet CT planned_qty (raw): {r.get('planned_qty')}")
-                                print(f"    - Order Sheet CT planned_qty (after 'or 0'): {planned_qty}")
-                                print(f"    → Planned Qty = {planned_qty}")
-                                print(f"")
-                                print(f"  STEP 4: Calculate Qty")
-                                print(f"    - Formula: Qty = Planned Qty * PCS")
-                                print(f"    - Calculation: {planned_qty} * {combo_pcs} = {calculated_qty}")
-                                print(f"    → Qty = {calculated_qty}")
-                                print(f"")
-                                print(f"  STEP 5: Get Qty/Ctn from Order Sheet CT")
-                                print(f"    - Order Sheet CT qty_ctn: {r.get('qty_ctn')}")
-                                print(f"    → Qty/Ctn = {r.get('qty_ctn')}")
-                                print(f"")
-                                print(f"{'='*60}")
-                                print(f"[get_data1] FINAL VALUES BEING SET:")
-                                print(f"  - order_qty: {order_qty} (from Order Sheet CT, NOT multiplied)")
-                                print(f"  - pcs: {combo_pcs} (from combo_item_row.pcs)")
-                                print(f"  - planned_qty: {planned_qty} (from Order Sheet CT)")
-                                print(f"  - qty: {calculated_qty} (calculated as: {planned_qty} * {combo_pcs})")
-                                print(f"  - qty_ctn: {r.get('qty_ctn')} (from Order Sheet CT)")
-                                print(f"{'='*60}")
+                                if trace.enabled():
+                                    trace(
+                                        "[get_data1] PROCESSING COMBO ITEM:\n"
+                                        "  Combo Item Code: {}\n"
+                                        "  Source: Item's custom_product_combo_item table\n"
+                                        "  STEP 1: Get PCS from combo_item_row.pcs\n"
+                                        "    - combo_item_row.pcs (raw): {}\n"
+                                        "    - combo_item_row.pcs (after 'or 1'): {}\n"
+                                        "    → PCS = {}\n"
+                                        "  STEP 2: Get Order Qty from Order Sheet CT\n"
+                                        "    - Order Sheet CT order_qty (raw): {}\n"
+                                        "    - Order Sheet CT order_qty (after 'or 0'): {}\n"
+                                        "    → Order Qty = {} (NOT multiplied by PCS)\n"
+                                        "  STEP 3: Get Planned Qty from Order Sheet CT\n"
+                                        "    - Order Sheet CT planned_qty (raw): {}\n"
+                                        "    - Order Sheet CT planned_qty (after 'or 0'): {}\n"
+                                        "    → Planned Qty = {}\n"
+                                        "  STEP 4: Calculate Qty\n"
+                                        "    - Formula: Qty = Planned Qty * PCS\n"
+                                        "    - Calculation: {} * {} = {}\n"
+                                        "    → Qty = {}\n"
+                                        "  STEP 5: Get Qty/Ctn from Order Sheet CT\n"
+                                        "    - Order Sheet CT qty_ctn: {}\n"
+                                        "    → Qty/Ctn = {}\n"
+                                        "[get_data1] FINAL VALUES BEING SET:\n"
+                                        "  - order_qty: {} (from Order Sheet CT, NOT multiplied)\n"
+                                        "  - pcs: {} (from combo_item_row.pcs)\n"
+                                        "  - planned_qty: {} (from Order Sheet CT)\n"
+                                        "  - qty: {} (calculated as: {} * {})\n"
+                                        "  - qty_ctn: {} (from Order Sheet CT)",
+                                        combo_item_code,
+                                        combo_item_row.pcs,
+                                        combo_pcs,
+                                        combo_pcs,
+                                        r.get('order_qty'),
+                                        order_qty,
+                                        order_qty,
+                                        r.get('planned_qty'),
+                                        planned_qty,
+                                        planned_qty,
+                                        planned_qty,
+                                        combo_pcs,
+                                        calculated_qty,
+                                        calculated_qty,
+                                        r.get('qty_ctn'),
+                                        r.get('qty_ctn'),
+                                        order_qty,
+                                        combo_pcs,
+                                        planned_qty,
+                                        calculated_qty,
+                                        planned_qty,
+                                        combo_pcs,
+                                        r.get('qty_ctn'),
+                                    )
                                 
                                 self._append_stitching_ct_row({
                                     "customer": r.get("customer"),
@@ -236,11 +283,10 @@ class StitchingReport(Document):
                                     "combo_item": combo_item_code,
                                 })
                                 
-                                print(f"[get_data1] ✓ Row added successfully!")
-                                print(f"{'='*60}\n")
+                                trace("[get_data1] ✓ Row added successfully!")
                         else:
                             # If no combo items in Item, try Stitching Size
-                            print(f"[get_data1] Row {idx+1}: No combo items in Item, checking Stitching Size...")
+                            trace("[get_data1] Row {}: No combo items in Item, checking Stitching Size...", idx + 1)
                             
                             # Get SIZE from variant attributes
                             size_value = None
@@ -255,56 +301,77 @@ class StitchingReport(Document):
                                     break
                             
                             if size_value:
-                                print(f"[get_data1] Found SIZE attribute: '{size_value}', checking Stitching Size...")
+                                trace("[get_data1] Found SIZE attribute: '{}', checking Stitching Size...", size_value)
                                 stitching_size = frappe.db.get_value("Stitching Size", size_value, "name")
                                 if stitching_size:
                                     stitching_size_doc = frappe.get_doc("Stitching Size", stitching_size)
                                     if stitching_size_doc.combo_detail and len(stitching_size_doc.combo_detail) > 0:
-                                        print(f"[get_data1] ✓ Found {len(stitching_size_doc.combo_detail)} combo items in Stitching Size")
+                                        if trace.enabled():
+                                            trace(
+                                                "[get_data1] ✓ Found {} combo items in Stitching Size",
+                                                len(stitching_size_doc.combo_detail),
+                                            )
                                         # Use combo items from Stitching Size
                                         for combo_item_row in stitching_size_doc.combo_detail:
                                             combo_item_code = combo_item_row.item
                                             combo_pcs = combo_item_row.pcs or 1
                                             calculated_qty = combo_pcs * planned_qty
                                             
-                                            print(f"\n{'='*60}")
-                                            print(f"[get_data1] PROCESSING COMBO ITEM FROM STITCHING SIZE:")
-                                            print(f"{'='*60}")
-                                            print(f"  Combo Item Code: {combo_item_code}")
-                                            print(f"  Source: Stitching Size '{stitching_size}' combo_detail table")
-                                            print(f"")
-                                            print(f"  STEP 1: Get PCS from stitching_size_doc.combo_detail")
-                                            print(f"    - combo_item_row.pcs (raw): {combo_item_row.pcs}")
-                                            print(f"    - combo_item_row.pcs (after 'or 1'): {combo_pcs}")
-                                            print(f"    → PCS = {combo_pcs}")
-                                            print(f"")
-                                            print(f"  STEP 2: Get Order Qty from Order Sheet CT")
-                                            print(f"    - Order Sheet CT order_qty (raw): {r.get('order_qty')}")
-                                            print(f"    - Order Sheet CT order_qty (after 'or 0'): {order_qty}")
-                                            print(f"    → Order Qty = {order_qty} (NOT multiplied by PCS)")
-                                            print(f"")
-                                            print(f"  STEP 3: Get Planned Qty from Order Sheet CT")
-                                            print(f"    - Order Sheet CT planned_qty (raw): {r.get('planned_qty')}")
-                                            print(f"    - Order Sheet CT planned_qty (after 'or 0'): {planned_qty}")
-                                            print(f"    → Planned Qty = {planned_qty}")
-                                            print(f"")
-                                            print(f"  STEP 4: Calculate Qty")
-                                            print(f"    - Formula: Qty = Planned Qty * PCS")
-                                            print(f"    - Calculation: {planned_qty} * {combo_pcs} = {calculated_qty}")
-                                            print(f"    → Qty = {calculated_qty}")
-                                            print(f"")
-                                            print(f"  STEP 5: Get Qty/Ctn from Order Sheet CT")
-                                            print(f"    - Order Sheet CT qty_ctn: {r.get('qty_ctn')}")
-                                            print(f"    → Qty/Ctn = {r.get('qty_ctn')}")
-                                            print(f"")
-                                            print(f"{'='*60}")
-                                            print(f"[get_data1] FINAL VALUES BEING SET:")
-                                            print(f"  - order_qty: {order_qty} (from Order Sheet CT, NOT multiplied)")
-                                            print(f"  - pcs: {combo_pcs} (from Stitching Size combo_detail)")
-                                            print(f"  - planned_qty: {planned_qty} (from Order Sheet CT)")
-                                            print(f"  - qty: {calculated_qty} (calculated as: {planned_qty} * {combo_pcs})")
-                                            print(f"  - qty_ctn: {r.get('qty_ctn')} (from Order Sheet CT)")
-                                            print(f"{'='*60}")
+                                            if trace.enabled():
+                                                trace(
+                                                    "[get_data1] PROCESSING COMBO ITEM FROM STITCHING SIZE:\n"
+                                                    "  Combo Item Code: {}\n"
+                                                    "  Source: Stitching Size '{}' combo_detail table\n"
+                                                    "  STEP 1: Get PCS from stitching_size_doc.combo_detail\n"
+                                                    "    - combo_item_row.pcs (raw): {}\n"
+                                                    "    - combo_item_row.pcs (after 'or 1'): {}\n"
+                                                    "    → PCS = {}\n"
+                                                    "  STEP 2: Get Order Qty from Order Sheet CT\n"
+                                                    "    - Order Sheet CT order_qty (raw): {}\n"
+                                                    "    - Order Sheet CT order_qty (after 'or 0'): {}\n"
+                                                    "    → Order Qty = {} (NOT multiplied by PCS)\n"
+                                                    "  STEP 3: Get Planned Qty from Order Sheet CT\n"
+                                                    "    - Order Sheet CT planned_qty (raw): {}\n"
+                                                    "    - Order Sheet CT planned_qty (after 'or 0'): {}\n"
+                                                    "    → Planned Qty = {}\n"
+                                                    "  STEP 4: Calculate Qty\n"
+                                                    "    - Formula: Qty = Planned Qty * PCS\n"
+                                                    "    - Calculation: {} * {} = {}\n"
+                                                    "    → Qty = {}\n"
+                                                    "  STEP 5: Get Qty/Ctn from Order Sheet CT\n"
+                                                    "    - Order Sheet CT qty_ctn: {}\n"
+                                                    "    → Qty/Ctn = {}\n"
+                                                    "[get_data1] FINAL VALUES BEING SET:\n"
+                                                    "  - order_qty: {} (from Order Sheet CT, NOT multiplied)\n"
+                                                    "  - pcs: {} (from Stitching Size combo_detail)\n"
+                                                    "  - planned_qty: {} (from Order Sheet CT)\n"
+                                                    "  - qty: {} (calculated as: {} * {})\n"
+                                                    "  - qty_ctn: {} (from Order Sheet CT)",
+                                                    combo_item_code,
+                                                    stitching_size,
+                                                    combo_item_row.pcs,
+                                                    combo_pcs,
+                                                    combo_pcs,
+                                                    r.get('order_qty'),
+                                                    order_qty,
+                                                    order_qty,
+                                                    r.get('planned_qty'),
+                                                    planned_qty,
+                                                    planned_qty,
+                                                    planned_qty,
+                                                    combo_pcs,
+                                                    calculated_qty,
+                                                    calculated_qty,
+                                                    r.get('qty_ctn'),
+                                                    r.get('qty_ctn'),
+                                                    order_qty,
+                                                    combo_pcs,
+                                                    planned_qty,
+                                                    calculated_qty,
+                                                    planned_qty,
+                                                    combo_pcs,
+                                                    r.get('qty_ctn'),
+                                                )
                                             
                                             self._append_stitching_ct_row({
                                                 "customer": r.get("customer"),
@@ -322,33 +389,46 @@ class StitchingReport(Document):
                                                 "combo_item": combo_item_code,
                                             })
                                             
-                                            print(f"[get_data1] ✓ Row added successfully!")
-                                            print(f"{'='*60}\n")
+                                            trace("[get_data1] ✓ Row added successfully!")
                                         continue
                             
                             # If no combo items found anywhere, skip
-                            print(f"[get_data1] Row {idx+1}: ✗ No combo items found (not in Item or Stitching Size), skipping")
+                            trace(
+                                "[get_data1] Row {}: ✗ No combo items found (not in Item or Stitching Size), skipping",
+                                idx + 1,
+                            )
                             continue
                     except Exception as e:
                         error_msg = f"Error processing item {so_item}: {str(e)}"
-                        print(f"[get_data1] Row {idx+1}: ✗ ERROR: {error_msg}")
+                        trace("[get_data1] Row {}: ✗ ERROR: {}", idx + 1, error_msg)
                         frappe.log_error(error_msg, "Stitching Report Item Processing")
                         continue
                 
-                print(f"\n{'='*60}")
-                print(f"[get_data1] SUMMARY:")
-                print(f"  - Total rows added to stitching_report_ct: {len(self.stitching_report_ct)}")
-                print(f"[get_data1] Final stitching_report_ct data:")
-                for idx, row in enumerate(self.stitching_report_ct):
-                    print(f"  Row {idx+1}:")
-                    print(f"    - so_item: {row.so_item}")
-                    print(f"    - combo_item: {row.combo_item}")
-                    print(f"    - order_qty: {row.order_qty}")
-                    print(f"    - planned_qty: {row.planned_qty}")
-                    print(f"    - pcs: {row.pcs}")
-                    print(f"    - qty: {row.qty}")
-                print(f"{'='*60}")
-                print(f"[get_data1] Saving Stitching Report...")
+                trace(
+                    "[get_data1] SUMMARY:\n"
+                    "  - Total rows added to stitching_report_ct: {}\n"
+                    "[get_data1] Final stitching_report_ct data:",
+                    len(self.stitching_report_ct),
+                )
+                if trace.enabled():
+                    for idx, row in enumerate(self.stitching_report_ct):
+                        trace(
+                            "  Row {}:\n"
+                            "    - so_item: {}\n"
+                            "    - combo_item: {}\n"
+                            "    - order_qty: {}\n"
+                            "    - planned_qty: {}\n"
+                            "    - pcs: {}\n"
+                            "    - qty: {}",
+                            idx + 1,
+                            row.so_item,
+                            row.combo_item,
+                            row.order_qty,
+                            row.planned_qty,
+                            row.pcs,
+                            row.qty,
+                        )
+                trace("[get_data1] Saving Stitching Report...")
                 
                 # Set flag to ignore link validation (allow cancelled Order Sheets)
                 self.flags.ignore_links = True
@@ -356,21 +436,20 @@ class StitchingReport(Document):
                 try:
                     self.save(ignore_permissions=True)
                     frappe.db.commit()
-                    print(f"[get_data1] ✓ Saved successfully")
+                    trace("[get_data1] ✓ Saved successfully")
                 except Exception as e:
-                    print(f"[get_data1] ERROR saving: {str(e)}")
+                    trace("[get_data1] ERROR saving: {}", str(e))
                     frappe.db.rollback()
                     raise
                 
-                print(f"{'='*60}\n")
             else:
-                print(f"[get_data1] Order Sheet is_or = 1, skipping (only process when is_or = 0)")
-                print(f"{'='*60}\n")
+                trace("[get_data1] Order Sheet is_or = 1, skipping (only process when is_or = 0)")
         else:
-            print(f"[get_data1] stitching_report_ct already has {existing_rows} rows, skipping fetch")
-            print(f"{'='*60}\n")
+            trace("[get_data1] stitching_report_ct already has {} rows, skipping fetch", existing_rows)
 
+    @query_budget()
     def validate(self):
+        reset_stage_totals(self)
         self.calculate_finished_cutting_qty()
         self.calculate_finished_stitching_qty()
         self._apply_subassembly_style_qty()
@@ -395,37 +474,11 @@ class StitchingReport(Document):
     def calculate_finished_cutting_qty(self):
         """Get finished cutting qty from Cutting Reports"""
         try:
-            cutting_totals = {}
+            stage_totals = stage_totals_for(self)
             for row in self.stitching_report_ct:
-                if not row.so_item:
-                    continue
-                
-                if row.combo_item:
-                    query = """
-                        SELECT SUM(crct.cutting_qty) AS total_cutting
-                        FROM `tabCutting Report CT` AS crct 
-                        LEFT JOIN `tabCutting Report` AS cr 
-                        ON crct.parent = cr.name
-                        WHERE cr.order_sheet = %s AND crct.so_item = %s AND crct.combo_item = %s AND cr.docstatus = 1
-                        GROUP BY crct.so_item, crct.combo_item
-                    """
-                    params = (self.order_sheet, row.so_item, row.combo_item)
-                else:
-                    query = """
-                        SELECT SUM(crct.cutting_qty) AS total_cutting
-                        FROM `tabCutting Report CT` AS crct 
-                        LEFT JOIN `tabCutting Report` AS cr 
-                        ON crct.parent = cr.name
-                        WHERE cr.order_sheet = %s AND crct.so_item = %s AND (crct.combo_item IS NULL OR crct.combo_item = '') AND cr.docstatus = 1
-                        GROUP BY crct.so_item
-                    """
-                    params = (self.order_sheet, row.so_item)
-
-                result = frappe.db.sql(query, params, as_dict=True)
-                cutting_totals[(row.so_item, row.combo_item or '')] = result[0].total_cutting if result else 0
-
-            for row in self.stitching_report_ct:
-                row.finished_cutting_qty = cutting_totals.get((row.so_item, row.combo_item or ''), 0)
+                row.finished_cutting_qty = (
+                    stage_totals.qty("Cutting", row.so_item, row.combo_item) if row.so_item else 0
+                )
 
         except Exception as e:
             frappe.log_error(frappe.get_traceback(), "Finished Cutting Quantity Fetch Failed")
@@ -433,65 +486,13 @@ class StitchingReport(Document):
     def calculate_finished_stitching_qty(self):
         """Calculate and update finished_stitching_qty in the child table based on user-entered stitching_qty values."""
         try:
-            stitching_totals = {}
-
-            for row in self.stitching_report_ct:
-                if not row.so_item:
-                    continue
-                
-                # Exclude current document from calculation
-                current_doc_filter = ""
-                if self.name:
-                    current_doc_filter = "AND sr.name != %s"
-                    if row.combo_item:
-                        query = """
-                            SELECT SUM(srct.stitching_qty) AS total_stitching
-                            FROM `tabStitching Report CT` AS srct 
-                            LEFT JOIN `tabStitching Report` AS sr 
-                            ON srct.parent = sr.name
-                            WHERE sr.order_sheet = %s AND srct.so_item = %s AND srct.combo_item = %s AND sr.docstatus = 1 {current_doc_filter}
-                            GROUP BY srct.so_item, srct.combo_item
-                        """.format(current_doc_filter=current_doc_filter)
-                        params = (self.order_sheet, row.so_item, row.combo_item, self.name)
-                    else:
-                        query = """
-                            SELECT SUM(srct.stitching_qty) AS total_stitching
-                            FROM `tabStitching Report CT` AS srct 
-                            LEFT JOIN `tabStitching Report` AS sr 
-                            ON srct.parent = sr.name
-                            WHERE sr.order_sheet = %s AND srct.so_item = %s AND (srct.combo_item IS NULL OR srct.combo_item = '') AND sr.docstatus = 1 {current_doc_filter}
-                            GROUP BY srct.so_item
-                        """.format(current_doc_filter=current_doc_filter)
-                        params = (self.order_sheet, row.so_item, self.name)
-                else:
-                    # New document, no need to exclude
-                    if row.combo_item:
-                        query = """
-                            SELECT SUM(srct.stitching_qty) AS total_stitching
-                            FROM `tabStitching Report CT` AS srct 
-                            LEFT JOIN `tabStitching Report` AS sr 
-                            ON srct.parent = sr.name
-                            WHERE sr.order_sheet = %s AND srct.so_item = %s AND srct.combo_item = %s AND sr.docstatus = 1
-                            GROUP BY srct.so_item, srct.combo_item
-                        """
-                        params = (self.order_sheet, row.so_item, row.combo_item)
-                    else:
-                        query = """
-                            SELECT SUM(srct.stitching_qty) AS total_stitching
-                            FROM `tabStitching Report CT` AS srct 
-                            LEFT JOIN `tabStitching Report` AS sr 
-                            ON srct.parent = sr.name
-                            WHERE sr.order_sheet = %s AND srct.so_item = %s AND (srct.combo_item IS NULL OR srct.combo_item = '') AND sr.docstatus = 1
-                            GROUP BY srct.so_item
-                        """
-                        params = (self.order_sheet, row.so_item)
-
-                result = frappe.db.sql(query, params, as_dict=True)
-                stitching_totals[(row.so_item, row.combo_item or '')] = result[0].total_stitching if result else 0
-
+            # Exclude current document from calculation
+            stage_totals = stage_totals_for(self)
             for row in self.stitching_report_ct:
-                row.finished_stitched_qty = flt(
-                    stitching_totals.get((row.so_item, row.combo_item or ''), 0)
+                row.finished_stitched_qty = (
+                    stage_totals.qty("Stitching", row.so_item, row.combo_item, exclude_self=True)
+                    if row.so_item
+                    else 0
                 )
 
         except Exception as e:
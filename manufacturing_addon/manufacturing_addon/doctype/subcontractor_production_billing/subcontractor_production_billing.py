@@ -62,11 +62,10 @@ class SubcontractorProductionBilling(Document):
 		period_from = self.period_from or getdate(self.posting_date)
 		period_to = self.period_to or getdate(self.posting_date)
 		
-		# Fetch Delivery Note quantities
-		dn_data = self.get_delivery_note_quantities(period_from, period_to)
-		
-		# Fetch production report quantities
-		production_data = self.get_production_report_quantities(period_from, period_to)
+		# One grouped query per source (DNs, production reports, receipts)
+		sources = self.get_billing_sources(period_from, period_to)
+		dn_data = sources["dn_qty"]
+		production_data = sources["production"]
 		
 		# Combine data and create billing items
 		billing_items_map = {}
@@ -119,8 +118,9 @@ class SubcontractorProductionBilling(Document):
 		
 		# Fetch rates and calculate amounts
 		missing_rates = []
+		rates = get_rates(self.supplier, list(billing_items_map), self.posting_date)
 		for item_code, data in billing_items_map.items():
-			rate_info = get_rate(self.supplier, item_code, self.posting_date)
+			rate_info = rates.get(item_code)
 			if rate_info:
 				data["rate"] = flt(rate_info.get("rate_per_pcs", 0))
 			else:
@@ -163,207 +163,103 @@ class SubcontractorProductionBilling(Document):
 			).format(len(missing_rates), missing_list), indicator="orange", title=_("Warning"))
 		
 		# Build references string
-		self.build_references(period_from, period_to)
+		self.build_references(period_from, period_to, sources=sources)
 		
 		return len(self.billing_items)
 	
-	def get_delivery_note_quantities(self, period_from, period_to):
+	def get_supplier_customer(self):
+		"""Customer linked on the Supplier (if the field exists), read once per document"""
+		if "supplier_customer" not in self.flags:
+			customer = None
+			if frappe.get_meta("Supplier").has_field("customer"):
+				customer = frappe.db.get_value("Supplier", self.supplier, "customer")
+			self.flags.supplier_customer = customer
+		return self.flags.supplier_customer
+	
+	def get_billing_sources(self, period_from, period_to):
 		"""
-		Get Delivery Note quantities for the supplier
-		Links Delivery Notes to suppliers through Purchase Orders
-		Also checks if supplier is set up as customer
-		Returns: dict {item_code: total_qty}
+		Quantities and references for the billing period, one grouped query per source
+		Returns: dict {
+			dn_qty: {item_code: qty}, dn_refs: [names],
+			production: {item_code: {cutting_qty, stitching_qty, packing_qty}},
+			report_refs: {stage: [names]}, pr_refs: [names]
+		}
 		"""
-		dn_data = {}
-		
-		# Method 1: Get Delivery Notes linked through Purchase Orders
-		# Delivery Note Items may have purchase_order_item reference
-		delivery_notes_po = frappe.db.sql("""
-			SELECT dni.item_code, SUM(dni.qty) as total_qty
+		values = {
+			"supplier": self.supplier,
+			"customer": self.get_supplier_customer(),
+			"period_from": period_from,
+			"period_to": period_to
+		}
+		
+		# Delivery Notes linked through Purchase Orders, plus those where the
+		# supplier is set up as customer (summed separately, as before)
+		customer_branch = ""
+		if values["customer"]:
+			customer_branch = """
+			UNION ALL
+			SELECT dn.name AS delivery_note, dni.item_code, SUM(dni.qty) AS total_qty
+			FROM `tabDelivery Note` dn
+			INNER JOIN `tabDelivery Note Item` dni ON dni.parent = dn.name
+			WHERE dn.customer = %(customer)s
+				AND dn.docstatus = 1
+				AND dn.posting_date BETWEEN %(period_from)s AND %(period_to)s
+			GROUP BY dn.name, dni.item_code
+			"""
+		dn_rows = frappe.db.sql(f"""
+			SELECT dn.name AS delivery_note, dni.item_code, SUM(dni.qty) AS total_qty
 			FROM `tabDelivery Note Item` dni
 			INNER JOIN `tabDelivery Note` dn ON dn.name = dni.parent
-			LEFT JOIN `tabPurchase Order Item` poi ON poi.name = dni.purchase_order_item
-			LEFT JOIN `tabPurchase Order` po ON po.name = poi.parent
+			INNER JOIN `tabPurchase Order Item` poi ON poi.name = dni.purchase_order_item
+			INNER JOIN `tabPurchase Order` po ON po.name = poi.parent
 			WHERE po.supplier = %(supplier)s
 				AND dn.docstatus = 1
 				AND dn.posting_date BETWEEN %(period_from)s AND %(period_to)s
-				AND dni.item_code IS NOT NULL
-			GROUP BY dni.item_code
-		""", {
-			"supplier": self.supplier,
-			"period_from": period_from,
-			"period_to": period_to
-		}, as_dict=True)
-		
-		for item in delivery_notes_po:
-			item_code = item.item_code
-			qty = flt(item.total_qty)
-			if item_code not in dn_data:
-				dn_data[item_code] = 0
-			dn_data[item_code] += qty
-		
-		# Method 2: Get Delivery Notes where supplier is set up as customer
-		try:
-			supplier_doc = frappe.get_doc("Supplier", self.supplier)
-			customer_name = None
-			if hasattr(supplier_doc, 'customer') and supplier_doc.customer:
-				customer_name = supplier_doc.customer
-		except:
-			customer_name = None
-		
-		if customer_name:
-			delivery_notes_customer = frappe.db.sql("""
-				SELECT dni.item_code, SUM(dni.qty) as total_qty
-				FROM `tabDelivery Note` dn
-				INNER JOIN `tabDelivery Note Item` dni ON dni.parent = dn.name
-				WHERE dn.customer = %(customer)s
-					AND dn.docstatus = 1
-					AND dn.posting_date BETWEEN %(period_from)s AND %(period_to)s
-					AND dni.item_code IS NOT NULL
-				GROUP BY dni.item_code
-			""", {
-				"customer": customer_name,
-				"period_from": period_from,
-				"period_to": period_to
-			}, as_dict=True)
-			
-			for item in delivery_notes_customer:
-				item_code = item.item_code
-				qty = flt(item.total_qty)
-				if item_code not in dn_data:
-					dn_data[item_code] = 0
-				dn_data[item_code] += qty
-		
-		return dn_data
-	
-	def get_production_report_quantities(self, period_from, period_to):
-		"""
-		Get production report quantities (Cutting, Stitching, Packing) for the supplier
-		Returns: dict {item_code: {cutting_qty: x, stitching_qty: y, packing_qty: z}}
-		"""
-		production_data = {}
-		
-		# Get Cutting Report quantities
-		cutting_data = frappe.db.sql("""
-			SELECT crct.so_item as item_code, SUM(crct.cutting_qty) as total_qty
+			GROUP BY dn.name, dni.item_code
+			{customer_branch}
+		""", values, as_dict=True)
+		
+		dn_qty = {}
+		for row in dn_rows:
+			if row.item_code:
+				dn_qty[row.item_code] = dn_qty.get(row.item_code, 0) + flt(row.total_qty)
+		
+		# Cutting / Stitching / Packing quantities and report names together
+		stage_rows = frappe.db.sql("""
+			SELECT 'cutting_qty' AS stage, cr.name AS report, crct.so_item AS item_code, SUM(crct.cutting_qty) AS total_qty
 			FROM `tabCutting Report` cr
-			INNER JOIN `tabCutting Report CT` crct ON crct.parent = cr.name
+			LEFT JOIN `tabCutting Report CT` crct ON crct.parent = cr.name
 			WHERE cr.supplier = %(supplier)s
 				AND cr.docstatus = 1
 				AND cr.date BETWEEN %(period_from)s AND %(period_to)s
-				AND crct.so_item IS NOT NULL
-			GROUP BY crct.so_item
-		""", {
-			"supplier": self.supplier,
-			"period_from": period_from,
-			"period_to": period_to
-		}, as_dict=True)
-		
-		# Get Stitching Report quantities
-		stitching_data = frappe.db.sql("""
-			SELECT srct.so_item as item_code, SUM(srct.stitching_qty) as total_qty
+			GROUP BY cr.name, crct.so_item
+			UNION ALL
+			SELECT 'stitching_qty', sr.name, srct.so_item, SUM(srct.stitching_qty)
 			FROM `tabStitching Report` sr
-			INNER JOIN `tabStitching Report CT` srct ON srct.parent = sr.name
+			LEFT JOIN `tabStitching Report CT` srct ON srct.parent = sr.name
 			WHERE sr.supplier = %(supplier)s
 				AND sr.docstatus = 1
 				AND sr.date BETWEEN %(period_from)s AND %(period_to)s
-				AND srct.so_item IS NOT NULL
-			GROUP BY srct.so_item
-		""", {
-			"supplier": self.supplier,
-			"period_from": period_from,
-			"period_to": period_to
-		}, as_dict=True)
-		
-		# Get Packing Report quantities
-		packing_data = frappe.db.sql("""
-			SELECT prct.so_item as item_code, SUM(prct.packaging_qty) as total_qty
+			GROUP BY sr.name, srct.so_item
+			UNION ALL
+			SELECT 'packing_qty', pr.name, prct.so_item, SUM(prct.packaging_qty)
 			FROM `tabPacking Report` pr
-			INNER JOIN `tabPacking Report CT` prct ON prct.parent = pr.name
+			LEFT JOIN `tabPacking Report CT` prct ON prct.parent = pr.name
 			WHERE pr.supplier = %(supplier)s
 				AND pr.docstatus = 1
 				AND pr.date BETWEEN %(period_from)s AND %(period_to)s
-				AND prct.so_item IS NOT NULL
-			GROUP BY prct.so_item
-		""", {
-			"supplier": self.supplier,
-			"period_from": period_from,
-			"period_to": period_to
-		}, as_dict=True)
-		
-		# Combine data
-		for item in cutting_data:
-			item_code = item.item_code
-			if item_code not in production_data:
-				production_data[item_code] = {}
-			production_data[item_code]["cutting_qty"] = flt(item.total_qty)
-		
-		for item in stitching_data:
-			item_code = item.item_code
-			if item_code not in production_data:
-				production_data[item_code] = {}
-			production_data[item_code]["stitching_qty"] = flt(item.total_qty)
-		
-		for item in packing_data:
-			item_code = item.item_code
-			if item_code not in production_data:
-				production_data[item_code] = {}
-			production_data[item_code]["packing_qty"] = flt(item.total_qty)
-		
-		return production_data
-	
-	def build_references(self, period_from, period_to):
-		"""Build references string for Delivery Notes and Reports"""
-		references = []
-		
-		# Get Delivery Note references linked through Purchase Orders
-		dn_refs_po = frappe.db.sql("""
-			SELECT DISTINCT dn.name
-			FROM `tabDelivery Note Item` dni
-			INNER JOIN `tabDelivery Note` dn ON dn.name = dni.parent
-			LEFT JOIN `tabPurchase Order Item` poi ON poi.name = dni.purchase_order_item
-			LEFT JOIN `tabPurchase Order` po ON po.name = poi.parent
-			WHERE po.supplier = %(supplier)s
-				AND dn.docstatus = 1
-				AND dn.posting_date BETWEEN %(period_from)s AND %(period_to)s
-			ORDER BY dn.name
-		""", {
-			"supplier": self.supplier,
-			"period_from": period_from,
-			"period_to": period_to
-		}, as_list=True)
-		
-		# Get Delivery Note references if supplier is customer
-		try:
-			supplier_doc = frappe.get_doc("Supplier", self.supplier)
-			customer_name = None
-			if hasattr(supplier_doc, 'customer') and supplier_doc.customer:
-				customer_name = supplier_doc.customer
-		except:
-			customer_name = None
+			GROUP BY pr.name, prct.so_item
+		""", values, as_dict=True)
+		
+		production = {}
+		report_refs = {"cutting_qty": set(), "stitching_qty": set(), "packing_qty": set()}
+		for row in stage_rows:
+			report_refs[row.stage].add(row.report)
+			if not row.item_code:
+				continue
+			item_data = production.setdefault(row.item_code, {})
+			item_data[row.stage] = item_data.get(row.stage, 0) + flt(row.total_qty)
 		
-		dn_refs_customer = []
-		if customer_name:
-			dn_refs_customer = frappe.db.sql("""
-				SELECT DISTINCT dn.name
-				FROM `tabDelivery Note` dn
-				INNER JOIN `tabDelivery Note Item` dni ON dni.parent = dn.name
-				WHERE dn.customer = %(customer)s
-					AND dn.docstatus = 1
-					AND dn.posting_date BETWEEN %(period_from)s AND %(period_to)s
-				ORDER BY dn.name
-			""", {
-				"customer": customer_name,
-				"period_from": period_from,
-				"period_to": period_to
-			}, as_list=True)
-		
-		# Combine and deduplicate
-		all_dn_refs = list(set([ref[0] for ref in dn_refs_po] + [ref[0] for ref in dn_refs_customer]))
-		if all_dn_refs:
-			references.append("Delivery Notes: " + ", ".join(sorted(all_dn_refs)))
-		
-		# Get Purchase Receipt references
 		pr_refs = frappe.db.sql("""
 			SELECT DISTINCT pr.name
 			FROM `tabPurchase Receipt` pr
@@ -372,65 +268,47 @@ class SubcontractorProductionBilling(Document):
 				AND pr.docstatus = 1
 				AND pr.posting_date BETWEEN %(period_from)s AND %(period_to)s
 			ORDER BY pr.name
-		""", {
-			"supplier": self.supplier,
-			"period_from": period_from,
-			"period_to": period_to
-		}, as_list=True)
-		
-		if pr_refs:
-			references.append("Purchase Receipts: " + ", ".join([ref[0] for ref in pr_refs]))
-		
-		# Get Report references
-		report_refs = []
-		
-		cutting_refs = frappe.db.sql("""
-			SELECT DISTINCT name
-			FROM `tabCutting Report`
-			WHERE supplier = %(supplier)s
-				AND docstatus = 1
-				AND date BETWEEN %(period_from)s AND %(period_to)s
-			ORDER BY name
-		""", {
-			"supplier": self.supplier,
-			"period_from": period_from,
-			"period_to": period_to
-		}, as_list=True)
-		
-		if cutting_refs:
-			report_refs.append("Cutting: " + ", ".join([ref[0] for ref in cutting_refs]))
-		
-		stitching_refs = frappe.db.sql("""
-			SELECT DISTINCT name
-			FROM `tabStitching Report`
-			WHERE supplier = %(supplier)s
-				AND docstatus = 1
-				AND date BETWEEN %(period_from)s AND %(period_to)s
-			ORDER BY name
-		""", {
-			"supplier": self.supplier,
-			"period_from": period_from,
-			"period_to": period_to
-		}, as_list=True)
+		""", values, pluck=True)
+		
+		return {
+			"dn_qty": dn_qty,
+			"dn_refs": sorted({row.delivery_note for row in dn_rows}),
+			"production": production,
+			"report_refs": {stage: sorted(names) for stage, names in report_refs.items()},
+			"pr_refs": pr_refs
+		}
+	
+	def get_delivery_note_quantities(self, period_from, period_to):
+		"""
+		Get Delivery Note quantities for the supplier
+		Links Delivery Notes to suppliers through Purchase Orders
+		Also checks if supplier is set up as customer
+		Returns: dict {item_code: total_qty}
+		"""
+		return self.get_billing_sources(period_from, period_to)["dn_qty"]
+	
+	def get_production_report_quantities(self, period_from, period_to):
+		"""
+		Get production report quantities (Cutting, Stitching, Packing) for the supplier
+		Returns: dict {item_code: {cutting_qty: x, stitching_qty: y, packing_qty: z}}
+		"""
+		return self.get_billing_sources(period_from, period_to)["production"]
+	
+	def build_references(self, period_from, period_to, sources=None):
+		"""Build references string for Delivery Notes and Reports"""
+		sources = sources or self.get_billing_sources(period_from, period_to)
+		references = []
 		
-		if stitching_refs:
-			report_refs.append("Stitching: " + ", ".join([ref[0] for ref in stitching_refs]))
+		if sources["dn_refs"]:
+			references.append("Delivery Notes: " + ", ".join(sources["dn_refs"]))
 		
-		packing_refs = frappe.db.sql("""
-			SELECT DISTINCT name
-			FROM `tabPacking Report`
-			WHERE supplier = %(supplier)s
-				AND docstatus = 1
-				AND date BETWEEN %(period_from)s AND %(period_to)s
-			ORDER BY name
-		""", {
-			"supplier": self.supplier,
-			"period_from": period_from,
-			"period_to": period_to
-		}, as_list=True)
+		if sources["pr_refs"]:
+			references.append("Purchase Receipts: " + ", ".join(sources["pr_refs"]))
 		
-		if packing_refs:
-			report_refs.append("Packing: " + ", ".join([ref[0] for ref in packing_refs]))
+		report_refs = []
+		for label, stage in (("Cutting", "cutting_qty"), ("Stitching", "stitching_qty"), ("Packing", "packing_qty")):
+			if sources["report_refs"][stage]:
+				report_refs.append(f"{label}: " + ", ".join(sources["report_refs"][stage]))
 		
 		if report_refs:
 			references.append(" | ".join(report_refs))
@@ -506,8 +384,9 @@ def refresh_rates(docname):
 	updated_count = 0
 	missing_items = []
 	
+	rates = get_rates(doc.supplier, [item.item_code for item in doc.billing_items], doc.posting_date)
 	for item in doc.billing_items:
-		rate_info = get_rate(doc.supplier, item.item_code, doc.posting_date)
+		rate_info = rates.get(item.item_code)
 		if rate_info:
 			new_rate = flt(rate_info.get("rate_per_pcs", 0))
 			if new_rate > 0:
@@ -529,6 +408,6 @@ def refresh_rates(docname):
 	}
 
 
-# Import the get_rate function
-from manufacturing_addon.manufacturing_addon.doctype.subcontractor_rate_card.subcontractor_rate_card import get_rate
+# Import the rate card resolvers
+from manufacturing_addon.manufacturing_addon.doctype.subcontractor_rate_card.subcontractor_rate_card import get_rates
 
@@ -51,6 +51,58 @@ class SubcontractorRateCard(Document):
 				).format(card.name))
 
 
+def on_doctype_update():
+	# get_rates looks up (supplier, item_code) ordered by valid_from
+	frappe.db.add_index("Subcontractor Rate Card", ["supplier", "item_code", "valid_from"])
+
+
+def get_rates(supplier, item_codes, posting_date=None):
+	"""
+	Get the effective rate for many items of a supplier on a given date, in one query
+
+	Per item, the rate card valid on posting_date with the latest valid_from wins;
+	if none is valid, the latest rate card is used (same fallback as get_rate).
+
+	Returns:
+		dict: {item_code: rate info} for items that have any rate card
+	"""
+	item_codes = list({code for code in item_codes or [] if code})
+	if not supplier or not item_codes:
+		return {}
+
+	from frappe.utils import getdate
+	posting_date = getdate(posting_date or frappe.utils.today())
+
+	rate_cards = frappe.db.sql("""
+		SELECT name, item_code, rate_per_pcs, uom, valid_from, valid_to
+		FROM `tabSubcontractor Rate Card`
+		WHERE supplier = %(supplier)s
+			AND item_code IN %(item_codes)s
+		ORDER BY item_code, valid_from DESC
+	""", {
+		"supplier": supplier,
+		"item_codes": item_codes
+	}, as_dict=True)
+
+	valid = {}
+	latest = {}
+	for card in rate_cards:
+		latest.setdefault(card.item_code, card)
+		if (
+			card.item_code not in valid
+			and card.valid_from and getdate(card.valid_from) <= posting_date
+			and (not card.valid_to or getdate(card.valid_to) >= posting_date)
+		):
+			valid[card.item_code] = card
+
+	rates = {}
+	for item_code, card in latest.items():
+		card = valid.get(item_code) or card
+		card.pop("item_code", None)
+		rates[item_code] = card
+	return rates
+
+
 @frappe.whitelist()
 def get_rate(supplier, item_code, posting_date=None):
 	"""
@@ -64,49 +116,4 @@ def get_rate(supplier, item_code, posting_date=None):
 	Returns:
 		dict: Rate information or None
 	"""
-	if not posting_date:
-		posting_date = frappe.utils.today()
-	
-	# Convert posting_date to date object for comparison
-	from frappe.utils import getdate
-	posting_date_obj = getdate(posting_date)
-	
-	# Find the latest valid rate card
-	# First try: Find rate card where posting_date falls within valid_from and valid_to
-	rate_card = frappe.db.sql("""
-		SELECT name, rate_per_pcs, uom, valid_from, valid_to
-		FROM `tabSubcontractor Rate Card`
-		WHERE supplier = %(supplier)s
-			AND item_code = %(item_code)s
-			AND valid_from <= %(posting_date)s
-			AND (valid_to IS NULL OR valid_to >= %(posting_date)s)
-		ORDER BY valid_from DESC
-		LIMIT 1
-	""", {
-		"supplier": supplier,
-		"item_code": item_code,
-		"posting_date": posting_date
-	}, as_dict=True)
-	
-	if rate_card:
-		return rate_card[0]
-	
-	# Fallback: If no rate card found for the exact date, get the latest rate card
-	# (in case valid_from is in the future but user wants to use it)
-	latest_rate_card = frappe.db.sql("""
-		SELECT name, rate_per_pcs, uom, valid_from, valid_to
-		FROM `tabSubcontractor Rate Card`
-		WHERE supplier = %(supplier)s
-			AND item_code = %(item_code)s
-		ORDER BY valid_from DESC
-		LIMIT 1
-	""", {
-		"supplier": supplier,
-		"item_code": item_code
-	}, as_dict=True)
-	
-	if latest_rate_card:
-		return latest_rate_card[0]
-	
-	return None
-
+	return get_rates(supplier, [item_code], posting_date).get(item_code)
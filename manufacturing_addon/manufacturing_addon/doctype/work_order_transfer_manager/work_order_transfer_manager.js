@@ -226,6 +226,10 @@ frappe.ui.form.on('Work Order Transfer Manager', {
         
         if (frm.fields_dict.dashboard_status) {
             const wrapper = $(frm.fields_dict.dashboard_status.wrapper);
+            // Aggregates come from the server; table rows from the loaded form
+            if (!data.work_order_summary) {
+                Object.assign(data, get_wotm_dashboard_rows(frm));
+            }
             const dashboard_html = create_wotm_dashboard_html(data);
             $(wrapper).empty();
             $(dashboard_html).appendTo(wrapper);
@@ -772,6 +776,7 @@ frappe.ui.form.on('Work Order Transfer Manager', {
                 console.log("🔍 DEBUG: Background job started callback:", r);
                 if (r.message && r.message.success) {
                     frappe.show_alert({ message: __("Background job started"), indicator: "green" });
+                    frm.trigger("listen_background_transfer_progress");
                 } else {
                     frappe.show_alert({ message: __("Error starting background job"), indicator: "red" });
                 }
@@ -783,6 +788,38 @@ frappe.ui.form.on('Work Order Transfer Manager', {
         });
     },
     
+    listen_background_transfer_progress: function(frm) {
+        const channel = `raw_material_transfer_job_${frm.doc.name}`;
+        frappe.realtime.off(channel);
+        frappe.realtime.on(channel, function(data) {
+            if (!data || !data.status) {
+                return;
+            }
+            if (data.status === "Failed") {
+                frappe.realtime.off(channel);
+                frappe.show_alert({
+                    message: __("Transfer job stopped: {0}. Run it again to resume.", [data.message || ""]),
+                    indicator: "red"
+                }, 10);
+            } else if (data.status === "Completed") {
+                frappe.realtime.off(channel);
+                frappe.show_alert({
+                    message: __("Created {0} Raw Material Transfer(s)", [data.transfers.length]),
+                    indicator: "green"
+                });
+                frm.reload_doc();
+            } else {
+                frappe.show_progress(
+                    __("Creating Raw Material Transfers"),
+                    data.completed_chunks,
+                    data.total_chunks,
+                    __("Chunk {0} of {1}", [data.completed_chunks, data.total_chunks]),
+                    true
+                );
+            }
+        });
+    },
+
     select_all_items: function(frm) {
         console.log("🔍 DEBUG: select_all_raw_materials() called");
         frm.doc.transfer_items.forEach(function(item) {
@@ -1331,6 +1368,35 @@ frappe.ui.form.on("Work Order Transfer Items Table", {
     }
 });
 
+function get_wotm_dashboard_rows(frm) {
+    const work_order_summary = (frm.doc.work_order_summary || []).map(item => {
+        const total_ordered = flt(item.total_ordered_qty);
+        const total_transferred = flt(item.total_transferred_qty);
+        return {
+            item_code: item.item_code,
+            item_name: item.item_name,
+            total_ordered_qty: total_ordered,
+            total_transferred_qty: total_transferred,
+            total_pending_qty: flt(item.total_pending_qty),
+            progress_percentage: total_ordered > 0 ? flt((total_transferred / total_ordered) * 100, 1) : 0
+        };
+    });
+
+    const raw_materials = (frm.doc.transfer_items || []).map(item => ({
+        item_code: item.item_code,
+        item_name: item.item_name,
+        total_required_qty: flt(item.total_required_qty),
+        transferred_qty_so_far: flt(item.transferred_qty_so_far),
+        pending_qty: flt(item.pending_qty),
+        item_transfer_status: item.item_transfer_status || "Pending",
+        item_transfer_percentage: flt(item.item_transfer_percentage),
+        source: item.source,
+        extra_percentage: item.extra_percentage
+    }));
+
+    return { work_order_summary, raw_materials };
+}
+
 function create_wotm_dashboard_html(data) {
     let html = `
         <div style="padding: 20px; background: #f8f9fa; border-radius: 8px; margin: 10px 0;">
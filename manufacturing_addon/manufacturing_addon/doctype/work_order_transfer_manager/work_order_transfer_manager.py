@@ -1,12 +1,17 @@
 import pstats
 import frappe
 from frappe import _
-from frappe.utils import flt
+from frappe.utils import cint, flt
 from rq.job import Job
 from rq.command import send_stop_job_command
 from frappe.utils.background_jobs import get_redis_conn
 import time
 
+from manufacturing_addon.manufacturing_addon.utils.query_budget import query_budget
+from manufacturing_addon.manufacturing_addon.utils.trace import get_tracer
+
+trace = get_tracer("work_order_transfer_manager")
+
 class WorkOrderTransferManager(frappe.model.document.Document):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -18,10 +23,10 @@ class WorkOrderTransferManager(frappe.model.document.Document):
 
     def onload(self):
         """Called when document is loaded in UI"""
-        print(f"🔍 DEBUG: onload() called for document: {self.name}")
+        trace("🔍 DEBUG: onload() called for document: {}", self.name)
         # Auto-calculate transferred quantities if they are all 0
         if self.transfer_items and all(flt(item.transferred_qty_so_far) == 0 for item in self.transfer_items):
-            print(f"🔍 DEBUG: All transferred quantities are 0, calculating from Stock Entries")
+            trace("🔍 DEBUG: All transferred quantities are 0, calculating from Stock Entries")
             work_orders = [wo.work_order for wo in self.work_order_details] if self.work_order_details else []
             calculated_quantities = calculate_transferred_quantities_from_all_sources(self.name, work_orders)
             
@@ -30,12 +35,19 @@ class WorkOrderTransferManager(frappe.model.document.Document):
                     item.transferred_qty_so_far = calculated_quantities[item.item_code]
                     # Recalculate pending quantity
                     item.pending_qty = max(flt(item.total_required_qty) - flt(item.transferred_qty_so_far), 0)
-                    print(f"🔍 DEBUG: Calculated transferred_qty_so_far for {item.item_code}: {item.transferred_qty_so_far}, pending: {item.pending_qty}")
+                    trace(
+                        "🔍 DEBUG: Calculated transferred_qty_so_far for {}: {}, pending: {}",
+                        item.item_code,
+                        item.transferred_qty_so_far,
+                        item.pending_qty,
+                    )
 
     def validate(self):
         if not self._totals_calculated:
             self.calculate_totals()
             self._totals_calculated = True
+
+        self.set_dashboard_summary()
         
         # Auto-fetch cost center from sales order if not set (only if field exists)
         if hasattr(self, 'cost_center') and not self.cost_center and self.sales_order:
@@ -60,7 +72,12 @@ class WorkOrderTransferManager(frappe.model.document.Document):
                     # Try to set company one more time before throwing error
                     if self.company:
                         item.company = self.company
-                        print(f"🔍 DEBUG: Set company for transfer item {i+1} ({item.item_code}) during validation: {item.company}")
+                        trace(
+                            "🔍 DEBUG: Set company for transfer item {} ({}) during validation: {}",
+                            i + 1,
+                            item.item_code,
+                            item.company,
+                        )
                     else:
                         frappe.throw(f"Company field is missing for transfer item {i+1} ({item.item_code}). Please ensure all items have a company set.")
         
@@ -71,7 +88,12 @@ class WorkOrderTransferManager(frappe.model.document.Document):
                         # Try to set company one more time before throwing error
                         if self.company:
                             item.company = self.company
-                            print(f"🔍 DEBUG: Set company for work order detail {i+1} ({item.work_order}) during validation: {item.company}")
+                            trace(
+                                "🔍 DEBUG: Set company for work order detail {} ({}) during validation: {}",
+                                i + 1,
+                                item.work_order,
+                                item.company,
+                            )
                         else:
                             frappe.throw(f"Company field is missing for work order detail {i+1} ({item.work_order}). Please ensure all items have a company set.")
         
@@ -82,17 +104,22 @@ class WorkOrderTransferManager(frappe.model.document.Document):
                         # Try to set company one more time before throwing error
                         if self.company:
                             item.company = self.company
-                            print(f"🔍 DEBUG: Set company for work order summary {i+1} ({item.item_code}) during validation: {item.company}")
+                            trace(
+                                "🔍 DEBUG: Set company for work order summary {} ({}) during validation: {}",
+                                i + 1,
+                                item.item_code,
+                                item.company,
+                            )
                         else:
                             frappe.throw(f"Company field is missing for work order summary {i+1} ({item.item_code}). Please ensure all items have a company set.")
 
     def create_extra_qty_request(self):
         """Create a single consolidated Extra Qty Request based on extra_percentage in transfer_items"""
-        print(f"🔍 DEBUG: create_extra_qty_request() called for document: {self.name}")
+        trace("🔍 DEBUG: create_extra_qty_request() called for document: {}", self.name)
         
         # Check if we have transfer_items with extra_percentage > 0
         if not self.transfer_items:
-            print(f"🔍 DEBUG: No transfer items found")
+            trace("🔍 DEBUG: No transfer items found")
             return
         
         # Collect all items with extra percentage and calculate their extra quantities
@@ -112,13 +139,19 @@ class WorkOrderTransferManager(frappe.model.document.Document):
                             'extra_percentage': extra_percentage,
                             'total_required_qty': total_required_qty
                         })
-                        print(f"🔍 DEBUG: Item {item.item_code}: total_required={total_required_qty}, extra_pct={extra_percentage}%, extra_qty={extra_qty}")
+                        trace(
+                            "🔍 DEBUG: Item {}: total_required={}, extra_pct={}%, extra_qty={}",
+                            item.item_code,
+                            total_required_qty,
+                            extra_percentage,
+                            extra_qty,
+                        )
         
         if not extra_items:
-            print(f"🔍 DEBUG: No items with extra quantities found")
+            trace("🔍 DEBUG: No items with extra quantities found")
             return
         
-        print(f"🔍 DEBUG: Creating consolidated Extra Qty Request with {len(extra_items)} items")
+        trace("🔍 DEBUG: Creating consolidated Extra Qty Request with {} items", len(extra_items))
         
         # Create a single consolidated Extra Qty Request document
         doc = frappe.get_doc({
@@ -140,17 +173,17 @@ class WorkOrderTransferManager(frappe.model.document.Document):
         
         # Insert the consolidated document
         doc.insert()
-        print(f"🔍 DEBUG: Created consolidated Extra Qty Request: {doc.name} with {len(extra_items)} items")
+        trace("🔍 DEBUG: Created consolidated Extra Qty Request: {} with {} items", doc.name, len(extra_items))
         frappe.msgprint(f"Created consolidated Extra Qty Request: {doc.name} with {len(extra_items)} items")
         
         return doc.name
 
     def add_extra_quantities_to_pending(self):
         """Add extra quantities directly to pending quantities instead of creating Extra Qty Requests"""
-        print(f"🔍 DEBUG: add_extra_quantities_to_pending() called for document: {self.name}")
+        trace("🔍 DEBUG: add_extra_quantities_to_pending() called for document: {}", self.name)
         
         if not self.transfer_items:
-            print(f"🔍 DEBUG: No transfer items found")
+            trace("🔍 DEBUG: No transfer items found")
             return
         
         extra_items_added = 0
@@ -187,17 +220,23 @@ class WorkOrderTransferManager(frappe.model.document.Document):
                     )
                     
                     extra_items_added += 1
-                    print(f"🔍 DEBUG: Added {extra_qty} extra to pending for {item.item_code} (was {current_pending}, now {new_pending})")
+                    trace(
+                        "🔍 DEBUG: Added {} extra to pending for {} (was {}, now {})",
+                        extra_qty,
+                        item.item_code,
+                        current_pending,
+                        new_pending,
+                    )
         
         if extra_items_added > 0:
             frappe.msgprint(f"Added extra quantities to pending quantities for {extra_items_added} items. No separate Extra Qty Request created.")
-            print(f"🔍 DEBUG: Added extra quantities to pending for {extra_items_added} items")
+            trace("🔍 DEBUG: Added extra quantities to pending for {} items", extra_items_added)
         else:
-            print(f"🔍 DEBUG: No extra quantities to add to pending")
+            trace("🔍 DEBUG: No extra quantities to add to pending")
 
     def create_extra_qty_request_item(self, item, extra_qty=None):
         """Create individual Extra Qty Request item"""
-        print(f"🔍 DEBUG: create_extra_qty_request_item() called for document: {self.name}")
+        trace("🔍 DEBUG: create_extra_qty_request_item() called for document: {}", self.name)
         frappe.msgprint(f"🔍 DEBUG: create_extra_qty_request_item() called for document: {self.name}")
         
         # Calculate extra_qty if not provided (for backward compatibility)
@@ -212,7 +251,7 @@ class WorkOrderTransferManager(frappe.model.document.Document):
                 extra_qty = total_required_qty * (extra_percentage / 100) if total_required_qty > 0 and extra_percentage > 0 else 0
         
         if extra_qty <= 0:
-            print(f"🔍 DEBUG: No extra qty to create request for item {item.item_code}")
+            trace("🔍 DEBUG: No extra qty to create request for item {}", item.item_code)
             return
         
         doc = frappe.get_doc({
@@ -228,10 +267,10 @@ class WorkOrderTransferManager(frappe.model.document.Document):
             "qty": flt(extra_qty),
             "uom": getattr(item, "uom", None),
         })
-        print(f"🔍 DEBUG: About to insert extra qty request item: {doc.name}")
+        trace("🔍 DEBUG: About to insert extra qty request item: {}", doc.name)
         frappe.msgprint(f"🔍 DEBUG: About to insert extra qty request item: {doc.name}")
         doc.insert()
-        print(f"🔍 DEBUG: Created extra qty request item: {doc.name}")
+        trace("🔍 DEBUG: Created extra qty request item: {}", doc.name)
         frappe.msgprint(f"🔍 DEBUG: Created extra qty request item: {doc.name}")
 
 
@@ -270,7 +309,7 @@ class WorkOrderTransferManager(frappe.model.document.Document):
         self.recalculate_quantities_from_transfer_qty()
 
     def before_submit(self):
-        print(f"🔍 DEBUG: before_submit() called for document: {self.name}")
+        trace("🔍 DEBUG: before_submit() called for document: {}", self.name)
         if not self._totals_calculated:
             self.calculate_totals()
             self._totals_calculated = True
@@ -278,7 +317,7 @@ class WorkOrderTransferManager(frappe.model.document.Document):
         # Ensure company is set on parent document
         if not self.company:
             self.company = frappe.defaults.get_global_default("company")
-            print(f"🔍 DEBUG: Set company in before_submit: {self.company}")
+            trace("🔍 DEBUG: Set company in before_submit: {}", self.company)
 
         # Ensure company is set in all child tables before submitting
         self.ensure_company_in_child_tables()
@@ -290,7 +329,7 @@ class WorkOrderTransferManager(frappe.model.document.Document):
             frappe.throw("No raw materials found. Please fetch work orders first.")
 
     def validate_sales_order(self):
-        print(f"🔍 DEBUG: validate_sales_order() called")
+        trace("🔍 DEBUG: validate_sales_order() called")
         if self.sales_order:
             so_doc = frappe.get_doc("Sales Order", self.sales_order)
             self.customer = so_doc.customer
@@ -298,15 +337,15 @@ class WorkOrderTransferManager(frappe.model.document.Document):
             # Ensure company is set from sales order if not already set
             if not self.company and so_doc.company:
                 self.company = so_doc.company
-                print(f"🔍 DEBUG: Set company from sales order: {self.company}")
+                trace("🔍 DEBUG: Set company from sales order: {}", self.company)
 
     def calculate_totals(self):
-        print(f"🔍 DEBUG: calculate_totals() called")
+        trace("🔍 DEBUG: calculate_totals() called")
         
         # Ensure company is set
         if not self.company:
             self.company = frappe.defaults.get_global_default("company")
-            print(f"🔍 DEBUG: Set company in calculate_totals: {self.company}")
+            trace("🔍 DEBUG: Set company in calculate_totals: {}", self.company)
         
         total_ordered, total_delivered, total_pending = 0, 0, 0
 
@@ -323,11 +362,36 @@ class WorkOrderTransferManager(frappe.model.document.Document):
         if hasattr(self, 'total_pending_qty'):
             self.total_pending_qty = total_pending
 
-        print(f"🔍 DEBUG: Totals calculated - Ordered: {total_ordered}, Delivered: {total_delivered}, Pending: {total_pending}")
+        trace(
+            "🔍 DEBUG: Totals calculated - Ordered: {}, Delivered: {}, Pending: {}",
+            total_ordered,
+            total_delivered,
+            total_pending,
+        )
+
+    def set_dashboard_summary(self):
+        """Store dashboard aggregates on the parent (see get_wotm_dashboard_data)."""
+        status_counts = {"Pending": 0, "In Progress": 0, "Completed": 0}
+        for item in self.transfer_items or []:
+            status = item.item_transfer_status if item.item_transfer_status in status_counts else "Pending"
+            status_counts[status] += 1
+
+        self.update({
+            "total_work_orders": len(self.work_order_details or []),
+            "completed_work_orders": sum(
+                1 for row in self.work_order_details or [] if flt(row.pending_qty) <= 0
+            ),
+            "total_raw_materials": len(self.transfer_items or []),
+            "total_transferred_qty": sum(flt(row.total_transferred_qty) for row in self.work_order_summary or []),
+            "total_pending_transfer_qty": sum(flt(row.total_pending_qty) for row in self.work_order_summary or []),
+            "raw_materials_pending": status_counts["Pending"],
+            "raw_materials_in_progress": status_counts["In Progress"],
+            "raw_materials_completed": status_counts["Completed"],
+        })
 
     def recalculate_quantities_from_transfer_qty(self):
         """Recalculate quantities based on transfer_qty changes"""
-        print(f"🔍 DEBUG: recalculate_quantities_from_transfer_qty() called")
+        trace("🔍 DEBUG: recalculate_quantities_from_transfer_qty() called")
         
         if not self.transfer_items:
             return
@@ -339,7 +403,15 @@ class WorkOrderTransferManager(frappe.model.document.Document):
             transferred_qty_so_far = flt(item.transferred_qty_so_far or 0)
             additional_transfer_qty = flt(item.additional_transfer_qty or 0)
             
-            print(f"🔍 DEBUG: Processing {item.item_code} - transfer_qty: {transfer_qty}, total_required_qty: {total_required_qty}, extra_qty: {extra_qty}, transferred_qty_so_far: {transferred_qty_so_far}, additional_transfer_qty: {additional_transfer_qty}")
+            trace(
+                "🔍 DEBUG: Processing {} - transfer_qty: {}, total_required_qty: {}, extra_qty: {}, transferred_qty_so_far: {}, additional_transfer_qty: {}",
+                item.item_code,
+                transfer_qty,
+                total_required_qty,
+                extra_qty,
+                transferred_qty_so_far,
+                additional_transfer_qty,
+            )
             
             # Calculate total_available_qty = total_required_qty + extra_qty + additional_transfer_qty
             new_total_available_qty = total_required_qty + extra_qty + additional_transfer_qty
@@ -352,17 +424,23 @@ class WorkOrderTransferManager(frappe.model.document.Document):
             # Update transfer_qty to match the new total available (if user manually changed additional_transfer_qty)
             if additional_transfer_qty > 0:
                 item.transfer_qty = new_total_available_qty
-                print(f"🔍 DEBUG: Updated transfer_qty to match total_available_qty: {item.transfer_qty}")
+                trace("🔍 DEBUG: Updated transfer_qty to match total_available_qty: {}", item.transfer_qty)
             
-            print(f"🔍 DEBUG: Updated {item.item_code} - additional_transfer_qty: {additional_transfer_qty}, total_available_qty: {new_total_available_qty}, pending_qty: {new_pending_qty}")
+            trace(
+                "🔍 DEBUG: Updated {} - additional_transfer_qty: {}, total_available_qty: {}, pending_qty: {}",
+                item.item_code,
+                additional_transfer_qty,
+                new_total_available_qty,
+                new_pending_qty,
+            )
 
     def on_submit(self):
-        print(f"🔍 DEBUG: on_submit() called for document: {self.name}")
+        trace("🔍 DEBUG: on_submit() called for document: {}", self.name)
         
         # Ensure company is set
         if not self.company:
             self.company = frappe.defaults.get_global_default("company")
-            print(f"🔍 DEBUG: Set company in on_submit: {self.company}")
+            trace("🔍 DEBUG: Set company in on_submit: {}", self.company)
         
         # Extra quantities are now added during "Fetch Work Order" instead of on submit
         # No need to add extra quantities here anymore
@@ -378,15 +456,15 @@ class WorkOrderTransferManager(frappe.model.document.Document):
         # except Exception as e:
         #     print(f"⚠️ WARNING: Could not auto-create Extra Raw Material Transfer on submit: {e}")
         
-        print(f"🔍 DEBUG: Document submitted successfully")
+        trace("🔍 DEBUG: Document submitted successfully")
 
     def on_cancel(self):
-        print(f"🔍 DEBUG: on_cancel() called for document: {self.name}")
+        trace("🔍 DEBUG: on_cancel() called for document: {}", self.name)
         
         # Ensure company is set
         if not self.company:
             self.company = frappe.defaults.get_global_default("company")
-            print(f"🔍 DEBUG: Set company in on_cancel: {self.company}")
+            trace("🔍 DEBUG: Set company in on_cancel: {}", self.company)
         
         existing_transfers = frappe.get_all(
             "Raw Material Transfer",
@@ -408,16 +486,17 @@ def get_transfer_status(transferred_qty, ordered_qty):
 
 
 @frappe.whitelist()
+@query_budget()
 def populate_work_order_tables(sales_order, doc_name):
     """Populate WOTM: finished items, work orders, and raw materials"""
-    print(f"🔍 DEBUG: Starting populate_work_order_tables for sales_order: {sales_order}, doc_name: {doc_name}")
+    trace("🔍 DEBUG: Starting populate_work_order_tables for sales_order: {}, doc_name: {}", sales_order, doc_name)
     
     # Ensure we have a valid company
     company = frappe.defaults.get_global_default("company")
     if not company:
         frappe.throw("Company is not set in global defaults. Please set a default company.")
     
-    print(f"🔍 DEBUG: Using company: {company}")
+    trace("🔍 DEBUG: Using company: {}", company)
 
     # if doc_name.company:
     #     for i in doc_name:
@@ -426,32 +505,32 @@ def populate_work_order_tables(sales_order, doc_name):
         # Check if WOTM already exists for this sales order (only active ones)
         existing_wotm = frappe.db.exists("Work Order Transfer Manager", {"sales_order": sales_order, "docstatus": ["!=", 2]})
         if existing_wotm and existing_wotm == doc_name:
-            print(f"🔍 DEBUG: Active WOTM already exists for sales order {sales_order}: {existing_wotm}")
+            trace("🔍 DEBUG: Active WOTM already exists for sales order {}: {}", sales_order, existing_wotm)
             doc = frappe.get_doc("Work Order Transfer Manager", existing_wotm)
             
             # Fix existing child table rows with missing company field
-            print(f"🔍 DEBUG: Fixing existing child table rows with missing company field")
+            trace("🔍 DEBUG: Fixing existing child table rows with missing company field")
             
             # Fix transfer items
             if doc.transfer_items:
                 for item in doc.transfer_items:
                     if not item.company:
                         item.company = frappe.defaults.get_global_default("company")
-                        print(f"🔍 DEBUG: Fixed company for existing transfer item {item.item_code}")
+                        trace("🔍 DEBUG: Fixed company for existing transfer item {}", item.item_code)
             
             # Fix work order details
             if doc.work_order_details:
                 for item in doc.work_order_details:
                     if hasattr(item, "company") and not item.company:
                         item.company = frappe.defaults.get_global_default("company")
-                        print(f"🔍 DEBUG: Fixed company for existing work order detail {item.work_order}")
+                        trace("🔍 DEBUG: Fixed company for existing work order detail {}", item.work_order)
             
             # Fix work order summary
             if doc.work_order_summary:
                 for item in doc.work_order_summary:
                     if hasattr(item, "company") and not item.company:
                         item.company = frappe.defaults.get_global_default("company")
-                        print(f"🔍 DEBUG: Fixed company for existing work order summary {item.item_code}")
+                        trace("🔍 DEBUG: Fixed company for existing work order summary {}", item.item_code)
             
             # Ensure required fields are set (only for draft documents)
             if doc.docstatus == 0:
@@ -490,11 +569,14 @@ def populate_work_order_tables(sales_order, doc_name):
             # Save the document with fixed child table rows
             try:
                 doc.save()
-                print(f"🔍 DEBUG: Saved existing WOTM with company: {doc.company}")
+                trace("🔍 DEBUG: Saved existing WOTM with company: {}", doc.company)
             except Exception as save_error:
-                print(f"❌ DEBUG: Error saving existing WOTM: {save_error}")
                 # If save fails, try to fix the child table rows directly in the database
-                print(f"🔍 DEBUG: Attempting to fix child table rows directly in database")
+                trace(
+                    "❌ DEBUG: Error saving existing WOTM: {}\n"
+                    "🔍 DEBUG: Attempting to fix child table rows directly in database",
+                    save_error,
+                )
                 
                 # Fix transfer items directly in database
                 frappe.db.sql("""
@@ -505,11 +587,11 @@ def populate_work_order_tables(sales_order, doc_name):
                 
                 # Note: Work Order Details and Summary tables don't have company column
                 # Skip direct database updates for these tables
-                print(f"🔍 DEBUG: Skipping direct database updates for work order details/summary (no company column)")
+                trace("🔍 DEBUG: Skipping direct database updates for work order details/summary (no company column)")
                 
                 # Commit the changes
                 frappe.db.commit()
-                print(f"🔍 DEBUG: Fixed child table rows directly in database")
+                trace("🔍 DEBUG: Fixed child table rows directly in database")
                 
                 # Reload the document
                 doc = frappe.get_doc("Work Order Transfer Manager", existing_wotm)
@@ -518,11 +600,15 @@ def populate_work_order_tables(sales_order, doc_name):
             # Check if there's a cancelled document
             cancelled_wotm = frappe.db.exists("Work Order Transfer Manager", {"sales_order": sales_order, "docstatus": 2})
             if cancelled_wotm:
-                print(f"🔍 DEBUG: Found cancelled WOTM for sales order {sales_order}: {cancelled_wotm}, creating new document")
+                trace(
+                    "🔍 DEBUG: Found cancelled WOTM for sales order {}: {}, creating new document",
+                    sales_order,
+                    cancelled_wotm,
+                )
             
             # Create new document (either no existing WOTM or only cancelled ones exist)
             if not frappe.db.exists("Work Order Transfer Manager", doc_name):
-                print(f"🔍 DEBUG: Document {doc_name} not found, creating new document")
+                trace("🔍 DEBUG: Document {} not found, creating new document", doc_name)
                 doc = frappe.new_doc("Work Order Transfer Manager")
                 doc.sales_order = sales_order
                 doc.posting_date = frappe.utils.today()
@@ -550,46 +636,46 @@ def populate_work_order_tables(sales_order, doc_name):
                                 doc.target_warehouse = warehouses[1].name
                             else:
                                 doc.target_warehouse = warehouses[0].name
-                            print(f"🔍 DEBUG: source={doc.source_warehouse}, target={doc.target_warehouse}")
+                            trace("🔍 DEBUG: source={}, target={}", doc.source_warehouse, doc.target_warehouse)
                 except Exception as e:
-                    print(f"🔍 DEBUG: Error setting defaults: {e}")
+                    trace("🔍 DEBUG: Error setting defaults: {}", e)
 
-                print(f"🔍 DEBUG: About to insert new document")
+                trace("🔍 DEBUG: About to insert new document")
                 doc.insert()
-                print(f"🔍 DEBUG: Created new document with name: {doc.name}")
+                trace("🔍 DEBUG: Created new document with name: {}", doc.name)
                 
                 # Ensure company is set after insert
                 if not doc.company:
                     doc.company = frappe.defaults.get_global_default("company")
                     doc.save()
-                    print(f"🔍 DEBUG: Set company after insert: {doc.company}")
+                    trace("🔍 DEBUG: Set company after insert: {}", doc.company)
             else:
-                print(f"🔍 DEBUG: Found existing document: {doc_name}")
+                trace("🔍 DEBUG: Found existing document: {}", doc_name)
                 doc = frappe.get_doc("Work Order Transfer Manager", doc_name)
                 
                 # Fix existing child table rows with missing company field
-                print(f"🔍 DEBUG: Fixing existing child table rows with missing company field for document: {doc_name}")
+                trace("🔍 DEBUG: Fixing existing child table rows with missing company field for document: {}", doc_name)
                 
                 # Fix transfer items
                 if doc.transfer_items:
                     for item in doc.transfer_items:
                         if not item.company:
                             item.company = frappe.defaults.get_global_default("company")
-                            print(f"🔍 DEBUG: Fixed company for existing transfer item {item.item_code}")
+                            trace("🔍 DEBUG: Fixed company for existing transfer item {}", item.item_code)
                 
                 # Fix work order details
                 if doc.work_order_details:
                     for item in doc.work_order_details:
                         if hasattr(item, "company") and not item.company:
                             item.company = frappe.defaults.get_global_default("company")
-                            print(f"🔍 DEBUG: Fixed company for existing work order detail {item.work_order}")
+                            trace("🔍 DEBUG: Fixed company for existing work order detail {}", item.work_order)
                 
                 # Fix work order summary
                 if doc.work_order_summary:
                     for item in doc.work_order_summary:
                         if hasattr(item, "company") and not item.company:
                             item.company = frappe.defaults.get_global_default("company")
-                            print(f"🔍 DEBUG: Fixed company for existing work order summary {item.item_code}")
+                            trace("🔍 DEBUG: Fixed company for existing work order summary {}", item.item_code)
                 
                 if not getattr(doc, 'company', None):
                     doc.company = frappe.defaults.get_global_default("company")
@@ -597,11 +683,15 @@ def populate_work_order_tables(sales_order, doc_name):
                 # Save the document with fixed child table rows
                 try:
                     doc.save()
-                    print(f"🔍 DEBUG: Set company on existing document: {doc.company}")
+                    trace("🔍 DEBUG: Set company on existing document: {}", doc.company)
                 except Exception as save_error:
-                    print(f"❌ DEBUG: Error saving existing document: {save_error}")
                     # If save fails, try to fix the child table rows directly in the database
-                    print(f"🔍 DEBUG: Attempting to fix child table rows directly in database for document: {doc_name}")
+                    trace(
+                        "❌ DEBUG: Error saving existing document: {}\n"
+                        "🔍 DEBUG: Attempting to fix child table rows directly in database for document: {}",
+                        save_error,
+                        doc_name,
+                    )
                     
                     # Fix transfer items directly in database
                     frappe.db.sql("""
@@ -612,11 +702,13 @@ def populate_work_order_tables(sales_order, doc_name):
                     
                     # Note: Work Order Details and Summary tables don't have company column
                     # Skip direct database updates for these tables
-                    print(f"🔍 DEBUG: Skipping direct database updates for work order details/summary (no company column)")
+                    trace(
+                        "🔍 DEBUG: Skipping direct database updates for work order details/summary (no company column)",
+                    )
                     
                     # Commit the changes
                     frappe.db.commit()
-                    print(f"🔍 DEBUG: Fixed child table rows directly in database for document: {doc_name}")
+                    trace("🔍 DEBUG: Fixed child table rows directly in database for document: {}", doc_name)
                     
                     # Reload the document
                     doc = frappe.get_doc("Work Order Transfer Manager", doc_name)
@@ -624,12 +716,12 @@ def populate_work_order_tables(sales_order, doc_name):
         # Ensure company is set on the parent document
         if not doc.company:
             doc.company = company
-            print(f"🔍 DEBUG: Set company on parent document: {doc.company}")
+            trace("🔍 DEBUG: Set company on parent document: {}", doc.company)
         
         # Double-check company is set
         if not doc.company:
             doc.company = frappe.defaults.get_global_default("company")
-            print(f"🔍 DEBUG: Set company to: {doc.company}")
+            trace("🔍 DEBUG: Set company to: {}", doc.company)
         
         # Preserve existing transferred quantities before clearing
         existing_transferred_quantities = {}
@@ -649,11 +741,14 @@ def populate_work_order_tables(sales_order, doc_name):
         # Force a save to clear the existing child table rows
         try:
             doc.save()
-            print(f"🔍 DEBUG: Cleared existing child table rows")
+            trace("🔍 DEBUG: Cleared existing child table rows")
         except Exception as clear_error:
-            print(f"❌ DEBUG: Error clearing child table rows: {clear_error}")
             # If clearing fails, try to delete the child table rows directly
-            print(f"🔍 DEBUG: Attempting to delete child table rows directly from database")
+            trace(
+                "❌ DEBUG: Error clearing child table rows: {}\n"
+                "🔍 DEBUG: Attempting to delete child table rows directly from database",
+                clear_error,
+            )
             
             # Delete transfer items directly from database
             frappe.db.sql("""
@@ -675,7 +770,7 @@ def populate_work_order_tables(sales_order, doc_name):
             
             # Commit the changes
             frappe.db.commit()
-            print(f"🔍 DEBUG: Deleted child table rows directly from database")
+            trace("🔍 DEBUG: Deleted child table rows directly from database")
             
             # Reload the document
             doc = frappe.get_doc("Work Order Transfer Manager", doc.name)
@@ -691,7 +786,7 @@ def populate_work_order_tables(sales_order, doc_name):
                 if not customer:
                     frappe.throw(f"Sales Order {sales_order} does not have a customer. Please set a customer for the Sales Order first.")
                 doc.customer = customer
-                print(f"🔍 DEBUG: Set customer from Sales Order: {customer}")
+                trace("🔍 DEBUG: Set customer from Sales Order: {}", customer)
             except Exception as e:
                 frappe.throw(f"Error fetching customer from Sales Order {sales_order}: {str(e)}")
 
@@ -705,11 +800,11 @@ def populate_work_order_tables(sales_order, doc_name):
             WHERE sales_order = %s AND docstatus = 1
             ORDER BY creation ASC
         """, (sales_order,), as_dict=True)
-        print(f"🔍 DEBUG: Retrieved {len(work_orders)} work orders")
+        trace("🔍 DEBUG: Retrieved {} work orders", len(work_orders))
 
         # Fetch Production Plan raw materials
         pp_raw_materials = get_production_plan_raw_materials(sales_order, company)
-        print(f"🔍 DEBUG: Retrieved {len(pp_raw_materials)} raw materials from Production Plans")
+        trace("🔍 DEBUG: Retrieved {} raw materials from Production Plans", len(pp_raw_materials))
 
         # Optional: populate extra items child-table if present (customization)
         try:
@@ -729,9 +824,9 @@ def populate_work_order_tables(sales_order, doc_name):
                             "target_warehouse": doc.target_warehouse,
                             "company": doc.company
                         })
-                print(f"🔍 DEBUG: Populated extra_transfer_items table with Production Plan extras")
+                trace("🔍 DEBUG: Populated extra_transfer_items table with Production Plan extras")
         except Exception as e:
-            print(f"⚠️ WARNING: Could not populate extra_transfer_items: {e}")
+            trace("⚠️ WARNING: Could not populate extra_transfer_items: {}", e)
 
         item_summary = {}
         raw_material_summary = {}
@@ -749,7 +844,7 @@ def populate_work_order_tables(sales_order, doc_name):
                 for ri in tdoc.raw_materials:
                     transferred_map[ri.item_code] = transferred_map.get(ri.item_code, 0) + flt(ri.transfer_qty)
         except Exception as e:
-            print(f"❌ DEBUG: Error precomputing transferred_map: {e}")
+            trace("❌ DEBUG: Error precomputing transferred_map: {}", e)
             transferred_map = {}
 
         for wo in work_orders:
@@ -789,7 +884,7 @@ def populate_work_order_tables(sales_order, doc_name):
             # Ensure company is set
             if hasattr(detail_row, "company") and not detail_row.company:
                 detail_row.company = doc.company
-                print(f"🔍 DEBUG: Set company for work order detail {wo.name}: {detail_row.company}")
+                trace("🔍 DEBUG: Set company for work order detail {}: {}", wo.name, detail_row.company)
 
             # Raw materials for pending qty only
             if pending_qty > 0:
@@ -820,7 +915,7 @@ def populate_work_order_tables(sales_order, doc_name):
                                 "creation": wo.creation
                             })
                 except Exception as e:
-                    print(f"❌ DEBUG: Error calculating raw materials: {e}")
+                    trace("❌ DEBUG: Error calculating raw materials: {}", e)
 
         # Add Production Plan raw materials to the summary
         for raw_code, pp_data in pp_raw_materials.items():
@@ -868,8 +963,12 @@ def populate_work_order_tables(sales_order, doc_name):
         # except Exception as e:
         #     print(f"⚠️ WARNING: Could not populate extra_transfer_items: {e}")
 
-        print(f"🔍 DEBUG: Processed {len(item_summary)} unique finished items")
-        print(f"🔍 DEBUG: Found {len(raw_material_summary)} unique raw materials (Work Orders + Production Plans)")
+        trace(
+            "🔍 DEBUG: Processed {} unique finished items\n"
+            "🔍 DEBUG: Found {} unique raw materials (Work Orders + Production Plans)",
+            len(item_summary),
+            len(raw_material_summary),
+        )
 
         # Summary rows
         for item_code, summary in item_summary.items():
@@ -888,7 +987,7 @@ def populate_work_order_tables(sales_order, doc_name):
             # Ensure company is set
             if hasattr(summary_row, "company") and not summary_row.company:
                 summary_row.company = doc.company
-                print(f"🔍 DEBUG: Set company for work order summary {item_code}: {summary_row.company}")
+                trace("🔍 DEBUG: Set company for work order summary {}: {}", item_code, summary_row.company)
 
         # Transfer items (respect already-transferred from submitted RMT)
         for raw_item_code, raw_summary in raw_material_summary.items():
@@ -922,7 +1021,7 @@ def populate_work_order_tables(sales_order, doc_name):
                 if not company_value:
                     frappe.throw("Company is required. Please set the company field.")
                 
-                print(f"🔍 DEBUG: Using company value for {raw_item_code}: {company_value}")
+                trace("🔍 DEBUG: Using company value for {}: {}", raw_item_code, company_value)
                 
                 # Calculate initial status and percentage for this item
                 item_status, item_percentage = calculate_transfer_status_and_percentage(transferred_so_far, total_required)
@@ -951,33 +1050,43 @@ def populate_work_order_tables(sales_order, doc_name):
                 # Double-check that company is set
                 if not transfer_item.company:
                     transfer_item.company = company_value
-                    print(f"🔍 DEBUG: Set company for {raw_item_code} after append: {transfer_item.company}")
+                    trace("🔍 DEBUG: Set company for {} after append: {}", raw_item_code, transfer_item.company)
                 
                 # Verify company is set
                 if not transfer_item.company:
-                    print(f"❌ DEBUG: Company still not set for {raw_item_code} after setting it!")
+                    trace("❌ DEBUG: Company still not set for {} after setting it!", raw_item_code)
                     # Try one more time
                     transfer_item.company = company_value
                 else:
-                    print(f"🔍 DEBUG: Added transfer item for {raw_item_code} with company: {transfer_item.company}")
+                    trace("🔍 DEBUG: Added transfer item for {} with company: {}", raw_item_code, transfer_item.company)
             except Exception as e:
-                print(f"❌ DEBUG: Error appending raw material to transfer_items: {e}")
-                print(f"❌ DEBUG: Raw item code: {raw_item_code}")
-                print(f"❌ DEBUG: Raw summary: {raw_summary}")
+                trace(
+                    "❌ DEBUG: Error appending raw material to transfer_items: {}\n"
+                    "❌ DEBUG: Raw item code: {}\n"
+                    "❌ DEBUG: Raw summary: {}",
+                    e,
+                    raw_item_code,
+                    raw_summary,
+                )
                 raise e
 
         # Restore preserved transferred quantities OR calculate from Stock Entries
         if existing_transferred_quantities:
-            print(f"🔍 DEBUG: Restoring preserved transferred quantities")
+            trace("🔍 DEBUG: Restoring preserved transferred quantities")
             for item in doc.transfer_items:
                 if item.item_code in existing_transferred_quantities:
                     item.transferred_qty_so_far = existing_transferred_quantities[item.item_code]
                     # Recalculate pending quantity
                     item.pending_qty = max(flt(item.total_required_qty) - flt(item.transferred_qty_so_far), 0)
-                    print(f"🔍 DEBUG: Restored transferred_qty_so_far for {item.item_code}: {item.transferred_qty_so_far}, pending: {item.pending_qty}")
+                    trace(
+                        "🔍 DEBUG: Restored transferred_qty_so_far for {}: {}, pending: {}",
+                        item.item_code,
+                        item.transferred_qty_so_far,
+                        item.pending_qty,
+                    )
         else:
             # If no preserved quantities, calculate from Stock Entries
-            print(f"🔍 DEBUG: No preserved quantities found, calculating from Stock Entries")
+            trace("🔍 DEBUG: No preserved quantities found, calculating from Stock Entries")
             work_orders = [wo.work_order for wo in doc.work_order_details]
             calculated_quantities = calculate_transferred_quantities_from_all_sources(doc.name, work_orders)
             
@@ -986,7 +1095,12 @@ def populate_work_order_tables(sales_order, doc_name):
                     item.transferred_qty_so_far = calculated_quantities[item.item_code]
                     # Recalculate pending quantity
                     item.pending_qty = max(flt(item.total_required_qty) - flt(item.transferred_qty_so_far), 0)
-                    print(f"🔍 DEBUG: Calculated transferred_qty_so_far for {item.item_code}: {item.transferred_qty_so_far}, pending: {item.pending_qty}")
+                    trace(
+                        "🔍 DEBUG: Calculated transferred_qty_so_far for {}: {}, pending: {}",
+                        item.item_code,
+                        item.transferred_qty_so_far,
+                        item.pending_qty,
+                    )
         
         # Ensure company is set in all child tables before saving
         doc.ensure_company_in_child_tables()
@@ -994,19 +1108,19 @@ def populate_work_order_tables(sales_order, doc_name):
         # Double-check all transfer items have company set
         for i, item in enumerate(doc.transfer_items):
             if not item.company:
-                print(f"🔍 DEBUG: Setting company for item {i+1} ({item.item_code})")
+                trace("🔍 DEBUG: Setting company for item {} ({})", i + 1, item.item_code)
                 item.company = doc.company
         
         # Double-check all work order details have company set
         for i, item in enumerate(doc.work_order_details):
             if hasattr(item, "company") and not item.company:
-                print(f"🔍 DEBUG: Setting company for work order detail {i+1} ({item.work_order})")
+                trace("🔍 DEBUG: Setting company for work order detail {} ({})", i + 1, item.work_order)
                 item.company = doc.company
         
         # Double-check all work order summary items have company set
         for i, item in enumerate(doc.work_order_summary):
             if hasattr(item, "company") and not item.company:
-                print(f"🔍 DEBUG: Setting company for work order summary {i+1} ({item.item_code})")
+                trace("🔍 DEBUG: Setting company for work order summary {} ({})", i + 1, item.item_code)
                 item.company = doc.company
         
         # Final validation - ensure all items have company set
@@ -1024,7 +1138,7 @@ def populate_work_order_tables(sales_order, doc_name):
                 missing_company_items.append(f"Work Order Summary {i+1} ({item.item_code})")
         
         if missing_company_items:
-            print(f"❌ DEBUG: Missing company for items: {missing_company_items}")
+            trace("❌ DEBUG: Missing company for items: {}", missing_company_items)
             frappe.throw(f"Company is missing for the following items: {', '.join(missing_company_items)}")
         
         # Calculate extra quantities and populate new fields (when Fetch Work Order is clicked)
@@ -1055,29 +1169,102 @@ def populate_work_order_tables(sales_order, doc_name):
             
             if extra_qty > 0:
                 extra_items_added += 1
-                print(f"🔍 DEBUG: Set extra_qty={extra_qty}, total_available_qty={total_available_qty}, pending_qty={pending_qty} for {item.item_code}")
+                trace(
+                    "🔍 DEBUG: Set extra_qty={}, total_available_qty={}, pending_qty={} for {}",
+                    extra_qty,
+                    total_available_qty,
+                    pending_qty,
+                    item.item_code,
+                )
         
         if extra_items_added > 0:
-            print(f"🔍 DEBUG: Set extra quantities for {extra_items_added} items during Fetch Work Order")
+            trace("🔍 DEBUG: Set extra quantities for {} items during Fetch Work Order", extra_items_added)
         
         # Save the document
         try:
             doc.save()
-            print(f"🔍 DEBUG: Successfully saved WOTM document: {doc.name}")
+            trace("🔍 DEBUG: Successfully saved WOTM document: {}", doc.name)
             return {"success": True, "message": "Work Order Transfer Manager created successfully", "doc_name": doc.name}
         except Exception as save_error:
-            print(f"❌ DEBUG: Error saving WOTM document: {save_error}")
+            trace("❌ DEBUG: Error saving WOTM document: {}", save_error)
             frappe.throw(f"Error saving Work Order Transfer Manager: {str(save_error)}")
             
     except Exception as e:
-        print(f"❌ DEBUG: Error in populate_work_order_tables: {e}")
+        trace("❌ DEBUG: Error in populate_work_order_tables: {}", e)
         frappe.throw(f"Error creating Work Order Transfer Manager: {str(e)}")
 
 
+def get_stock_snapshots_for_items(item_codes, warehouse=None, company=None):
+    """Return ({item_code: qty in warehouse}, {item_code: qty across company}) in two queries."""
+    item_codes = list({code for code in item_codes if code})
+    warehouse_stock, company_stock = {}, {}
+    if not item_codes:
+        return warehouse_stock, company_stock
+
+    if warehouse:
+        for row in frappe.db.sql("""
+            SELECT item_code, SUM(actual_qty) AS qty FROM `tabBin`
+            WHERE warehouse = %(warehouse)s AND item_code IN %(items)s
+            GROUP BY item_code
+        """, {"warehouse": warehouse, "items": tuple(item_codes)}, as_dict=True):
+            warehouse_stock[row.item_code] = flt(row.qty)
+
+    if company:
+        for row in frappe.db.sql("""
+            SELECT b.item_code, SUM(b.actual_qty) AS qty
+            FROM `tabBin` b
+            JOIN `tabWarehouse` w ON w.name = b.warehouse
+            WHERE w.company = %(company)s AND w.is_group = 0 AND b.item_code IN %(items)s
+            GROUP BY b.item_code
+        """, {"company": company, "items": tuple(item_codes)}, as_dict=True):
+            company_stock[row.item_code] = flt(row.qty)
+
+    return warehouse_stock, company_stock
+
+
+def _new_raw_material_transfer(doc):
+    """Raw Material Transfer header copied from a Work Order Transfer Manager."""
+    raw_transfer_doc = frappe.new_doc("Raw Material Transfer")
+    raw_transfer_doc.sales_order = doc.sales_order
+    raw_transfer_doc.work_order_transfer_manager = doc.name
+    raw_transfer_doc.posting_date = doc.posting_date
+    raw_transfer_doc.posting_time = doc.posting_time
+    raw_transfer_doc.company = doc.company
+    raw_transfer_doc.warehouse = doc.source_warehouse
+    raw_transfer_doc.stock_entry_type = doc.stock_entry_type
+    return raw_transfer_doc
+
+
+def _pending_transfer_row(doc, item, warehouse_stock, company_stock):
+    """raw_materials row transferring the full pending qty of a WOTM transfer item."""
+    # total_required_qty = original requirement (from WOTM total_required_qty)
+    # transferred_so_far = already transferred (from WOTM transferred_qty_so_far)
+    # pending_qty = remaining to be transferred, transferred in full
+    pending_qty = flt(item.pending_qty)
+    transferred_so_far = flt(item.transferred_qty_so_far or 0)
+    return {
+        "item_code": item.item_code,
+        "item_name": item.item_name,
+        "total_required_qty": flt(item.total_required_qty) or (pending_qty + transferred_so_far),
+        "pending_qty": pending_qty,
+        "transfer_qty": pending_qty,
+        "transferred_qty_so_far": transferred_so_far,
+        "extra_qty": flt(item.extra_qty or 0),
+        "additional_transfer_qty": flt(item.additional_transfer_qty or 0),
+        "total_available_qty": flt(item.total_available_qty or 0),
+        "uom": item.uom,
+        "warehouse": doc.source_warehouse,
+        "source_warehouse": doc.source_warehouse,
+        "target_warehouse": doc.target_warehouse,
+        "actual_qty_at_warehouse": flt(warehouse_stock.get(item.item_code, 0)),
+        "actual_qty_at_company": flt(company_stock.get(item.item_code, 0)),
+    }
+
+
 @frappe.whitelist()
 def create_raw_material_transfer_doc(doc_name):
     """Create a new Raw Material Transfer with selected rows"""
-    print(f"🔍 DEBUG: Starting create_raw_material_transfer_doc for doc_name: {doc_name}")
+    trace("🔍 DEBUG: Starting create_raw_material_transfer_doc for doc_name: {}", doc_name)
     try:
         doc = frappe.get_doc("Work Order Transfer Manager", doc_name)
         
@@ -1085,39 +1272,20 @@ def create_raw_material_transfer_doc(doc_name):
         if not doc.company:
             doc.company = frappe.defaults.get_global_default("company")
             doc.save()
-            print(f"🔍 DEBUG: Set company in create_raw_material_transfer_doc: {doc.company}")
+            trace("🔍 DEBUG: Set company in create_raw_material_transfer_doc: {}", doc.company)
         selected_items = [i for i in doc.transfer_items if i.select_for_transfer and flt(i.transfer_qty) > 0]
         if not selected_items:
             frappe.throw("Please select raw materials and enter transfer quantities")
 
-        raw_transfer_doc = frappe.new_doc("Raw Material Transfer")
-        raw_transfer_doc.sales_order = doc.sales_order
-        raw_transfer_doc.work_order_transfer_manager = doc.name
-        raw_transfer_doc.posting_date = doc.posting_date
-        raw_transfer_doc.posting_time = doc.posting_time
-        raw_transfer_doc.company = doc.company
-        raw_transfer_doc.warehouse = doc.source_warehouse
-        raw_transfer_doc.stock_entry_type = doc.stock_entry_type
+        raw_transfer_doc = _new_raw_material_transfer(doc)
+        warehouse_stock, company_stock = get_stock_snapshots_for_items(
+            [i.item_code for i in selected_items], doc.source_warehouse, doc.company
+        )
 
         for item in selected_items:
             # Actuals
-            awh = 0
-            if doc.source_warehouse:
-                bin_qty = frappe.db.sql("""
-                    SELECT actual_qty FROM `tabBin`
-                    WHERE item_code = %s AND warehouse = %s
-                """, (item.item_code, doc.source_warehouse), as_dict=True)
-                awh = flt(bin_qty[0].actual_qty) if bin_qty else 0
-
-            acomp = 0
-            if doc.company:
-                comp_bins = frappe.db.sql("""
-                    SELECT SUM(b.actual_qty) AS qty
-                    FROM `tabBin` b
-                    JOIN `tabWarehouse` w ON w.name = b.warehouse
-                    WHERE b.item_code = %s AND w.company = %s AND w.is_group = 0
-                """, (item.item_code, doc.company), as_dict=True)
-                acomp = flt(comp_bins[0].qty) if comp_bins and comp_bins[0].qty is not None else 0
+            awh = flt(warehouse_stock.get(item.item_code, 0))
+            acomp = flt(company_stock.get(item.item_code, 0))
 
             # Calculate the correct quantities:
             # total_required_qty = original requirement (from WOTM total_required_qty)
@@ -1175,7 +1343,7 @@ def create_raw_material_transfer_doc(doc_name):
 @frappe.whitelist()
 def create_all_pending_transfer(doc_name):
     """Create a new Raw Material Transfer with ALL remaining items"""
-    print(f"🔍 DEBUG: Starting create_all_pending_transfer for doc_name: {doc_name}")
+    trace("🔍 DEBUG: Starting create_all_pending_transfer for doc_name: {}", doc_name)
     try:
         doc = frappe.get_doc("Work Order Transfer Manager", doc_name)
         
@@ -1183,7 +1351,7 @@ def create_all_pending_transfer(doc_name):
         if not doc.company:
             doc.company = frappe.defaults.get_global_default("company")
             doc.save()
-            print(f"🔍 DEBUG: Set company in create_all_pending_transfer: {doc.company}")
+            trace("🔍 DEBUG: Set company in create_all_pending_transfer: {}", doc.company)
         if doc.docstatus != 1:
             frappe.throw("Please submit the Work Order Transfer Manager document first")
 
@@ -1191,67 +1359,19 @@ def create_all_pending_transfer(doc_name):
         if not pending_items:
             frappe.throw("No raw materials with pending quantities found")
 
-        raw_transfer_doc = frappe.new_doc("Raw Material Transfer")
-        raw_transfer_doc.sales_order = doc.sales_order
-        raw_transfer_doc.work_order_transfer_manager = doc.name
-        raw_transfer_doc.posting_date = doc.posting_date
-        raw_transfer_doc.posting_time = doc.posting_time
-        raw_transfer_doc.company = doc.company
-        raw_transfer_doc.warehouse = doc.source_warehouse
-        raw_transfer_doc.stock_entry_type = doc.stock_entry_type
-
+        raw_transfer_doc = _new_raw_material_transfer(doc)
+        warehouse_stock, company_stock = get_stock_snapshots_for_items(
+            [i.item_code for i in pending_items], doc.source_warehouse, doc.company
+        )
         for item in pending_items:
-            # Actuals
-            awh = 0
-            if doc.source_warehouse:
-                bin_qty = frappe.db.sql("""
-                    SELECT actual_qty FROM `tabBin`
-                    WHERE item_code = %s AND warehouse = %s
-                """, (item.item_code, doc.source_warehouse), as_dict=True)
-                awh = flt(bin_qty[0].actual_qty) if bin_qty else 0
-
-            acomp = 0
-            if doc.company:
-                comp_bins = frappe.db.sql("""
-                    SELECT SUM(b.actual_qty) AS qty
-                    FROM `tabBin` b
-                    JOIN `tabWarehouse` w ON w.name = b.warehouse
-                    WHERE b.item_code = %s AND w.company = %s AND w.is_group = 0
-                """, (item.item_code, doc.company), as_dict=True)
-                acomp = flt(comp_bins[0].qty) if comp_bins and comp_bins[0].qty is not None else 0
-
-            # Calculate the correct quantities:
-            # total_required_qty = original requirement (from WOTM total_required_qty)
-            # transferred_so_far = already transferred (from WOTM transferred_qty_so_far)
-            # pending_qty = remaining to be transferred (from WOTM pending_qty)
-            # transfer_qty = what we're transferring now
-            
-            total_required = flt(item.total_required_qty) or (flt(item.pending_qty) + flt(item.transferred_qty_so_far or 0))
-            transferred_so_far = flt(item.transferred_qty_so_far or 0)
-            pending_qty = flt(item.pending_qty)  # This is the actual remaining amount
-            
-            raw_transfer_doc.append("raw_materials", {
-                "item_code": item.item_code,
-                "item_name": item.item_name,
-                "total_required_qty": total_required,  # Original requirement (712.310)
-                "pending_qty": pending_qty,  # This is the actual remaining amount (312.3)
-                "transfer_qty": pending_qty,  # Transfer the full remaining amount
-                "transferred_qty_so_far": transferred_so_far,  # Already transferred (400)
-                "extra_qty": flt(item.extra_qty or 0),  # Copy extra qty from WOTM
-                "additional_transfer_qty": flt(item.additional_transfer_qty or 0),  # Copy additional transfer qty from WOTM
-                "total_available_qty": flt(item.total_available_qty or 0),  # Copy total available qty from WOTM
-                "uom": item.uom,
-                "warehouse": doc.source_warehouse,
-                "source_warehouse": doc.source_warehouse,
-                "target_warehouse": doc.target_warehouse,
-                "actual_qty_at_warehouse": awh,
-                "actual_qty_at_company": acomp
-            })
+            raw_transfer_doc.append(
+                "raw_materials", _pending_transfer_row(doc, item, warehouse_stock, company_stock)
+            )
 
         raw_transfer_doc.insert()
 
         # Update WOTM after creation (pre-submit)
-        update_transfer_quantities(doc_name, raw_transfer_doc.name)
+        _update_transfer_quantities_or_throw(doc_name, raw_transfer_doc.name)
 
         return {
             "success": True,
@@ -1260,6 +1380,9 @@ def create_all_pending_transfer(doc_name):
         }
 
     except Exception as e:
+        # keep the transfer and the WOTM quantities atomic: without this the inserted
+        # transfer would commit with stale pending_qty and the next run would duplicate it
+        frappe.db.rollback()
         error_msg = str(e)
         if len(error_msg) > 60:
             error_msg = error_msg[:57] + "..."
@@ -1270,20 +1393,94 @@ def create_all_pending_transfer(doc_name):
         return {"success": False, "message": str(e)}
 
 
+def _update_transfer_quantities_or_throw(doc_name, transfer_doc_name=None):
+	out = update_transfer_quantities(doc_name, transfer_doc_name)
+	if isinstance(out, dict) and not out.get("success", True):
+		frappe.throw(out.get("message") or "Could not update WOTM transfer quantities")
+
+
+# Items per Raw Material Transfer created by the background pipeline
+PENDING_TRANSFER_CHUNK_SIZE = 50
+
+
+def _pending_transfer_job_name(doc_name):
+	return f"create_raw_material_transfer_{doc_name}"
+
+
+def get_pending_transfer_state(doc_name):
+	"""Chunk plan and progress of the pending-transfer pipeline for a WOTM (or None).
+
+	Kept on the WOTM itself so a resumed run never re-plans chunks whose
+	transfers were already committed.
+	"""
+	state = frappe.db.get_value("Work Order Transfer Manager", doc_name, "pending_transfer_state")
+	return frappe.parse_json(state) if state else None
+
+
+def _set_pending_transfer_state(doc_name, state):
+	frappe.db.set_value(
+		"Work Order Transfer Manager",
+		doc_name,
+		"pending_transfer_state",
+		frappe.as_json(state),
+		update_modified=False,
+	)
+
+
+def _publish_pending_transfer_progress(doc_name, state):
+	try:
+		frappe.publish_realtime(
+			event=f"raw_material_transfer_job_{doc_name}",
+			message={
+				"success": state["status"] != "Failed",
+				"status": state["status"],
+				"completed_chunks": len(state["done"]),
+				"total_chunks": len(state["chunks"]),
+				"transfers": [t for t in state["done"].values() if t],
+				"message": state.get("error"),
+			},
+			user=frappe.session.user,
+		)
+	except Exception:
+		pass
+
+
+def _plan_pending_transfer_chunks(doc_name, chunk_size):
+	"""Pending transfer rows of a WOTM, split into chunks of child row names."""
+	rows = frappe.get_all(
+		"Work Order Transfer Items Table",
+		filters={"parent": doc_name, "parenttype": "Work Order Transfer Manager", "pending_qty": [">", 0]},
+		pluck="name",
+		order_by="idx asc",
+	)
+	return [rows[i : i + chunk_size] for i in range(0, len(rows), chunk_size)]
+
+
 @frappe.whitelist()
 def create_all_pending_transfer_background(doc_name):
-	"""Create a new Raw Material Transfer with ALL remaining items in background and return job id"""
-	print(f"🔍 DEBUG: Starting create_all_pending_transfer_background for doc_name: {doc_name}")
+	"""Create Raw Material Transfers for ALL remaining items in a chunked background job.
+
+	If a previous run failed part way, the job resumes from the first unfinished chunk.
+	"""
+	job_name = _pending_transfer_job_name(doc_name)
 	try:
+		state = get_pending_transfer_state(doc_name)
 		job = frappe.enqueue(
 			"manufacturing_addon.manufacturing_addon.doctype.work_order_transfer_manager.work_order_transfer_manager.create_all_pending_transfer_job",
 			doc_name=doc_name,
 			queue="long",
 			timeout=600,
-			job_name=f"create_raw_material_transfer_{doc_name}"
+			job_name=job_name
 		)
 		job_id = job.get_id() if job else None
-		return {"success": True, "message": "Background job started.", "job_started": True, "job_id": job_id, "job_name": f"create_raw_material_transfer_{doc_name}"}
+		return {
+			"success": True,
+			"message": "Background job started.",
+			"job_started": True,
+			"job_id": job_id,
+			"job_name": job_name,
+			"resuming": bool(state and state.get("status") == "Failed"),
+		}
 	except Exception as e:
 		error_msg = str(e)
 		if len(error_msg) > 60:
@@ -1295,35 +1492,79 @@ def create_all_pending_transfer_background(doc_name):
 		return {"success": False, "message": str(e)}
 
 
-def create_all_pending_transfer_job(doc_name):
-	print(f"🔍 DEBUG: Background job started for doc_name: {doc_name}")
-	channel = f"raw_material_transfer_job_{doc_name}"
-	try:
-		# reuse foreground creator
-		out = create_all_pending_transfer(doc_name)
-		print(f"🔍 DEBUG: Background job result: {out}")
+def create_all_pending_transfer_job(doc_name, chunk_size=PENDING_TRANSFER_CHUNK_SIZE):
+	"""Build pending Raw Material Transfers in committed chunks, publishing progress per chunk."""
+	doc = frappe.get_doc("Work Order Transfer Manager", doc_name)
+	if doc.docstatus != 1:
+		frappe.throw("Please submit the Work Order Transfer Manager document first")
+	if not doc.company:
+		frappe.db.set_value("Work Order Transfer Manager", doc_name, "company", frappe.defaults.get_global_default("company"))
+		doc.company = frappe.defaults.get_global_default("company")
+
+	state = get_pending_transfer_state(doc_name)
+	if not state or state.get("status") == "Completed":
+		state = {
+			"chunks": _plan_pending_transfer_chunks(doc_name, cint(chunk_size) or PENDING_TRANSFER_CHUNK_SIZE),
+			"done": {},
+			"status": "Running",
+		}
+	state["status"] = "Running"
+	state["error"] = None
+	_set_pending_transfer_state(doc_name, state)
+	frappe.db.commit()
+
+	rows_by_name = {row.name: row for row in doc.transfer_items}
+	for idx, row_names in enumerate(state["chunks"]):
+		if str(idx) in state["done"]:
+			continue
 		try:
-			frappe.publish_realtime(event=channel, message={"success": True, "result": out}, user=frappe.session.user)
-		except Exception:
-			pass
-		return out
-	except Exception as e:
-		error_msg = str(e)
-		if len(error_msg) > 60:
-			error_msg = error_msg[:57] + "..."
-		full_message = f"Error in background job: {error_msg}"
-		if len(full_message) > 140:
-			full_message = f"Error in background job: {error_msg[:50]}..."
-		frappe.log_error(full_message)
-		try:
-			frappe.publish_realtime(event=channel, message={"success": False, "message": error_msg}, user=frappe.session.user)
-		except Exception:
-			pass
+			items = [rows_by_name[n] for n in row_names if n in rows_by_name and flt(rows_by_name[n].pending_qty) > 0]
+			if items:
+				warehouse_stock, company_stock = get_stock_snapshots_for_items(
+					[i.item_code for i in items], doc.source_warehouse, doc.company
+				)
+				raw_transfer_doc = _new_raw_material_transfer(doc)
+				for item in items:
+					raw_transfer_doc.append(
+						"raw_materials", _pending_transfer_row(doc, item, warehouse_stock, company_stock)
+					)
+				raw_transfer_doc.insert()
+				state["done"][str(idx)] = raw_transfer_doc.name
+				_update_transfer_quantities_or_throw(doc_name, raw_transfer_doc.name)
+			else:
+				state["done"][str(idx)] = None
+			# the transfer, the WOTM quantities and the chunk state commit together
+			_set_pending_transfer_state(doc_name, state)
+			frappe.db.commit()
+		except Exception as e:
+			frappe.db.rollback()
+			state["done"].pop(str(idx), None)
+			state["status"] = "Failed"
+			state["error"] = f"Chunk {idx + 1}/{len(state['chunks'])}: {str(e)[:120]}"
+			frappe.log_error(frappe.get_traceback(), "Pending Transfer Chunk Failed")
+			# reflect the chunks committed so far before recording the failure
+			update_transfer_quantities(doc_name)
+			_set_pending_transfer_state(doc_name, state)
+			frappe.db.commit()
+			_publish_pending_transfer_progress(doc_name, state)
+			return {"success": False, "message": state["error"]}
+
+		_publish_pending_transfer_progress(doc_name, state)
+
+	state["status"] = "Completed"
+	_set_pending_transfer_state(doc_name, state)
+	_publish_pending_transfer_progress(doc_name, state)
+	transfers = [t for t in state["done"].values() if t]
+	return {
+		"success": True,
+		"message": f"Created {len(transfers)} Raw Material Transfer document(s)",
+		"doc_names": transfers,
+	}
 
 @frappe.whitelist()
 def create_all_pending_transfer_direct(doc_name):
 	"""Synchronous version: create ALL pending transfer in the same request (no background)."""
-	print(f"🔍 DEBUG: Starting create_all_pending_transfer_direct for doc_name: {doc_name}")
+	trace("🔍 DEBUG: Starting create_all_pending_transfer_direct for doc_name: {}", doc_name)
 	return create_all_pending_transfer(doc_name)
 
 
@@ -1383,7 +1624,7 @@ def get_remaining_pending_items(doc_name):
 @frappe.whitelist()
 def create_selective_transfer(doc_name):
     """Create a Stock Entry directly for selected raw materials"""
-    print(f"🔍 DEBUG: Starting create_selective_transfer for doc_name: {doc_name}")
+    trace("🔍 DEBUG: Starting create_selective_transfer for doc_name: {}", doc_name)
     try:
         doc = frappe.get_doc("Work Order Transfer Manager", doc_name)
         
@@ -1702,7 +1943,13 @@ def update_transfer_quantities(doc_name, transfer_doc_name=None):
                     try:
                         frappe.db.set_value("Work Order Transfer Items Table", row.name, "total_required_qty", new_total_required)
                         total_required = new_total_required
-                        print(f"🔍 DEBUG: Updated total_required_qty for {row.item_code} from {getattr(row, 'total_required_qty', 0)} to {new_total_required} due to extra transfer")
+                        if trace.enabled():
+                            trace(
+                                "🔍 DEBUG: Updated total_required_qty for {} from {} to {} due to extra transfer",
+                                row.item_code,
+                                getattr(row, 'total_required_qty', 0),
+                                new_total_required,
+                            )
                     except Exception as e:
                         pass
                         # print(f"⚠️ WARNING: Could not update total_required_qty for row {row.name}: {e}")
@@ -1766,6 +2013,7 @@ def update_transfer_quantities(doc_name, transfer_doc_name=None):
         overall_status, overall_percentage = calculate_overall_wotm_status(doc)
         frappe.db.set_value("Work Order Transfer Manager", doc.name, "transfer_status", overall_status)
         frappe.db.set_value("Work Order Transfer Manager", doc.name, "transfer_percentage", overall_percentage)
+        update_wotm_dashboard_summary(doc.name)
 
         # print("🔍 DEBUG: Quantities updated on child rows (no parent save needed)")
         return {"success": True}
@@ -1946,7 +2194,7 @@ def get_background_job_status(job_id: str = None, job_name: str = None):
                 job = Job.fetch(jq[0].job_id, connection=conn)
         if not job:
             return {"success": False, "message": "Job not found"}
-        return {
+        out = {
             "success": True,
             "status": job.get_status(),
             "is_finished": job.is_finished,
@@ -1954,6 +2202,21 @@ def get_background_job_status(job_id: str = None, job_name: str = None):
             "enqueued_at": str(getattr(job, "enqueued_at", None)),
             "ended_at": str(getattr(job, "ended_at", None)),
         }
+
+        # Chunk progress of the pending-transfer pipeline
+        job_name = job_name or (job.kwargs or {}).get("job_name") or ""
+        prefix = _pending_transfer_job_name("")
+        if job_name.startswith(prefix):
+            state = get_pending_transfer_state(job_name[len(prefix):])
+            if state:
+                out["progress"] = {
+                    "status": state["status"],
+                    "completed_chunks": len(state["done"]),
+                    "total_chunks": len(state["chunks"]),
+                    "transfers": [t for t in state["done"].values() if t],
+                    "error": state.get("error"),
+                }
+        return out
     except Exception as e:
         return {"success": False, "message": str(e)}
 
@@ -1975,125 +2238,173 @@ def cancel_background_job(job_id: str):
         return {"success": False, "message": str(e)}
 
 
+WOTM_DASHBOARD_FIELDS = [
+    "name",
+    "customer",
+    "customer_name",
+    "sales_order",
+    "posting_date",
+    "transfer_status",
+    "transfer_percentage",
+    "total_work_orders",
+    "completed_work_orders",
+    "total_raw_materials",
+    "total_transferred_qty",
+    "total_pending_transfer_qty",
+    "raw_materials_pending",
+    "raw_materials_in_progress",
+    "raw_materials_completed",
+]
+
+STOCK_SNAPSHOT_CACHE_KEY = "wotm_stock_snapshots"
+STOCK_SNAPSHOT_CACHE_TTL = 60  # seconds
+
+
+def update_wotm_dashboard_summary(doc_name):
+    """Recompute the stored dashboard aggregates of a WOTM from its child tables.
+
+    Used where transfers are written straight to child rows (submitted WOTMs),
+    so validate() and set_dashboard_summary() do not run. One grouped query.
+    """
+    summary = frappe.db.sql("""
+        SELECT
+            (SELECT COUNT(*) FROM `tabWork Order Details Table`
+                WHERE parenttype = 'Work Order Transfer Manager' AND parent = %(name)s) AS total_work_orders,
+            (SELECT COUNT(*) FROM `tabWork Order Details Table`
+                WHERE parenttype = 'Work Order Transfer Manager' AND parent = %(name)s
+                AND IFNULL(pending_qty, 0) <= 0) AS completed_work_orders,
+            (SELECT IFNULL(SUM(total_transferred_qty), 0) FROM `tabWork Order Transfer Summary Table`
+                WHERE parenttype = 'Work Order Transfer Manager' AND parent = %(name)s) AS total_transferred_qty,
+            (SELECT IFNULL(SUM(total_pending_qty), 0) FROM `tabWork Order Transfer Summary Table`
+                WHERE parenttype = 'Work Order Transfer Manager' AND parent = %(name)s) AS total_pending_transfer_qty,
+            COUNT(ti.name) AS total_raw_materials,
+            IFNULL(SUM(ti.item_transfer_status = 'In Progress'), 0) AS raw_materials_in_progress,
+            IFNULL(SUM(ti.item_transfer_status = 'Completed'), 0) AS raw_materials_completed
+        FROM `tabWork Order Transfer Items Table` ti
+        WHERE ti.parenttype = 'Work Order Transfer Manager' AND ti.parentfield = 'transfer_items'
+            AND ti.parent = %(name)s
+    """, {"name": doc_name}, as_dict=True)[0]
+
+    values = {
+        "total_work_orders": cint(summary.total_work_orders),
+        "completed_work_orders": cint(summary.completed_work_orders),
+        "total_raw_materials": cint(summary.total_raw_materials),
+        "total_transferred_qty": flt(summary.total_transferred_qty),
+        "total_pending_transfer_qty": flt(summary.total_pending_transfer_qty),
+        "raw_materials_pending": cint(summary.total_raw_materials)
+            - cint(summary.raw_materials_in_progress)
+            - cint(summary.raw_materials_completed),
+        "raw_materials_in_progress": cint(summary.raw_materials_in_progress),
+        "raw_materials_completed": cint(summary.raw_materials_completed),
+    }
+    frappe.db.set_value("Work Order Transfer Manager", doc_name, values, update_modified=False)
+    frappe.cache.delete_value(f"{STOCK_SNAPSHOT_CACHE_KEY}::{doc_name}")
+    return values
+
+
+def _dashboard_status_info(transfer_status, overall_transfer_percentage):
+    if transfer_status == "Completed":
+        return {"status": transfer_status, "message": "All transfers completed", "status_color": "#2e7d32"}
+    if transfer_status == "In Progress":
+        return {
+            "status": transfer_status,
+            "message": f"Transfer {overall_transfer_percentage:.1f}% complete",
+            "status_color": "#f57c00",
+        }
+    return {"status": transfer_status or "Pending", "message": "No transfers started", "status_color": "#d32f2f"}
+
+
+def _dashboard_rows(doc_name):
+    """Work order summary and raw material rows for callers without the form loaded."""
+    work_order_summary = []
+    for item in frappe.get_all(
+        "Work Order Transfer Summary Table",
+        filters={"parenttype": "Work Order Transfer Manager", "parent": doc_name},
+        fields=["item_code", "item_name", "total_ordered_qty", "total_transferred_qty", "total_pending_qty"],
+        order_by="idx",
+    ):
+        total_ordered = flt(item.total_ordered_qty)
+        work_order_summary.append({
+            "item_code": item.item_code,
+            "item_name": item.item_name,
+            "total_ordered_qty": total_ordered,
+            "total_transferred_qty": flt(item.total_transferred_qty),
+            "total_pending_qty": flt(item.total_pending_qty),
+            "progress_percentage": round(flt(item.total_transferred_qty) / total_ordered * 100, 1) if total_ordered > 0 else 0,
+        })
+
+    raw_materials = frappe.get_all(
+        "Work Order Transfer Items Table",
+        filters={"parenttype": "Work Order Transfer Manager", "parentfield": "transfer_items", "parent": doc_name},
+        fields=[
+            "item_code",
+            "item_name",
+            "total_required_qty",
+            "transferred_qty_so_far",
+            "pending_qty",
+            "item_transfer_status",
+            "item_transfer_percentage",
+            "source",
+            "extra_percentage",
+        ],
+        order_by="idx",
+    )
+    for item in raw_materials:
+        item.item_transfer_status = item.item_transfer_status or "Pending"
+
+    return work_order_summary, raw_materials
+
+
 @frappe.whitelist()
-def get_wotm_dashboard_data(doc_name):
-    """Get dashboard data for Work Order Transfer Manager"""
-    # print(f"🔍 DEBUG: get_wotm_dashboard_data called with doc_name: {doc_name}")
+def get_wotm_dashboard_data(doc_name, include_rows=0):
+    """Get dashboard data for Work Order Transfer Manager.
+
+    Reads the aggregates stored on the parent in one query. The form renders
+    the summary and raw material tables from its own child rows; pass
+    include_rows=1 to also get them from the server.
+    """
     try:
-        doc = frappe.get_doc("Work Order Transfer Manager", doc_name)
-        # print(f"🔍 DEBUG: Successfully loaded WOTM document: {doc.name}")
-        
-        # Get customer name
-        customer_name = ""
-        if doc.customer:
-            customer_name = frappe.db.get_value("Customer", doc.customer, "customer_name") or doc.customer
-            # print(f"🔍 DEBUG: Customer name: {customer_name}")
-        
-        # Calculate totals from work order summary
-        total_work_orders = len(doc.work_order_details) if doc.work_order_details else 0
-        total_transferred = 0
-        total_pending = 0
-        completed_work_orders = 0
-        
-        # print(f"🔍 DEBUG: Total work orders: {total_work_orders}")
-        # print(f"🔍 DEBUG: Work order summary count: {len(doc.work_order_summary) if doc.work_order_summary else 0}")
-        # print(f"🔍 DEBUG: Transfer items count: {len(doc.transfer_items) if doc.transfer_items else 0}")
-        
-        work_order_summary_data = []
-        if doc.work_order_summary:
-            for item in doc.work_order_summary:
-                total_transferred += flt(item.total_transferred_qty or 0)
-                total_pending += flt(item.total_pending_qty or 0)
-                
-                # Calculate progress percentage
-                total_ordered = flt(item.total_ordered_qty or 0)
-                progress_percentage = 0
-                if total_ordered > 0:
-                    progress_percentage = (flt(item.total_transferred_qty or 0) / total_ordered) * 100
-                
-                work_order_summary_data.append({
-                    "item_code": item.item_code,
-                    "item_name": item.item_name,
-                    "total_ordered_qty": total_ordered,
-                    "total_transferred_qty": flt(item.total_transferred_qty or 0),
-                    "total_pending_qty": flt(item.total_pending_qty or 0),
-                    "progress_percentage": round(progress_percentage, 1)
-                })
-        
-        # Count completed work orders
-        if doc.work_order_details:
-            for item in doc.work_order_details:
-                # Work Order Details Table does not have transferred_qty; use pending_qty to infer completion
-                if flt(getattr(item, "pending_qty", 0) or 0) <= 0:
-                    completed_work_orders += 1
-        
-        # Calculate work order progress percentage
+        doc = frappe.db.get_value(
+            "Work Order Transfer Manager", doc_name, WOTM_DASHBOARD_FIELDS, as_dict=True
+        )
+        if not doc:
+            return None
+
+        total_work_orders = cint(doc.total_work_orders)
+        completed_work_orders = cint(doc.completed_work_orders)
         work_order_progress_percentage = 0
         if total_work_orders > 0:
             work_order_progress_percentage = (completed_work_orders / total_work_orders) * 100
-        
-        # Get raw materials data
-        raw_materials_data = []
-        total_raw_materials = 0
-        if doc.transfer_items:
-            total_raw_materials = len(doc.transfer_items)
-            for item in doc.transfer_items:
-                raw_materials_data.append({
-                    "item_code": item.item_code,
-                    "item_name": item.item_name,
-                    "total_required_qty": flt(item.total_required_qty or 0),
-                    "transferred_qty_so_far": flt(item.transferred_qty_so_far or 0),
-                    "pending_qty": flt(item.pending_qty or 0),
-                    "item_transfer_status": item.item_transfer_status or "Pending",
-                    "item_transfer_percentage": flt(item.item_transfer_percentage or 0)
-                })
-        
-        # Calculate overall transfer percentage
+
         overall_transfer_percentage = flt(doc.transfer_percentage or 0)
-        
-        # Determine status info
-        status_info = {
-            "status": doc.transfer_status or "Pending",
-            "message": "Transfer in progress",
-            "status_color": "#d32f2f"  # Default red
-        }
-        
-        if doc.transfer_status == "Completed":
-            status_info["message"] = "All transfers completed"
-            status_info["status_color"] = "#2e7d32"  # Green
-        elif doc.transfer_status == "In Progress":
-            status_info["message"] = f"Transfer {overall_transfer_percentage:.1f}% complete"
-            status_info["status_color"] = "#f57c00"  # Orange
-        else:
-            status_info["message"] = "No transfers started"
-            status_info["status_color"] = "#d32f2f"  # Red
-        
+
         result_data = {
             "wotm_name": doc.name,
             "customer": doc.customer,
-            "customer_name": customer_name,
+            "customer_name": doc.customer_name or doc.customer or "",
             "sales_order": doc.sales_order,
             "posting_date": doc.posting_date,
             "total_work_orders": total_work_orders,
-            "total_transferred": total_transferred,
-            "total_pending": total_pending,
-            "total_raw_materials": total_raw_materials,
+            "total_transferred": flt(doc.total_transferred_qty),
+            "total_pending": flt(doc.total_pending_transfer_qty),
+            "total_raw_materials": cint(doc.total_raw_materials),
             "completed_work_orders": completed_work_orders,
+            "raw_material_status_counts": {
+                "Pending": cint(doc.raw_materials_pending),
+                "In Progress": cint(doc.raw_materials_in_progress),
+                "Completed": cint(doc.raw_materials_completed),
+            },
             "overall_transfer_percentage": round(overall_transfer_percentage, 1),
             "work_order_progress_percentage": round(work_order_progress_percentage, 1),
-            "status_info": status_info,
-            "work_order_summary": work_order_summary_data,
-            "raw_materials": raw_materials_data
+            "status_info": _dashboard_status_info(doc.transfer_status, overall_transfer_percentage),
         }
-        
-        # print(f"🔍 DEBUG: Returning dashboard data: {result_data}")
+
+        if cint(include_rows):
+            result_data["work_order_summary"], result_data["raw_materials"] = _dashboard_rows(doc.name)
+
         return result_data
         
     except Exception as e:
-        pass
-        # print(f"❌ DEBUG: Error in get_wotm_dashboard_data: {str(e)}")
-        import traceback
-        # print(f"❌ DEBUG: Full traceback: {traceback.format_exc()}")
         frappe.log_error(f"Error getting WOTM dashboard data: {str(e)}")
         return None
 
@@ -2102,39 +2413,41 @@ def get_stock_snapshots_only(doc_name):
     """
     Get stock snapshots for WOTM items without modifying the document.
     This is a read-only method to prevent timestamp mismatch errors.
+
+    Served from a short-lived cache per WOTM (STOCK_SNAPSHOT_CACHE_TTL), so
+    repeated form refreshes do not re-read `tabBin`.
     """
     try:
-        doc = frappe.get_doc("Work Order Transfer Manager", doc_name)
+        cache_key = f"{STOCK_SNAPSHOT_CACHE_KEY}::{doc_name}"
+        stock_data = frappe.cache.get_value(cache_key)
+        if stock_data is not None:
+            return {"success": True, "stock_data": stock_data}
+
+        doc = frappe.db.get_value(
+            "Work Order Transfer Manager", doc_name, ["source_warehouse", "company"], as_dict=True
+        )
         stock_data = []
-        
-        if doc.transfer_items and doc.source_warehouse:
-            for item in doc.transfer_items:
-                # Get warehouse stock
-                warehouse_qty = 0
-                if doc.source_warehouse:
-                    bin_qty = frappe.db.sql("""
-                        SELECT actual_qty FROM `tabBin`
-                        WHERE item_code = %s AND warehouse = %s
-                    """, (item.item_code, doc.source_warehouse), as_dict=True)
-                    warehouse_qty = flt(bin_qty[0].actual_qty) if bin_qty else 0
 
-                # Get company stock
-                company_qty = 0
-                if doc.company:
-                    company_bins = frappe.db.sql("""
-                        SELECT SUM(b.actual_qty) AS qty
-                        FROM `tabBin` b
-                        JOIN `tabWarehouse` w ON w.name = b.warehouse
-                        WHERE b.item_code = %s AND w.company = %s AND w.is_group = 0
-                    """, (item.item_code, doc.company), as_dict=True)
-                    company_qty = flt(company_bins[0].qty) if company_bins and company_bins[0].qty is not None else 0
+        if doc and doc.source_warehouse:
+            item_codes = frappe.get_all(
+                "Work Order Transfer Items Table",
+                filters={"parenttype": "Work Order Transfer Manager", "parentfield": "transfer_items", "parent": doc_name},
+                pluck="item_code",
+                order_by="idx",
+            )
+            warehouse_stock, company_stock = get_stock_snapshots_for_items(
+                item_codes, doc.source_warehouse, doc.company
+            )
+            stock_data = [
+                {
+                    "item_code": item_code,
+                    "actual_qty_at_warehouse": flt(warehouse_stock.get(item_code)),
+                    "actual_qty_at_company": flt(company_stock.get(item_code)),
+                }
+                for item_code in item_codes
+            ]
 
-                stock_data.append({
-                    "item_code": item.item_code,
-                    "actual_qty_at_warehouse": warehouse_qty,
-                    "actual_qty_at_company": company_qty
-                })
-        
+        frappe.cache.set_value(cache_key, stock_data, expires_in_sec=STOCK_SNAPSHOT_CACHE_TTL)
         return {
             "success": True,
             "stock_data": stock_data
@@ -2180,7 +2493,7 @@ def update_transfer_quantities_submitted(doc_name, transfer_doc_name=None):
             fields=["name", "item_code", "total_required_qty", "pending_qty", "transferred_qty_so_far"]
         )
         
-        print(f"🔍 DEBUG: Fou   nd {len(transfer_items)} transfer items to update")
+        trace("🔍 DEBUG: Fou   nd {} transfer items to update", len(transfer_items))
         
         if not transfer_items:
             # print(f"⚠️ WARNING: No transfer items found for document {doc_name}")
@@ -2211,7 +2524,12 @@ def update_transfer_quantities_submitted(doc_name, transfer_doc_name=None):
                     new_total_required = total_trans
                     frappe.db.set_value("Work Order Transfer Items Table", item.name, "total_required_qty", new_total_required)
                     total_required = new_total_required
-                    print(f"🔍 DEBUG: Updated total_required_qty for {item.item_code} from {item.total_required_qty} to {new_total_required} due to extra transfer")
+                    trace(
+                        "🔍 DEBUG: Updated total_required_qty for {} from {} to {} due to extra transfer",
+                        item.item_code,
+                        item.total_required_qty,
+                        new_total_required,
+                    )
                 
                 remaining = max(total_required - total_trans, 0)
                 
@@ -2270,6 +2588,7 @@ def update_transfer_quantities_submitted(doc_name, transfer_doc_name=None):
             "transfer_status": overall_status,
             "transfer_percentage": overall_percentage
         })
+        update_wotm_dashboard_summary(doc_name)
 
         # print("🔍 DEBUG: Quantities updated successfully for submitted document")
         return {"success": True}
@@ -5,6 +5,7 @@ import frappe
 from frappe import _
 from frappe.utils import flt, getdate, nowdate
 
+from manufacturing_addon.manufacturing_addon.utils.query_budget import query_budget
 from manufacturing_addon.manufacturing_addon.utils.report_style_contractor import (
 	billing_amount_for_work,
 	_style_row_matches_report_line,
@@ -678,6 +679,7 @@ def _build_unbilled_rows(ct_rows, billed_lines):
 
 
 @frappe.whitelist()
+@query_budget()
 def get_contractor_billing_data(filters=None):
 	filters = _parse_filters(filters)
 	process_filter = (filters.get("process") or "All").strip()
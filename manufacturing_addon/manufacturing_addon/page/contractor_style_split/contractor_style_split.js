@@ -7,7 +7,7 @@ frappe.pages["contractor-style-split"].on_page_load = function (wrapper) {
 		single_column: true,
 	});
 
-	const state = { page, controls: {} };
+	const state = { page, controls: {}, start: 0, page_length: 500 };
 	render_layout(wrapper, state);
 	setup_filters(state);
 	setup_actions(state);
@@ -64,12 +64,26 @@ function setup_filters(state) {
 		options: "Manufacturing Contractor",
 	});
 	Object.values(state.controls).forEach((c) => {
-		if (c?.$input) c.$input.on("change", () => refresh_data(state));
+		if (c?.$input)
+			c.$input.on("change", () => {
+				state.start = 0;
+				refresh_data(state);
+			});
 	});
 }
 
 function setup_actions(state) {
 	state.page.add_inner_button(__("Refresh"), () => refresh_data(state));
+	state.page.add_inner_button(__("Previous Page"), () => {
+		if (!state.start) return;
+		state.start = Math.max(state.start - state.page_length, 0);
+		refresh_data(state);
+	});
+	state.page.add_inner_button(__("Next Page"), () => {
+		if (state.start + state.page_length >= (state.total_rows || 0)) return;
+		state.start += state.page_length;
+		refresh_data(state);
+	});
 }
 
 function get_filters(state) {
@@ -87,10 +101,11 @@ function refresh_data(state) {
 	frappe.call({
 		method:
 			"manufacturing_addon.manufacturing_addon.utils.style_contractor_split.get_contractor_split_dashboard",
-		args: get_filters(state),
+		args: { ...get_filters(state), start: state.start, page_length: state.page_length },
 		freeze: true,
 		callback(r) {
 			const data = r.message || {};
+			state.total_rows = (data.summary && data.summary.rows) || 0;
 			render_meta(state, data);
 			render_summary(state, data.summary || {});
 			render_table(state, data.rows || []);
@@ -100,11 +115,15 @@ function refresh_data(state) {
 
 function render_meta(state, data) {
 	const s = data.summary || {};
+	const shown = (data.rows || []).length;
+	const from = shown ? (data.start || 0) + 1 : 0;
 	state.$meta.text(
-		__("{0} split line(s) | {1} contractor(s) | Total {2}", [
+		__("{0} split line(s) | {1} contractor(s) | Total {2} | Showing {3}-{4}", [
 			s.rows || 0,
 			s.contractors || 0,
 			format_money(s.total_amount || 0),
+			from,
+			(data.start || 0) + shown,
 		])
 	);
 }
@@ -5,6 +5,11 @@ import frappe
 from frappe import _
 from frappe.utils import nowdate
 
+from manufacturing_addon.manufacturing_addon.utils.query_budget import query_budget
+from manufacturing_addon.manufacturing_addon.utils.trace import get_tracer
+
+trace = get_tracer("order_tracking")
+
 
 def _get_bundle_items_for_so_item(so_item):
 	"""Return bundle item definitions as [{'item': code, 'pcs': qty}, ...]."""
@@ -222,6 +227,7 @@ def _stage_date_clause(parent_alias, report_date):
 
 
 @frappe.whitelist()
+@query_budget()
 def get_dashboard_data(customer=None, sales_order=None, order_sheet=None, order_sheets=None, report_date=None):
 	"""
 	Get dashboard data for Order Tracking page.
@@ -280,11 +286,13 @@ def get_dashboard_data(customer=None, sales_order=None, order_sheet=None, order_
 		cutting_date_clause, cutting_date_vals = _stage_date_clause("cr", report_date)
 
 		if cutting_report_names:
-			print(f"\n{'='*80}")
-			print(f"[Order Tracking] Fetching Cutting Report data...")
-			print(f"  - Cutting Report Names: {cutting_report_names}")
-			print(f"  - Order Sheet Names: {order_sheet_names}")
-			print(f"{'='*80}\n")
+			trace(
+				"[Order Tracking] Fetching Cutting Report data...\n"
+				"  - Cutting Report Names: {}\n"
+				"  - Order Sheet Names: {}",
+				cutting_report_names,
+				order_sheet_names,
+			)
 			
 			cutting_report_ct = frappe.db.sql(
 				f"""
@@ -304,10 +312,22 @@ def get_dashboard_data(customer=None, sales_order=None, order_sheet=None, order_
 				as_dict=True,
 			)
 			
-			print(f"[Order Tracking] Cutting Report CT Query Results:")
-			print(f"  - Total rows: {len(cutting_report_ct)}")
-			for idx, row in enumerate(cutting_report_ct, 1):
-				print(f"  - Row {idx}: order_sheet='{row.order_sheet}', so_item='{row.so_item}', combo_item='{row.combo_item or ''}', finished_qty={row.finished_qty}, planned_qty={row.planned_qty}")
+			trace(
+				"[Order Tracking] Cutting Report CT Query Results:\n"
+				"  - Total rows: {}",
+				len(cutting_report_ct),
+			)
+			if trace.enabled():
+				for idx, row in enumerate(cutting_report_ct, 1):
+					trace(
+						"  - Row {}: order_sheet='{}', so_item='{}', combo_item='{}', finished_qty={}, planned_qty={}",
+						idx,
+						row.order_sheet,
+						row.so_item,
+						row.combo_item or '',
+						row.finished_qty,
+						row.planned_qty,
+					)
 			
 			for row in cutting_report_ct:
 				key = f"{row.order_sheet}||{row.so_item}||{row.combo_item or ''}"
@@ -317,10 +337,10 @@ def get_dashboard_data(customer=None, sales_order=None, order_sheet=None, order_
 					"finished": row.finished_qty or 0,  # Same as qty (what was cut)
 					"planned": row.planned_qty or 0
 				}
-				print(f"  - Stored cutting_data['{key}'] = {cutting_data[key]}")
+				if trace.enabled():
+					trace("  - Stored cutting_data['{}'] = {}", key, cutting_data[key])
 			
-			print(f"\n[Order Tracking] Final cutting_data keys: {list(cutting_data.keys())}")
-			print(f"{'='*80}\n")
+			trace("[Order Tracking] Final cutting_data keys: {}", list(cutting_data.keys()))
 		
 		# Get Stitching Report data
 		stitching_reports = frappe.get_all(
@@ -335,11 +355,13 @@ def get_dashboard_data(customer=None, sales_order=None, order_sheet=None, order_
 		stitching_date_clause, stitching_date_vals = _stage_date_clause("sr", report_date)
 
 		if stitching_report_names:
-			print(f"\n{'='*80}")
-			print(f"[Order Tracking] Fetching Stitching Report data...")
-			print(f"  - Stitching Report Names: {stitching_report_names}")
-			print(f"  - Order Sheet Names: {order_sheet_names}")
-			print(f"{'='*80}\n")
+			trace(
+				"[Order Tracking] Fetching Stitching Report data...\n"
+				"  - Stitching Report Names: {}\n"
+				"  - Order Sheet Names: {}",
+				stitching_report_names,
+				order_sheet_names,
+			)
 			
 			stitching_report_ct = frappe.db.sql(
 				f"""
@@ -359,10 +381,22 @@ def get_dashboard_data(customer=None, sales_order=None, order_sheet=None, order_
 				as_dict=True,
 			)
 			
-			print(f"[Order Tracking] Stitching Report CT Query Results:")
-			print(f"  - Total rows: {len(stitching_report_ct)}")
-			for idx, row in enumerate(stitching_report_ct, 1):
-				print(f"  - Row {idx}: order_sheet='{row.order_sheet}', so_item='{row.so_item}', combo_item='{row.combo_item or ''}', finished_qty={row.finished_qty}, planned_qty={row.planned_qty}")
+			trace(
+				"[Order Tracking] Stitching Report CT Query Results:\n"
+				"  - Total rows: {}",
+				len(stitching_report_ct),
+			)
+			if trace.enabled():
+				for idx, row in enumerate(stitching_report_ct, 1):
+					trace(
+						"  - Row {}: order_sheet='{}', so_item='{}', combo_item='{}', finished_qty={}, planned_qty={}",
+						idx,
+						row.order_sheet,
+						row.so_item,
+						row.combo_item or '',
+						row.finished_qty,
+						row.planned_qty,
+					)
 			
 			for row in stitching_report_ct:
 				key = f"{row.order_sheet}||{row.so_item}||{row.combo_item or ''}"
@@ -372,10 +406,10 @@ def get_dashboard_data(customer=None, sales_order=None, order_sheet=None, order_
 					"finished": row.finished_qty or 0,  # Same as qty (what was stitched)
 					"planned": row.planned_qty or 0
 				}
-				print(f"  - Stored stitching_data['{key}'] = {stitching_data[key]}")
+				if trace.enabled():
+					trace("  - Stored stitching_data['{}'] = {}", key, stitching_data[key])
 			
-			print(f"\n[Order Tracking] Final stitching_data keys: {list(stitching_data.keys())}")
-			print(f"{'='*80}\n")
+			trace("[Order Tracking] Final stitching_data keys: {}", list(stitching_data.keys()))
 		
 		# Get Packing Report data
 		packing_reports = frappe.get_all(
@@ -390,11 +424,13 @@ def get_dashboard_data(customer=None, sales_order=None, order_sheet=None, order_
 		packing_date_clause, packing_date_vals = _stage_date_clause("pr", report_date)
 
 		if packing_report_names:
-			print(f"\n{'='*80}")
-			print(f"[Order Tracking] Fetching Packing Report data...")
-			print(f"  - Packing Report Names: {packing_report_names}")
-			print(f"  - Order Sheet Names: {order_sheet_names}")
-			print(f"{'='*80}\n")
+			trace(
+				"[Order Tracking] Fetching Packing Report data...\n"
+				"  - Packing Report Names: {}\n"
+				"  - Order Sheet Names: {}",
+				packing_report_names,
+				order_sheet_names,
+			)
 			
 			# Packing is done at finished item level, so we need to SUM all quantities
 			# for a given order_sheet + so_item, regardless of combo_item
@@ -415,10 +451,21 @@ def get_dashboard_data(customer=None, sales_order=None, order_sheet=None, order_
 				as_dict=True,
 			)
 			
-			print(f"[Order Tracking] Packing Report CT Query Results (Aggregated by finished item):")
-			print(f"  - Total rows: {len(packing_report_ct)}")
-			for idx, row in enumerate(packing_report_ct, 1):
-				print(f"  - Row {idx}: order_sheet='{row.order_sheet}', so_item='{row.so_item}', finished_qty={row.finished_qty}, planned_qty={row.planned_qty}")
+			trace(
+				"[Order Tracking] Packing Report CT Query Results (Aggregated by finished item):\n"
+				"  - Total rows: {}",
+				len(packing_report_ct),
+			)
+			if trace.enabled():
+				for idx, row in enumerate(packing_report_ct, 1):
+					trace(
+						"  - Row {}: order_sheet='{}', so_item='{}', finished_qty={}, planned_qty={}",
+						idx,
+						row.order_sheet,
+						row.so_item,
+						row.finished_qty,
+						row.planned_qty,
+					)
 			
 			for row in packing_report_ct:
 				# For packing, we aggregate all bundle items into finished item
@@ -430,10 +477,10 @@ def get_dashboard_data(customer=None, sales_order=None, order_sheet=None, order_
 					"finished": row.finished_qty or 0,  # Same as qty (what was packed)
 					"planned": row.planned_qty or 0  # Planned qty (sum of all bundle items)
 				}
-				print(f"  - Stored packing_data['{key}'] = {packing_data[key]}")
+				if trace.enabled():
+					trace("  - Stored packing_data['{}'] = {}", key, packing_data[key])
 			
-			print(f"\n[Order Tracking] Final packing_data keys: {list(packing_data.keys())}")
-			print(f"{'='*80}\n")
+			trace("[Order Tracking] Final packing_data keys: {}", list(packing_data.keys()))
 		
 		# Build details array with bundle items breakdown
 		details = []
@@ -465,12 +512,18 @@ def get_dashboard_data(customer=None, sales_order=None, order_sheet=None, order_
 			# For packing, finished items DO have data (packing is done at finished item level)
 			finished_key = f"{order_sheet}||{so_item}||"
 			
-			print(f"\n{'='*80}")
-			print(f"[Order Tracking] Processing finished item row:")
-			print(f"  - Order Sheet: {order_sheet}")
-			print(f"  - SO Item: {so_item}")
-			print(f"  - Finished Key: '{finished_key}'")
-			print(f"  - Available packing_data keys: {list(packing_data.keys())}")
+			if trace.enabled():
+				trace(
+					"[Order Tracking] Processing finished item row:\n"
+					"  - Order Sheet: {}\n"
+					"  - SO Item: {}\n"
+					"  - Finished Key: '{}'\n"
+					"  - Available packing_data keys: {}",
+					order_sheet,
+					so_item,
+					finished_key,
+					list(packing_data.keys()),
+				)
 			
 			cutting_info_finished = _get_finished_item_stage_info(
 				cutting_data, order_sheet, so_item, bundle_items if bundle_items and bundle_items[0]["item"] != so_item else [], row.planned_qty or 0
@@ -481,21 +534,26 @@ def get_dashboard_data(customer=None, sales_order=None, order_sheet=None, order_
 			# Packing is done at finished item level, so combo_item is always empty
 			packing_info_finished = packing_data.get(finished_key, {"qty": 0, "finished": 0, "planned": 0})
 			
-			print(f"  - Cutting Info: {cutting_info_finished}")
-			print(f"  - Stitching Info: {stitching_info_finished}")
-			print(f"  - Packing Info: {packing_info_finished}")
+			trace(
+				"  - Cutting Info: {}\n"
+				"  - Stitching Info: {}\n"
+				"  - Packing Info: {}",
+				cutting_info_finished,
+				stitching_info_finished,
+				packing_info_finished,
+			)
 			
 			# Try alternative keys if main key doesn't match
 			if packing_info_finished["qty"] == 0 and packing_info_finished["finished"] == 0:
-				print(f"  - ⚠️ Packing data not found with key '{finished_key}', trying alternatives...")
+				trace("  - ⚠️ Packing data not found with key '{}', trying alternatives...", finished_key)
 				for alt_key in packing_data.keys():
 					if order_sheet in alt_key and so_item in alt_key:
-						print(f"  - Found matching key: '{alt_key}' -> {packing_data[alt_key]}")
+						if trace.enabled():
+							trace("  - Found matching key: '{}' -> {}", alt_key, packing_data[alt_key])
 						packing_info_finished = packing_data[alt_key]
 						break
 			
-			print(f"  - Final Packing Info: {packing_info_finished}")
-			print(f"{'='*80}\n")
+			trace("  - Final Packing Info: {}", packing_info_finished)
 			
 			# Calculate total PCS
 			total_pcs = sum([bi["pcs"] for bi in bundle_items])
@@ -546,17 +604,35 @@ def get_dashboard_data(customer=None, sales_order=None, order_sheet=None, order_
 				if cutting_info["planned"] == 0 or cutting_info["planned"] > order_sheet_planned_qty:
 					# Use Order Sheet planned_qty as fallback (all bundle items share the same planned_qty)
 					cutting_info["planned"] = order_sheet_planned_qty
-					print(f"  - ⚠️ Fixed Cutting planned_qty for {combo_item_code}: {cutting_info['planned']} -> {order_sheet_planned_qty} (using Order Sheet planned_qty)")
+					if trace.enabled():
+						trace(
+							"  - ⚠️ Fixed Cutting planned_qty for {}: {} -> {} (using Order Sheet planned_qty)",
+							combo_item_code,
+							cutting_info['planned'],
+							order_sheet_planned_qty,
+						)
 				
 				# For Stitching: if planned_qty is 0 or inflated by repeated voucher rows,
 				# use the finished-item planned qty instead of the summed voucher planned qty.
 				if stitching_info["planned"] == 0 or stitching_info["planned"] > order_sheet_planned_qty:
 					if cutting_info["planned"] > 0:
 						stitching_info["planned"] = cutting_info["planned"]
-						print(f"  - ⚠️ Fixed Stitching planned_qty for {combo_item_code}: {stitching_info['planned']} -> {cutting_info['planned']} (using Cutting planned_qty)")
+						if trace.enabled():
+							trace(
+								"  - ⚠️ Fixed Stitching planned_qty for {}: {} -> {} (using Cutting planned_qty)",
+								combo_item_code,
+								stitching_info['planned'],
+								cutting_info['planned'],
+							)
 					elif order_sheet_planned_qty > 0:
 						stitching_info["planned"] = order_sheet_planned_qty
-						print(f"  - ⚠️ Fixed Stitching planned_qty for {combo_item_code}: {stitching_info['planned']} -> {order_sheet_planned_qty} (using Order Sheet planned_qty)")
+						if trace.enabled():
+							trace(
+								"  - ⚠️ Fixed Stitching planned_qty for {}: {} -> {} (using Order Sheet planned_qty)",
+								combo_item_code,
+								stitching_info['planned'],
+								order_sheet_planned_qty,
+							)
 				# Packing is done at finished item level, not bundle item level
 				# So bundle items don't have packing data
 				
@@ -585,55 +661,83 @@ def get_dashboard_data(customer=None, sales_order=None, order_sheet=None, order_
 			total_packing_planned += packing_info_finished["planned"]
 			total_packing_finished += packing_info_finished["finished"]
 			
-			print(f"\n[Progress Calc] Finished Item Packing:")
-			print(f"  - Packing: finished={packing_info_finished['finished']}, planned={packing_info_finished['planned']}")
-			print(f"  - Total Packing Planned (so far): {total_packing_planned}")
-			print(f"  - Total Packing Finished (so far): {total_packing_finished}")
+			if trace.enabled():
+				trace(
+					"[Progress Calc] Finished Item Packing:\n"
+					"  - Packing: finished={}, planned={}\n"
+					"  - Total Packing Planned (so far): {}\n"
+					"  - Total Packing Finished (so far): {}",
+					packing_info_finished['finished'],
+					packing_info_finished['planned'],
+					total_packing_planned,
+					total_packing_finished,
+				)
 			
 			# Add order_qty and planned_qty (only once per finished item)
 			total_order_qty += row.order_qty or 0
 			total_planned_qty += row.planned_qty or 0
 		
 		# Calculate summary
-		print(f"\n{'='*80}")
-		print(f"[Progress Calc] FINAL SUMMARY CALCULATIONS:")
-		print(f"{'='*80}")
-		print(f"\n[Cutting Progress]")
-		print(f"  - Total Order Qty: {total_order_qty}")
-		print(f"  - Total Cutting Planned (qty): {total_cutting_planned}")
-		print(f"  - Total Cutting Finished (qty): {total_cutting_finished}")
+		trace(
+			"[Progress Calc] FINAL SUMMARY CALCULATIONS:\n"
+			"[Cutting Progress]\n"
+			"  - Total Order Qty: {}\n"
+			"  - Total Cutting Planned (qty): {}\n"
+			"  - Total Cutting Finished (qty): {}",
+			total_order_qty,
+			total_cutting_planned,
+			total_cutting_finished,
+		)
 		
 		# Cutting % = finished / planned × 100
 		if total_cutting_planned > 0:
 			cutting_progress = (total_cutting_finished / total_cutting_planned) * 100
-			print(f"  - Calculation: ({total_cutting_finished:.2f} / {total_cutting_planned}) * 100 = {cutting_progress:.1f}%")
+			trace(
+				"  - Calculation: ({:.2f} / {}) * 100 = {:.1f}%",
+				total_cutting_finished,
+				total_cutting_planned,
+				cutting_progress,
+			)
 		else:
 			cutting_progress = 0
-			print(f"  - No planned qty, progress = 0%")
+			trace("  - No planned qty, progress = 0%")
 		
-		print(f"\n[Stitching Progress]")
-		print(f"  - Total Stitching Planned (qty): {total_stitching_planned}")
-		print(f"  - Total Stitching Finished (qty): {total_stitching_finished}")
+		trace(
+			"[Stitching Progress]\n"
+			"  - Total Stitching Planned (qty): {}\n"
+			"  - Total Stitching Finished (qty): {}",
+			total_stitching_planned,
+			total_stitching_finished,
+		)
 		
 		# Stitching % = finished / planned × 100
 		if total_stitching_planned > 0:
 			stitching_progress = (total_stitching_finished / total_stitching_planned) * 100
-			print(f"  - Calculation: ({total_stitching_finished:.2f} / {total_stitching_planned}) * 100 = {stitching_progress:.1f}%")
+			trace(
+				"  - Calculation: ({:.2f} / {}) * 100 = {:.1f}%",
+				total_stitching_finished,
+				total_stitching_planned,
+				stitching_progress,
+			)
 		else:
 			stitching_progress = 0
-			print(f"  - No planned qty, progress = 0%")
+			trace("  - No planned qty, progress = 0%")
 		
-		print(f"\n[Packing Progress]")
-		print(f"  - Total Packing Finished: {total_packing_finished}")
-		print(f"  - Total Packing Planned: {total_packing_planned}")
+		trace(
+			"[Packing Progress]\n"
+			"  - Total Packing Finished: {}\n"
+			"  - Total Packing Planned: {}",
+			total_packing_finished,
+			total_packing_planned,
+		)
 		
 		# Packing % = finished / planned × 100
 		if total_packing_planned > 0:
 			packing_progress = (total_packing_finished / total_packing_planned) * 100
-			print(f"  - Calculation: ({total_packing_finished} / {total_packing_planned}) * 100 = {packing_progress:.1f}%")
+			trace("  - Calculation: ({} / {}) * 100 = {:.1f}%", total_packing_finished, total_packing_planned, packing_progress)
 		else:
 			packing_progress = 0
-			print(f"  - No planned qty, progress = 0%")
+			trace("  - No planned qty, progress = 0%")
 		
 		# Overall progress: For finished items, get packing data from finished item rows (not bundle items)
 		# Sum up packing_finished from parent rows (finished items) only
@@ -643,20 +747,25 @@ def get_dashboard_data(customer=None, sales_order=None, order_sheet=None, order_
 				# Only count finished items' packing, not bundle items
 				total_packing_finished_finished_items += detail_row.get("packing_finished", 0)
 		
-		print(f"\n[Overall Progress]")
-		print(f"  - Total Planned Qty: {total_planned_qty}")
-		print(f"  - Total Packing Finished (finished items): {total_packing_finished_finished_items}")
+		trace(
+			"[Overall Progress]\n"
+			"  - Total Planned Qty: {}\n"
+			"  - Total Packing Finished (finished items): {}",
+			total_planned_qty,
+			total_packing_finished_finished_items,
+		)
 		
 		# Overall progress = packed finished items / total planned qty × 100
 		overall_progress = (
 			(total_packing_finished_finished_items / total_planned_qty * 100) if total_planned_qty > 0 else 0
 		)
-		print(
-			f"  - Overall Progress: ({total_packing_finished_finished_items} / {total_planned_qty}) * 100 = {overall_progress:.1f}%"
+		trace(
+			"  - Overall Progress: ({} / {}) * 100 = {:.1f}%",
+			total_packing_finished_finished_items,
+			total_planned_qty,
+			overall_progress,
 		)
 		
-		print(f"{'='*80}\n")
-		
 		summary = {
 			"total_orders": len(order_sheet_names),
 			"total_order_qty": total_order_qty,
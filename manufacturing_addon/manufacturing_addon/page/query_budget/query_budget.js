@@ -0,0 +1,82 @@
+frappe.pages["query-budget"].on_page_load = function (wrapper) {
+	const page = frappe.ui.make_app_page({
+		parent: wrapper,
+		title: __("Query Budget"),
+		single_column: true,
+	});
+
+	const API = "manufacturing_addon.manufacturing_addon.page.query_budget.query_budget";
+	const $body = $(`
+		<div class="query-budget-page" style="padding: 12px 0;">
+			<div class="qb-meta" style="font-size:12px; color:#6b7280; margin-bottom:8px;"></div>
+			<div class="qb-table-wrap" style="overflow:auto; border:1px solid #e5e7eb; border-radius:8px; background:#fff;"></div>
+		</div>
+	`);
+	$(wrapper).find(".layout-main-section").empty().append($body);
+
+	page.set_primary_action(__("Refresh"), refresh, "refresh");
+	page.add_inner_button(__("Clear Samples"), () => {
+		frappe.confirm(__("Discard all recorded samples?"), () => {
+			frappe.call({ method: `${API}.clear`, callback: refresh });
+		});
+	});
+	page.add_inner_button(__("Settings"), () => frappe.set_route("Form", "Manufacturing Addon Setting"));
+
+	function fmt(value, digits) {
+		return format_number(value || 0, null, digits);
+	}
+
+	function render(data) {
+		const rows = data.endpoints || [];
+		$body.find(".qb-meta").text(
+			data.enabled
+				? __("Sampling {0}% of calls · last {1} samples kept per endpoint", [data.sample_rate, data.ring_size])
+				: __("Profiling is off. Enable it in Manufacturing Addon Setting.")
+		);
+
+		if (!rows.length) {
+			$body.find(".qb-table-wrap").html(`<div class="text-muted" style="padding:16px;">${__("No samples recorded yet.")}</div>`);
+			return;
+		}
+
+		const head = [
+			__("Endpoint"), __("Samples"),
+			__("Queries p50"), __("Queries p95"),
+			__("DB ms p50"), __("DB ms p95"),
+			__("Python ms p50"), __("Python ms p95"),
+			__("Peak KB p50"), __("Peak KB p95"),
+			__("Last Seen"),
+		];
+		const body = rows.map((row) => `
+			<tr>
+				<td style="font-family:monospace;">${frappe.utils.escape_html(row.endpoint)}</td>
+				<td class="text-right">${row.samples}</td>
+				<td class="text-right">${fmt(row.queries_p50, 0)}</td>
+				<td class="text-right">${fmt(row.queries_p95, 0)}</td>
+				<td class="text-right">${fmt(row.db_ms_p50, 1)}</td>
+				<td class="text-right">${fmt(row.db_ms_p95, 1)}</td>
+				<td class="text-right">${fmt(row.py_ms_p50, 1)}</td>
+				<td class="text-right">${fmt(row.py_ms_p95, 1)}</td>
+				<td class="text-right">${fmt(row.peak_kb_p50, 0)}</td>
+				<td class="text-right">${fmt(row.peak_kb_p95, 0)}</td>
+				<td>${new Date(row.last_seen * 1000).toLocaleString()}</td>
+			</tr>
+		`).join("");
+
+		$body.find(".qb-table-wrap").html(`
+			<table class="table table-bordered table-condensed" style="margin:0; font-size:12px;">
+				<thead><tr>${head.map((h) => `<th>${h}</th>`).join("")}</tr></thead>
+				<tbody>${body}</tbody>
+			</table>
+		`);
+	}
+
+	function refresh() {
+		frappe.call({
+			method: `${API}.get_summary`,
+			callback: (r) => render(r.message || {}),
+		});
+	}
+
+	refresh();
+};
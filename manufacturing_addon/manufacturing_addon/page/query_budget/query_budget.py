@@ -0,0 +1,21 @@
+import frappe
+
+from manufacturing_addon.manufacturing_addon.utils import query_budget
+
+
+@frappe.whitelist()
+def get_summary():
+	frappe.only_for("System Manager")
+	rate = query_budget._sample_rate()
+	return {
+		"enabled": bool(rate),
+		"sample_rate": rate,
+		"ring_size": query_budget.RING_SIZE,
+		"endpoints": query_budget.get_query_budget_summary(),
+	}
+
+
+@frappe.whitelist(methods=["POST"])
+def clear():
+	frappe.only_for("System Manager")
+	query_budget.clear_query_budget()
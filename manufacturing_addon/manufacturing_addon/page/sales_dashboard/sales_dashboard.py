@@ -6,8 +6,11 @@ from datetime import date, datetime, timedelta
 import frappe
 from frappe.utils import cint, flt, getdate, nowdate
 
+from manufacturing_addon.manufacturing_addon.utils.query_budget import query_budget
+
 
 @frappe.whitelist()
+@query_budget()
 def get_dashboard_data(filters=None):
 	filters = _coerce_filters(filters)
 	from_date = getdate(filters["from_date"])
@@ -1,66 +1,61 @@
 import frappe
 from frappe import _
+from frappe.utils import flt
 
 def execute(filters=None):
     if not filters:
         filters = {}
 
-    # Fetching Parent Data (Operation Report)
+    # Fetching Parent and Child Data (Operation Report + CT) in one query;
+    # the child filter sits in the join so reports without matching rows still show
     conditions = []
+    values = {}
     if filters.get("from_date"):
-        conditions.append(f"opr.date >= '{filters.get('from_date')}'")
+        conditions.append("opr.date >= %(from_date)s")
+        values["from_date"] = filters.get("from_date")
     if filters.get("to_date"):
-        conditions.append(f"opr.date <= '{filters.get('to_date')}'")
+        conditions.append("opr.date <= %(to_date)s")
+        values["to_date"] = filters.get("to_date")
     if filters.get("order_sheet"):
-        conditions.append(f"opr.order_sheet = '{filters.get('order_sheet')}'")
+        conditions.append("opr.order_sheet = %(order_sheet)s")
+        values["order_sheet"] = filters.get("order_sheet")
 
     condition_query = " AND ".join(conditions) if conditions else "1=1"
 
-    # Modified parent query to exclude 'customer'
-    operation_reports = frappe.db.sql(f"""
+    child_conditions = ""
+    if filters.get("finished_size"):
+        child_conditions = " AND or_ct.finished_size LIKE %(finished_size)s"
+        values["finished_size"] = f"%{filters.get('finished_size')}%"
+
+    rows = frappe.db.sql(f"""
         SELECT 
-            opr.name, opr.date, opr.time, opr.order_sheet, opr.ordered_qty, opr.ready_qty, opr.percentage
+            opr.name, opr.date, opr.time, opr.order_sheet, opr.ordered_qty, opr.ready_qty, opr.percentage,
+            or_ct.finished_size, or_ct.customer
         FROM `tabOperation Report` opr
+        LEFT JOIN `tabOperation Report CT` or_ct
+            ON or_ct.parent = opr.name AND or_ct.parenttype = 'Operation Report'{child_conditions}
         WHERE {condition_query}
-        ORDER BY opr.date DESC
-    """, as_dict=True)
+        ORDER BY opr.date DESC, opr.name, or_ct.idx
+    """, values, as_dict=True)
 
-    # Fetching Child Table Data (Operation Report CT)
-    operation_report_names = [or_data["name"] for or_data in operation_reports]
-    if not operation_report_names:
+    if not rows:
         return [], [], {}, {}
 
-    child_conditions = ""
-    if filters.get("finished_size"):
-        child_conditions += f" AND or_ct.finished_size LIKE '%{filters.get('finished_size')}%'"
-
-    # Modified child query to include 'customer'
-    child_data = frappe.db.sql(f"""
-        SELECT 
-            or_ct.parent, or_ct.finished_size, or_ct.customer
-        FROM `tabOperation Report CT` or_ct
-        WHERE or_ct.parent IN ({', '.join(['%s'] * len(operation_report_names))}) {child_conditions}
-    """, tuple(operation_report_names), as_dict=True)
-
     # Formatting the data
     data = []
+    operation_reports = []
     total_ordered_qty = 0
     total_ready_qty = 0
     total_percentage = 0
-    for or_data in operation_reports:
-        child_records = [cd for cd in child_data if cd["parent"] == or_data["name"]]
-        if not child_records:
-            # No child data for this row
-            data.append([or_data["name"], or_data["date"], or_data["time"], or_data["order_sheet"], or_data["ordered_qty"], or_data["ready_qty"], or_data["percentage"], "", "", ""])
-        else:
-            # Loop through child records and correctly map finished_size and customer
-            for child in child_records:
-                data.append([or_data["name"], or_data["date"], or_data["time"], or_data["order_sheet"], or_data["ordered_qty"], or_data["ready_qty"], or_data["percentage"], child["finished_size"], child["customer"]])
-        
-        # Summing up totals
-        total_ordered_qty += or_data["ordered_qty"]
-        total_ready_qty += or_data["ready_qty"]
-        total_percentage += or_data["percentage"]
+    for row in rows:
+        data.append([row.name, row.date, row.time, row.order_sheet, row.ordered_qty, row.ready_qty, row.percentage, row.finished_size or "", row.customer or ""])
+
+        # Summing up totals once per report, not per child row
+        if not operation_reports or operation_reports[-1].name != row.name:
+            operation_reports.append(row)
+            total_ordered_qty += flt(row.ordered_qty)
+            total_ready_qty += flt(row.ready_qty)
+            total_percentage += flt(row.percentage)
 
     # Summary
     summary = {
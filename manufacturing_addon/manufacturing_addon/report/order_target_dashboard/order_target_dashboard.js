@@ -99,6 +99,11 @@ frappe.query_reports["Order Target Dashboard"] = {
 			}
 		}
 
+		// ── Projected slippage past shipment date ────────────────
+		if (column.fieldname === "slippage_days" && data.slippage_days > 0) {
+			value = `<b style="color:#e74c3c;">${data.slippage_days}</b>`;
+		}
+
 		// ── Bold daily / weekly target ────────────────────────────
 		if (column.fieldname === "daily_target" || column.fieldname === "weekly_target") {
 			const qty = data[column.fieldname];
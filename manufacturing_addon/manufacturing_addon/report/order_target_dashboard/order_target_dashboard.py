@@ -1,9 +1,13 @@
 # Copyright (c) 2026, mohtashim and contributors
 # For license information, please see license.txt
 
+import math
+
 import frappe
 from frappe import _
-from frappe.utils import flt, today, date_diff
+from frappe.utils import add_days, cint, date_diff, flt, getdate, today
+
+from manufacturing_addon.manufacturing_addon.utils.stage_totals import STAGE_TABLES
 
 
 def execute(filters=None):
@@ -23,6 +27,8 @@ def get_columns():
 		{"label": _("Delayed Days"),   "fieldname": "delayed_days",   "fieldtype": "Int",     "width": 100},
 		{"label": _("Daily Target"),   "fieldname": "daily_target",   "fieldtype": "Float",   "precision": "0", "width": 110},
 		{"label": _("Weekly Target"),  "fieldname": "weekly_target",  "fieldtype": "Float",   "precision": "0", "width": 115},
+		{"label": _("Projected Completion"), "fieldname": "projected_completion", "fieldtype": "Date", "width": 130},
+		{"label": _("Slippage Days"),  "fieldname": "slippage_days",  "fieldtype": "Int",     "width": 105},
 		# ── Cutting ──────────────────────────────────────
 		{"label": _("Total Cut"),        "fieldname": "total_cut",         "fieldtype": "Float", "precision": "0", "width": 95},
 		{"label": _("Pending Cut"),      "fieldname": "pending_cut",       "fieldtype": "Float", "precision": "0", "width": 95},
@@ -56,8 +62,17 @@ def get_columns():
 	]
 
 
+# (fieldname suffix, stage key in STAGE_TABLES)
+REPORT_STAGES = (
+	("cut", "Cutting"),
+	("stitch", "Stitching"),
+	("check", "Checking"),
+	("pack", "Packing"),
+)
+
+
 def get_data(filters):
-	report_date = filters.get("report_date") or today()
+	report_date = getdate(filters.get("report_date") or today())
 
 	# ── Build order sheet query ───────────────────────────
 	conditions = ["os.docstatus = 1"]
@@ -96,187 +111,134 @@ def get_data(filters):
 	if not order_sheets:
 		return []
 
-	os_names = [row.order_sheet for row in order_sheets]
-	in_ph = "({})".format(", ".join(["%s"] * len(os_names)))
-
-	# ── Helper: cumulative totals + active days per order_sheet ──
-	def get_stage_stats(report_dt, ct_dt, qty_col):
-		rows = frappe.db.sql(
-			f"""
-			SELECT
-				cr.order_sheet,
-				IFNULL(SUM(crct.{qty_col}), 0)  AS total_qty,
-				COUNT(DISTINCT cr.date)           AS active_days
-			FROM `tab{report_dt}` cr
-			JOIN `tab{ct_dt}` crct ON crct.parent = cr.name
-			WHERE cr.docstatus = 1
-			  AND cr.order_sheet IN {in_ph}
-			GROUP BY cr.order_sheet
-			""",
-			tuple(os_names),
-			as_dict=True,
-		)
-		return {
-			r.order_sheet: {
-				"total": flt(r.total_qty),
-				"days":  max(int(r.active_days or 1), 1),
-			}
-			for r in rows
-		}
+	stage_stats = get_stage_stats([row.order_sheet for row in order_sheets], report_date)
+	data = project_order_sheets(order_sheets, stage_stats, report_date)
 
-	# ── Helper: today's production ────────────────────────
-	def get_today_qty(report_dt, ct_dt, qty_col):
-		rows = frappe.db.sql(
-			f"""
-			SELECT cr.order_sheet, IFNULL(SUM(crct.{qty_col}), 0) AS qty
-			FROM `tab{report_dt}` cr
-			JOIN `tab{ct_dt}` crct ON crct.parent = cr.name
-			WHERE cr.docstatus = 1
-			  AND cr.order_sheet IN {in_ph}
-			  AND cr.date = %s
-			GROUP BY cr.order_sheet
-			""",
-			tuple(os_names) + (report_date,),
-			as_dict=True,
-		)
-		return {r.order_sheet: flt(r.qty) for r in rows}
-
-	# Cumulative stage stats
-	cut_stats    = get_stage_stats("Cutting Report",   "Cutting Report CT",   "cutting_qty")
-	stitch_stats = get_stage_stats("Stitching Report", "Stitching Report CT", "stitching_qty")
-	check_stats  = get_stage_stats("Checking Report",  "Checking Report CT",  "checking_qty")
-	pack_stats   = get_stage_stats("Packing Report",   "Packing Report CT",   "packaging_qty")
-
-	# Today's production
-	cut_today    = get_today_qty("Cutting Report",   "Cutting Report CT",   "cutting_qty")
-	stitch_today = get_today_qty("Stitching Report", "Stitching Report CT", "stitching_qty")
-	check_today  = get_today_qty("Checking Report",  "Checking Report CT",  "checking_qty")
-	pack_today   = get_today_qty("Packing Report",   "Packing Report CT",   "packaging_qty")
-
-	# ── Build result rows ─────────────────────────────────
 	status_filter = filters.get("status") or "All"
-	data = []
+	if status_filter not in ("All", ""):
+		data = [row for row in data if row["status"] == status_filter]
 
-	for row in order_sheets:
-		os_name       = row.order_sheet
-		order_qty     = flt(row.order_qty)
-		shipment_date = row.shipment_date
-
-		days_remaining = date_diff(shipment_date, report_date)
-		delayed_days   = max(0, -days_remaining)
-
-		# Per-stage cumulative totals
-		cs = cut_stats.get(os_name,    {"total": 0, "days": 1})
-		ss = stitch_stats.get(os_name, {"total": 0, "days": 1})
-		chs = check_stats.get(os_name, {"total": 0, "days": 1})
-		ps = pack_stats.get(os_name,   {"total": 0, "days": 1})
-
-		tc  = cs["total"]
-		ts  = ss["total"]
-		tch = chs["total"]
-		tp  = ps["total"]
-
-		# Pending per stage
-		pending_cut    = max(order_qty - tc,  0)
-		pending_stitch = max(order_qty - ts,  0)
-		pending_check  = max(order_qty - tch, 0)
-		pending_pack   = max(order_qty - tp,  0)
-
-		# Percentage per stage
-		def pct(done, total):
-			return (done / total * 100) if total > 0 else 0
-
-		cut_pct    = pct(tc,  order_qty)
-		stitch_pct = pct(ts,  order_qty)
-		check_pct  = pct(tch, order_qty)
-		pack_pct   = pct(tp,  order_qty)
-
-		# Historical average daily rate per stage
-		avg_daily_cut    = round(tc  / cs["days"],  1) if tc  > 0 else 0
-		avg_daily_stitch = round(ts  / ss["days"],  1) if ts  > 0 else 0
-		avg_daily_check  = round(tch / chs["days"], 1) if tch > 0 else 0
-		avg_daily_pack   = round(tp  / ps["days"],  1) if tp  > 0 else 0
-
-		# Needed daily rate per stage to finish on time
-		def needed_rate(pending, days_left):
-			if days_left > 0:
-				return round(pending / days_left, 1)
-			elif days_left == 0:
-				return pending
-			else:
-				return 0  # already overdue
-
-		needed_daily_cut    = needed_rate(pending_cut,    days_remaining)
-		needed_daily_stitch = needed_rate(pending_stitch, days_remaining)
-		needed_daily_check  = needed_rate(pending_check,  days_remaining)
-		needed_daily_pack   = needed_rate(pending_pack,   days_remaining)
+	return data
+
+
+def get_stage_stats(os_names, report_date):
+	"""Cumulative total, active days and report-date qty per stage, one query.
+
+	Returns {order_sheet: {"total_cut": .., "days_cut": .., "today_cut": .., ...}}.
+	"""
+	union = " UNION ALL ".join(
+		f"""
+		SELECT '{key}' AS stage, r.order_sheet, r.date, SUM(IFNULL(ct.{qty_col}, 0)) AS qty
+		FROM `tab{report_dt}` r
+		JOIN `tab{ct_dt}` ct ON ct.parent = r.name
+		WHERE r.docstatus = 1 AND r.order_sheet IN %(os_names)s
+		GROUP BY r.order_sheet, r.date
+		"""
+		for key, stage in REPORT_STAGES
+		for report_dt, ct_dt, qty_col in (STAGE_TABLES[stage],)
+	)
+	aggregates = ",\n".join(
+		f"""
+			SUM(CASE WHEN u.stage = '{key}' THEN u.qty ELSE 0 END) AS total_{key},
+			COUNT(DISTINCT CASE WHEN u.stage = '{key}' THEN u.date END) AS days_{key},
+			SUM(CASE WHEN u.stage = '{key}' AND u.date = %(report_date)s THEN u.qty ELSE 0 END) AS today_{key}"""
+		for key, _stage in REPORT_STAGES
+	)
+
+	rows = frappe.db.sql(
+		f"""
+		SELECT u.order_sheet, {aggregates}
+		FROM ({union}) u
+		GROUP BY u.order_sheet
+		""",
+		{"os_names": tuple(os_names), "report_date": report_date},
+		as_dict=True,
+	)
+	return {r.order_sheet: r for r in rows}
+
+
+def project_order_sheets(order_sheets, stage_stats, report_date):
+	"""Pace, required rate, projected completion and slippage for every order sheet.
+
+	Works column-wise over all order sheets: the per-stage arrays are built once
+	and every derived figure is a single pass over them.
+	"""
+	n = len(order_sheets)
+	order_qty = [flt(row.order_qty) for row in order_sheets]
+	days_remaining = [date_diff(row.shipment_date, report_date) for row in order_sheets]
+	stats = [stage_stats.get(row.order_sheet) or {} for row in order_sheets]
+
+	columns = {}
+	for key, _stage in REPORT_STAGES:
+		total = [flt(s.get(f"total_{key}")) for s in stats]
+		days = [max(cint(s.get(f"days_{key}")), 1) for s in stats]
+		pending = [max(q - t, 0) for q, t in zip(order_qty, total)]
+		columns[f"total_{key}"] = total
+		columns[f"pending_{key}"] = pending
+		columns[f"{key}_pct"] = [(t / q * 100) if q > 0 else 0 for t, q in zip(total, order_qty)]
+		columns[f"avg_daily_{key}"] = [round(t / d, 1) if t > 0 else 0 for t, d in zip(total, days)]
+		columns[f"needed_daily_{key}"] = [_needed_rate(p, dl) for p, dl in zip(pending, days_remaining)]
+		columns[f"today_{key}"] = [flt(s.get(f"today_{key}")) for s in stats]
+
+	# Packing is the finishing stage: its pace drives the projection.
+	projected_completion = [
+		_projected_completion(report_date, pending, pace)
+		for pending, pace in zip(columns["pending_pack"], columns["avg_daily_pack"])
+	]
+
+	data = []
+	for i, row in enumerate(order_sheets):
+		record = {
+			"order_sheet": row.order_sheet,
+			"customer": row.customer,
+			"shipment_date": row.shipment_date,
+			"order_qty": order_qty[i],
+			"days_remaining": days_remaining[i],
+			"delayed_days": max(0, -days_remaining[i]),
+			"projected_completion": projected_completion[i],
+			"slippage_days": (
+				max(date_diff(projected_completion[i], row.shipment_date), 0)
+				if projected_completion[i]
+				else None
+			),
+		}
+		for fieldname, values in columns.items():
+			record[fieldname] = values[i]
 
 		# Packing-based overall daily / weekly target
-		if days_remaining > 0:
-			daily_target = needed_daily_pack
-		elif days_remaining == 0:
-			daily_target = pending_pack
-		else:
-			daily_target = 0
-
-		weekly_target = daily_target * 7
-
-		# ── Status logic ──────────────────────────────────
-		if pack_pct >= 100:
-			status = "Completed"
-		elif days_remaining < 0:
-			status = "Overdue"
-		elif tc == 0 and ts == 0 and tch == 0 and tp == 0:
-			status = "Not Started"
-		else:
-			today_cut_qty = flt(cut_today.get(os_name, 0))
-			if order_qty > 0 and days_remaining > 0 and needed_daily_cut > 0:
-				status = "On Track" if today_cut_qty >= needed_daily_cut * 0.85 else "Behind"
-			else:
-				status = "On Track"
-
-		if status_filter not in ("All", "") and status != status_filter:
-			continue
-
-		data.append({
-			"order_sheet":   os_name,
-			"customer":      row.customer,
-			"shipment_date": shipment_date,
-			"order_qty":     order_qty,
-			"days_remaining": days_remaining,
-			"delayed_days":  delayed_days,
-			"daily_target":  daily_target,
-			"weekly_target": weekly_target,
-			# Cutting
-			"total_cut":          tc,
-			"pending_cut":        pending_cut,
-			"cut_pct":            cut_pct,
-			"avg_daily_cut":      avg_daily_cut,
-			"needed_daily_cut":   needed_daily_cut,
-			"today_cut":          flt(cut_today.get(os_name, 0)),
-			# Stitching
-			"total_stitch":         ts,
-			"pending_stitch":       pending_stitch,
-			"stitch_pct":           stitch_pct,
-			"avg_daily_stitch":     avg_daily_stitch,
-			"needed_daily_stitch":  needed_daily_stitch,
-			"today_stitch":         flt(stitch_today.get(os_name, 0)),
-			# Checking
-			"total_check":        tch,
-			"pending_check":      pending_check,
-			"check_pct":          check_pct,
-			"avg_daily_check":    avg_daily_check,
-			"needed_daily_check": needed_daily_check,
-			"today_check":        flt(check_today.get(os_name, 0)),
-			# Packing
-			"total_pack":        tp,
-			"pending_pack":      pending_pack,
-			"pack_pct":          pack_pct,
-			"avg_daily_pack":    avg_daily_pack,
-			"needed_daily_pack": needed_daily_pack,
-			"today_pack":        flt(pack_today.get(os_name, 0)),
-			# Status
-			"status": status,
-		})
+		record["daily_target"] = record["needed_daily_pack"] if days_remaining[i] >= 0 else 0
+		record["weekly_target"] = record["daily_target"] * 7
+		record["status"] = _get_status(record)
+		data.append(record)
 
 	return data
+
+
+def _needed_rate(pending, days_left):
+	"""Daily rate needed to finish on time."""
+	if days_left > 0:
+		return round(pending / days_left, 1)
+	elif days_left == 0:
+		return pending
+	return 0  # already overdue
+
+
+def _projected_completion(report_date, pending, pace):
+	"""Date the stage finishes at its historical pace; None when it has no pace yet."""
+	if pending <= 0:
+		return report_date
+	if pace <= 0:
+		return None
+	return add_days(report_date, math.ceil(pending / pace))
+
+
+def _get_status(record):
+	if record["pack_pct"] >= 100:
+		return "Completed"
+	if record["days_remaining"] < 0:
+		return "Overdue"
+	if not any(record[f"total_{key}"] for key, _stage in REPORT_STAGES):
+		return "Not Started"
+	if record["order_qty"] > 0 and record["days_remaining"] > 0 and record["needed_daily_cut"] > 0:
+		return "On Track" if record["today_cut"] >= record["needed_daily_cut"] * 0.85 else "Behind"
+	return "On Track"
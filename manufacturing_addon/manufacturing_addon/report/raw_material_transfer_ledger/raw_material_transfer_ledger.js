@@ -1,7 +1,19 @@
+// Any filter change starts paging over from the first page of the new result set
+function reset_ledger_paging(report) {
+    report.ledger_previous_cursors = [];
+    if (report.get_filter_value("cursor")) {
+        // clearing the cursor refreshes the report
+        report.set_filter_value("cursor", "");
+    } else {
+        report.refresh();
+    }
+}
+
 frappe.query_reports["Raw Material Transfer Ledger"] = {
     "filters": [
         {
             "fieldname": "raw_material_transfer",
+            "on_change": reset_ledger_paging,
             "label": __("Raw Material Transfer"),
             "fieldtype": "Link",
             "options": "Raw Material Transfer",
@@ -15,18 +27,21 @@ frappe.query_reports["Raw Material Transfer Ledger"] = {
         },
         {
             "fieldname": "from_date",
+            "on_change": reset_ledger_paging,
             "label": __("From Date"),
             "fieldtype": "Date",
             "default": frappe.datetime.month_start()
         },
         {
             "fieldname": "to_date",
+            "on_change": reset_ledger_paging,
             "label": __("To Date"),
             "fieldtype": "Date",
             "default": frappe.datetime.get_today()
         },
         {
             "fieldname": "item_code",
+            "on_change": reset_ledger_paging,
             "label": __("Item Code"),
             "fieldtype": "Link",
             "options": "Item",
@@ -40,10 +55,64 @@ frappe.query_reports["Raw Material Transfer Ledger"] = {
         },
         {
             "fieldname": "work_order",
+            "on_change": reset_ledger_paging,
             "label": __("Work Order"),
             "fieldtype": "Link",
             "options": "Work Order"
+        },
+        {
+            "fieldname": "page_length",
+            "on_change": reset_ledger_paging,
+            "label": __("Rows per Page"),
+            "fieldtype": "Int",
+            "default": 500
+        },
+        {
+            "fieldname": "cursor",
+            "label": __("Cursor"),
+            "fieldtype": "Data",
+            "hidden": 1
         }
-    ]
+    ],
+
+    "onload": function(report) {
+        // Keyset paging: the cursor is the sort key of the last row on the page
+        report.ledger_previous_cursors = [];
+
+        report.page.add_inner_button(__("Next Page"), function() {
+            let data = report.data || [];
+            let page_length = report.get_filter_value("page_length") || 500;
+            if (data.length < page_length) {
+                frappe.show_alert({message: __("This is the last page"), indicator: "orange"});
+                return;
+            }
+            let last = data[data.length - 1];
+            report.ledger_previous_cursors.push(report.get_filter_value("cursor") || "");
+            report.set_filter_value("cursor", JSON.stringify([
+                last.posting_date, last.rmt_name, last.stock_entry, last.se_detail_idx
+            ]));
+        }, __("Pages"));
+
+        report.page.add_inner_button(__("Previous Page"), function() {
+            if (!report.ledger_previous_cursors.length) return;
+            report.set_filter_value("cursor", report.ledger_previous_cursors.pop());
+        }, __("Pages"));
+
+        report.page.add_inner_button(__("First Page"), function() {
+            report.ledger_previous_cursors = [];
+            report.set_filter_value("cursor", "");
+        }, __("Pages"));
+
+        ["csv", "xlsx"].forEach(function(file_format) {
+            report.page.add_inner_button(file_format.toUpperCase(), function() {
+                let filters = Object.assign({}, report.get_values());
+                delete filters.cursor;
+                window.open(
+                    "/api/method/manufacturing_addon.manufacturing_addon.report.raw_material_transfer_ledger.raw_material_transfer_ledger.export_ledger?"
+                    + $.param({filters: JSON.stringify(filters), file_format: file_format})
+                );
+            }, __("Export All"));
+        });
+    }
 };
 
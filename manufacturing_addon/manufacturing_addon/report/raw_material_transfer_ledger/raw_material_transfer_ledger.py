@@ -1,6 +1,11 @@
 import frappe
 from frappe import _
-from frappe.utils import flt
+from frappe.utils import cint, flt
+
+from manufacturing_addon.manufacturing_addon.utils.export import iter_pages, send_export
+
+DEFAULT_PAGE_LENGTH = 500
+MAX_PAGE_LENGTH = 5000
 
 def execute(filters=None):
     if not filters:
@@ -9,13 +14,13 @@ def execute(filters=None):
     # Get columns
     columns = get_columns()
     
-    # Get data
-    data = get_data(filters)
+    # Get one page of data; the "cursor" filter is the last row of the previous page
+    data, _next_cursor = get_data(filters, cursor=filters.get("cursor"), page_length=filters.get("page_length"))
     
-    # Get summary
-    summary = get_summary(data)
+    # Get summary over the whole filtered ledger, not just this page
+    summary = get_summary(filters)
     
-    return columns, data, None, None
+    return columns, data, None, None, summary
 
 def get_columns():
     return [
@@ -94,151 +99,193 @@ def get_columns():
         }
     ]
 
-def get_data(filters):
+def get_page_length(page_length=None):
+    page_length = cint(page_length) or DEFAULT_PAGE_LENGTH
+    return min(max(page_length, 1), MAX_PAGE_LENGTH)
+
+def get_ledger_source(filters):
     """
-    Get all stock entries and their items for raw material transfers
-    This report shows all stock entries created when submitting an RMT
+    Return (from_clause, stock_entry_field, work_order_field, status_field).
+    RMTs submitted before the RMT Stock Entry table existed only carry the single
+    stock_entry field; those are read through it when filtered to one RMT.
     """
+    rmt = filters.get("raw_material_transfer")
+    if rmt and not frappe.db.exists("RMT Stock Entry", {"parent": rmt, "parenttype": "Raw Material Transfer"}):
+        return (
+            """`tabRaw Material Transfer` rmt
+            INNER JOIN `tabStock Entry` se ON se.name = rmt.stock_entry
+            INNER JOIN `tabStock Entry Detail` se_item ON se_item.parent = se.name""",
+            "se.name",
+            "se.work_order",
+            "'Submitted'",
+        )
+    
+    return (
+        """`tabRaw Material Transfer` rmt
+        INNER JOIN `tabRMT Stock Entry` rmt_se ON rmt_se.parent = rmt.name
+        INNER JOIN `tabStock Entry` se ON se.name = rmt_se.stock_entry
+        INNER JOIN `tabStock Entry Detail` se_item ON se_item.parent = se.name""",
+        "rmt_se.stock_entry",
+        "rmt_se.work_order",
+        "rmt_se.status",
+    )
+
+def get_conditions(filters, work_order_field):
     conditions = ["rmt.docstatus = 1"]
+    values = {}
     
     if filters.get("raw_material_transfer"):
-        conditions.append(f"rmt.name = '{filters.get('raw_material_transfer')}'")
+        conditions.append("rmt.name = %(raw_material_transfer)s")
+        values["raw_material_transfer"] = filters.get("raw_material_transfer")
     
     if filters.get("from_date"):
-        conditions.append(f"rmt.posting_date >= '{filters.get('from_date')}'")
+        conditions.append("rmt.posting_date >= %(from_date)s")
+        values["from_date"] = filters.get("from_date")
     
     if filters.get("to_date"):
-        conditions.append(f"rmt.posting_date <= '{filters.get('to_date')}'")
+        conditions.append("rmt.posting_date <= %(to_date)s")
+        values["to_date"] = filters.get("to_date")
     
-    condition_str = " AND ".join(conditions) if conditions else "1=1"
+    if filters.get("item_code"):
+        conditions.append("se_item.item_code = %(item_code)s")
+        values["item_code"] = filters.get("item_code")
+    
+    if filters.get("work_order"):
+        conditions.append(f"{work_order_field} = %(work_order)s")
+        values["work_order"] = filters.get("work_order")
     
-    # First, try to query from the child table (new method with multiple stock entries)
-    query_child = f"""
+    return conditions, values
+
+def get_data(filters, cursor=None, page_length=None):
+    """
+    Get one page of stock entry items for raw material transfers.
+    This report shows all stock entries created when submitting an RMT.
+    
+    Rows are ordered by (posting_date DESC, rmt_name, stock_entry, row idx), which
+    is unique, so pages are fetched by keyset: ``cursor`` is that tuple for the
+    last row already shown. Returns (rows, next_cursor); next_cursor is None on
+    the last page.
+    """
+    from_clause, se_field, wo_field, status_field = get_ledger_source(filters)
+    conditions, values = get_conditions(filters, wo_field)
+    page_length = get_page_length(page_length)
+    
+    cursor = frappe.parse_json(cursor) if isinstance(cursor, str) else cursor
+    if cursor:
+        values.update({
+            "after_date": cursor[0],
+            "after_rmt": cursor[1],
+            "after_se": cursor[2],
+            "after_idx": cint(cursor[3]),
+        })
+        conditions.append("""(
+            rmt.posting_date < %(after_date)s
+            OR (rmt.posting_date = %(after_date)s
+                AND (rmt.name, se_item.parent, se_item.idx) > (%(after_rmt)s, %(after_se)s, %(after_idx)s))
+        )""")
+    
+    values["page_length"] = page_length
+    data = frappe.db.sql(f"""
         SELECT 
             rmt.name as rmt_name,
             rmt.posting_date,
             rmt.posting_time,
             rmt.company,
             rmt.sales_order,
-            rmt_se.stock_entry,
-            rmt_se.work_order,
-            rmt_se.status,
+            {se_field} as stock_entry,
+            {wo_field} as work_order,
+            {status_field} as status,
+            se_item.idx as se_detail_idx,
             se_item.item_code,
             se_item.item_name,
             se_item.uom,
             se_item.qty,
             se_item.s_warehouse,
             se_item.t_warehouse
-        FROM `tabRaw Material Transfer` rmt
-        INNER JOIN `tabRMT Stock Entry` rmt_se ON rmt_se.parent = rmt.name
-        INNER JOIN `tabStock Entry` se ON se.name = rmt_se.stock_entry
-        INNER JOIN `tabStock Entry Detail` se_item ON se_item.parent = se.name
-        WHERE {condition_str}
-    """
+        FROM {from_clause}
+        WHERE {" AND ".join(conditions)}
+        ORDER BY rmt.posting_date DESC, rmt.name, se_item.parent, se_item.idx
+        LIMIT %(page_length)s
+    """, values, as_dict=True)
     
-    # Add item code filter if specified
-    if filters.get("item_code"):
-        query_child += f" AND se_item.item_code = '{filters.get('item_code')}'"
+    next_cursor = None
+    if len(data) == page_length:
+        last = data[-1]
+        next_cursor = [str(last.posting_date), last.rmt_name, last.stock_entry, last.se_detail_idx]
     
-    # Add work order filter if specified
-    if filters.get("work_order"):
-        query_child += f" AND rmt_se.work_order = '{filters.get('work_order')}'"
-    
-    query_child += " ORDER BY rmt.posting_date DESC, rmt_se.stock_entry, se_item.item_code"
-    
-    data = frappe.db.sql(query_child, as_dict=True)
-    
-    # If no data from child table, fallback to old method with single stock_entry field
-    if not data and filters.get("raw_material_transfer"):
-        # Fallback query using the old stock_entry field
-        query_fallback = f"""
-            SELECT 
-                rmt.name as rmt_name,
-                rmt.posting_date,
-                rmt.posting_time,
-                rmt.company,
-                rmt.sales_order,
-                se.name as stock_entry,
-                se.work_order as work_order,
-                'Submitted' as status,
-                se_item.item_code,
-                se_item.item_name,
-                se_item.uom,
-                se_item.qty,
-                se_item.s_warehouse,
-                se_item.t_warehouse
-            FROM `tabRaw Material Transfer` rmt
-            INNER JOIN `tabStock Entry` se ON se.name = rmt.stock_entry
-            INNER JOIN `tabStock Entry Detail` se_item ON se_item.parent = se.name
-            WHERE {condition_str}
-        """
-        
-        if filters.get("item_code"):
-            query_fallback += f" AND se_item.item_code = '{filters.get('item_code')}'"
-        
-        if filters.get("work_order"):
-            query_fallback += f" AND se.work_order = '{filters.get('work_order')}'"
-        
-        query_fallback += " ORDER BY rmt.posting_date DESC, se.name, se_item.item_code"
-        
-        data = frappe.db.sql(query_fallback, as_dict=True)
-    
-    return data
+    return data, next_cursor
 
-def get_summary(data):
+def get_summary(filters):
     """
-    Calculate summary statistics
+    Summary statistics for the whole filtered ledger, aggregated in SQL
     """
-    if not data:
+    from_clause, se_field, wo_field, _status_field = get_ledger_source(filters)
+    conditions, values = get_conditions(filters, wo_field)
+    
+    totals = frappe.db.sql(f"""
+        SELECT
+            COUNT(DISTINCT rmt.name) as transfers,
+            COUNT(DISTINCT {se_field}) as stock_entries,
+            COUNT(DISTINCT se_item.item_code) as items,
+            COALESCE(SUM(se_item.qty), 0) as total_qty
+        FROM {from_clause}
+        WHERE {" AND ".join(conditions)}
+    """, values, as_dict=True)[0]
+    
+    if not totals.transfers:
         return []
     
-    summary = []
-    
-    # Count unique transfers, stock entries, and items
-    unique_rmt = set()
-    unique_stock_entries = set()
-    item_quantities = {}
-    
-    for row in data:
-        unique_rmt.add(row.rmt_name)
-        unique_stock_entries.add(row.stock_entry)
-        
-        if row.item_code not in item_quantities:
-            item_quantities[row.item_code] = 0
-        item_quantities[row.item_code] += flt(row.qty)
-    
-    total_qty = sum(item_quantities.values())
-    avg_qty = total_qty / len(item_quantities) if item_quantities else 0
-    
-    summary.append({
-        "label": _("Total Raw Material Transfers"),
-        "value": len(unique_rmt),
-        "indicator": "blue"
-    })
-    
-    summary.append({
-        "label": _("Total Stock Entries"),
-        "value": len(unique_stock_entries),
-        "indicator": "green"
-    })
-    
-    summary.append({
-        "label": _("Total Items Transferred"),
-        "value": len(item_quantities),
-        "indicator": "orange"
-    })
-    
-    summary.append({
-        "label": _("Total Quantity Transferred"),
-        "value": f"{total_qty:,.2f}",
-        "indicator": "purple"
-    })
-    
-    summary.append({
-        "label": _("Average Quantity per Item"),
-        "value": f"{avg_qty:,.2f}",
-        "indicator": "gray"
-    })
-    
-    return summary
+    total_qty = flt(totals.total_qty)
+    avg_qty = total_qty / totals.items if totals.items else 0
+    
+    return [
+        {
+            "label": _("Total Raw Material Transfers"),
+            "value": totals.transfers,
+            "datatype": "Int",
+            "indicator": "blue"
+        },
+        {
+            "label": _("Total Stock Entries"),
+            "value": totals.stock_entries,
+            "datatype": "Int",
+            "indicator": "green"
+        },
+        {
+            "label": _("Total Items Transferred"),
+            "value": totals.items,
+            "datatype": "Int",
+            "indicator": "orange"
+        },
+        {
+            "label": _("Total Quantity Transferred"),
+            "value": total_qty,
+            "datatype": "Float",
+            "indicator": "purple"
+        },
+        {
+            "label": _("Average Quantity per Item"),
+            "value": avg_qty,
+            "datatype": "Float",
+            "indicator": "gray"
+        }
+    ]
 
+@frappe.whitelist()
+def export_ledger(filters=None, file_format="csv"):
+    """
+    Stream the full filtered ledger as CSV or XLSX, fetched page by page
+    """
+    frappe.has_permission("Raw Material Transfer", "read", throw=True)
+    filters = frappe._dict(frappe.parse_json(filters) or {})
+    filters.pop("cursor", None)
+    
+    def fetch_page(cursor, page_length):
+        return get_data(filters, cursor=cursor, page_length=page_length)
+    
+    return send_export(
+        "raw_material_transfer_ledger",
+        get_columns(),
+        iter_pages(fetch_page),
+        file_format=file_format,
+    )
@@ -0,0 +1,165 @@
+# Copyright (c) 2026, Manufacturing Addon contributors
+# License: MIT
+
+"""FIFO allocation of delivered quantities to a Sales Order's open Work Orders.
+
+All open work orders are loaded in one query and every item is allocated in a
+single pass. Applying a plan updates produced_qty with one statement and builds
+one Manufacture Stock Entry per work order, all in the caller's transaction.
+"""
+
+import time
+
+import frappe
+from frappe import _
+from frappe.utils import flt
+
+
+def load_open_work_orders(sales_order, item_codes=None):
+	"""Submitted work orders of a Sales Order with pending qty, oldest first."""
+	filters = {"sales_order": sales_order, "docstatus": 1}
+	if item_codes:
+		filters["item_code"] = ["in", list(item_codes)]
+	work_orders = frappe.get_all(
+		"Work Order",
+		filters=filters,
+		fields=["name", "item_code", "qty", "produced_qty"],
+		order_by="creation asc, name asc",
+	)
+	return [wo for wo in work_orders if flt(wo.qty) - flt(wo.produced_qty) > 0]
+
+
+def plan_delivery_allocation(work_orders, delivery_map):
+	"""Allocate {item_code: qty} FIFO over ``work_orders`` in one pass.
+
+	Returns a plan dict: per-item results, per-work-order allocations and
+	any quantity that could not be allocated.
+	"""
+	remaining = {item_code: flt(qty) for item_code, qty in delivery_map.items() if flt(qty) > 0}
+	items = {
+		item_code: {
+			"item_code": item_code,
+			"total_delivery_qty": qty,
+			"allocated_qty": 0,
+			"work_orders": [],
+		}
+		for item_code, qty in remaining.items()
+	}
+	allocations = []
+
+	for wo in work_orders:
+		left = remaining.get(wo.item_code, 0)
+		if left <= 0:
+			continue
+		pending_qty = flt(wo.qty) - flt(wo.produced_qty)
+		if pending_qty <= 0:
+			continue
+
+		allocation_qty = min(left, pending_qty)
+		remaining[wo.item_code] = left - allocation_qty
+		allocation = {
+			"work_order": wo.name,
+			"item_code": wo.item_code,
+			"allocated_qty": allocation_qty,
+			"new_produced_qty": flt(wo.produced_qty) + allocation_qty,
+		}
+		allocations.append(allocation)
+		items[wo.item_code]["work_orders"].append(allocation)
+		items[wo.item_code]["allocated_qty"] += allocation_qty
+
+	return {
+		"items": list(items.values()),
+		"allocations": allocations,
+		"unallocated": {item_code: qty for item_code, qty in remaining.items() if qty > 0},
+	}
+
+
+def update_produced_qty(allocations):
+	"""Write new produced_qty for every allocated work order in one statement."""
+	if not allocations:
+		return
+	cases = " ".join(["WHEN %s THEN %s"] * len(allocations))
+	values = []
+	for a in allocations:
+		values.extend([a["work_order"], a["new_produced_qty"]])
+	names = [a["work_order"] for a in allocations]
+	frappe.db.sql(
+		f"""
+		UPDATE `tabWork Order`
+		SET produced_qty = CASE name {cases} END
+		WHERE name IN ({", ".join(["%s"] * len(names))})
+		""",
+		tuple(values + names),
+	)
+
+
+def build_allocation_stock_entries(allocations, posting_date, posting_time, reference_doctype, reference_name):
+	"""One submitted Manufacture Stock Entry per allocated work order."""
+	stock_entries = []
+	for a in allocations:
+		stock_entry = frappe.new_doc("Stock Entry")
+		stock_entry.stock_entry_type = "Manufacture"
+		stock_entry.posting_date = posting_date
+		stock_entry.posting_time = posting_time
+		stock_entry.work_order = a["work_order"]
+		stock_entry.reference_doctype = reference_doctype
+		stock_entry.reference_document = reference_name
+		stock_entry.append("items", {
+			"item_code": a["item_code"],
+			"qty": a["allocated_qty"],
+			"s_warehouse": "",
+			"t_warehouse": "",
+			"is_finished_item": 1,
+		})
+		stock_entry.insert()
+		stock_entry.submit()
+		stock_entries.append(stock_entry.name)
+	return stock_entries
+
+
+def allocate_delivery(
+	sales_order,
+	delivery_map,
+	dry_run=False,
+	create_stock_entries=False,
+	posting_date=None,
+	posting_time=None,
+	reference_doctype=None,
+	reference_name=None,
+):
+	"""Plan (and unless ``dry_run``, apply) a FIFO delivery allocation.
+
+	Nothing is committed here; the caller's request transaction covers the
+	produced_qty update and every Stock Entry.
+	"""
+	timings = {}
+	start = time.perf_counter()
+	work_orders = load_open_work_orders(sales_order, item_codes=list(delivery_map))
+	timings["load_work_orders"] = time.perf_counter() - start
+
+	start = time.perf_counter()
+	plan = plan_delivery_allocation(work_orders, delivery_map)
+	timings["plan"] = time.perf_counter() - start
+
+	plan["dry_run"] = bool(dry_run)
+	plan["stock_entries"] = []
+	if not dry_run:
+		start = time.perf_counter()
+		update_produced_qty(plan["allocations"])
+		timings["update_work_orders"] = time.perf_counter() - start
+
+		if create_stock_entries:
+			start = time.perf_counter()
+			plan["stock_entries"] = build_allocation_stock_entries(
+				plan["allocations"], posting_date, posting_time, reference_doctype, reference_name
+			)
+			timings["stock_entries"] = time.perf_counter() - start
+
+		for item_code, qty in plan["unallocated"].items():
+			frappe.msgprint(
+				_("Warning: {0} units of {1} could not be allocated to work orders").format(qty, item_code),
+				indicator="orange",
+			)
+
+	plan["timings"] = timings
+	return plan
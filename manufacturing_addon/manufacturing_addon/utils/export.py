@@ -0,0 +1,92 @@
+# Copyright (c) 2026, Manufacturing Addon contributors
+# License: MIT
+
+"""Chunked CSV / XLSX downloads for large reports.
+
+Rows are pulled page by page (keyset pagination in the caller), written
+straight to a temporary file and the file is streamed back to the browser,
+so neither the worker nor the response builder ever holds the full result.
+Whitelisted methods return ``send_export`` directly; Frappe passes a
+werkzeug Response through unchanged.
+"""
+
+import csv
+import os
+import tempfile
+
+import frappe
+from frappe.utils import cstr
+from werkzeug.wrappers import Response
+from werkzeug.wsgi import wrap_file
+
+EXPORT_PAGE_SIZE = 2000
+EXPORT_FORMATS = {
+	"csv": "text/csv; charset=utf-8",
+	"xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def iter_pages(fetch_page, page_size=EXPORT_PAGE_SIZE):
+	"""Yield rows from ``fetch_page(cursor, page_size) -> (rows, next_cursor)`` until exhausted."""
+	cursor = None
+	while True:
+		rows, cursor = fetch_page(cursor, page_size)
+		yield from rows
+		if not cursor or len(rows) < page_size:
+			return
+
+
+def _row_values(columns, row):
+	if isinstance(row, dict):
+		return [row.get(col["fieldname"]) for col in columns]
+	return list(row)
+
+
+def _write_csv(path, columns, rows):
+	with open(path, "w", newline="", encoding="utf-8-sig") as f:
+		writer = csv.writer(f)
+		writer.writerow([cstr(col.get("label") or col["fieldname"]) for col in columns])
+		for row in rows:
+			writer.writerow(["" if v is None else v for v in _row_values(columns, row)])
+
+
+def _write_xlsx(path, columns, rows, sheet_name):
+	from openpyxl import Workbook
+
+	# write-only workbooks flush rows to disk instead of building the sheet in memory
+	wb = Workbook(write_only=True)
+	ws = wb.create_sheet(sheet_name[:31] or "Sheet1")
+	ws.append([cstr(col.get("label") or col["fieldname"]) for col in columns])
+	for row in rows:
+		ws.append([cstr(v) if isinstance(v, (bytes, bytearray)) else v for v in _row_values(columns, row)])
+	wb.save(path)
+
+
+def send_export(filename, columns, rows, file_format="csv"):
+	"""Write ``rows`` (an iterable of dicts keyed by column fieldname) and stream the file.
+
+	``columns`` uses the report column shape: ``[{"label", "fieldname"}, ...]``.
+	"""
+	file_format = (file_format or "csv").lower()
+	if file_format not in EXPORT_FORMATS:
+		frappe.throw(frappe._("Unsupported export format: {0}").format(file_format))
+
+	fd, path = tempfile.mkstemp(suffix=f".{file_format}")
+	os.close(fd)
+	try:
+		if file_format == "xlsx":
+			_write_xlsx(path, columns, rows, filename)
+		else:
+			_write_csv(path, columns, rows)
+		f = open(path, "rb")
+	finally:
+		# the open handle keeps the data readable until the response is closed
+		os.unlink(path)
+
+	response = Response(
+		wrap_file(frappe.local.request.environ, f),
+		mimetype=EXPORT_FORMATS[file_format],
+		direct_passthrough=True,
+	)
+	response.headers["Content-Disposition"] = f'attachment; filename="{filename}.{file_format}"'
+	return response
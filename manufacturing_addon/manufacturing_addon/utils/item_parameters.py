@@ -0,0 +1,138 @@
+# Copyright (c) 2026, Manufacturing Addon contributors
+# License: MIT
+
+"""Item Category parameters and Stitching Size combo templates for Items.
+
+The Item validate hook copies the category's parameter list and the size's
+combo_detail onto new Items. Both are cached in Redis per category / size
+(cleared from the Item Category and Stitching Size doc_events), so a batch
+of variants costs one lookup per distinct category and size, not per Item.
+"""
+
+import frappe
+from frappe.utils import flt
+
+from manufacturing_addon.manufacturing_addon.utils.size_parser import extract_size
+
+CATEGORY_PARAMETERS_KEY = "manufacturing_addon_category_parameters"
+SIZE_COMBO_KEY = "manufacturing_addon_size_combo_templates"
+
+
+def _cached_child_rows(cache_key, parenttype, parentfield, child_doctype, fields, parents):
+	"""{parent: [row tuple, ...]} from cache, loading all misses in one query."""
+	parents = {p for p in parents if p}
+	result = {}
+	misses = []
+	for parent in parents:
+		rows = frappe.cache.hget(cache_key, parent)
+		if rows is None:
+			misses.append(parent)
+		else:
+			result[parent] = rows
+
+	if misses:
+		# MariaDB matches `parent IN (...)` case-insensitively, so a size taken from
+		# an item name ('140x220') can come back as its Stitching Size ('140X220')
+		requested = {}
+		for parent in misses:
+			requested.setdefault(parent.lower(), []).append(parent)
+		loaded = {parent: [] for parent in misses}
+		for row in frappe.get_all(
+			child_doctype,
+			filters={"parenttype": parenttype, "parentfield": parentfield, "parent": ["in", misses]},
+			fields=["parent"] + fields,
+			order_by="parent, idx",
+		):
+			for parent in requested.get(row.parent.lower(), ()):
+				loaded[parent].append(tuple(row.get(f) for f in fields))
+		for parent, rows in loaded.items():
+			frappe.cache.hset(cache_key, parent, rows)
+		result.update(loaded)
+
+	return result
+
+
+def get_category_parameters(categories):
+	"""{Item Category: [parameter, ...]}"""
+	rows = _cached_child_rows(
+		CATEGORY_PARAMETERS_KEY,
+		"Item Category",
+		"custom_item_parameter",
+		"Item Parameter",
+		["parameter"],
+		categories,
+	)
+	return {category: [r[0] for r in params] for category, params in rows.items()}
+
+
+def get_size_combo_templates(sizes):
+	"""{Stitching Size: [(item, pcs), ...]}; unknown sizes map to an empty list."""
+	return _cached_child_rows(
+		SIZE_COMBO_KEY,
+		"Stitching Size",
+		"combo_detail",
+		"Product Combo Item",
+		["item", "pcs"],
+		sizes,
+	)
+
+
+def _clear_cached_parent(cache_key, name):
+	# entries are cached under the requested spelling, which may differ in case
+	name = (name or "").lower()
+	for key in frappe.cache.hkeys(cache_key):
+		key = frappe.safe_decode(key)
+		if key.lower() == name:
+			frappe.cache.hdel(cache_key, key)
+
+
+def clear_category_parameters_cache(doc, method=None):
+	_clear_cached_parent(CATEGORY_PARAMETERS_KEY, doc.name)
+
+
+def clear_size_combo_cache(doc, method=None):
+	_clear_cached_parent(SIZE_COMBO_KEY, doc.name)
+
+
+def _item_size(doc):
+	for attr in doc.get("attributes") or []:
+		if attr.attribute and attr.attribute.upper() == "SIZE" and attr.attribute_value:
+			return attr.attribute_value
+	return extract_size(doc.name or doc.item_code)
+
+
+def apply_item_parameters(docs):
+	"""Fill category parameters and size combos on a batch of (unsaved) Items.
+
+	Existing custom_item_parameter / custom_product_combo_item rows are kept.
+	"""
+	docs = [doc for doc in docs if doc]
+	categories = {}
+	for item_group in {doc.item_group for doc in docs if doc.item_group}:
+		categories[item_group] = frappe.get_cached_value("Item Group", item_group, "custom_item_category")
+
+	sizes = {doc.name: _item_size(doc) for doc in docs}
+	parameters = get_category_parameters(categories.values())
+	combos = get_size_combo_templates(sizes.values())
+
+	for doc in docs:
+		category = categories.get(doc.item_group)
+		if category and not doc.get("custom_item_parameter"):
+			for parameter in parameters.get(category) or []:
+				doc.append("custom_item_parameter", {"parameter": parameter})
+
+		combo_rows = combos.get(sizes.get(doc.name)) or []
+		if combo_rows and doc.meta.has_field("custom_product_combo_item") and not doc.get("custom_product_combo_item"):
+			for item, pcs in combo_rows:
+				doc.append("custom_product_combo_item", {"item": item, "pcs": flt(pcs)})
+
+
+def prime_item_parameter_caches(item_groups=None, sizes=None):
+	"""Warm both caches ahead of a variant batch (one query per doctype)."""
+	categories = [
+		frappe.get_cached_value("Item Group", item_group, "custom_item_category")
+		for item_group in set(item_groups or [])
+		if item_group
+	]
+	get_category_parameters(categories)
+	get_size_combo_templates(sizes or [])
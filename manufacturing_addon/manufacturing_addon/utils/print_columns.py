@@ -1,13 +1,15 @@
 # Copyright (c) 2026, mohtashim and contributors
 # Dynamic child-table columns for print formats from GridView user settings.
-# Pattern: Sudhanshu Badole — cache hgetall, SQL fallback, meta in_list_view.
+# Pattern: Sudhanshu Badole — user settings key, SQL fallback, meta in_list_view.
 
 import json
 
 import frappe
+from frappe.utils.caching import request_cache
 
 PARENT_DOCTYPE = "Order Sheet"
 CHILD_DOCTYPE = "Order Sheet CT"
+PRINT_COLUMNS_CACHE_KEY = "order_sheet_print_columns"
 SKIP_FIELD_TYPES = frozenset(
 	("Section Break", "Column Break", "Tab Break", "HTML", "Button", "Fold", "Heading")
 )
@@ -24,82 +26,91 @@ def _map_fieldnames(meta, fieldnames: list[str]) -> list[dict]:
 	return out
 
 
-def _columns_from_gridview(gridview_data: dict, meta) -> list[dict] | None:
+def _gridview_fieldnames(gridview_data) -> list[str]:
 	if not isinstance(gridview_data, dict):
-		return None
+		return []
 	rows = gridview_data.get(CHILD_DOCTYPE) or gridview_data.get("order_sheet_ct")
 	if not rows:
-		return None
-	fieldnames = [r.get("fieldname") for r in rows if r.get("fieldname")]
-	cols = _map_fieldnames(meta, fieldnames)
-	return cols or None
+		return []
+	return [r.get("fieldname") for r in rows if isinstance(r, dict) and r.get("fieldname")]
 
 
-def _gridview_columns_for_session_user(meta, user: str):
-	"""Resolve GridView from Redis scan, SQL, then get_user_settings (current UI columns)."""
+def _parse_settings(data) -> dict:
+	if isinstance(data, dict):
+		return data
 	try:
-		user_settings_all = frappe.cache.hgetall("_user_settings")
+		parsed = json.loads(frappe.safe_decode(data) if data else "{}")
 	except Exception:
-		user_settings_all = None
+		return {}
+	return parsed if isinstance(parsed, dict) else {}
 
-	if user_settings_all:
-		for key, data in user_settings_all.items():
-			key = frappe.safe_decode(key)
-			try:
-				dt_key, usr = key.split("::")
-			except ValueError:
-				continue
-			if dt_key != PARENT_DOCTYPE or usr != user:
-				continue
-			try:
-				payload = json.loads(frappe.safe_decode(data) if data else "{}")
-				gv = payload.get("GridView") or {}
-				cols = _columns_from_gridview(gv, meta)
-				if cols:
-					return cols
-			except Exception:
-				continue
 
+def _gridview_fieldnames_from_settings(user: str, doctype: str = PARENT_DOCTYPE) -> list[str]:
+	"""GridView child fieldnames from this user's settings: one Redis key, then ``__UserSettings``."""
 	try:
-		sql_rows = frappe.db.sql(
-			"""SELECT data FROM `__UserSettings` WHERE `user`=%s AND `doctype`=%s""",
-			(user, PARENT_DOCTYPE),
-			as_dict=True,
+		fieldnames = _gridview_fieldnames(
+			_parse_settings(frappe.cache.hget("_user_settings", f"{doctype}::{user}")).get("GridView")
 		)
+		if fieldnames:
+			return fieldnames
 	except Exception:
-		sql_rows = []
-
-	for row in sql_rows or []:
-		try:
-			parsed = json.loads(row.get("data") or "{}")
-			gv = parsed.get("GridView") or {}
-			cols = _columns_from_gridview(gv, meta)
-			if cols:
-				return cols
-		except Exception:
-			continue
+		pass
 
 	try:
-		from frappe.model.utils.user_settings import get_user_settings
-
-		raw = get_user_settings(PARENT_DOCTYPE)
-		parsed = json.loads(raw or "{}")
-		gv = parsed.get("GridView") or {}
-		cols = _columns_from_gridview(gv, meta)
-		if cols:
-			return cols
+		rows = frappe.db.sql(
+			"""SELECT data FROM `__UserSettings` WHERE `user`=%s AND `doctype`=%s""",
+			(user, doctype),
+		)
 	except Exception:
-		pass
+		rows = []
+
+	for (data,) in rows or []:
+		fieldnames = _gridview_fieldnames(_parse_settings(data).get("GridView"))
+		if fieldnames:
+			return fieldnames
+
+	return []
+
 
-	return None
+@request_cache
+def _resolved_gridview_fieldnames(user: str, doctype: str = PARENT_DOCTYPE) -> list[str]:
+	"""Cached per (user, doctype) in Redis and per request/job in memory.
+
+	Cleared by ``save_user_settings`` when the user saves grid settings.
+	"""
+	fieldnames = frappe.cache.hget(PRINT_COLUMNS_CACHE_KEY, f"{doctype}::{user}")
+	if fieldnames is None:
+		fieldnames = _gridview_fieldnames_from_settings(user, doctype)
+		frappe.cache.hset(PRINT_COLUMNS_CACHE_KEY, f"{doctype}::{user}", fieldnames)
+	return fieldnames
+
+
+def _gridview_columns_for_session_user(meta, user: str):
+	"""Resolve GridView columns for ``user`` (see _resolved_gridview_fieldnames)."""
+	return _map_fieldnames(meta, _resolved_gridview_fieldnames(user)) or None
+
+
+def clear_print_columns_cache(doctype: str, user: str | None = None):
+	frappe.cache.hdel(PRINT_COLUMNS_CACHE_KEY, f"{doctype}::{user or frappe.session.user}")
+
+
+@frappe.whitelist()
+def save_user_settings(doctype, user_settings):
+	"""Override of ``frappe.model.utils.user_settings.save`` that drops resolved print columns."""
+	from frappe.model.utils.user_settings import save
+
+	out = save(doctype, user_settings)
+	clear_print_columns_cache(doctype)
+	return out
 
 
 def get_order_sheet_ct_dynamic_columns(doc=None):
 	"""Jinja method: Order Sheet CT columns matching GridView (Configure Columns).
 
 	Priority (important):
-	1. Live GridView — Redis ``hgetall``, ``__UserSettings`` SQL, ``get_user_settings`` so print
-	   always matches **current** Configure Columns (Sudhanshu Badole pattern).
+	1. Live GridView — the user's ``_user_settings`` Redis key, then ``__UserSettings`` SQL, so
+	   print matches **current** Configure Columns (Sudhanshu Badole pattern). Resolved
+	   fieldnames are cached per (user, doctype) until the user saves grid settings again.
 	2. Document ``order_sheet_print_column_order`` — only used when no GridView is found (e.g. stale
 	   JSON must **not** override a 6-column grid because the doc once saved only 2 columns).
 
@@ -0,0 +1,201 @@
+# Copyright (c) 2026, Manufacturing Addon contributors
+# License: MIT
+
+"""Opt-in query budget profiling for whitelisted endpoints and doc hooks.
+
+``@query_budget()`` (or ``with query_budget("name"):``) records query count,
+DB time, Python time and peak traced memory for one call. Sampling is
+switched on from Manufacturing Addon Setting; when it is off the wrapper
+costs one attribute lookup per call. Samples land in a Redis list per
+endpoint trimmed to ``RING_SIZE`` entries, summarised by the Query Budget
+desk page.
+"""
+
+import functools
+import json
+import math
+import random
+import time
+import tracemalloc
+
+import frappe
+from frappe.utils import cint, flt
+
+QUERY_BUDGET_KEY = "manufacturing_addon_query_budget"
+RING_SIZE = 200
+METRICS = ("queries", "db_ms", "py_ms", "peak_kb")
+
+
+def _sample_rate():
+	"""Sampling percentage for this request (0 when profiling is off)."""
+	rate = getattr(frappe.local, "query_budget_sample_rate", None)
+	if rate is None:
+		try:
+			settings = frappe.get_cached_doc("Manufacturing Addon Setting")
+			rate = flt(settings.get("query_profiling_sample_rate")) if cint(settings.get("enable_query_profiling")) else 0
+		except Exception:
+			rate = 0
+		frappe.local.query_budget_sample_rate = rate
+	return rate
+
+
+class _Probe:
+	"""Counts frappe.db.sql calls made while active (nested probes share the outer patch)."""
+
+	def __init__(self, name, record=True):
+		self.name = name
+		self.record = record
+		self.queries = 0
+		self.db_time = 0.0
+		self.sample = None
+
+	def __enter__(self):
+		stack = getattr(frappe.local, "query_budget_stack", None)
+		if stack is None:
+			stack = frappe.local.query_budget_stack = []
+		self.outermost = not stack
+		stack.append(self)
+
+		if self.outermost:
+			db = frappe.db
+			self._patched = "sql" in db.__dict__ and db.__dict__["sql"]
+			original = db.sql
+
+			def sql(*args, **kwargs):
+				start = time.perf_counter()
+				try:
+					return original(*args, **kwargs)
+				finally:
+					elapsed = time.perf_counter() - start
+					for probe in frappe.local.query_budget_stack:
+						probe.queries += 1
+						probe.db_time += elapsed
+
+			db.sql = sql
+			self._tracing = not tracemalloc.is_tracing()
+			if self._tracing:
+				tracemalloc.start()
+
+		self.started = time.perf_counter()
+		return self
+
+	def __exit__(self, *exc):
+		wall = time.perf_counter() - self.started
+		peak = 0
+		stack = frappe.local.query_budget_stack
+		stack.pop()
+
+		if self.outermost:
+			if self._tracing:
+				peak = tracemalloc.get_traced_memory()[1]
+				tracemalloc.stop()
+			if self._patched:
+				frappe.db.sql = self._patched
+			else:
+				del frappe.db.sql
+
+		self.sample = {
+			"ts": int(time.time()),
+			"queries": self.queries,
+			"db_ms": round(self.db_time * 1000, 2),
+			"py_ms": round(max(wall - self.db_time, 0) * 1000, 2),
+			"peak_kb": round(peak / 1024, 1),
+		}
+		if self.record:
+			_record(self.name, self.sample)
+		return False
+
+
+class _NullProbe:
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc):
+		return False
+
+
+_NULL_PROBE = _NullProbe()
+
+
+def _record(name, sample):
+	try:
+		key = f"{QUERY_BUDGET_KEY}::{name}"
+		frappe.cache.lpush(key, json.dumps(sample))
+		frappe.cache.ltrim(key, 0, RING_SIZE - 1)
+		frappe.cache.hset(QUERY_BUDGET_KEY, name, sample["ts"])
+	except Exception:
+		# profiling must never break the call it measures
+		pass
+
+
+def _probe(name):
+	rate = _sample_rate()
+	if not rate or getattr(frappe.local, "db", None) is None:
+		return _NULL_PROBE
+	if rate < 100 and random.random() * 100 >= rate and not getattr(frappe.local, "query_budget_stack", None):
+		return _NULL_PROBE
+	return _Probe(name)
+
+
+def measure(name):
+	"""Always-on probe that keeps its sample on ``.sample`` instead of recording it (used by benchmarks)."""
+	return _Probe(name, record=False)
+
+
+class query_budget:
+	"""Decorator / context manager recording the query budget of one entry point.
+
+	As a decorator the endpoint name defaults to ``<module>.<qualname>``.
+	"""
+
+	def __init__(self, name=None):
+		self.name = name
+
+	def __call__(self, fn):
+		name = self.name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__qualname__}"
+
+		@functools.wraps(fn)
+		def wrapper(*args, **kwargs):
+			with _probe(name):
+				return fn(*args, **kwargs)
+
+		return wrapper
+
+	def __enter__(self):
+		self._active = _probe(self.name or "anonymous")
+		return self._active.__enter__()
+
+	def __exit__(self, *exc):
+		return self._active.__exit__(*exc)
+
+
+def _percentile(values, pct):
+	if not values:
+		return 0
+	# nearest-rank percentile
+	values = sorted(values)
+	index = max(math.ceil(pct / 100 * len(values)) - 1, 0)
+	return values[index]
+
+
+def get_query_budget_summary():
+	"""[{endpoint, samples, last_seen, <metric>_p50, <metric>_p95, ...}] sorted by p95 DB time."""
+	summary = []
+	for name, last_seen in (frappe.cache.hgetall(QUERY_BUDGET_KEY) or {}).items():
+		name = frappe.safe_decode(name)
+		samples = [json.loads(s) for s in frappe.cache.lrange(f"{QUERY_BUDGET_KEY}::{name}", 0, -1) or []]
+		if not samples:
+			continue
+		row = {"endpoint": name, "samples": len(samples), "last_seen": cint(last_seen)}
+		for metric in METRICS:
+			values = [flt(s.get(metric)) for s in samples]
+			row[f"{metric}_p50"] = _percentile(values, 50)
+			row[f"{metric}_p95"] = _percentile(values, 95)
+		summary.append(row)
+	return sorted(summary, key=lambda row: row["db_ms_p95"], reverse=True)
+
+
+def clear_query_budget():
+	for name in (frappe.cache.hgetall(QUERY_BUDGET_KEY) or {}):
+		frappe.cache.delete_value(f"{QUERY_BUDGET_KEY}::{frappe.safe_decode(name)}")
+	frappe.cache.delete_value(QUERY_BUDGET_KEY)
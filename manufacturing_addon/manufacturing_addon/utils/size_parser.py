@@ -0,0 +1,149 @@
+# Copyright (c) 2026, Manufacturing Addon contributors
+# License: MIT
+
+"""Textile size / article parsing for item names and SIZE attribute values.
+
+Item names look like ``BDH-QCS-140X220,60X70+15-WHITE`` or
+``DUVET-(135X200/80X80)*2``: an article prefix, then a size token made of
+``LxW`` components joined by ``/`` (set components) and ``,`` (standard
+sizes such as pillow cases), each with an optional ``+flap``, and an
+optional ``*N`` multiplier. Patterns are compiled once and parse results are
+memoized per input string, so Item validate hooks and Sales Order imports
+can call these freely.
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+# size-like token: digits with X separators and optional /, +, *, or parentheses
+SIZE_TOKEN_RE = re.compile(r"([0-9][0-9Xx/,+*().]*[Xx][0-9Xx/,+*().]*)")
+# first "<num>X<num>" in an item name; the article is whatever precedes it
+ARTICLE_BOUNDARY_RE = re.compile(r"\d+(?:\.\d+)?X\d+")
+DIMENSION_RE = re.compile(r"(\d+(?:\.\d+)?)\s*[Xx]\s*(\d+(?:\.\d+)?)")
+FLAP_RE = re.compile(r"\+\s*(\d+(?:\.\d+)?)")
+MULTIPLIER_RE = re.compile(r"^(.*?)\s*\*\s*(\d+)$")
+# explicit piece count in front of a dimension: '2 PCS 50X75' is two pieces of 50X75.
+# A bare leading number is a dimension ('160X200X30' is a fitted sheet), never a count.
+COUNT_PREFIX_RE = re.compile(r"^(\d+)\s*PCS?\b\s*[Xx@-]?\s*", re.IGNORECASE)
+
+PARSE_CACHE_SIZE = 8192
+
+SizeComponent = namedtuple("SizeComponent", ["lenght", "width", "flap", "qty", "text"])
+ParsedSize = namedtuple(
+	"ParsedSize",
+	["value", "normalized", "lenght", "width", "components", "standard_sizes", "multiplier"],
+)
+ParsedItemName = namedtuple("ParsedItemName", ["item_name", "article", "size"])
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def normalize_size(value):
+	"""Strip units, quotes and wrapping parentheses: '(135X200/80X80)*2' -> '135X200/80X80*2'."""
+	value = (value or "").strip()
+	value = value.replace(" CM", "").replace('"', "").strip()
+	return _strip_parentheses(value).strip()
+
+
+def _strip_parentheses(value):
+	if value.startswith("("):
+		value = value[1:]
+	if ")*" in value:
+		value = value.replace(")*", "*")
+	if value.endswith(")"):
+		value = value[:-1]
+	return value
+
+
+def size_dimensions(size_value):
+	"""(lenght, width) of the first part of a normalized size, or (None, None)."""
+	parsed = parse_size(size_value)
+	return (parsed.lenght, parsed.width)
+
+
+def _parse_component(text):
+	text = text.strip()
+	qty = 1
+	count = COUNT_PREFIX_RE.match(text)
+	if count:
+		qty = int(count.group(1))
+	match = DIMENSION_RE.search(text, count.end() if count else 0)
+	if not match:
+		return None
+	flap = FLAP_RE.search(text, match.end())
+	return SizeComponent(
+		float(match.group(1)),
+		float(match.group(2)),
+		float(flap.group(1)) if flap else None,
+		qty,
+		text,
+	)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_size(size_value):
+	"""Structured view of a size value.
+
+	``components`` are the ``/``-separated parts of the main size, and
+	``standard_sizes`` the ``,``-separated parts after it (e.g. pillow
+	cases). ``lenght``/``width`` are the first two numbers of the first
+	component (after any explicit ``N PCS`` count), as Stitching Size
+	records expect.
+	"""
+	normalized = normalize_size(size_value)
+	body, multiplier = normalized, 1
+	match = MULTIPLIER_RE.match(normalized)
+	if match:
+		body, multiplier = match.group(1), int(match.group(2))
+
+	groups = [g for g in body.split(",") if g.strip()]
+	components = ()
+	standard_sizes = ()
+	if groups:
+		components = tuple(c for c in map(_parse_component, groups[0].split("/")) if c)
+		standard_sizes = tuple(
+			c for group in groups[1:] for c in map(_parse_component, group.split("/")) if c
+		)
+
+	# first two numbers of the first component, after any explicit 'N PCS' count
+	first = components[0] if components else (standard_sizes[0] if standard_sizes else None)
+	lenght, width = (first.lenght, first.width) if first else (None, None)
+	return ParsedSize(
+		size_value, normalized, lenght, width, components, standard_sizes, multiplier
+	)
+
+
+def _extract_size(item_name):
+	match = SIZE_TOKEN_RE.search(item_name)
+	if not match:
+		return None
+	return _strip_parentheses(match.group(1).strip())
+
+
+def _extract_article(item_name):
+	match = ARTICLE_BOUNDARY_RE.search(item_name)
+	if not match:
+		return None
+	return item_name[:match.start()].strip().rstrip("- ").strip() or None
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_item_name(item_name):
+	"""Article prefix and size token of an item name (either may be None)."""
+	item_name = item_name or ""
+	return ParsedItemName(item_name, _extract_article(item_name), _extract_size(item_name))
+
+
+def extract_size(item_name):
+	"""Size token from an item name, e.g. '140X220,60X70+15' or '135X200/80X80*2'."""
+	return parse_item_name(item_name or "").size
+
+
+def extract_article(item_name):
+	"""Article prefix before the size token, e.g. 'BDH-QCS' from 'BDH-QCS-140X220...'."""
+	return parse_item_name(item_name or "").article
+
+
+def clear_parse_cache():
+	for fn in (normalize_size, parse_size, parse_item_name):
+		fn.cache_clear()
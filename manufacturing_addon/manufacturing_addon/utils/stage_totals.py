@@ -0,0 +1,130 @@
+# Copyright (c) 2026, Manufacturing Addon contributors
+# License: MIT
+
+"""Cumulative stage quantities per (so_item, combo_item) for an Order Sheet.
+
+Report validate hooks read finished quantities of earlier (and their own)
+stages from here: one grouped query per stage, regardless of CT row count.
+Operation Report keeps all three stages on one CT row, so its totals come
+from a single grouped query as well.
+"""
+
+import frappe
+from frappe.utils import cstr, flt
+
+# stage -> (report doctype, child doctype, qty field)
+STAGE_TABLES = {
+	"Cutting": ("Cutting Report", "Cutting Report CT", "cutting_qty"),
+	"Stitching": ("Stitching Report", "Stitching Report CT", "stitching_qty"),
+	"Checking": ("Checking Report", "Checking Report CT", "checking_qty"),
+	"Quality": ("Quality Report", "Quality Report CT", "quality_qty"),
+	"Packing": ("Packing Report", "Packing Report CT", "packaging_qty"),
+}
+
+
+def get_stage_totals(order_sheet, stage, exclude_name=None):
+	"""Return {(so_item, combo_item or ""): qty} from submitted reports of one stage."""
+	if not order_sheet:
+		return {}
+
+	report_doctype, child_doctype, qty_field = STAGE_TABLES[stage]
+	exclude = ""
+	params = [order_sheet]
+	if exclude_name:
+		exclude = "AND r.name != %s"
+		params.append(exclude_name)
+
+	rows = frappe.db.sql(
+		f"""
+		SELECT ct.so_item, IFNULL(ct.combo_item, '') AS combo_item,
+			SUM(IFNULL(ct.{qty_field}, 0)) AS total_qty
+		FROM `tab{child_doctype}` ct
+		INNER JOIN `tab{report_doctype}` r ON r.name = ct.parent
+		WHERE r.order_sheet = %s AND r.docstatus = 1
+			AND IFNULL(ct.so_item, '') != '' {exclude}
+		GROUP BY ct.so_item, IFNULL(ct.combo_item, '')
+		""",
+		tuple(params),
+		as_dict=True,
+	)
+	return {(d.so_item, d.combo_item or ""): flt(d.total_qty) for d in rows}
+
+
+OPERATION_QTY_FIELDS = ("cutting1", "stitching1", "packaging1")
+
+
+def get_operation_totals(order_sheet):
+	"""Return {(so_item, combo_item or ""): {cutting1, stitching1, packaging1}} from submitted Operation Reports."""
+	if not order_sheet:
+		return {}
+
+	sums = ", ".join(f"SUM(IFNULL(ct.{f}, 0)) AS {f}" for f in OPERATION_QTY_FIELDS)
+	rows = frappe.db.sql(
+		f"""
+		SELECT ct.so_item, IFNULL(ct.combo_item, '') AS combo_item, {sums}
+		FROM `tabOperation Report CT` ct
+		INNER JOIN `tabOperation Report` r ON r.name = ct.parent
+		WHERE r.order_sheet = %s AND r.docstatus = 1
+			AND IFNULL(ct.so_item, '') != ''
+		GROUP BY ct.so_item, IFNULL(ct.combo_item, '')
+		""",
+		(order_sheet,),
+		as_dict=True,
+	)
+	return {
+		(d.so_item, d.combo_item or ""): {f: flt(d.get(f)) for f in OPERATION_QTY_FIELDS}
+		for d in rows
+	}
+
+
+class StageTotals:
+	"""Memoized stage totals for one document save.
+
+	validate(), before_save() and the *_condition() checks all read the same
+	totals; each (stage, exclude_self) pair is queried at most once.
+	"""
+
+	def __init__(self, order_sheet, doc_name=None):
+		self.order_sheet = order_sheet
+		self.doc_name = doc_name
+		self._totals = {}
+
+	def totals(self, stage, exclude_self=False):
+		key = (stage, bool(exclude_self and self.doc_name))
+		if key not in self._totals:
+			self._totals[key] = get_stage_totals(
+				self.order_sheet, stage, exclude_name=self.doc_name if key[1] else None
+			)
+		return self._totals[key]
+
+	def qty(self, stage, so_item, combo_item=None, exclude_self=False):
+		return flt(self.totals(stage, exclude_self).get((so_item, cstr(combo_item)), 0))
+
+	def bundle_equivalent_qty(self, stage, so_item, bundle_items, use_highest=False, exclude_self=False):
+		"""Finished-set equivalent of component totals: component qty / pcs, min (or max)."""
+		totals = self.totals(stage, exclude_self)
+		normalized = [
+			flt(totals.get((so_item, cstr(b.get("item"))), 0)) / (flt(b.get("pcs")) or 1)
+			for b in bundle_items
+		]
+		if not normalized:
+			return 0
+		return max(normalized) if use_highest else min(normalized)
+
+
+def reset_stage_totals(doc):
+	"""Drop memoized totals; call at the start of validate so each save re-reads."""
+	doc.flags.stage_totals = None
+
+
+def stage_totals_for(doc):
+	"""Return the StageTotals memo attached to ``doc`` for the current save."""
+	provider = doc.flags.get("stage_totals")
+	if (
+		provider is None
+		or provider.order_sheet != doc.order_sheet
+		or provider.doc_name != doc.name
+	):
+		provider = StageTotals(doc.order_sheet, doc.name)
+		doc.flags.stage_totals = provider
+	return provider
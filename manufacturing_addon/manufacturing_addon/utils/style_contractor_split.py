@@ -207,6 +207,62 @@ def validate_style_contractor_splits(report_rows, qty_field, report_label):
 				)
 
 
+SPLIT_DASHBOARD_SOURCES = (
+	("Cutting", "Cutting Report", "Cutting Report CT"),
+	("Stitching", "Stitching Report", "Stitching Report CT"),
+	("Packing", "Packing Report", "Packing Report CT"),
+)
+
+
+def _split_dashboard_union(operation=None, from_date=None, to_date=None, order_sheet=None, contractor=None):
+	"""UNION ALL of report ⋈ CT ⋈ Report Style Contractor per operation, filtered in SQL."""
+	conditions = ["r.docstatus = 1", "IFNULL(sc.contractor, '') != ''"]
+	values = {}
+	if from_date:
+		conditions.append("r.date >= %(from_date)s")
+		values["from_date"] = from_date
+	if to_date:
+		conditions.append("r.date <= %(to_date)s")
+		values["to_date"] = to_date
+	if order_sheet:
+		conditions.append("r.order_sheet = %(order_sheet)s")
+		values["order_sheet"] = order_sheet
+	if contractor:
+		conditions.append("sc.contractor = %(contractor)s")
+		values["contractor"] = contractor
+	where_sql = " AND ".join(conditions)
+
+	selects = []
+	for op_name, report_dt, ct_dt in SPLIT_DASHBOARD_SOURCES:
+		if operation and operation not in ("All", op_name):
+			continue
+		selects.append(
+			f"""
+			SELECT
+				'{op_name}' AS operation,
+				r.name AS report_name,
+				r.date AS report_date,
+				r.order_sheet,
+				ct.so_item,
+				ct.idx AS ct_idx,
+				IFNULL(ct.combo_item, '') AS combo_item,
+				sc.style,
+				sc.contractor,
+				IFNULL(sc.split_qty, 0) AS split_qty,
+				IFNULL(sc.qty, 0) AS billable_qty,
+				IFNULL(sc.rate, 0) AS rate,
+				IFNULL(sc.amount, 0) AS amount,
+				sc.is_subassembly,
+				sc.idx AS sc_idx
+			FROM `tab{report_dt}` r
+			INNER JOIN `tab{ct_dt}` ct ON ct.parent = r.name AND ct.parenttype = '{report_dt}'
+			INNER JOIN `tabReport Style Contractor` sc ON sc.parent = ct.name AND sc.parenttype = '{ct_dt}'
+			WHERE {where_sql}
+			"""
+		)
+	return " UNION ALL ".join(selects), values
+
+
 @frappe.whitelist()
 def get_contractor_split_dashboard(
 	from_date=None,
@@ -214,119 +270,64 @@ def get_contractor_split_dashboard(
 	operation=None,
 	order_sheet=None,
 	contractor=None,
+	start=0,
+	page_length=500,
 ):
-	"""Dashboard: contractor billing split by process / style from submitted reports."""
-	from frappe.utils import getdate
+	"""Dashboard: contractor billing split by process / style from submitted reports.
+
+	Filtering, sorting and paging run in SQL; ``summary`` covers every matching
+	split line, ``rows`` only the requested page.
+	"""
+	from frappe.utils import cint, getdate
 
 	from_date = getdate(from_date) if from_date else None
 	to_date = getdate(to_date) if to_date else None
-
-	report_sources = (
-		("Cutting", "Cutting Report", "Cutting Report CT", "cutting_qty"),
-		("Stitching", "Stitching Report", "Stitching Report CT", "stitching_qty"),
-		("Packing", "Packing Report", "Packing Report CT", "packaging_qty"),
+	start = max(cint(start), 0)
+	page_length = cint(page_length) or 500
+
+	empty = {"rows": [], "summary": {"rows": 0, "total_amount": 0, "contractors": 0}, "start": start, "page_length": page_length}
+	if not frappe.db.table_exists("Report Style Contractor"):
+		return empty
+
+	union_sql, values = _split_dashboard_union(operation, from_date, to_date, order_sheet, contractor)
+	if not union_sql:
+		return empty
+
+	summary = frappe.db.sql(
+		f"""
+		SELECT COUNT(*) AS `rows`, IFNULL(SUM(s.amount), 0) AS total_amount,
+			COUNT(DISTINCT s.contractor) AS contractors
+		FROM ({union_sql}) s
+		""",
+		values,
+		as_dict=True,
+	)[0]
+
+	rows = frappe.db.sql(
+		f"""
+		SELECT s.*
+		FROM ({union_sql}) s
+		ORDER BY s.report_date DESC, s.order_sheet DESC, s.operation DESC, s.style DESC,
+			s.report_name, s.so_item, s.ct_idx, s.sc_idx
+		LIMIT %(page_length)s OFFSET %(start)s
+		""",
+		dict(values, start=start, page_length=page_length),
+		as_dict=True,
 	)
+	for row in rows:
+		row.report_date = str(row.report_date) if row.report_date else ""
+		row.split_qty = flt(row.split_qty)
+		row.billable_qty = flt(row.billable_qty)
+		row.rate = flt(row.rate)
+		row.amount = flt(row.amount)
 
-	rows = []
-	for op_name, report_dt, ct_dt, qty_field in report_sources:
-		if operation and operation not in ("All", op_name):
-			continue
-		if not frappe.db.table_exists("Report Style Contractor"):
-			continue
-
-		filters = {"docstatus": 1}
-		if from_date:
-			filters["date"] = [">=", from_date]
-		if to_date:
-			if "date" in filters:
-				filters["date"] = ["between", [from_date, to_date]]
-			else:
-				filters["date"] = ["<=", to_date]
-		if order_sheet:
-			filters["order_sheet"] = order_sheet
-
-		reports = frappe.get_all(
-			report_dt,
-			filters=filters,
-			fields=["name", "order_sheet", "date", "supplier"],
-		)
-		if not reports:
-			continue
-
-		report_map = {r.name: r for r in reports}
-		ct_rows = frappe.get_all(
-			ct_dt,
-			filters={"parent": ["in", list(report_map)]},
-			fields=["name", "parent", "so_item", "combo_item", "article"],
-		)
-		if not ct_rows:
-			continue
-
-		sc_rows = frappe.get_all(
-			"Report Style Contractor",
-			filters={
-				"parent": ["in", [c.name for c in ct_rows]],
-				"parenttype": ct_dt,
-			},
-			fields=[
-				"parent",
-				"style",
-				"contractor",
-				"split_qty",
-				"qty",
-				"rate",
-				"amount",
-				"is_subassembly",
-				"operation",
-			],
-			order_by="parent asc, idx asc",
-		)
-
-		ct_map = {c.name: c for c in ct_rows}
-		for sc in sc_rows:
-			if contractor and sc.contractor != contractor:
-				continue
-			if not sc.contractor:
-				continue
-			ct = ct_map.get(sc.parent)
-			if not ct:
-				continue
-			report = report_map.get(ct.parent)
-			if not report:
-				continue
-
-			rows.append(
-				{
-					"operation": op_name,
-					"report_name": report.name,
-					"report_date": str(report.date) if report.date else "",
-					"order_sheet": report.order_sheet,
-					"so_item": ct.so_item,
-					"combo_item": ct.combo_item or "",
-					"style": sc.style,
-					"contractor": sc.contractor,
-					"split_qty": flt(sc.split_qty),
-					"billable_qty": flt(sc.qty),
-					"rate": flt(sc.rate),
-					"amount": flt(sc.amount),
-					"is_subassembly": sc.is_subassembly,
-				}
-			)
-
-	rows.sort(
-		key=lambda r: (
-			r.get("report_date") or "",
-			r.get("order_sheet") or "",
-			r.get("operation") or "",
-			r.get("style") or "",
-		),
-		reverse=True,
-	)
-
-	summary = {
-		"rows": len(rows),
-		"total_amount": sum(flt(r.get("amount")) for r in rows),
-		"contractors": len({r.get("contractor") for r in rows if r.get("contractor")}),
+	return {
+		"rows": rows,
+		"summary": {
+			"rows": summary.rows,
+			"total_amount": flt(summary.total_amount),
+			"contractors": summary.contractors,
+		},
+		"start": start,
+		"page_length": page_length,
 	}
-
-	return {"rows": rows, "summary": summary}
@@ -0,0 +1,29 @@
+# Copyright (c) 2026, Manufacturing Addon contributors
+# License: MIT
+
+from unittest.mock import patch
+
+import frappe
+from frappe.tests.utils import FrappeTestCase
+
+from manufacturing_addon.manufacturing_addon.utils import item_parameters
+
+
+class TestItemParameters(FrappeTestCase):
+	def setUp(self):
+		frappe.cache.delete_value(item_parameters.SIZE_COMBO_KEY)
+
+	def tearDown(self):
+		frappe.cache.delete_value(item_parameters.SIZE_COMBO_KEY)
+
+	def test_size_differing_only_in_case(self):
+		# MariaDB returns the Stitching Size spelling, not the one taken from the item name
+		rows = [frappe._dict(parent="140X220", item="_Test Pillow Case", pcs=2)]
+		with patch.object(item_parameters.frappe, "get_all", return_value=rows):
+			combos = item_parameters.get_size_combo_templates(["140x220", "90X190"])
+
+		self.assertEqual(combos, {"140x220": [("_Test Pillow Case", 2)], "90X190": []})
+		self.assertEqual(frappe.cache.hget(item_parameters.SIZE_COMBO_KEY, "140x220"), [("_Test Pillow Case", 2)])
+
+		item_parameters.clear_size_combo_cache(frappe._dict(name="140X220"))
+		self.assertIsNone(frappe.cache.hget(item_parameters.SIZE_COMBO_KEY, "140x220"))
@@ -0,0 +1,99 @@
+# Copyright (c) 2026, Manufacturing Addon contributors
+# License: MIT
+
+import unittest
+
+import re
+
+from manufacturing_addon.manufacturing_addon.benchmarks.item_name_parsing import (
+	SIZES,
+	_legacy_extract,
+	build_corpus,
+)
+from manufacturing_addon.manufacturing_addon.utils import size_parser
+
+
+def _legacy_dimensions(size_value):
+	# lenght/width rule find_or_create_size used before the shared parser
+	first_part = size_parser.normalize_size(size_value)
+	for separator in [",", "+", "/"]:
+		if separator in first_part:
+			first_part = first_part.split(separator)[0].strip()
+			break
+	match = re.search(r"(\d+(?:\.\d+)?)\s*[Xx]\s*(\d+(?:\.\d+)?)", first_part)
+	return (float(match.group(1)), float(match.group(2))) if match else (None, None)
+
+
+class TestSizeParser(unittest.TestCase):
+	def setUp(self):
+		size_parser.clear_parse_cache()
+
+	def test_plain_size(self):
+		parsed = size_parser.parse_size("140X220")
+		self.assertEqual((parsed.lenght, parsed.width), (140, 220))
+		self.assertEqual([(c.lenght, c.width, c.flap, c.qty) for c in parsed.components], [(140, 220, None, 1)])
+		self.assertEqual(parsed.standard_sizes, ())
+		self.assertEqual(parsed.multiplier, 1)
+
+	def test_units_and_empty_values(self):
+		self.assertEqual(size_parser.size_dimensions('140 X 220 CM"'), (140, 220))
+		for value in (None, "", "FREE SIZE"):
+			parsed = size_parser.parse_size(value)
+			self.assertEqual((parsed.lenght, parsed.width, parsed.components), (None, None, ()))
+
+	def test_piece_count_prefix(self):
+		parsed = size_parser.parse_size("2 PCS 50X75")
+		self.assertEqual((parsed.lenght, parsed.width), (50, 75))
+		self.assertEqual([(c.lenght, c.width, c.qty) for c in parsed.components], [(50, 75, 2)])
+
+		parsed = size_parser.parse_size("240X260/2PCS X65X65")
+		self.assertEqual((parsed.lenght, parsed.width), (240, 260))
+		self.assertEqual([(c.lenght, c.width, c.qty) for c in parsed.components], [(240, 260, 1), (65, 65, 2)])
+
+	def test_three_part_sizes(self):
+		# a bare leading number is a dimension, not a piece count
+		parsed = size_parser.parse_size("160X200X30")
+		self.assertEqual((parsed.lenght, parsed.width), (160, 200))
+		self.assertEqual(parsed.components[0].qty, 1)
+
+		parsed = size_parser.parse_size("90X190X25+30")
+		self.assertEqual((parsed.lenght, parsed.width), (90, 190))
+		self.assertEqual(parsed.components[0].flap, 30)
+
+		for value in ("160X200X30", "90X190X25+30", "2X50X75", "180X200X35,2X50X75", "150X200X30/50X75", *SIZES):
+			self.assertEqual(size_parser.size_dimensions(value), _legacy_dimensions(value), value)
+
+	def test_flap_suffix(self):
+		parsed = size_parser.parse_size("46X71+7.5")
+		self.assertEqual((parsed.lenght, parsed.width), (46, 71))
+		self.assertEqual(parsed.components[0].flap, 7.5)
+
+		parsed = size_parser.parse_size("160X200+25,2 PCS 50X75")
+		self.assertEqual([(c.lenght, c.width, c.flap, c.qty) for c in parsed.components], [(160, 200, 25, 1)])
+		self.assertEqual([(c.lenght, c.width, c.flap, c.qty) for c in parsed.standard_sizes], [(50, 75, None, 2)])
+
+	def test_standard_sizes(self):
+		parsed = size_parser.parse_size("140X220,60X70+15")
+		self.assertEqual((parsed.lenght, parsed.width), (140, 220))
+		self.assertEqual([(c.lenght, c.width, c.flap) for c in parsed.standard_sizes], [(60, 70, 15)])
+
+	def test_combo_size_with_multiplier(self):
+		self.assertEqual(size_parser.extract_size("DUVET-(135X200/80X80)*2"), "135X200/80X80*2")
+
+		parsed = size_parser.parse_size("(135X200/80X80)*2")
+		self.assertEqual(parsed.normalized, "135X200/80X80*2")
+		self.assertEqual(parsed.multiplier, 2)
+		self.assertEqual((parsed.lenght, parsed.width), (135, 200))
+		self.assertEqual([(c.lenght, c.width) for c in parsed.components], [(135, 200), (80, 80)])
+
+	def test_article(self):
+		self.assertEqual(size_parser.extract_article("BDH-QCS-140X220,60X70+15-WHITE"), "BDH-QCS")
+		self.assertEqual(size_parser.extract_size("BDH-QCS-140X220,60X70+15-WHITE"), "140X220,60X70+15")
+		self.assertIsNone(size_parser.extract_article("PLAIN ITEM"))
+		self.assertIsNone(size_parser.extract_size("PLAIN ITEM"))
+
+	def test_matches_legacy_extractor(self):
+		names = set(build_corpus(lines=2000, distinct=500)) | {"DUVET-(135X200/80X80)*2", "PLAIN ITEM", ""}
+		for name in names:
+			parsed = size_parser.parse_item_name(name)
+			self.assertEqual((parsed.article, parsed.size), _legacy_extract(name), name)
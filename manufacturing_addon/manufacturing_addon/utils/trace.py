@@ -0,0 +1,82 @@
+# Copyright (c) 2026, Manufacturing Addon contributors
+# License: MIT
+
+"""Debug tracing for hot paths, switched per module in Manufacturing Addon Setting.
+
+	trace = get_tracer("packing_report")
+	trace("Row {}: so_item={!r}", idx, so_item)
+
+Messages are ``str.format`` templates filled only when the module's
+``trace_<module>`` flag is on, so a disabled call costs a flag lookup and
+nothing is formatted or written. Enabled traces go as JSON lines to a
+rotating site log (``manufacturing_addon_trace.log``), which bounds disk use.
+Guard expensive argument building with ``if trace.enabled():``.
+"""
+
+import json
+
+import frappe
+from frappe.utils import cint
+
+TRACE_LOGGER = "manufacturing_addon_trace"
+TRACE_LOG_MAX_SIZE = 1_000_000
+TRACE_LOG_FILE_COUNT = 5
+
+TRACE_MODULES = (
+	"packing_report",
+	"stitching_report",
+	"order_tracking",
+	"work_order_transfer_manager",
+	"raw_material_transfer",
+)
+
+
+def _enabled_modules():
+	"""Set of modules with tracing on, read once per request."""
+	modules = getattr(frappe.local, "manufacturing_addon_trace_modules", None)
+	if modules is None:
+		try:
+			settings = frappe.get_cached_doc("Manufacturing Addon Setting")
+			modules = frozenset(m for m in TRACE_MODULES if cint(settings.get(f"trace_{m}")))
+		except Exception:
+			modules = frozenset()
+		frappe.local.manufacturing_addon_trace_modules = modules
+	return modules
+
+
+class Tracer:
+	__slots__ = ("module",)
+
+	def __init__(self, module):
+		self.module = module
+
+	def enabled(self):
+		return self.module in _enabled_modules()
+
+	def __call__(self, message, *args, **fields):
+		if self.module not in _enabled_modules():
+			return
+		try:
+			text = message.format(*args) if args else message
+		except Exception:
+			text = f"{message} {args!r}"
+
+		record = {"module": self.module, "message": text.strip("\n")}
+		if fields:
+			record.update(fields)
+		_logger().info(json.dumps(record, default=str, ensure_ascii=False))
+
+
+def _logger():
+	return frappe.logger(
+		TRACE_LOGGER,
+		allow_site=True,
+		max_size=TRACE_LOG_MAX_SIZE,
+		file_count=TRACE_LOG_FILE_COUNT,
+	)
+
+
+def get_tracer(module):
+	if module not in TRACE_MODULES:
+		raise ValueError(f"Unknown trace module: {module}")
+	return Tracer(module)
@@ -0,0 +1,8 @@
+# Copyright (c) 2026, manufacturing_addon contributors
+
+import frappe
+
+
+def execute():
+	# on_doctype_update only runs when the doctype is synced; create the get_issued_qty_map index on existing sites.
+	frappe.db.add_index("Raw Material Issuance", ["planning", "docstatus"])
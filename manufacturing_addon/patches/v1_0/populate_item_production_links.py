@@ -0,0 +1,10 @@
+# Copyright (c) 2026, manufacturing_addon contributors
+
+from manufacturing_addon.manufacturing_addon.doctype.item_production_link.item_production_link import (
+	rebuild_item_production_links,
+)
+
+
+def execute():
+	# Backfill the Item dashboard connection table from existing Order Sheets and reports.
+	rebuild_item_production_links()
@@ -0,0 +1,10 @@
+# Copyright (c) 2026, manufacturing_addon contributors
+
+from manufacturing_addon.manufacturing_addon.doctype.shipment_loading.shipment_loading import (
+	refresh_stored_packing_readiness,
+)
+
+
+def execute():
+	# Fill ready_cbm (and refresh pieces/cartons) so the loading board can read stored readiness.
+	refresh_stored_packing_readiness()
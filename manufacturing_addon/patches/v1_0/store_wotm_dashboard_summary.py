@@ -0,0 +1,20 @@
+# Copyright (c) 2026, manufacturing_addon contributors
+
+import frappe
+
+from manufacturing_addon.manufacturing_addon.doctype.work_order_transfer_manager.work_order_transfer_manager import (
+	update_wotm_dashboard_summary,
+)
+
+
+def execute():
+	# Backfill the stored dashboard aggregates and customer name read by get_wotm_dashboard_data.
+	frappe.db.sql(
+		"""
+		UPDATE `tabWork Order Transfer Manager` wotm
+		JOIN `tabCustomer` c ON c.name = wotm.customer
+		SET wotm.customer_name = c.customer_name
+		"""
+	)
+	for name in frappe.get_all("Work Order Transfer Manager", pluck="name"):
+		update_wotm_dashboard_summary(name)
@@ -8,6 +8,8 @@ const ITEM_PRODUCTION_CONNECTIONS = [
 ];
 const ITEM_OPEN_COUNT_METHOD =
 	"manufacturing_addon.manufacturing_addon.doctype.item.item_dashboard.get_open_count";
+const ITEM_PRODUCTION_LINK_NAMES_METHOD =
+	"manufacturing_addon.manufacturing_addon.doctype.item.item_dashboard.get_production_link_names";
 
 function ensure_item_production_connections(frm) {
 	if (frm.is_new() || !frm.meta) return false;
@@ -62,21 +64,35 @@ function sync_item_production_connection_links(frm) {
 		);
 		if (!$el.length) return;
 
-		const names = (link.names || []).filter(Boolean);
-		if (names.length) {
-			$el.attr("data-names", names.join(","));
-			$el.find("a.badge-link").removeAttr("disabled");
+		const $badge = $el.find("a.badge-link");
+		if (cint(link.count) > 0) {
+			$badge.removeAttr("disabled");
 			$el.find(".count")
 				.removeClass("hidden")
-				.text(cint(link.count) > 99 ? "99+" : cint(link.count || names.length));
+				.text(cint(link.count) > 99 ? "99+" : cint(link.count));
+			// Names are loaded only when the connection is opened.
+			$badge.off("click.item_production").on("click.item_production", (e) => {
+				e.preventDefault();
+				e.stopPropagation();
+				open_item_production_connection(frm, link.doctype);
+			});
 		} else {
-			$el.removeAttr("data-names");
-			$el.find("a.badge-link").attr("disabled", true);
+			$badge.attr("disabled", true).off("click.item_production");
 			$el.find(".count").addClass("hidden").text("");
 		}
 	});
 }
 
+function open_item_production_connection(frm, doctype) {
+	frappe
+		.xcall(ITEM_PRODUCTION_LINK_NAMES_METHOD, { item_code: frm.doc.name, doctype })
+		.then((names) => {
+			if (!names || !names.length) return;
+			frappe.route_options = { name: ["in", names] };
+			frappe.set_route("List", doctype);
+		});
+}
+
 frappe.ui.form.on("Item", {
 	onload(frm) {
 		ensure_item_production_connections(frm);
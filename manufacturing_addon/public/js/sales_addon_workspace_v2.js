@@ -10,6 +10,7 @@
 		activeTab: "overview",
 		selectedOrder: null,
 		data: null,
+		loadingMore: false,
 		charts: {},
 	};
 	let apexPromise = null;
@@ -390,6 +391,13 @@
 				border-radius: 4px;
 				transition: width 0.6s ease;
 			}
+			.sad-table-actions {
+				display: flex;
+				align-items: center;
+				justify-content: space-between;
+				gap: 12px;
+				padding: 12px 4px;
+			}
 			.sad-table-card {
 				background: #fff;
 				border-radius: 14px;
@@ -646,7 +654,7 @@
 			.then(() => {
 				frappe.call({
 					method: "manufacturing_addon.sales_addon_api.get_sales_addon_customer_sales_data",
-					args: { filters: state.filters },
+					args: { filters: request_filters() },
 					callback: (response) => {
 						if (!is_target_route()) return;
 						state.data = normalize_data(response.message || {});
@@ -659,8 +667,37 @@
 			.catch(() => show_error(block, "ApexCharts could not be loaded."));
 	}
 
-	function normalize_data(data) {
-		const orders = (data.orders || []).map((row) => ({
+	function request_filters() {
+		return { ...state.filters, status: state.statusFilter };
+	}
+
+	function load_more_orders(block) {
+		if (!state.data?.next_cursor || state.loadingMore) return;
+		state.loadingMore = true;
+		frappe.call({
+			method: "manufacturing_addon.sales_addon_api.get_sales_addon_orders",
+			args: { filters: request_filters(), cursor: state.data.next_cursor },
+			callback: (response) => {
+				state.loadingMore = false;
+				if (!is_target_route() || !state.data) return;
+				const page = response.message || {};
+				state.data.orders = state.data.orders.concat(normalize_orders(page.orders));
+				state.data.next_cursor = page.next_cursor || null;
+				render_content(block);
+			},
+			error: () => {
+				state.loadingMore = false;
+			},
+		});
+	}
+
+	function export_orders() {
+		const query = $.param({ filters: JSON.stringify(request_filters()), file_format: "csv" });
+		window.open(`/api/method/manufacturing_addon.sales_addon_api.export_sales_addon_orders?${query}`);
+	}
+
+	function normalize_orders(rows) {
+		return (rows || []).map((row) => ({
 			...row,
 			transaction_date: row.transaction_date || "",
 			delivery_date: row.delivery_date || "",
@@ -673,6 +710,10 @@
 			per_delivered: flt(row.per_delivered),
 			per_billed: flt(row.per_billed),
 		}));
+	}
+
+	function normalize_data(data) {
+		const orders = normalize_orders(data.orders);
 		const normalize_breakdown = (rows) => (rows || []).map((row) => ({
 			name: row.name || "Unassigned",
 			value: flt(row.value),
@@ -684,6 +725,12 @@
 			territory_breakdown: normalize_breakdown(data.territory_breakdown),
 			status_pipeline: normalize_breakdown(data.status_pipeline),
 			item_group_breakdown: normalize_breakdown(data.item_group_breakdown),
+			summary: data.summary || {},
+			status_breakdown: data.status_breakdown || [],
+			monthly_trend: data.monthly_trend || [],
+			currency_totals: data.currency_totals || [],
+			customer_totals: data.customer_totals || [],
+			next_cursor: data.next_cursor || null,
 			filters: data.filters || state.filters,
 		};
 	}
@@ -717,7 +764,8 @@
 			button.addEventListener("click", () => {
 				state.statusFilter = button.getAttribute("data-status");
 				state.selectedOrder = null;
-				render_dashboard(block);
+				render_status_filters(block);
+				load_data(block);
 			});
 		});
 	}
@@ -734,11 +782,11 @@
 	}
 
 	function render_kpis(block) {
-		const orders = get_filtered_orders();
-		const totalRevenue = sum(orders, "grand_total");
-		const totalOrders = orders.length;
+		const summary = state.data.summary || {};
+		const totalRevenue = flt(summary.total_amount);
+		const totalOrders = cint(summary.order_count, 0);
 		const avgOrderValue = totalOrders ? totalRevenue / totalOrders : 0;
-		const completedOrders = orders.filter((row) => row.status === "Completed").length;
+		const completedOrders = cint(summary.completed_count, 0);
 		const completionRate = totalOrders ? Math.round((completedOrders / totalOrders) * 100) : 0;
 		const kpis = [
 			{
@@ -752,7 +800,7 @@
 			{
 				label: "Total Orders",
 				value: totalOrders,
-				sub: `${state.data.orders.length} in range`,
+				sub: `${cint(summary.orders_in_range, 0)} in range`,
 				accent: "#7c3aed",
 				from: "#f5f3ff",
 				to: "#ede9fe",
@@ -848,9 +896,14 @@
 	}
 
 	function orders_markup() {
-		const orders = get_filtered_orders();
+		const orders = state.data.orders;
 		const selected = orders.find((row) => row.name === state.selectedOrder);
+		const total = cint(state.data.summary?.order_count, orders.length);
 		return `
+			<div class="sad-table-actions">
+				<span class="sad-progress-meta">Showing ${orders.length} of ${total} orders</span>
+				<button class="sad-btn-primary" type="button" data-action="export-orders">Export CSV</button>
+			</div>
 			<div class="sad-table-card">
 				<div class="sad-table-wrap">
 					<table class="sad-table">
@@ -864,6 +917,7 @@
 						</tbody>
 					</table>
 				</div>
+				${state.data.next_cursor ? `<div class="sad-table-actions"><button class="sad-btn-primary" type="button" data-action="load-more">Load More</button></div>` : ""}
 				${selected ? order_detail_markup(selected) : ""}
 			</div>
 		`;
@@ -889,13 +943,13 @@
 	}
 
 	function render_overview_charts(host) {
-		const monthly = get_monthly_data(get_non_cancelled_orders());
-		const status = get_status_data(state.data.orders);
+		const monthly = get_monthly_data();
+		const status = get_status_data();
 		const pipeline = get_status_pipeline_data();
 		const territory = get_territory_data();
 		const itemGroups = get_item_group_data();
-		const currency = get_currency_data(get_filtered_orders());
-		const customers = get_top_customers(get_filtered_orders(), 5);
+		const currency = get_currency_data();
+		const customers = get_top_customers();
 
 		render_area_chart(host.querySelector('[data-chart="monthly-revenue"]'), monthly, "revenue", "#2563eb", "Monthly Revenue", base_currency());
 		render_donut_chart(host.querySelector('[data-chart="status-breakdown"]'), status, "value");
@@ -908,8 +962,8 @@
 	}
 
 	function render_analytics_charts(host) {
-		const monthly = get_monthly_data(get_non_cancelled_orders());
-		const filtered = get_filtered_orders();
+		const monthly = get_monthly_data();
+		const filtered = state.data.orders;
 		render_simple_bar_chart(host.querySelector('[data-chart="orders-per-month"]'), monthly, "orders", "Orders");
 		render_area_chart(host.querySelector('[data-chart="qty-trend"]'), monthly, "qty", "#7c3aed", "Quantity");
 		render_progress_cards(host.querySelector('[data-role="progress-cards"]'), filtered.slice(0, 8));
@@ -1224,6 +1278,9 @@
 	}
 
 	function bind_order_events(host) {
+		const block = document.getElementById(BLOCK_ID);
+		host.querySelector('[data-action="export-orders"]')?.addEventListener("click", export_orders);
+		host.querySelector('[data-action="load-more"]')?.addEventListener("click", () => load_more_orders(block));
 		host.querySelectorAll("[data-order]").forEach((row) => {
 			row.addEventListener("click", () => {
 				const orderName = row.getAttribute("data-order");
@@ -1233,40 +1290,21 @@
 		});
 	}
 
-	function get_filtered_orders() {
-		const orders = state.data?.orders || [];
-		if (state.statusFilter === "All") return orders.filter((order) => order.status !== "Cancelled");
-		return orders.filter((order) => order.status === state.statusFilter);
-	}
-
-	function get_non_cancelled_orders() {
-		return (state.data?.orders || []).filter((order) => order.status !== "Cancelled");
-	}
-
-	function get_monthly_data(orders) {
-		const map = {};
-		orders.forEach((order) => {
-			const month = month_label(order.transaction_date);
-			if (!month) return;
-			if (!map[month.key]) {
-				map[month.key] = { month: month.label, sort_key: month.key, revenue: 0, orders: 0, qty: 0 };
-			}
-			map[month.key].revenue += flt(order.grand_total);
-			map[month.key].orders += 1;
-			map[month.key].qty += flt(order.total_qty);
-		});
-		return Object.values(map).sort((a, b) => a.sort_key.localeCompare(b.sort_key));
+	function get_monthly_data() {
+		return (state.data?.monthly_trend || []).map((row) => ({
+			month: month_label(`${row.sort_key}-01`)?.label || row.sort_key,
+			sort_key: row.sort_key,
+			revenue: flt(row.revenue),
+			orders: cint(row.orders, 0),
+			qty: flt(row.qty),
+		}));
 	}
 
-	function get_status_data(orders) {
-		const counts = {};
-		orders.forEach((order) => {
-			counts[order.status] = (counts[order.status] || 0) + 1;
-		});
-		return Object.entries(counts).map(([name, value]) => ({
-			name,
-			value,
-			color: get_status_config(name).border,
+	function get_status_data() {
+		return (state.data?.status_breakdown || []).map((row) => ({
+			name: row.name,
+			value: cint(row.order_count, 0),
+			color: get_status_config(row.name).border,
 		}));
 	}
 
@@ -1286,26 +1324,14 @@
 			.sort((a, b) => b.value - a.value);
 	}
 
-	function get_currency_data(orders) {
-		const totals = {};
-		orders.forEach((order) => {
-			const key = order.currency || base_currency();
-			totals[key] = (totals[key] || 0) + flt(order.grand_total);
-		});
-		return Object.entries(totals)
-			.map(([name, value]) => ({ name, value }))
+	function get_currency_data() {
+		return (state.data?.currency_totals || [])
+			.map((row) => ({ name: row.currency || base_currency(), value: flt(row.total_amount) }))
 			.sort((a, b) => b.value - a.value);
 	}
 
-	function get_top_customers(orders, limit) {
-		const totals = {};
-		orders.forEach((order) => {
-			totals[order.customer_name] = (totals[order.customer_name] || 0) + flt(order.grand_total);
-		});
-		return Object.entries(totals)
-			.map(([name, value]) => ({ name, value }))
-			.sort((a, b) => b.value - a.value)
-			.slice(0, limit);
+	function get_top_customers() {
+		return (state.data?.customer_totals || []).map((row) => ({ name: row.name, value: flt(row.value) }));
 	}
 
 	function get_status_config(status) {
@@ -1434,10 +1460,6 @@
 		return flt(value).toLocaleString("en-PK", { maximumFractionDigits: 0 });
 	}
 
-	function sum(rows, key) {
-		return rows.reduce((total, row) => total + flt(row[key]), 0);
-	}
-
 	function cint(value, fallback) {
 		const parsed = Number.parseInt(value, 10);
 		return Number.isNaN(parsed) ? fallback : parsed;
@@ -4,22 +4,40 @@ import frappe
 from frappe import _
 from frappe.utils import add_days, add_months, flt, get_first_day, get_last_day, getdate, now_datetime, nowdate
 
+from manufacturing_addon.manufacturing_addon.utils.export import iter_pages, send_export
+from manufacturing_addon.manufacturing_addon.utils.query_budget import query_budget
+
+
+ORDERS_PAGE_LENGTH = 50
+MAX_ORDERS_PAGE_LENGTH = 500
+
+ORDER_EXPORT_COLUMNS = [
+	{"label": _("Sales Order"), "fieldname": "name"},
+	{"label": _("Transaction Date"), "fieldname": "transaction_date"},
+	{"label": _("Delivery Date"), "fieldname": "delivery_date"},
+	{"label": _("Customer"), "fieldname": "customer"},
+	{"label": _("Customer Name"), "fieldname": "customer_name"},
+	{"label": _("Territory"), "fieldname": "territory"},
+	{"label": _("Currency"), "fieldname": "currency"},
+	{"label": _("Grand Total"), "fieldname": "grand_total"},
+	{"label": _("Base Grand Total"), "fieldname": "base_grand_total"},
+	{"label": _("Total Qty"), "fieldname": "total_qty"},
+	{"label": _("% Delivered"), "fieldname": "per_delivered"},
+	{"label": _("% Billed"), "fieldname": "per_billed"},
+	{"label": _("Status"), "fieldname": "status"},
+]
+
 
 @frappe.whitelist()
 def get_sales_addon_customer_sales_data(filters=None):
-	filters = _coerce_filters(filters)
-	conditions = ["so.docstatus < 2", "so.transaction_date between %(from_date)s and %(to_date)s"]
-	params = {
-		"from_date": filters["from_date"],
-		"to_date": filters["to_date"],
-		"top_n": filters["top_n"],
-	}
+	"""Aggregates for the Sales Addon workspace plus the first page of orders.
 
-	if filters.get("company"):
-		conditions.append("so.company = %(company)s")
-		params["company"] = filters["company"]
-
-	where_clause = " where " + " and ".join(conditions)
+	Everything except the order page is grouped in SQL; further pages come from
+	get_sales_addon_orders and full downloads from export_sales_addon_orders.
+	"""
+	filters = _coerce_filters(filters)
+	where_clause, params = _sales_data_where(filters)
+	status_condition = _status_condition(filters)
 
 	top_customers = frappe.db.sql(
 		f"""
@@ -39,26 +57,78 @@ def get_sales_addon_customer_sales_data(filters=None):
 		as_dict=True,
 	)
 
-	orders = frappe.db.sql(
+	summary = frappe.db.sql(
 		f"""
 		select
-			so.name,
-			so.docstatus,
-			so.transaction_date,
-			so.delivery_date,
-			so.customer,
-			coalesce(so.customer_name, so.customer) as customer_name,
-			coalesce(so.territory, 'Unassigned') as territory,
-			so.currency,
-			ifnull(so.grand_total, 0) as grand_total,
-			ifnull(so.base_grand_total, 0) as base_grand_total,
-			ifnull(so.per_delivered, 0) as per_delivered,
-			ifnull(so.per_billed, 0) as per_billed,
-			ifnull(so.total_qty, 0) as total_qty,
-			so.status
+			count(so.name) as orders_in_range,
+			sum(case when {status_condition} then 1 else 0 end) as order_count,
+			sum(case when {status_condition} then ifnull(so.grand_total, 0) else 0 end) as total_amount,
+			sum(case when {status_condition} and so.status = 'Completed' then 1 else 0 end) as completed_count
 		from `tabSales Order` so
 		{where_clause}
-		order by so.transaction_date asc, so.modified desc
+		""",
+		params,
+		as_dict=True,
+	)[0]
+
+	status_breakdown = frappe.db.sql(
+		f"""
+		select
+			coalesce(nullif(so.status, ''), if(so.docstatus = 0, 'Draft', 'To Deliver and Bill')) as name,
+			count(so.name) as order_count
+		from `tabSales Order` so
+		{where_clause}
+		group by 1
+		""",
+		params,
+		as_dict=True,
+	)
+
+	monthly_trend = frappe.db.sql(
+		f"""
+		select
+			date_format(so.transaction_date, '%%Y-%%m') as sort_key,
+			sum(ifnull(so.grand_total, 0)) as revenue,
+			count(so.name) as orders,
+			sum(ifnull(so.total_qty, 0)) as qty
+		from `tabSales Order` so
+		{where_clause}
+		and so.status != 'Cancelled'
+		group by sort_key
+		order by sort_key asc
+		""",
+		params,
+		as_dict=True,
+	)
+
+	currency_totals = frappe.db.sql(
+		f"""
+		select
+			coalesce(nullif(so.currency, ''), %(not_set)s) as currency,
+			count(so.name) as order_count,
+			sum(ifnull(so.grand_total, 0)) as total_amount,
+			sum(ifnull(so.base_grand_total, 0)) as base_total_amount
+		from `tabSales Order` so
+		{where_clause}
+		and {status_condition}
+		group by 1
+		order by total_amount desc
+		""",
+		{**params, "not_set": _("Not Set")},
+		as_dict=True,
+	)
+
+	customer_totals = frappe.db.sql(
+		f"""
+		select
+			max(coalesce(so.customer_name, so.customer)) as name,
+			sum(ifnull(so.grand_total, 0)) as value
+		from `tabSales Order` so
+		{where_clause}
+		and {status_condition}
+		group by so.customer
+		order by value desc
+		limit 5
 		""",
 		params,
 		as_dict=True,
@@ -122,8 +192,7 @@ def get_sales_addon_customer_sales_data(filters=None):
 		as_dict=True,
 	)
 
-	grouped_orders = _group_orders_by_currency(orders)
-	orders_list = _normalize_orders(orders)
+	orders, next_cursor = _get_orders_page(filters)
 
 	return {
 		"currency": _get_default_currency(filters.get("company")),
@@ -132,6 +201,13 @@ def get_sales_addon_customer_sales_data(filters=None):
 			"to_date": str(filters["to_date"]),
 			"company": filters.get("company"),
 			"top_n": filters["top_n"],
+			"status": filters["status"],
+		},
+		"summary": {
+			"orders_in_range": int(summary.orders_in_range or 0),
+			"order_count": int(summary.order_count or 0),
+			"total_amount": flt(summary.total_amount),
+			"completed_count": int(summary.completed_count or 0),
 		},
 		"top_customers": [
 			{
@@ -142,6 +218,28 @@ def get_sales_addon_customer_sales_data(filters=None):
 			}
 			for row in top_customers
 		],
+		"status_breakdown": [
+			{"name": row.name, "order_count": int(row.order_count or 0)} for row in status_breakdown
+		],
+		"monthly_trend": [
+			{
+				"sort_key": row.sort_key,
+				"revenue": flt(row.revenue),
+				"orders": int(row.orders or 0),
+				"qty": flt(row.qty),
+			}
+			for row in monthly_trend
+		],
+		"currency_totals": [
+			{
+				"currency": row.currency,
+				"order_count": int(row.order_count or 0),
+				"total_amount": flt(row.total_amount),
+				"base_total_amount": flt(row.base_total_amount),
+			}
+			for row in currency_totals
+		],
+		"customer_totals": [{"name": row.name, "value": flt(row.value)} for row in customer_totals],
 		"territory_breakdown": [
 			{
 				"name": row.name,
@@ -159,11 +257,35 @@ def get_sales_addon_customer_sales_data(filters=None):
 			}
 			for row in item_group_breakdown
 		],
-		"orders": orders_list,
-		"currency_wise_orders": grouped_orders,
+		"orders": orders,
+		"next_cursor": next_cursor,
 	}
 
 
+@frappe.whitelist()
+def get_sales_addon_orders(filters=None, cursor=None, page_length=None):
+	"""Next page of workspace orders after ``cursor`` ([transaction_date, name])."""
+	orders, next_cursor = _get_orders_page(_coerce_filters(filters), cursor, page_length)
+	return {"orders": orders, "next_cursor": next_cursor}
+
+
+@frappe.whitelist()
+def export_sales_addon_orders(filters=None, file_format="csv"):
+	"""Stream every order matching the workspace filters as a file download."""
+	frappe.has_permission("Sales Order", "read", throw=True)
+	filters = _coerce_filters(filters)
+
+	def fetch_page(cursor, page_length):
+		return _get_orders_page(filters, cursor, page_length)
+
+	return send_export(
+		"sales_orders_{0}_{1}".format(filters["from_date"], filters["to_date"]),
+		ORDER_EXPORT_COLUMNS,
+		iter_pages(fetch_page),
+		file_format=file_format,
+	)
+
+
 def _coerce_filters(filters):
 	if isinstance(filters, str):
 		filters = json.loads(filters)
@@ -177,47 +299,77 @@ def _coerce_filters(filters):
 		"to_date": getdate(filters.get("to_date") or today),
 		"company": filters.get("company"),
 		"top_n": cint_or_default(filters.get("top_n"), 8),
+		"status": filters.get("status") or "All",
 	}
 
 
-def _group_orders_by_currency(orders):
-	grouped = {}
+def _sales_data_where(filters):
+	conditions = ["so.docstatus < 2", "so.transaction_date between %(from_date)s and %(to_date)s"]
+	params = {
+		"from_date": filters["from_date"],
+		"to_date": filters["to_date"],
+		"top_n": filters["top_n"],
+		"status": filters["status"],
+	}
 
-	for row in orders:
-		currency = row.currency or _("Not Set")
-		if currency not in grouped:
-			grouped[currency] = {
-				"currency": currency,
-				"order_count": 0,
-				"total_amount": 0.0,
-				"base_total_amount": 0.0,
-				"orders": [],
-			}
+	if filters.get("company"):
+		conditions.append("so.company = %(company)s")
+		params["company"] = filters["company"]
+
+	return " where " + " and ".join(conditions), params
 
-		group = grouped[currency]
-		group["order_count"] += 1
-		group["total_amount"] += flt(row.grand_total)
-		group["base_total_amount"] += flt(row.base_grand_total)
-		group["orders"].append(
-			{
-				"name": row.name,
-				"docstatus": int(row.docstatus or 0),
-				"transaction_date": str(row.transaction_date),
-				"delivery_date": str(row.delivery_date) if row.delivery_date else None,
-				"customer": row.customer,
-				"customer_name": row.customer_name,
-				"territory": row.territory,
-				"currency": currency,
-				"grand_total": flt(row.grand_total),
-				"base_grand_total": flt(row.base_grand_total),
-				"per_delivered": flt(row.per_delivered),
-				"per_billed": flt(row.per_billed),
-				"total_qty": flt(row.total_qty),
-				"status": row.status,
-			}
-		)
 
-	return list(grouped.values())
+def _status_condition(filters):
+	# "All" means every non-cancelled order, matching the workspace status chips
+	if filters["status"] == "All":
+		return "so.status != 'Cancelled'"
+	return "so.status = %(status)s"
+
+
+def _get_orders_page(filters, cursor=None, page_length=None):
+	"""(orders, next_cursor) ordered by (transaction_date, name); keyset paginated."""
+	where_clause, params = _sales_data_where(filters)
+	where_clause += f" and {_status_condition(filters)}"
+	page_length = min(cint_or_default(page_length, ORDERS_PAGE_LENGTH), MAX_ORDERS_PAGE_LENGTH)
+	params["page_length"] = page_length
+
+	if isinstance(cursor, str):
+		cursor = json.loads(cursor)
+	if cursor:
+		where_clause += " and (so.transaction_date, so.name) > (%(after_date)s, %(after_name)s)"
+		params["after_date"], params["after_name"] = cursor[0], cursor[1]
+
+	orders = frappe.db.sql(
+		f"""
+		select
+			so.name,
+			so.docstatus,
+			so.transaction_date,
+			so.delivery_date,
+			so.customer,
+			coalesce(so.customer_name, so.customer) as customer_name,
+			coalesce(so.territory, 'Unassigned') as territory,
+			so.currency,
+			ifnull(so.grand_total, 0) as grand_total,
+			ifnull(so.base_grand_total, 0) as base_grand_total,
+			ifnull(so.per_delivered, 0) as per_delivered,
+			ifnull(so.per_billed, 0) as per_billed,
+			ifnull(so.total_qty, 0) as total_qty,
+			so.status
+		from `tabSales Order` so
+		{where_clause}
+		order by so.transaction_date asc, so.name asc
+		limit %(page_length)s
+		""",
+		params,
+		as_dict=True,
+	)
+
+	next_cursor = None
+	if len(orders) == page_length:
+		next_cursor = [str(orders[-1].transaction_date), orders[-1].name]
+
+	return _normalize_orders(orders), next_cursor
 
 
 def _normalize_orders(orders):
@@ -289,6 +441,12 @@ def _ordered_status_pipeline(rows):
 	return ordered
 
 
+LISTVIEW_DASHBOARD_CACHE_KEY = "sales_order_listview_dashboard"
+# Safety net for status changes ERPNext writes with db_set (no doc event fires)
+LISTVIEW_DASHBOARD_CACHE_TTL = 600
+PENDING_STATUSES = ("To Deliver and Bill", "To Deliver", "To Bill")
+
+
 @frappe.whitelist()
 def get_sales_order_listview_dashboard(from_date=None, to_date=None, company=None):
 	today = getdate(nowdate())
@@ -297,116 +455,67 @@ def get_sales_order_listview_dashboard(from_date=None, to_date=None, company=Non
 	from_date = getdate(from_date) if from_date else default_from_date
 	company = company or None
 
-	conditions = [
-		"so.docstatus = 1",
-		"so.status != 'Cancelled'",
-		"so.transaction_date between %(from_date)s and %(to_date)s",
-	]
-	params = {"from_date": from_date, "to_date": to_date}
+	cache_field = f"{company or ''}::{from_date}::{to_date}"
+	cached = frappe.cache.hget(LISTVIEW_DASHBOARD_CACHE_KEY, cache_field)
+	if cached and cached.get("cached_at", 0) > now_datetime().timestamp() - LISTVIEW_DASHBOARD_CACHE_TTL:
+		return cached["data"]
 
-	if company:
-		conditions.append("so.company = %(company)s")
-		params["company"] = company
+	data = _build_sales_order_listview_dashboard(from_date, to_date, company)
+	frappe.cache.hset(
+		LISTVIEW_DASHBOARD_CACHE_KEY,
+		cache_field,
+		{"cached_at": now_datetime().timestamp(), "data": data},
+	)
+	return data
 
-	where_clause = " where " + " and ".join(conditions)
 
-	kpi_row = frappe.db.sql(
-		f"""
-		select
-			count(so.name) as total_orders,
-			sum(ifnull(so.base_grand_total, 0)) as total_value,
-			sum(case when so.docstatus = 0 then ifnull(so.base_grand_total, 0) else 0 end) as draft_value,
-			sum(case when so.status in ('To Deliver and Bill', 'To Deliver', 'To Bill') then ifnull(so.base_grand_total, 0) else 0 end) as pending_value,
-			sum(case when so.status = 'Completed' then ifnull(so.base_grand_total, 0) else 0 end) as completed_value,
-			sum(case when so.status = 'Closed' then ifnull(so.base_grand_total, 0) else 0 end) as closed_value
-		from `tabSales Order` so
-		{where_clause}
-		""",
-		params,
-		as_dict=True,
-	)[0]
+def clear_sales_order_listview_dashboard_cache(doc=None, method=None):
+	"""Sales Order / Delivery Note / Sales Invoice doc_events: drop every cached range."""
+	frappe.cache.delete_value(LISTVIEW_DASHBOARD_CACHE_KEY)
 
+
+def _build_sales_order_listview_dashboard(from_date, to_date, company):
 	trend_start = get_first_day(add_months(to_date, -11))
-	trend_params = {"trend_start": trend_start, "to_date": to_date}
-	if company:
-		trend_params["company"] = company
+	base_currency = _get_default_currency(company)
 
-	trend_conditions = [
+	conditions = [
 		"so.docstatus = 1",
 		"so.status != 'Cancelled'",
-		"so.transaction_date between %(trend_start)s and %(to_date)s",
+		"so.transaction_date between %(scan_start)s and %(to_date)s",
 	]
-	if company:
-		trend_conditions.append("so.company = %(company)s")
-	trend_where_clause = " where " + " and ".join(trend_conditions)
-
-	trend_rows = frappe.db.sql(
-		f"""
-		select
-			date_format(so.transaction_date, '%%Y-%%m') as sort_key,
-			sum(ifnull(so.base_grand_total, 0)) as value,
-			count(so.name) as order_count
-		from `tabSales Order` so
-		{trend_where_clause}
-		group by sort_key
-		order by sort_key asc
-		""",
-		trend_params,
-		as_dict=True,
-	)
+	params = {
+		"from_date": from_date,
+		"to_date": to_date,
+		"scan_start": min(from_date, trend_start),
+		"base_currency": base_currency,
+	}
 
-	status_rows = frappe.db.sql(
-		f"""
-		select
-			case
-				when so.docstatus = 0 then 'Draft'
-				when so.status = 'Closed' then 'Closed'
-				when so.status = 'Completed' then 'Completed'
-				when so.status = 'To Bill' then 'To Bill'
-				when so.status = 'To Deliver' then 'To Deliver'
-				when so.status = 'To Deliver and Bill' then 'To Deliver and Bill'
-				else coalesce(nullif(so.status, ''), 'Other')
-			end as name,
-			sum(ifnull(so.base_grand_total, 0)) as value,
-			count(so.name) as order_count
-		from `tabSales Order` so
-		{where_clause}
-		group by 1
-		""",
-		params,
-		as_dict=True,
-	)
+	if company:
+		conditions.append("so.company = %(company)s")
+		params["company"] = company
 
-	territory_rows = frappe.db.sql(
-		f"""
-		select
-			coalesce(nullif(so.territory, ''), 'Unassigned') as name,
-			sum(ifnull(so.base_grand_total, 0)) as value,
-			count(so.name) as order_count
-		from `tabSales Order` so
-		{where_clause}
-		group by coalesce(nullif(so.territory, ''), 'Unassigned')
-		order by value desc
-		limit 6
-		""",
-		params,
-		as_dict=True,
-	)
+	where_clause = " where " + " and ".join(conditions)
 
-	currency_rows = frappe.db.sql(
+	# One scan covers both the KPI range and the 12-month trend window; every
+	# section below is folded from these (month, in_range, status, territory,
+	# currency) groups, which stay small regardless of the number of orders.
+	groups = frappe.db.sql(
 		f"""
 		select
-			coalesce(nullif(so.currency, ''), %(base_currency)s) as name,
+			date_format(so.transaction_date, '%%Y-%%m') as sort_key,
+			so.transaction_date >= %(from_date)s as in_range,
+			so.transaction_date >= %(trend_start)s as in_trend,
+			coalesce(nullif(so.status, ''), 'Other') as status,
+			coalesce(nullif(so.territory, ''), 'Unassigned') as territory,
+			coalesce(nullif(so.currency, ''), %(base_currency)s) as currency,
+			count(so.name) as order_count,
 			sum(ifnull(so.grand_total, 0)) as currency_value,
-			sum(ifnull(so.base_grand_total, 0)) as base_value,
-			count(so.name) as order_count
+			sum(ifnull(so.base_grand_total, 0)) as base_value
 		from `tabSales Order` so
 		{where_clause}
-		group by coalesce(nullif(so.currency, ''), %(base_currency)s)
-		order by base_value desc
-		limit 6
+		group by 1, 2, 3, 4, 5, 6
 		""",
-		{**params, "base_currency": _get_default_currency(company)},
+		{**params, "trend_start": trend_start},
 		as_dict=True,
 	)
 
@@ -423,6 +532,7 @@ def get_sales_order_listview_dashboard(from_date=None, to_date=None, company=Non
 			count(so.name) as order_count
 		from `tabSales Order` so
 		{where_clause}
+		and so.transaction_date >= %(from_date)s
 		group by coalesce(nullif(so.customer, ''), '')
 		order by value desc
 		limit 5
@@ -431,57 +541,79 @@ def get_sales_order_listview_dashboard(from_date=None, to_date=None, company=Non
 		as_dict=True,
 	)
 
-	trend_map = {row.sort_key: row for row in trend_rows}
+	kpis = {
+		"total_orders": 0,
+		"total_value": 0.0,
+		"draft_value": 0.0,
+		"pending_value": 0.0,
+		"completed_value": 0.0,
+		"closed_value": 0.0,
+	}
+	trend_map, status_map, territory_map, currency_map = {}, {}, {}, {}
+
+	for row in groups:
+		value = flt(row.base_value)
+		order_count = int(row.order_count or 0)
+
+		if row.in_trend:
+			trend = trend_map.setdefault(row.sort_key, {"value": 0.0, "order_count": 0})
+			trend["value"] += value
+			trend["order_count"] += order_count
+
+		if not row.in_range:
+			continue
+
+		kpis["total_orders"] += order_count
+		kpis["total_value"] += value
+		if row.status in PENDING_STATUSES:
+			kpis["pending_value"] += value
+		elif row.status == "Completed":
+			kpis["completed_value"] += value
+		elif row.status == "Closed":
+			kpis["closed_value"] += value
+
+		for section, key in ((status_map, row.status), (territory_map, row.territory)):
+			bucket = section.setdefault(key, frappe._dict(name=key, value=0.0, order_count=0))
+			bucket.value += value
+			bucket.order_count += order_count
+
+		currency = currency_map.setdefault(
+			row.currency, {"name": row.currency, "currency_value": 0.0, "base_value": 0.0, "order_count": 0}
+		)
+		currency["currency_value"] += flt(row.currency_value)
+		currency["base_value"] += value
+		currency["order_count"] += order_count
+
 	yearly_trend = []
 	for month_offset in range(12):
 		month_start = get_first_day(add_months(trend_start, month_offset))
 		month_key = month_start.strftime("%Y-%m")
-		row = trend_map.get(month_key)
+		row = trend_map.get(month_key) or {}
 		yearly_trend.append(
 			{
 				"label": month_start.strftime("%b %Y"),
 				"sort_key": month_key,
-				"value": flt(row.value) if row else 0.0,
-				"order_count": int((row.order_count if row else 0) or 0),
+				"value": flt(row.get("value")),
+				"order_count": int(row.get("order_count") or 0),
 			}
 		)
 
 	return {
-		"currency": _get_default_currency(company),
+		"currency": base_currency,
 		"filters": {
 			"from_date": str(trend_start),
 			"to_date": str(to_date),
 			"company": company,
 		},
-		"kpis": {
-			"total_orders": int(kpi_row.total_orders or 0),
-			"total_value": flt(kpi_row.total_value),
-			"draft_value": flt(kpi_row.draft_value),
-			"pending_value": flt(kpi_row.pending_value),
-			"completed_value": flt(kpi_row.completed_value),
-			"closed_value": flt(kpi_row.closed_value),
-		},
-		"yearly_trend": [
-			row for row in yearly_trend
-		],
-		"status_pipeline": _ordered_status_pipeline(status_rows),
-		"territory_breakdown": [
-			{
-				"name": row.name,
-				"value": flt(row.value),
-				"order_count": int(row.order_count or 0),
-			}
-			for row in territory_rows
-		],
-		"currency_breakdown": [
-			{
-				"name": row.name,
-				"currency_value": flt(row.currency_value),
-				"base_value": flt(row.base_value),
-				"order_count": int(row.order_count or 0),
-			}
-			for row in currency_rows
-		],
+		"kpis": kpis,
+		"yearly_trend": yearly_trend,
+		"status_pipeline": _ordered_status_pipeline(status_map.values()),
+		"territory_breakdown": sorted(
+			({"name": row.name, "value": row.value, "order_count": row.order_count} for row in territory_map.values()),
+			key=lambda row: row["value"],
+			reverse=True,
+		)[:6],
+		"currency_breakdown": sorted(currency_map.values(), key=lambda row: row["base_value"], reverse=True)[:6],
 		"top_customers": [
 			{
 				"name": row.name,
@@ -533,6 +665,7 @@ def _sd_mlabel(d):
 # ── Sales Dashboard main API ──────────────────────────────────────────────────
 
 @frappe.whitelist()
+@query_budget()
 def get_dashboard_data(from_date=None, to_date=None):
 	today    = getdate(nowdate())
 	end_date = getdate(to_date) if to_date else today